@@ -48,7 +48,7 @@ from homeassistant.const import (
     SERVICE_TURN_OFF,
     SERVICE_TURN_ON,
 )
-from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.core import Event, ExecutorLane, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv, issue_registry as ir
 from homeassistant.helpers.deprecation import (
@@ -725,8 +725,9 @@ class Camera(Entity, cached_properties=CACHED_PROPERTIES_WITH_ATTR_):
         self, width: int | None = None, height: int | None = None
     ) -> bytes | None:
         """Return bytes of camera image."""
-        return await self.hass.async_add_executor_job(
-            partial(self.camera_image, width=width, height=height)
+        return await self.hass.async_add_lane_executor_job(
+            ExecutorLane.CAMERA,
+            partial(self.camera_image, width=width, height=height),
         )
 
     async def handle_async_still_stream(
@@ -1204,7 +1205,9 @@ async def async_handle_snapshot_service(
             img_file.write(image_data)
 
     try:
-        await hass.async_add_executor_job(_write_image, snapshot_file, image)
+        await hass.async_add_lane_executor_job(
+            ExecutorLane.CAMERA, _write_image, snapshot_file, image
+        )
     except OSError as err:
         _LOGGER.error("Can't write image to file: %s", err)
 
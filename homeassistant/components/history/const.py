@@ -5,3 +5,7 @@ DOMAIN = "history"
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+DOWNSAMPLE_METHOD_BUCKETS = "buckets"
+DOWNSAMPLE_METHOD_LTTB = "lttb"
+MAX_DOWNSAMPLE_BUCKETS = 10000
@@ -0,0 +1,303 @@
+"""Downsample history server side for graphs."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime as dt
+import math
+from typing import Any, Literal
+
+from homeassistant.components.recorder import history, statistics
+from homeassistant.const import (
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from .const import DOWNSAMPLE_METHOD_LTTB
+
+# Use the statistics instead of the states when a bucket is
+# at least as long as a statistics period
+_STATISTICS_PERIODS: tuple[tuple[float, Literal["hour", "5minute"]], ...] = (
+    (3600, "hour"),
+    (300, "5minute"),
+)
+_IGNORED_STATES = {None, STATE_UNAVAILABLE, STATE_UNKNOWN}
+
+# start, end, min, max, mean, last
+type _Segment = tuple[float, float, float | None, float | None, float | None, Any]
+
+
+def _float_or_none(state: Any) -> float | None:
+    """Return the state as a finite float or None."""
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _states_to_segments(states: list[dict[str, Any]], end_ts: float) -> list[_Segment]:
+    """Convert compressed states to segments which last until the next state.
+
+    Numeric states are aggregated, unknown and unavailable states are gaps.
+    If any other state is not numeric only the last state is kept.
+    """
+    numeric = any(
+        state[COMPRESSED_STATE_STATE] not in _IGNORED_STATES for state in states
+    ) and all(
+        _float_or_none(value) is not None
+        for state in states
+        if (value := state[COMPRESSED_STATE_STATE]) not in _IGNORED_STATES
+    )
+    segments: list[_Segment] = []
+    for idx, state in enumerate(states):
+        value = state[COMPRESSED_STATE_STATE]
+        start_ts: float = state[COMPRESSED_STATE_LAST_UPDATED]
+        if idx + 1 < len(states):
+            seg_end_ts: float = states[idx + 1][COMPRESSED_STATE_LAST_UPDATED]
+        else:
+            seg_end_ts = end_ts
+        if not numeric:
+            segments.append((start_ts, seg_end_ts, None, None, None, value))
+        elif (number := _float_or_none(value)) is not None:
+            segments.append((start_ts, seg_end_ts, number, number, number, number))
+    return segments
+
+
+def _statistics_to_segments(
+    rows: list[statistics.StatisticsRow], has_mean: bool
+) -> list[_Segment]:
+    """Convert statistics rows to segments."""
+    segments: list[_Segment] = []
+    for row in rows:
+        if has_mean:
+            if (mean := row.get("mean")) is None:
+                continue
+            segments.append(
+                (row["start"], row["end"], row.get("min"), row.get("max"), mean, mean)
+            )
+        elif (state := row.get("state")) is not None:
+            segments.append((row["start"], row["end"], state, state, state, state))
+    return segments
+
+
+def bucket_segments(
+    segments: list[_Segment], start_ts: float, end_ts: float, buckets: int
+) -> list[dict[str, Any]]:
+    """Aggregate segments into buckets of equal length.
+
+    The mean is weighted by how long each value lasted in the bucket.
+    Buckets without any data are left out.
+    """
+    width = (end_ts - start_ts) / buckets
+    # min, max, weighted sum, duration, last
+    results: list[list[Any] | None] = [None] * buckets
+    for seg_start, seg_end, seg_min, seg_max, seg_mean, seg_last in segments:
+        seg_start = max(seg_start, start_ts)
+        seg_end = min(seg_end, end_ts)
+        if seg_end <= seg_start:
+            continue
+        first = min(int((seg_start - start_ts) / width), buckets - 1)
+        last = min(int((seg_end - start_ts) / width), buckets - 1)
+        for idx in range(first, last + 1):
+            bucket_start = start_ts + idx * width
+            duration = min(seg_end, bucket_start + width) - max(seg_start, bucket_start)
+            if duration <= 0:
+                continue
+            if (result := results[idx]) is None:
+                result = results[idx] = [None, None, 0.0, 0.0, None]
+            result[4] = seg_last
+            if seg_mean is None:
+                continue
+            seg_min = seg_mean if seg_min is None else seg_min
+            seg_max = seg_mean if seg_max is None else seg_max
+            if result[0] is None or seg_min < result[0]:
+                result[0] = seg_min
+            if result[1] is None or seg_max > result[1]:
+                result[1] = seg_max
+            result[2] += seg_mean * duration
+            result[3] += duration
+
+    downsampled: list[dict[str, Any]] = []
+    for idx, result in enumerate(results):
+        if result is None:
+            continue
+        bucket: dict[str, Any] = {"start": start_ts + idx * width}
+        if result[3]:
+            bucket["min"] = result[0]
+            bucket["max"] = result[1]
+            bucket["mean"] = result[2] / result[3]
+        bucket["last"] = result[4]
+        downsampled.append(bucket)
+    return downsampled
+
+
+def largest_triangle_three_buckets(
+    points: list[tuple[float, float]], threshold: int
+) -> list[tuple[float, float]]:
+    """Downsample points to threshold points keeping the visual shape.
+
+    This is the Largest-Triangle-Three-Buckets algorithm. The first and
+    last points are always kept.
+    """
+    if threshold >= len(points):
+        return points
+    if threshold < 3:
+        return [points[0], points[-1]][-threshold:]
+    sampled = [points[0]]
+    every = (len(points) - 2) / (threshold - 2)
+    prev = 0
+    for idx in range(threshold - 2):
+        # The average of the next bucket is the third point of the triangle
+        avg_start = int((idx + 1) * every) + 1
+        avg_end = min(int((idx + 2) * every) + 1, len(points))
+        avg_len = avg_end - avg_start
+        avg_x = sum(point[0] for point in points[avg_start:avg_end]) / avg_len
+        avg_y = sum(point[1] for point in points[avg_start:avg_end]) / avg_len
+
+        prev_x, prev_y = points[prev]
+        max_area = -1.0
+        next_prev = prev + 1
+        for point_idx in range(int(idx * every) + 1, avg_start):
+            x, y = points[point_idx]
+            area = abs(
+                (prev_x - avg_x) * (y - prev_y) - (prev_x - x) * (avg_y - prev_y)
+            )
+            if area > max_area:
+                max_area = area
+                next_prev = point_idx
+        sampled.append(points[next_prev])
+        prev = next_prev
+    sampled.append(points[-1])
+    return sampled
+
+
+def _downsample_segments(
+    segments: list[_Segment],
+    start_ts: float,
+    end_ts: float,
+    buckets: int,
+    method: str,
+) -> list[dict[str, Any]]:
+    """Downsample the segments of an entity."""
+    if method != DOWNSAMPLE_METHOD_LTTB or any(
+        segment[4] is None for segment in segments
+    ):
+        downsampled = bucket_segments(segments, start_ts, end_ts, buckets)
+        if method != DOWNSAMPLE_METHOD_LTTB:
+            return downsampled
+        # States which are not numeric are reduced to the last state
+        # of each bucket
+        return [
+            {
+                COMPRESSED_STATE_STATE: bucket["last"],
+                COMPRESSED_STATE_LAST_UPDATED: bucket["start"],
+            }
+            for bucket in downsampled
+        ]
+    points: list[tuple[float, float]] = [
+        (max(segment[0], start_ts), segment[4])  # type: ignore[misc]
+        for segment in segments
+        if segment[1] > start_ts and segment[0] < end_ts
+    ]
+    return [
+        {COMPRESSED_STATE_STATE: value, COMPRESSED_STATE_LAST_UPDATED: time_ts}
+        for time_ts, value in largest_triangle_three_buckets(points, buckets)
+    ]
+
+
+def downsample_history(
+    hass: HomeAssistant,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    buckets: int,
+    method: str,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the history of entities downsampled to a number of buckets.
+
+    When the buckets are at least as long as a statistics period, the
+    statistics are used for the entities which have them. The states
+    after the last compiled statistics period are added to those.
+
+    This must be called from the recorder executor.
+    """
+    now = dt_util.utcnow()
+    end_time = min(end_time, now) if end_time else now
+    start_ts = start_time.timestamp()
+    end_ts = end_time.timestamp()
+    if end_ts <= start_ts:
+        return {}
+    width = (end_ts - start_ts) / buckets
+
+    segments: dict[str, list[_Segment]] = {}
+    # Entities to fetch the states for by the start of the states
+    states_start: defaultdict[float, list[str]] = defaultdict(list)
+    if period := next(
+        (period for length, period in _STATISTICS_PERIODS if width >= length), None
+    ):
+        metadata = statistics.get_metadata(hass, statistic_ids=set(entity_ids))
+        statistic_ids = {
+            statistic_id
+            for statistic_id, (_, meta) in metadata.items()
+            if meta["source"] == "recorder"
+        }
+        stats = (
+            statistics.statistics_during_period(
+                hass,
+                start_time,
+                end_time,
+                statistic_ids,
+                period,
+                None,
+                {"max", "mean", "min", "state"},
+            )
+            if statistic_ids
+            else {}
+        )
+        for statistic_id in statistic_ids:
+            if not (rows := stats.get(statistic_id)):
+                continue
+            segments[statistic_id] = _statistics_to_segments(
+                rows, metadata[statistic_id][1]["has_mean"]
+            )
+            if (rows_end_ts := rows[-1]["end"]) < end_ts:
+                states_start[rows_end_ts].append(statistic_id)
+    states_start[start_ts].extend(
+        entity_id for entity_id in entity_ids if entity_id not in segments
+    )
+
+    for states_start_ts, states_entity_ids in states_start.items():
+        if not states_entity_ids:
+            continue
+        entity_states = history.get_significant_states(
+            hass,
+            dt_util.utc_from_timestamp(states_start_ts),
+            end_time,
+            states_entity_ids,
+            None,
+            True,
+            True,
+            True,
+            True,
+            True,
+        )
+        for entity_id, states in entity_states.items():
+            segments.setdefault(entity_id, []).extend(
+                _states_to_segments(states, end_ts)  # type: ignore[arg-type]
+            )
+
+    return {
+        entity_id: downsampled
+        for entity_id in entity_ids
+        if (entity_segments := segments.get(entity_id))
+        and (
+            downsampled := _downsample_segments(
+                entity_segments, start_ts, end_ts, buckets, method
+            )
+        )
+    }
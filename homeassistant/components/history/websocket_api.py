@@ -7,7 +7,7 @@ from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from datetime import datetime as dt, timedelta
 import logging
-from typing import Any, cast
+from typing import Any
 
 import voluptuous as vol
 
@@ -34,11 +34,18 @@ from homeassistant.helpers.event import (
     async_track_point_in_utc_time,
     async_track_state_change_event,
 )
-from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.json import json_bytes, json_fragment
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .const import (
+    DOWNSAMPLE_METHOD_BUCKETS,
+    DOWNSAMPLE_METHOD_LTTB,
+    EVENT_COALESCE_TIME,
+    MAX_DOWNSAMPLE_BUCKETS,
+    MAX_PENDING_HISTORY_STATES,
+)
+from .downsample import downsample_history
 from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
 
 _LOGGER = logging.getLogger(__name__)
@@ -59,6 +66,7 @@ class HistoryLiveStream:
 def async_setup(hass: HomeAssistant) -> None:
     """Set up the history websocket API."""
     websocket_api.async_register_command(hass, ws_get_history_during_period)
+    websocket_api.async_register_command(hass, ws_get_downsampled_during_period)
     websocket_api.async_register_command(hass, ws_stream)
 
 
@@ -74,23 +82,17 @@ def _ws_get_significant_states(
     no_attributes: bool,
 ) -> bytes:
     """Fetch history significant_states and convert them to json in the executor."""
-    return json_bytes(
-        messages.result_message(
-            msg_id,
-            history.get_significant_states(
-                hass,
-                start_time,
-                end_time,
-                entity_ids,
-                None,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-                no_attributes,
-                True,
-            ),
-        )
+    states, _ = history.get_significant_states_json(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
     )
+    return json_bytes(messages.result_message(msg_id, states))
 
 
 @websocket_api.websocket_command(
@@ -156,7 +158,7 @@ async def ws_get_history_during_period(
     minimal_response = msg["minimal_response"]
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_read_executor_job(
             _ws_get_significant_states,
             hass,
             msg["id"],
@@ -171,8 +173,89 @@ async def ws_get_history_during_period(
     )
 
 
+def _ws_get_downsampled_history(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    buckets: int,
+    method: str,
+) -> bytes:
+    """Fetch downsampled history and convert it to json in the executor."""
+    return json_bytes(
+        messages.result_message(
+            msg_id,
+            downsample_history(hass, start_time, end_time, entity_ids, buckets, method),
+        )
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/downsampled_during_period",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Required("entity_ids"): [str],
+        vol.Required("buckets"): vol.All(
+            int, vol.Range(min=1, max=MAX_DOWNSAMPLE_BUCKETS)
+        ),
+        vol.Optional("method", default=DOWNSAMPLE_METHOD_BUCKETS): vol.In(
+            [DOWNSAMPLE_METHOD_BUCKETS, DOWNSAMPLE_METHOD_LTTB]
+        ),
+    }
+)
+@websocket_api.async_response
+async def ws_get_downsampled_during_period(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle downsampled history during period websocket command.
+
+    With the buckets method the min, max, mean and last state of each
+    bucket are returned. With the lttb method numeric states are reduced
+    to the number of buckets in the compressed state format.
+    """
+    if start_time := dt_util.parse_datetime(msg["start_time"]):
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str := msg.get("end_time"):
+        if end_time := dt_util.parse_datetime(end_time_str):
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = None
+
+    entity_ids: list[str] = msg["entity_ids"]
+    for entity_id in entity_ids:
+        if not hass.states.get(entity_id) and not valid_entity_id(entity_id):
+            connection.send_error(msg["id"], "invalid_entity_ids", "Invalid entity_ids")
+            return
+
+    if start_time > dt_util.utcnow():
+        connection.send_result(msg["id"], {})
+        return
+
+    connection.send_message(
+        await get_instance(hass).async_add_read_executor_job(
+            _ws_get_downsampled_history,
+            hass,
+            msg["id"],
+            start_time,
+            end_time,
+            entity_ids,
+            msg["buckets"],
+            msg["method"],
+        )
+    )
+
+
 def _generate_stream_message(
-    states: dict[str, list[dict[str, Any]]],
+    states: dict[str, list[dict[str, Any]]] | json_fragment,
     start_day: dt,
     end_day: dt,
 ) -> dict[str, Any]:
@@ -200,7 +283,7 @@ def _generate_websocket_response(
     msg_id: int,
     start_time: dt,
     end_time: dt,
-    states: dict[str, list[dict[str, Any]]],
+    states: dict[str, list[dict[str, Any]]] | json_fragment,
 ) -> bytes:
     """Generate a websocket response."""
     return json_bytes(
@@ -223,29 +306,16 @@ def _generate_historical_response(
     send_empty: bool,
 ) -> tuple[float, dt | None, bytes | None]:
     """Generate a historical response."""
-    states = cast(
-        dict[str, list[dict[str, Any]]],
-        history.get_significant_states(
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            None,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
-            True,
-        ),
+    states, last_time_ts = history.get_significant_states_json(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
     )
-    last_time_ts = 0.0
-    for state_list in states.values():
-        if (
-            state_list
-            and (state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED])
-            > last_time_ts
-        ):
-            last_time_ts = cast(float, state_last_time)
 
     if last_time_ts == 0:
         # If we did not send any states ever, we need to send an empty response
@@ -279,7 +349,7 @@ async def _async_send_historical_states(
 ) -> dt | None:
     """Fetch history significant_states and send them to the client."""
     instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
+    last_time_ts, last_time_dt, payload = await instance.async_add_read_executor_job(
         _generate_historical_response,
         hass,
         msg_id,
@@ -20,13 +20,15 @@ import voluptuous as vol
 from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.core import HomeAssistant, ServiceCall, State, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
 
-from .const import DOMAIN
+from .const import DOMAIN, JOB_STATS
+from .job_stats import JobStats
+from .websocket_api import async_setup_websocket_api
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
@@ -40,6 +42,9 @@ SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
 SERVICE_SET_ASYNCIO_DEBUG = "set_asyncio_debug"
 SERVICE_LOG_CURRENT_TASKS = "log_current_tasks"
+SERVICE_LOG_STATE_MEMORY = "log_state_memory"
+SERVICE_START_JOB_STATS = "start_job_stats"
+SERVICE_STOP_JOB_STATS = "stop_job_stats"
 
 _LRU_CACHE_WRAPPER_OBJECT = _lru_cache_wrapper.__name__
 _SQLALCHEMY_LRU_OBJECT = "LRUCache"
@@ -63,6 +68,9 @@ SERVICES = (
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_SET_ASYNCIO_DEBUG,
     SERVICE_LOG_CURRENT_TASKS,
+    SERVICE_LOG_STATE_MEMORY,
+    SERVICE_START_JOB_STATS,
+    SERVICE_STOP_JOB_STATS,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
@@ -72,6 +80,9 @@ DEFAULT_MAX_OBJECTS = 5
 CONF_ENABLED = "enabled"
 CONF_SECONDS = "seconds"
 CONF_MAX_OBJECTS = "max_objects"
+CONF_SAMPLE_RATE = "sample_rate"
+
+DEFAULT_SAMPLE_RATE = 10
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
 
@@ -260,6 +271,51 @@ async def async_setup_entry(  # noqa: C901
                 if not handle.cancelled():
                     _LOGGER.critical("Scheduled: %s", handle)
 
+    @callback
+    def _async_log_state_memory(call: ServiceCall) -> None:
+        """Log the memory used by the states in the state machine."""
+        usage = _get_state_memory_usage(hass.states.async_all())
+        stats = hass.states.async_attributes_stats()
+        _LOGGER.critical(
+            "State memory usage: %s states, %s bytes per state "
+            "(%s state, %s attributes, %s context, %s cache), "
+            "%s unique attribute mappings, %s interned",
+            usage["states"],
+            usage["bytes_per_state"],
+            usage["state_bytes"],
+            usage["attributes_bytes"],
+            usage["context_bytes"],
+            usage["cache_bytes"],
+            stats["unique_attributes"],
+            stats["interned_attributes"],
+        )
+
+        persistent_notification.async_create(
+            hass,
+            (
+                "State memory usage has been logged. See [the"
+                " logs](/config/logs) to review the stats."
+            ),
+            title="State memory usage logged",
+            notification_id="profile_state_memory",
+        )
+
+    @callback
+    def _async_start_job_stats(call: ServiceCall) -> None:
+        """Start sampling the event loop time of jobs."""
+        if (job_stats := domain_data.get(JOB_STATS)) and job_stats.running:
+            raise HomeAssistantError("Job stats already started")
+        job_stats = domain_data[JOB_STATS] = JobStats(hass, call.data[CONF_SAMPLE_RATE])
+        job_stats.async_start()
+
+    @callback
+    def _async_stop_job_stats(call: ServiceCall) -> None:
+        """Stop sampling the event loop time of jobs."""
+        if not (job_stats := domain_data.get(JOB_STATS)) or not job_stats.running:
+            raise HomeAssistantError("Job stats not running")
+        job_stats.async_stop()
+        _LOGGER.critical("Job stats by integration: %s", job_stats.async_integrations())
+
     async def _async_asyncio_debug(call: ServiceCall) -> None:
         """Enable or disable asyncio debug."""
         enabled = call.data[CONF_ENABLED]
@@ -382,6 +438,36 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_current_tasks,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_STATE_MEMORY,
+        _async_log_state_memory,
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_JOB_STATS,
+        _async_start_job_stats,
+        schema=vol.Schema(
+            {
+                vol.Optional(CONF_SAMPLE_RATE, default=DEFAULT_SAMPLE_RATE): vol.All(
+                    vol.Coerce(int), vol.Range(min=1)
+                )
+            }
+        ),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_JOB_STATS,
+        _async_stop_job_stats,
+    )
+
+    async_setup_websocket_api(hass)
+
     return True
 
 
@@ -391,6 +477,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
+    if (job_stats := hass.data[DOMAIN].get(JOB_STATS)) and job_stats.running:
+        job_stats.async_stop()
     hass.data.pop(DOMAIN)
     return True
 
@@ -491,6 +579,39 @@ def _log_objects(*_):
     _LOGGER.critical("Memory Growth: %s", objgraph.growth(limit=1000))
 
 
+def _get_state_memory_usage(states: list[State]) -> dict[str, int]:
+    """Return the approximate memory used by states.
+
+    Attributes and contexts shared between states are only counted once.
+    """
+    seen: set[int] = set()
+    state_bytes = attributes_bytes = context_bytes = cache_bytes = 0
+    for state in states:
+        state_bytes += sys.getsizeof(state)
+        if id(attributes := state.attributes) not in seen:
+            seen.add(id(attributes))
+            attributes_bytes += sys.getsizeof(attributes) + sum(
+                sys.getsizeof(value) for value in attributes.values()
+            )
+        if id(context := state.context) not in seen:
+            seen.add(id(context))
+            context_bytes += sys.getsizeof(context) + sys.getsizeof(context._cache)  # noqa: SLF001
+        cache = state._cache  # noqa: SLF001
+        cache_bytes += sys.getsizeof(cache) + sum(
+            sys.getsizeof(value) for value in cache.values() if id(value) not in seen
+        )
+        seen.update(id(value) for value in cache.values())
+    total = state_bytes + attributes_bytes + context_bytes + cache_bytes
+    return {
+        "states": len(states),
+        "state_bytes": state_bytes,
+        "attributes_bytes": attributes_bytes,
+        "context_bytes": context_bytes,
+        "cache_bytes": cache_bytes,
+        "bytes_per_state": total // len(states) if states else 0,
+    }
+
+
 def _get_function_absfile(func: Any) -> str | None:
     """Get the absolute file path of a function."""
     import inspect  # pylint: disable=import-outside-toplevel
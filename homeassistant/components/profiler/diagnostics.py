@@ -0,0 +1,27 @@
+"""Diagnostics support for the profiler integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_pending_timer_counts
+
+from .const import DOMAIN, JOB_STATS
+from .job_stats import JobStats
+
+TOP_JOBS = 50
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    job_stats: JobStats | None = hass.data[DOMAIN].get(JOB_STATS)
+    return {
+        "job_stats": job_stats.async_as_dict(TOP_JOBS) if job_stats else None,
+        "states": hass.states.async_attributes_stats(),
+        "executor_lanes": hass.async_executor_lane_stats(),
+        "pending_timers": async_pending_timer_counts(hass),
+    }
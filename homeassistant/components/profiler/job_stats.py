@@ -0,0 +1,194 @@
+"""Sample the time HassJobs spend running in the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import functools
+from time import perf_counter
+from typing import Any
+
+from homeassistant.core import HassJob, HassJobType, HomeAssistant, callback
+from homeassistant.loader import integration_domain_from_module
+
+# Upper bounds in seconds of the duration histogram buckets,
+# the last bucket holds everything slower than the last bound
+HISTOGRAM_BOUNDS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+HISTOGRAM_LABELS = (
+    *(f"<={bound * 1000:g}ms" for bound in HISTOGRAM_BOUNDS),
+    f">{HISTOGRAM_BOUNDS[-1] * 1000:g}ms",
+)
+
+
+@dataclass(slots=True)
+class JobTiming:
+    """Wall time spent in the event loop by a job target."""
+
+    integration: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    )
+
+    def record(self, duration: float) -> None:
+        """Record a run of the job."""
+        self.count += 1
+        self.total += duration
+        self.max = max(duration, self.max)
+        self.histogram[bisect_left(HISTOGRAM_BOUNDS, duration)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the timing."""
+        return {
+            "integration": self.integration,
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count,
+            "max": self.max,
+            "histogram": dict(zip(HISTOGRAM_LABELS, self.histogram, strict=True)),
+        }
+
+
+def _job_target_name(target: Callable[..., Any]) -> tuple[str, str]:
+    """Return the name and the integration of a job target."""
+    while isinstance(target, functools.partial):
+        target = target.func
+    module = getattr(target, "__module__", None) or type(target).__module__
+    qualname = getattr(target, "__qualname__", None) or type(target).__qualname__
+    return f"{module}.{qualname}", integration_domain_from_module(module)
+
+
+class JobStats:
+    """Sample the event loop time of HassJobs run by Home Assistant.
+
+    While running, the HassJob methods of the HomeAssistant instance are
+    shadowed by timed versions. When stopped the instance attributes are
+    removed again so there is no overhead when sampling is not running.
+    """
+
+    def __init__(self, hass: HomeAssistant, sample_rate: int) -> None:
+        """Initialize the job stats."""
+        self.hass = hass
+        self.sample_rate = sample_rate
+        self.timings: dict[str, JobTiming] = {}
+        self.sampled = 0
+        self._calls = 0
+        self.running = False
+
+    @callback
+    def _async_record(self, target: Callable[..., Any], duration: float) -> None:
+        """Record the duration of a job target."""
+        name, integration = _job_target_name(target)
+        if (timing := self.timings.get(name)) is None:
+            timing = self.timings[name] = JobTiming(integration)
+        timing.record(duration)
+        self.sampled += 1
+
+    @callback
+    def _async_should_sample(self) -> bool:
+        """Return if the next job should be sampled."""
+        self._calls += 1
+        return not self._calls % self.sample_rate
+
+    def _timed_callback(self, target: Callable[..., Any], *args: Any) -> Any:
+        """Run a callback and record its duration."""
+        start = perf_counter()
+        try:
+            return target(*args)
+        finally:
+            self._async_record(target, perf_counter() - start)
+
+    @callback
+    def async_start(self) -> None:
+        """Start sampling jobs."""
+        hass = self.hass
+        # Bound to the class implementations so the shadowing
+        # instance attributes can call through to them
+        run_hass_job = HomeAssistant.async_run_hass_job.__get__(hass)
+        add_hass_job = HomeAssistant._async_add_hass_job.__get__(hass)  # noqa: SLF001
+        timed_callback = self._timed_callback
+        should_sample = self._async_should_sample
+
+        @callback
+        def _async_run_hass_job(
+            hassjob: HassJob[..., Any], *args: Any, background: bool = False
+        ) -> asyncio.Future[Any] | None:
+            if hassjob.job_type is HassJobType.Callback and should_sample():
+                timed_callback(hassjob.target, *args)
+                return None
+            return run_hass_job(hassjob, *args, background=background)
+
+        @callback
+        def _async_add_hass_job(
+            hassjob: HassJob[..., Any], *args: Any, background: bool = False
+        ) -> asyncio.Future[Any] | None:
+            job_type = hassjob.job_type
+            if job_type is HassJobType.Executor or not should_sample():
+                return add_hass_job(hassjob, *args, background=background)
+            if job_type is HassJobType.Callback:
+                hass.loop.call_soon(timed_callback, hassjob.target, *args)
+                return None
+            # Coroutine functions are started eagerly, time the
+            # part that runs before the first suspension
+            start = perf_counter()
+            try:
+                return add_hass_job(hassjob, *args, background=background)
+            finally:
+                self._async_record(hassjob.target, perf_counter() - start)
+
+        hass.async_run_hass_job = _async_run_hass_job  # type: ignore[method-assign]
+        hass._async_add_hass_job = _async_add_hass_job  # type: ignore[method-assign]  # noqa: SLF001
+        self.running = True
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop sampling jobs."""
+        hass = self.hass
+        del hass.async_run_hass_job
+        del hass._async_add_hass_job  # noqa: SLF001
+        self.running = False
+
+    @callback
+    def async_top(self, limit: int) -> list[dict[str, Any]]:
+        """Return the job targets that spent the most time in the event loop."""
+        timings = sorted(
+            self.timings.items(), key=lambda item: item[1].total, reverse=True
+        )
+        return [
+            {"target": name, **timing.as_dict()} for name, timing in timings[:limit]
+        ]
+
+    @callback
+    def async_integrations(self) -> dict[str, dict[str, Any]]:
+        """Return the time spent in the event loop per integration."""
+        integrations: dict[str, dict[str, Any]] = {}
+        for timing in self.timings.values():
+            if (summary := integrations.get(timing.integration)) is None:
+                summary = integrations[timing.integration] = {
+                    "count": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                }
+            summary["count"] += timing.count
+            summary["total"] += timing.total
+            summary["max"] = max(summary["max"], timing.max)
+        return dict(
+            sorted(
+                integrations.items(), key=lambda item: item[1]["total"], reverse=True
+            )
+        )
+
+    @callback
+    def async_as_dict(self, limit: int) -> dict[str, Any]:
+        """Return a dict representation of the stats."""
+        return {
+            "running": self.running,
+            "sample_rate": self.sample_rate,
+            "sampled": self.sampled,
+            "integrations": self.async_integrations(),
+            "top": self.async_top(limit),
+        }
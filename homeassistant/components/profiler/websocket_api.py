@@ -0,0 +1,44 @@
+"""Websocket API for the profiler integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, JOB_STATS
+from .job_stats import JobStats
+
+DEFAULT_LIMIT = 20
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Set up the profiler websocket API."""
+    websocket_api.async_register_command(hass, ws_job_stats)
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/job_stats",
+        vol.Optional("limit", default=DEFAULT_LIMIT): vol.All(int, vol.Range(min=1)),
+    }
+)
+@callback
+def ws_job_stats(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the jobs that spent the most time in the event loop."""
+    job_stats: JobStats | None = hass.data.get(DOMAIN, {}).get(JOB_STATS)
+    if job_stats is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Job stats have not been started"
+        )
+        return
+    connection.send_result(msg["id"], job_stats.async_as_dict(msg["limit"]))
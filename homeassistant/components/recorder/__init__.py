@@ -31,6 +31,9 @@ from homeassistant.util.event_type import EventType
 from . import entity_registry, websocket_api
 from .const import (  # noqa: F401
     CONF_DB_INTEGRITY_CHECK,
+    DEFAULT_DB_READ_WORKERS,
+    DEFAULT_PURGE_YIELD_BACKLOG,
+    DEFAULT_SPILL_BACKLOG,
     DOMAIN,
     INTEGRATION_PLATFORM_COMPILE_STATISTICS,
     INTEGRATION_PLATFORM_METHODS,
@@ -38,6 +41,7 @@ from .const import (  # noqa: F401
     SupportedDialect,
 )
 from .core import Recorder
+from .partitions import PARTITION_INTERVALS
 from .services import async_register_services
 from .tasks import AddRecorderPlatformTask
 from .util import get_instance
@@ -57,8 +61,13 @@ CONF_AUTO_REPACK = "auto_repack"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
+CONF_DB_PARTITION_INTERVAL = "db_partition_interval"
+CONF_DB_READ_WORKERS = "db_read_workers"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
+CONF_PURGE_MAX_ROWS_PER_SECOND = "purge_max_rows_per_second"
+CONF_PURGE_YIELD_BACKLOG = "purge_yield_backlog"
+CONF_SPILL_BACKLOG = "spill_backlog"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
 
@@ -100,6 +109,12 @@ CONFIG_SCHEMA = vol.Schema(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): cv.positive_int,
+                    vol.Optional(CONF_PURGE_MAX_ROWS_PER_SECOND): vol.All(
+                        vol.Coerce(float), vol.Range(min=1)
+                    ),
+                    vol.Optional(
+                        CONF_PURGE_YIELD_BACKLOG, default=DEFAULT_PURGE_YIELD_BACKLOG
+                    ): cv.positive_int,
                     vol.Optional(CONF_DB_URL): vol.All(cv.string, validate_db_url),
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
@@ -113,6 +128,15 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_DB_PARTITION_INTERVAL): vol.In(
+                        PARTITION_INTERVALS
+                    ),
+                    vol.Optional(
+                        CONF_DB_READ_WORKERS, default=DEFAULT_DB_READ_WORKERS
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_SPILL_BACKLOG, default=DEFAULT_SPILL_BACKLOG
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
                 }
             ),
         )
@@ -163,8 +187,15 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        purge_max_rows_per_second=conf.get(CONF_PURGE_MAX_ROWS_PER_SECOND),
+        purge_yield_backlog=conf[CONF_PURGE_YIELD_BACKLOG],
+        partition_interval=conf.get(CONF_DB_PARTITION_INTERVAL),
+        db_read_workers=conf[CONF_DB_READ_WORKERS],
+        spill_backlog=conf[CONF_SPILL_BACKLOG],
     )
     get_instance.cache_clear()
+    if instance.spill_journal:
+        await hass.async_add_executor_job(instance.spill_journal.open)
     instance.async_initialize()
     instance.async_register()
     instance.start()
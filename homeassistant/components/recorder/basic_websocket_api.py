@@ -37,6 +37,10 @@ def ws_info(
         # for the thread state lock which will block the event loop.
         is_running = instance.is_running
         max_backlog = instance.max_backlog
+        purge_progress = instance.purge_progress
+        read_executor = instance.async_read_executor_stats()
+        caches = instance.async_cache_stats()
+        spill_journal = instance.async_spill_journal_stats()
     else:
         backlog = None
         migration_in_progress = False
@@ -44,13 +48,21 @@ def ws_info(
         recording = False
         is_running = False
         max_backlog = None
+        purge_progress = None
+        read_executor = None
+        caches = None
+        spill_journal = None
 
     recorder_info = {
         "backlog": backlog,
+        "caches": caches,
         "max_backlog": max_backlog,
         "migration_in_progress": migration_in_progress,
         "migration_is_live": migration_is_live,
+        "purge": purge_progress.as_dict() if purge_progress else None,
+        "read_executor": read_executor,
         "recording": recording,
+        "spill_journal": spill_journal,
         "thread_running": is_running,
     }
     connection.send_result(msg["id"], recorder_info)
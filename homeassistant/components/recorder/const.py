@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 from enum import StrEnum
+import os
 from typing import TYPE_CHECKING
 
 from homeassistant.const import (
@@ -30,6 +32,24 @@ CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 MAX_QUEUE_BACKLOG_MIN_VALUE = 65000
 MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG = 256 * 1024**2
 
+# A purge waits for the live writes while the backlog is above this
+DEFAULT_PURGE_YIELD_BACKLOG = 1000
+# Seconds to wait before trying again when a purge yields to the live writes
+PURGE_YIELD_DELAY = 5
+
+# Events are spilled to an on disk journal while the backlog is above this
+DEFAULT_SPILL_BACKLOG = 30000
+SPILL_JOURNAL_FILE = "home-assistant_v2.spill"
+
+# The caches of the table managers grow with the observed working set
+# up to this size
+MAX_LRU_CACHE_SIZE = 65536
+
+# The caches are warmed at startup from the states updated in this window
+CACHE_WARM_START_WINDOW = timedelta(days=1)
+# and at most this many of the latest states are scanned
+CACHE_WARM_MAX_STATES = 100000
+
 # The maximum number of rows (events) we purge in one delete statement
 
 # sqlite3 has a limit of 999 until version 3.32.0
@@ -45,6 +65,11 @@ SQLITE_MODERN_MAX_BIND_VARS = 4000
 DEFAULT_MAX_BIND_VARS = 4000
 
 DB_WORKER_PREFIX = "DbWorker"
+DB_READ_WORKER_PREFIX = "DbReadWorker"
+
+# Read only queries of history, logbook and statistics run in their
+# own workers so they can run in parallel with the database executor
+DEFAULT_DB_READ_WORKERS = min(max(os.cpu_count() or 1, 2), 8)
 
 ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
 
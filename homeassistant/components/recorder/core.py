@@ -7,6 +7,7 @@ from collections.abc import Callable, Iterable
 from concurrent.futures import CancelledError
 import contextlib
 from datetime import datetime, timedelta
+from functools import partial
 import logging
 import queue
 import sqlite3
@@ -35,10 +36,12 @@ from homeassistant.core import (
     CALLBACK_TYPE,
     Event,
     EventStateChangedData,
+    HassJob,
     HomeAssistant,
     callback,
 )
 from homeassistant.helpers.event import (
+    async_call_later,
     async_track_time_change,
     async_track_time_interval,
     async_track_utc_time_change,
@@ -48,19 +51,28 @@ from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
+from homeassistant.util.executor import ExecutorStats
 
-from . import migration, statistics
+from . import migration, partitions, statistics
 from .const import (
+    CACHE_WARM_MAX_STATES,
+    CACHE_WARM_START_WINDOW,
+    DB_READ_WORKER_PREFIX,
     DB_WORKER_PREFIX,
+    DEFAULT_DB_READ_WORKERS,
+    DEFAULT_PURGE_YIELD_BACKLOG,
+    DEFAULT_SPILL_BACKLOG,
     DOMAIN,
     KEEPALIVE_TIME,
     LAST_REPORTED_SCHEMA_VERSION,
     MARIADB_PYMYSQL_URL_PREFIX,
     MARIADB_URL_PREFIX,
+    MAX_LRU_CACHE_SIZE,
     MAX_QUEUE_BACKLOG_MIN_VALUE,
     MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    SPILL_JOURNAL_FILE,
     SQLITE_MAX_BIND_VARS,
     SQLITE_URL_PREFIX,
     SupportedDialect,
@@ -77,14 +89,21 @@ from .db_schema import (
     Statistics,
     StatisticsShortTerm,
 )
-from .executor import DBInterruptibleThreadPoolExecutor
+from .executor import (
+    DBInterruptibleThreadPoolExecutor,
+    InstrumentedDBInterruptibleThreadPoolExecutor,
+)
+from .journal import SpillJournal, SpillJournalStats, decode_event, encode_event
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
 from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .purge import PurgeProgress
+from .queries import find_latest_states_meta_and_attributes, find_max_state_id
+from .table_managers import LRUCacheStats
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
 from .table_managers.state_attributes import StateAttributesManager
-from .table_managers.states import StatesManager
+from .table_managers.states import PendingState, StatesManager
 from .table_managers.states_meta import StatesMetaManager
 from .table_managers.statistics_meta import StatisticsMetaManager
 from .tasks import (
@@ -100,6 +119,7 @@ from .tasks import (
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
+    ReplaySpillJournalTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -112,10 +132,12 @@ from .util import (
     build_mysqldb_conv,
     dburl_to_path,
     end_incomplete_runs,
+    execute_stmt_lambda_element,
     is_second_sunday,
     move_away_broken_database,
     session_scope,
     setup_connection_for_dialect,
+    setup_read_only_connection,
     validate_or_move_away_sqlite_database,
     write_lock_db_sqlite,
 )
@@ -140,6 +162,14 @@ DB_LOCK_QUEUE_CHECK_TIMEOUT = 10  # check every 10 seconds
 
 QUEUE_CHECK_INTERVAL = timedelta(minutes=5)
 
+# While events are spilled the journal is written and the backlog is
+# checked to start replaying the journal at this interval
+SPILL_CHECK_INTERVAL = timedelta(seconds=1)
+# Write the spilled events before the next check once this many are buffered
+SPILL_WRITE_RECORDS = 1000
+# The number of events replayed from the journal per recorder task
+SPILL_REPLAY_RECORDS = 1000
+
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
 
@@ -164,6 +194,11 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        purge_max_rows_per_second: float | None = None,
+        purge_yield_backlog: int = DEFAULT_PURGE_YIELD_BACKLOG,
+        partition_interval: str | None = None,
+        db_read_workers: int = DEFAULT_DB_READ_WORKERS,
+        spill_backlog: int = DEFAULT_SPILL_BACKLOG,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -174,6 +209,13 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.auto_repack = auto_repack
         self.keep_days = keep_days
+        self.purge_max_rows_per_second = purge_max_rows_per_second
+        self.purge_yield_backlog = purge_yield_backlog
+        self.purge_progress: PurgeProgress | None = None
+        # The interval of the partitions of the states and events tables,
+        # None if the tables are not partitioned
+        self.partition_interval = partition_interval
+        self.db_read_workers = db_read_workers
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
         self.commit_interval = commit_interval
@@ -193,6 +235,20 @@ class Recorder(threading.Thread):
         self.engine: Engine | None = None
         self.max_backlog: int = MAX_QUEUE_BACKLOG_MIN_VALUE
         self._psutil: ha_psutil.PsutilWrapper | None = None
+        # Events are spilled to the journal instead of the queue while
+        # the backlog is too large, None if spilling is disabled
+        self.spill_backlog = spill_backlog
+        self.spill_journal = (
+            SpillJournal(hass.config.path(SPILL_JOURNAL_FILE))
+            if spill_backlog
+            else None
+        )
+        self._spilling = False
+        self._spill_buffer: list[bytes] = []
+        self._spill_write: asyncio.Task[None] | None = None
+        self._spill_watcher: CALLBACK_TYPE | None = None
+        self._spill_replay_queued = False
+        self.spill_replay_rate: float | None = None
 
         # The entity_filter is exposed on the recorder instance so that
         # it can be used to see if an entity is being recorded and is called
@@ -201,6 +257,9 @@ class Recorder(threading.Thread):
         self.exclude_event_types = exclude_event_types
 
         self.schema_version = 0
+        # States are written with the bulk insert when the database
+        # schema is current, older schemas use the ORM
+        self._bulk_insert_states = False
         self._commits_without_expire = 0
         self._event_session_has_pending_writes = False
 
@@ -220,6 +279,12 @@ class Recorder(threading.Thread):
         self.use_legacy_events_index = False
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
+        self._db_read_executor: InstrumentedDBInterruptibleThreadPoolExecutor | None = (
+            None
+        )
+        self._read_thread_ids: set[int] = set()
+        self.read_engine: Engine | None = None
+        self._get_read_session: Callable[[], Session] | None = None
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
@@ -260,7 +325,15 @@ class Recorder(threading.Thread):
         return self._event_listener is not None
 
     def get_session(self) -> Session:
-        """Get a new sqlalchemy session."""
+        """Get a new sqlalchemy session.
+
+        Sessions of the read workers use the read only connections.
+        """
+        if (
+            self._get_read_session is not None
+            and threading.get_ident() in self._read_thread_ids
+        ):
+            return self._get_read_session()
         if self._get_session is None:
             raise RuntimeError("The database connection has not been established")
         return self._get_session()
@@ -269,6 +342,29 @@ class Recorder(threading.Thread):
         """Add a task to the recorder queue."""
         self._queue.put(task)
 
+    def queue_task_later(self, delay: float, task: RecorderTask) -> None:
+        """Add a task to the recorder queue after a delay.
+
+        This call is thread-safe.
+        """
+        self.hass.loop.call_soon_threadsafe(self._async_queue_task_later, delay, task)
+
+    @callback
+    def _async_queue_task_later(self, delay: float, task: RecorderTask) -> None:
+        """Schedule adding a task to the recorder queue."""
+        async_call_later(
+            self.hass,
+            delay,
+            HassJob(
+                partial(self._async_queue_delayed_task, task), cancel_on_shutdown=True
+            ),
+        )
+
+    @callback
+    def _async_queue_delayed_task(self, task: RecorderTask, now: datetime) -> None:
+        """Add a delayed task to the recorder queue."""
+        self.queue_task(task)
+
     def set_enable(self, enable: bool) -> None:
         """Enable or disable recording events and states."""
         self.enabled = enable
@@ -282,18 +378,37 @@ class Recorder(threading.Thread):
             max_workers=MAX_DB_EXECUTOR_WORKERS,
             shutdown_hook=self._shutdown_pool,
         )
+        if self.db_read_workers:
+            self._db_read_executor = InstrumentedDBInterruptibleThreadPoolExecutor(
+                self._read_thread_ids,
+                thread_name_prefix=DB_READ_WORKER_PREFIX,
+                max_workers=self.db_read_workers,
+                shutdown_hook=self._shutdown_read_pool,
+            )
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
         if self.engine and hasattr(self.engine.pool, "shutdown"):
             self.engine.pool.shutdown()
 
+    def _shutdown_read_pool(self) -> None:
+        """Close the read only dbpool connections in the current thread."""
+        if self.read_engine and hasattr(self.read_engine.pool, "shutdown"):
+            self.read_engine.pool.shutdown()
+
     @callback
     def async_initialize(self) -> None:
         """Initialize the recorder."""
         entity_filter = self.entity_filter
         exclude_event_types = self.exclude_event_types
-        queue_put = self._queue.put_nowait
+        queue_put: Callable[[Event], None]
+        if self.spill_journal is None:
+            queue_put = self._queue.put_nowait
+        else:
+            queue_put = self._async_queue_or_spill_event
+            if self.spill_journal.pending_bytes:
+                # Events spilled by the previous run are replayed first
+                self._async_start_spilling()
 
         @callback
         def _event_listener(event: Event) -> None:
@@ -356,6 +471,26 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    @callback
+    def async_add_read_executor_job[_T](
+        self, target: Callable[..., _T], *args: Any
+    ) -> asyncio.Future[_T]:
+        """Add a read only executor job from within the event loop.
+
+        The job runs in the read workers which use read only connections.
+        Without read only connections the job runs in the database executor.
+        """
+        if self.read_engine is None:
+            return self.hass.loop.run_in_executor(self._db_executor, target, *args)
+        return self.hass.loop.run_in_executor(self._db_read_executor, target, *args)
+
+    @callback
+    def async_read_executor_stats(self) -> ExecutorStats | None:
+        """Return the queue depth and latency stats of the read workers."""
+        if self._db_read_executor is None:
+            return None
+        return self._db_read_executor.stats()
+
     @callback
     def _async_check_queue(self, *_: Any) -> None:
         """Periodic check of the queue size to ensure we do not exhaust memory.
@@ -376,6 +511,161 @@ class Recorder(threading.Thread):
         )
         self._async_stop_queue_watcher_and_event_listener()
 
+    @callback
+    def _async_queue_or_spill_event(self, event: Event) -> None:
+        """Queue an event or spill it to the journal if the backlog is too large."""
+        if not self._spilling:
+            if self._queue.qsize() < self.spill_backlog:
+                self._queue.put_nowait(event)
+                return
+            _LOGGER.warning(
+                (
+                    "The recorder backlog reached %s events; events are written "
+                    "to %s until the database catches up"
+                ),
+                self.backlog,
+                self.spill_journal.path,  # type: ignore[union-attr]
+            )
+            self._async_start_spilling()
+        if record := encode_event(event, self._dialect_name):
+            self._spill_buffer.append(record)
+            if len(self._spill_buffer) >= SPILL_WRITE_RECORDS:
+                self._async_write_spill_buffer()
+
+    @callback
+    def _async_start_spilling(self) -> None:
+        """Start spilling the events to the journal."""
+        self._spilling = True
+        self._spill_watcher = async_track_time_interval(
+            self.hass,
+            self._async_check_spill,
+            SPILL_CHECK_INTERVAL,
+            name="Recorder spill watcher",
+        )
+
+    @callback
+    def _async_stop_spilling(self) -> None:
+        """Stop spilling the events to the journal."""
+        self._spilling = False
+        if self._spill_watcher:
+            self._spill_watcher()
+            self._spill_watcher = None
+
+    @callback
+    def _async_check_spill(self, *_: Any) -> None:
+        """Write the spilled events and replay them once the backlog is low.
+
+        Events are queued again once every spilled event has been replayed.
+        """
+        self._async_write_spill_buffer()
+        if self._spill_replay_queued or self.backlog >= self.spill_backlog // 2:
+            return
+        journal = self.spill_journal
+        assert journal is not None
+        if (
+            not journal.pending_bytes
+            and not self._spill_buffer
+            and self._spill_write is None
+        ):
+            _LOGGER.info("The recorder caught up with the spilled events")
+            self._async_stop_spilling()
+            return
+        self._spill_replay_queued = True
+        self.queue_task(ReplaySpillJournalTask())
+
+    @callback
+    def _async_spill_journal_replayed(self) -> None:
+        """Replay the next events once the recorder replayed a batch."""
+        self._spill_replay_queued = False
+        if self._spilling:
+            self._async_check_spill()
+
+    @callback
+    def _async_write_spill_buffer(self) -> None:
+        """Write the buffered events to the journal in the executor."""
+        if self._spill_write is None and self._spill_buffer:
+            self._spill_write = self.hass.async_create_background_task(
+                self._async_write_spill_journal(),
+                "Recorder spill journal write",
+                eager_start=True,
+            )
+
+    async def _async_write_spill_journal(self) -> None:
+        """Write the buffered events to the journal until the buffer is empty."""
+        journal = self.spill_journal
+        assert journal is not None
+        try:
+            while records := self._spill_buffer:
+                self._spill_buffer = []
+                try:
+                    await self.hass.async_add_executor_job(journal.append, records)
+                except OSError:
+                    _LOGGER.exception("Error writing the recorder spill journal")
+                    # Keep the events to try again with the next check
+                    self._spill_buffer[:0] = records
+                    return
+        finally:
+            self._spill_write = None
+
+    async def _async_flush_spill_journal(self) -> None:
+        """Write all buffered events to the journal."""
+        if self._spill_write:
+            await self._spill_write
+        self._async_write_spill_buffer()
+        if self._spill_write:
+            await self._spill_write
+
+    def _replay_spill_journal(self) -> None:
+        """Replay the next events from the spill journal.
+
+        The caches are loaded for all events of the batch at once
+        and the batch is committed in one go when it has been processed.
+        The batch is only marked as read in the journal once it has been
+        committed, a database error leaves it to be replayed again.
+        """
+        journal = self.spill_journal
+        assert journal is not None
+        start = time.monotonic()
+        try:
+            records = journal.read(SPILL_REPLAY_RECORDS)
+            if records and self.enabled:
+                events: list[RecorderTask | Event] = [
+                    decode_event(record) for record in records
+                ]
+                self._pre_process_startup_events(events)
+                for event in events:
+                    if TYPE_CHECKING:
+                        assert isinstance(event, Event)
+                    try:
+                        self._process_event_into_session(event)
+                    except SQLAlchemyError:
+                        raise
+                    except Exception:
+                        _LOGGER.exception("Error while processing event %s", event)
+                self._commit_event_session_or_retry()
+                journal.mark_read()
+                self.spill_replay_rate = len(records) / max(
+                    time.monotonic() - start, 0.001
+                )
+        except OSError:
+            _LOGGER.exception("Error reading the recorder spill journal")
+        finally:
+            self.hass.add_job(self._async_spill_journal_replayed)
+
+    @callback
+    def async_spill_journal_stats(self) -> SpillJournalStats | None:
+        """Return the size and replay rate of the spill journal."""
+        if (journal := self.spill_journal) is None:
+            return None
+        return {
+            "spilling": self._spilling,
+            "size": journal.pending_bytes
+            + sum(len(record) for record in self._spill_buffer),
+            "spilled": journal.records_written,
+            "replayed": journal.records_read,
+            "replay_rate": self.spill_replay_rate,
+        }
+
     def _available_memory(self) -> int:
         """Return the available memory in bytes."""
         if not self._psutil:
@@ -406,6 +696,9 @@ class Recorder(threading.Thread):
     def _async_stop_listeners(self) -> None:
         """Stop listeners."""
         self._async_stop_queue_watcher_and_event_listener()
+        if self._spill_watcher:
+            self._spill_watcher()
+            self._spill_watcher = None
         if self._keep_alive_listener:
             self._keep_alive_listener()
             self._keep_alive_listener = None
@@ -443,6 +736,9 @@ class Recorder(threading.Thread):
             self._hass_started.set_result(SHUTDOWN_TASK)
         self.queue_task(StopTask())
         self._async_stop_listeners()
+        if self._spilling:
+            # The spilled events are replayed with the next start
+            await self._async_flush_spill_journal()
         await self.hass.async_add_executor_job(self.join)
 
     @callback
@@ -528,13 +824,74 @@ class Recorder(threading.Thread):
     def _adjust_lru_size(self) -> None:
         """Trigger the LRU adjustment.
 
-        If the number of entities has increased, increase the size of the LRU
-        cache to avoid thrashing.
+        The LRU caches grow when the observed working set does not fit
+        to avoid thrashing. The states caches are always large enough
+        for twice the number of entities.
+        """
+        min_size = self.hass.states.async_entity_ids_count() * 2
+        self.state_attributes_manager.adapt_lru_size(min_size, MAX_LRU_CACHE_SIZE)
+        self.states_meta_manager.adapt_lru_size(min_size, MAX_LRU_CACHE_SIZE)
+        self.event_data_manager.adapt_lru_size(0, MAX_LRU_CACHE_SIZE)
+        self.event_type_manager.adapt_lru_size(0, MAX_LRU_CACHE_SIZE)
+        if min_size:
+            self.statistics_meta_manager.adjust_lru_size(min_size)
+
+    def _warm_caches(self) -> None:
+        """Warm the states_meta and state_attributes caches.
+
+        The ids of the entities and attributes of the latest state of
+        each recently updated entity are loaded with a single query, so
+        the states recorded after a restart do not have to look them up
+        one by one. The scan is bounded to the latest CACHE_WARM_MAX_STATES
+        states to keep it cheap on large databases.
         """
-        if new_size := self.hass.states.async_entity_ids_count() * 2:
-            self.state_attributes_manager.adjust_lru_size(new_size)
-            self.states_meta_manager.adjust_lru_size(new_size)
-            self.statistics_meta_manager.adjust_lru_size(new_size)
+        if not self.states_meta_manager.active:
+            return
+        start_ts = (dt_util.utcnow() - CACHE_WARM_START_WINDOW).timestamp()
+        limit = max(
+            self.states_meta_manager.cache_stats()["max_size"],
+            self.state_attributes_manager.cache_stats()["max_size"],
+        )
+        try:
+            with session_scope(session=self.get_session(), read_only=True) as session:
+                max_state_id = session.execute(find_max_state_id()).scalar()
+                if max_state_id is None:
+                    return
+                min_state_id = max_state_id - CACHE_WARM_MAX_STATES
+                rows = list(
+                    execute_stmt_lambda_element(
+                        session,
+                        find_latest_states_meta_and_attributes(
+                            start_ts, min_state_id, limit
+                        ),
+                        orm_rows=False,
+                    )
+                )
+        except SQLAlchemyError:
+            _LOGGER.exception("Error warming the recorder caches")
+            return
+        # The most recently updated entities are added last
+        # so they are the last to be evicted
+        rows.reverse()
+        self.states_meta_manager.prime(
+            (entity_id, metadata_id) for metadata_id, entity_id, _, _ in rows
+        )
+        self.state_attributes_manager.prime(
+            (shared_attrs, attributes_id)
+            for _, _, attributes_id, shared_attrs in rows
+            if attributes_id is not None and shared_attrs is not None
+        )
+        _LOGGER.debug("Warmed the recorder caches with %s states", len(rows))
+
+    @callback
+    def async_cache_stats(self) -> dict[str, LRUCacheStats]:
+        """Return the usage of the caches of the table managers."""
+        return {
+            "event_data": self.event_data_manager.cache_stats(),
+            "event_types": self.event_type_manager.cache_stats(),
+            "state_attributes": self.state_attributes_manager.cache_stats(),
+            "states_meta": self.states_meta_manager.cache_stats(),
+        }
 
     @callback
     def async_periodic_statistics(self) -> None:
@@ -782,8 +1139,13 @@ class Recorder(threading.Thread):
         # Catch up with missed statistics
         self._schedule_compile_missing_statistics()
         _LOGGER.debug("Recorder processing the queue")
+        self._bulk_insert_states = self.schema_version == SCHEMA_VERSION
         self._adjust_lru_size()
         self.hass.add_job(self._async_set_recorder_ready_migration_done)
+        # Warm the caches after the recorder is ready so the scan
+        # does not delay startup, the events received meanwhile
+        # are queued and recorded once it finishes
+        self._warm_caches()
         self._run_event_loop()
 
     def _activate_and_set_db_ready(
@@ -1009,14 +1371,21 @@ class Recorder(threading.Thread):
     def _process_one_event(self, event: Event[Any]) -> None:
         if not self.enabled:
             return
-        if event.event_type == EVENT_STATE_CHANGED:
-            self._process_state_changed_event_into_session(event)
-        else:
-            self._process_non_state_changed_event_into_session(event)
+        self._process_event_into_session(event)
         # Commit if the commit interval is zero
         if not self.commit_interval:
             self._commit_event_session_or_retry()
 
+    def _process_event_into_session(self, event: Event[Any]) -> None:
+        """Process an event into the session without committing it."""
+        if event.event_type == EVENT_STATE_CHANGED:
+            if self._bulk_insert_states:
+                self._queue_state_changed_event(event)
+            else:
+                self._process_state_changed_event_into_session(event)
+        else:
+            self._process_non_state_changed_event_into_session(event)
+
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
         session = self.event_session
@@ -1080,6 +1449,8 @@ class Recorder(threading.Thread):
 
         states_manager = self.states_manager
         if pending_state := states_manager.pop_pending(entity_id):
+            if TYPE_CHECKING:
+                assert isinstance(pending_state, States)
             dbstate.old_state = pending_state
             if old_state:
                 pending_state.last_reported_ts = old_state.last_reported_timestamp
@@ -1103,32 +1474,126 @@ class Recorder(threading.Thread):
             return
 
         # Map the entity_id to the StatesMeta table
+        if (
+            states_meta_ref := self._resolve_states_meta(
+                entity_id, entity_removed, session
+            )
+        ) is None:
+            return
+        if isinstance(states_meta_ref, StatesMeta):
+            dbstate.states_meta_rel = states_meta_ref
+        else:
+            dbstate.metadata_id = states_meta_ref
+
+        # Map the event data to the StateAttributes table
+        dbstate.attributes = None
+        attributes_ref = self._resolve_state_attributes(shared_attrs_bytes, session)
+        if isinstance(attributes_ref, StateAttributes):
+            dbstate.state_attributes = attributes_ref
+        else:
+            dbstate.attributes_id = attributes_ref
+
+        self._add_to_session(session, dbstate)
+
+    def _queue_state_changed_event(self, event: Event[EventStateChangedData]) -> None:
+        """Queue a state_changed event for the bulk insert of the next commit.
+
+        This is the same as _process_state_changed_event_into_session
+        without creating ORM objects for the states.
+        """
+        state_attributes_manager = self.state_attributes_manager
+        entity_removed = not event.data.get("new_state")
+        entity_id = event.data["entity_id"]
+
+        pending = PendingState.from_event(event)
+        row = pending.row
+        old_state = event.data["old_state"]
+
+        assert self.event_session is not None
+        session = self.event_session
+
+        states_manager = self.states_manager
+        if pending_state := states_manager.pop_pending(entity_id):
+            if TYPE_CHECKING:
+                assert isinstance(pending_state, PendingState)
+            pending.old_state = pending_state
+            if old_state:
+                pending_state.row["last_reported_ts"] = (
+                    old_state.last_reported_timestamp
+                )
+        elif old_state_id := states_manager.pop_committed(entity_id):
+            row["old_state_id"] = old_state_id
+            if old_state:
+                states_manager.update_pending_last_reported(
+                    old_state_id, old_state.last_reported_timestamp
+                )
+        if entity_removed:
+            row["state"] = None
+        else:
+            states_manager.add_pending(entity_id, pending)
+
+        if self.states_meta_manager.active:
+            row["entity_id"] = None
+
+        if entity_id is None or not (
+            shared_attrs_bytes := state_attributes_manager.serialize_from_event(event)
+        ):
+            return
+
+        if (
+            states_meta_ref := self._resolve_states_meta(
+                entity_id, entity_removed, session
+            )
+        ) is None:
+            return
+        if isinstance(states_meta_ref, StatesMeta):
+            pending.states_meta = states_meta_ref
+        else:
+            row["metadata_id"] = states_meta_ref
+
+        attributes_ref = self._resolve_state_attributes(shared_attrs_bytes, session)
+        if isinstance(attributes_ref, StateAttributes):
+            pending.state_attributes = attributes_ref
+        else:
+            row["attributes_id"] = attributes_ref
+
+        self._event_session_has_pending_writes = True
+        states_manager.queue_insert(pending)
+
+    def _resolve_states_meta(
+        self, entity_id: str, entity_removed: bool, session: Session
+    ) -> StatesMeta | int | None:
+        """Return the metadata_id of an entity_id or the pending StatesMeta.
+
+        Returns None if the state should not be recorded.
+        """
+        states_meta_manager = self.states_meta_manager
         if pending_states_meta := states_meta_manager.get_pending(entity_id):
-            dbstate.states_meta_rel = pending_states_meta
-        elif metadata_id := states_meta_manager.get(entity_id, session, True):
-            dbstate.metadata_id = metadata_id
-        elif states_meta_manager.active and entity_removed:
+            return pending_states_meta
+        if metadata_id := states_meta_manager.get(entity_id, session, True):
+            return metadata_id
+        if states_meta_manager.active and entity_removed:
             # If the entity was removed, we don't need to add it to the
             # StatesMeta table or record it in the pending commit
             # if it does not have a metadata_id allocated to it as
             # it either never existed or was just renamed.
-            return
-        else:
-            states_meta = StatesMeta(entity_id=entity_id)
-            states_meta_manager.add_pending(states_meta)
-            self._add_to_session(session, states_meta)
-            dbstate.states_meta_rel = states_meta
-
-        # Map the event data to the StateAttributes table
+            return None
+        states_meta = StatesMeta(entity_id=entity_id)
+        states_meta_manager.add_pending(states_meta)
+        self._add_to_session(session, states_meta)
+        return states_meta
+
+    def _resolve_state_attributes(
+        self, shared_attrs_bytes: bytes, session: Session
+    ) -> StateAttributes | int:
+        """Return the attributes_id of the shared attributes or the pending StateAttributes."""
+        state_attributes_manager = self.state_attributes_manager
         shared_attrs = shared_attrs_bytes.decode("utf-8")
-        dbstate.attributes = None
         # Matching attributes found in the pending commit
         if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
-            dbstate.state_attributes = pending_event_data
+            return pending_event_data
         # Matching attributes id found in the cache
-        elif (
-            attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
-        ) or (
+        if (attributes_id := state_attributes_manager.get_from_cache(shared_attrs)) or (
             (hash_ := StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes))
             and (
                 attributes_id := state_attributes_manager.get(
@@ -1136,15 +1601,12 @@ class Recorder(threading.Thread):
                 )
             )
         ):
-            dbstate.attributes_id = attributes_id
-        else:
-            # No matching attributes found, save them in the DB
-            dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
-            state_attributes_manager.add_pending(dbstate_attributes)
-            self._add_to_session(session, dbstate_attributes)
-            dbstate.state_attributes = dbstate_attributes
-
-        self._add_to_session(session, dbstate)
+            return attributes_id
+        # No matching attributes found, save them in the DB
+        dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
+        state_attributes_manager.add_pending(dbstate_attributes)
+        self._add_to_session(session, dbstate_attributes)
+        return dbstate_attributes
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1207,6 +1669,11 @@ class Recorder(threading.Thread):
                         for state_id, last_reported_timestamp in pending_last_reported.items()
                     ],
                 )
+        if self._bulk_insert_states:
+            # The ids of the new states_meta and state_attributes
+            # are needed for the bulk insert of the states
+            session.flush()
+            self.states_manager.insert_pending(session)
         session.commit()
 
         self._event_session_has_pending_writes = False
@@ -1235,6 +1702,7 @@ class Recorder(threading.Thread):
             self._close_connection()
         move_away_broken_database(dburl_to_path(self.db_url))
         self.recorder_runs_manager.reset()
+        statistics.get_statistics_rollup_cache(self.hass).clear()
         self._setup_recorder()
         if setup_run:
             self._setup_run()
@@ -1408,12 +1876,60 @@ class Recorder(threading.Thread):
         sqlalchemy_event.listen(self.engine, "connect", self._setup_recorder_connection)
 
         migration.pre_migrate_schema(self.engine)
+        if self.partition_interval:
+            self.partition_interval = partitions.setup_partitioned_tables(
+                self.engine, self.partition_interval
+            )
         Base.metadata.create_all(self.engine)
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
+        self._setup_read_engine(kwargs.get("connect_args"))
         _LOGGER.debug("Connected to recorder database")
 
+    def _setup_read_engine(self, connect_args: dict[str, Any] | None) -> None:
+        """Create the engine of the read only connections of the read workers.
+
+        An in memory SQLite database can not be opened a second time so
+        the read workers use the engine instead.
+        """
+        if (
+            not self.db_read_workers
+            or self.db_url == SQLITE_URL_PREFIX
+            or ":memory:" in self.db_url
+        ):
+            return
+        kwargs: dict[str, Any] = {"pool_size": self.db_read_workers}
+        if self._using_file_sqlite:
+            kwargs["poolclass"] = RecorderPool
+            kwargs["recorder_and_worker_thread_ids"] = self._read_thread_ids
+        else:
+            kwargs["echo"] = False
+            kwargs["max_overflow"] = 0
+        if connect_args:
+            kwargs["connect_args"] = connect_args
+        assert not self.read_engine
+        self.read_engine = create_engine(self.db_url, **kwargs, future=True)
+        sqlalchemy_event.listen(
+            self.read_engine, "connect", self._setup_read_only_connection
+        )
+        self._get_read_session = scoped_session(
+            sessionmaker(bind=self.read_engine, future=True)
+        )
+
+    def _setup_read_only_connection(
+        self, dbapi_connection: DBAPIConnection, connection_record: Any
+    ) -> None:
+        """Dbapi specific connection settings for the read only connections."""
+        assert self.read_engine is not None
+        dialect_name = self.read_engine.dialect.name
+        setup_connection_for_dialect(self, dialect_name, dbapi_connection, False)
+        setup_read_only_connection(dialect_name, dbapi_connection)
+
     def _close_connection(self) -> None:
         """Close the connection."""
+        if self.read_engine:
+            self.read_engine.dispose()
+            self.read_engine = None
+        self._get_read_session = None
         if self.engine:
             self.engine.dispose()
             self.engine = None
@@ -1463,13 +1979,18 @@ class Recorder(threading.Thread):
         try:
             self._end_session()
         finally:
-            if self._db_executor:
+            executors = [
+                executor
+                for executor in (self._db_executor, self._db_read_executor)
+                if executor
+            ]
+            for executor in executors:
                 # We shutdown the executor without forcefully
                 # joining the threads until after we have tried
                 # to cleanly close the connection.
-                self._db_executor.shutdown(join_threads_or_timeout=False)
+                executor.shutdown(join_threads_or_timeout=False)
             self._close_connection()
-            if self._db_executor:
+            for executor in executors:
                 # After the connection is closed, we can join the threads
                 # or forcefully shutdown the threads if they take too long.
-                self._db_executor.join_threads_or_timeout()
+                executor.join_threads_or_timeout()
@@ -8,7 +8,10 @@ import threading
 from typing import Any
 import weakref
 
-from homeassistant.util.executor import InterruptibleThreadPoolExecutor
+from homeassistant.util.executor import (
+    InstrumentedThreadPoolExecutor,
+    InterruptibleThreadPoolExecutor,
+)
 
 
 def _worker_with_shutdown_hook(
@@ -71,3 +74,9 @@ class DBInterruptibleThreadPoolExecutor(InterruptibleThreadPoolExecutor):
             executor_thread.start()
             self._threads.add(executor_thread)  # type: ignore[attr-defined]
             _threads_queues[executor_thread] = self._work_queue  # type: ignore[index]
+
+
+class InstrumentedDBInterruptibleThreadPoolExecutor(
+    DBInterruptibleThreadPoolExecutor, InstrumentedThreadPoolExecutor
+):
+    """A database executor that tracks queue depth and latency."""
@@ -7,7 +7,9 @@ from typing import Any
 
 from sqlalchemy.orm.session import Session
 
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED
 from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers.json import json_bytes, json_fragment
 from homeassistant.helpers.recorder import get_instance
 
 from ..filters import Filters
@@ -16,6 +18,7 @@ from .modern import (
     get_full_significant_states_with_session as _modern_get_full_significant_states_with_session,
     get_last_state_changes as _modern_get_last_state_changes,
     get_significant_states as _modern_get_significant_states,
+    get_significant_states_json as _modern_get_significant_states_json,
     get_significant_states_with_session as _modern_get_significant_states_with_session,
     state_changes_during_period as _modern_state_changes_during_period,
 )
@@ -27,6 +30,7 @@ __all__ = [
     "get_full_significant_states_with_session",
     "get_last_state_changes",
     "get_significant_states",
+    "get_significant_states_json",
     "get_significant_states_with_session",
     "state_changes_during_period",
 ]
@@ -115,6 +119,53 @@ def get_significant_states(
     )
 
 
+def get_significant_states_json(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> tuple[json_fragment, float]:
+    """Return the significant states in the compressed state format as json.
+
+    Also returns the newest last_updated timestamp or 0 if there are no states.
+    """
+    if get_instance(hass).states_meta_manager.active:
+        return _modern_get_significant_states_json(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        )
+    states = get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        True,
+    )
+    last_time_ts = max(
+        (
+            state_list[-1][COMPRESSED_STATE_LAST_UPDATED]  # type: ignore[index]
+            for state_list in states.values()
+        ),
+        default=0.0,
+    )
+    return json_fragment(json_bytes(states)), last_time_ts
+
+
 def get_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from array import array
 from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
 from itertools import groupby
@@ -21,9 +22,16 @@ from sqlalchemy import (
 )
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
-from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
+from homeassistant.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+)
 from homeassistant.core import HomeAssistant, State, split_entity_id
+from homeassistant.helpers.json import json_bytes, json_fragment
 from homeassistant.helpers.recorder import get_instance
 import homeassistant.util.dt as dt_util
 
@@ -33,6 +41,7 @@ from ..filters import Filters
 from ..models import (
     LazyState,
     datetime_to_timestamp_or_none,
+    encode_attributes_from_source,
     extract_metadata_ids,
     process_timestamp,
     row_to_compressed_state,
@@ -229,6 +238,47 @@ def get_significant_states_with_session(
         raise NotImplementedError("Filters are no longer supported")
     if not entity_ids:
         raise ValueError("entity_ids must be provided")
+    if not (
+        query := _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ):
+        return {}
+    stmt, start_time_ts, entity_id_to_metadata_id = query
+    return _sorted_states_to_dict(
+        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes=no_attributes,
+    )
+
+
+def _significant_states_query(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+) -> tuple[StatementLambdaElement, float | None, dict[str, int | None]] | None:
+    """Return the statement to query the significant states.
+
+    Also returns the start time to use for the states at the start
+    time and the metadata_ids of the entity_ids. Returns None if none
+    of the entity_ids have been recorded.
+    """
     entity_id_to_metadata_id: dict[str, int | None] | None = None
     metadata_ids_in_significant_domains: list[int] = []
     instance = get_instance(hass)
@@ -237,7 +287,7 @@ def get_significant_states_with_session(
             entity_ids, session, False
         )
     ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
-        return {}
+        return None
     metadata_ids = possible_metadata_ids
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
@@ -275,17 +325,65 @@ def get_significant_states_with_session(
             include_start_time_state,
         ],
     )
-    return _sorted_states_to_dict(
-        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
+    return (
+        stmt,
         start_time_ts if include_start_time_state else None,
-        entity_ids,
         entity_id_to_metadata_id,
-        minimal_response,
-        compressed_state_format,
-        no_attributes=no_attributes,
     )
 
 
+def get_significant_states_json(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> tuple[json_fragment, float]:
+    """Return the significant states in the compressed state format as json.
+
+    The json is the same as get_significant_states with
+    compressed_state_format but the rows are collected into columns
+    and serialized without creating a dict for each state.
+
+    Also returns the newest last_updated timestamp of the states
+    or 0 if there are none.
+    """
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    with session_scope(hass=hass, read_only=True) as session:
+        if not (
+            query := _significant_states_query(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                no_attributes,
+            )
+        ):
+            return json_fragment(b"{}"), 0.0
+        stmt, start_time_ts, entity_id_to_metadata_id = query
+        columns = _HistoryColumns(
+            start_time_ts,
+            entity_id_to_metadata_id,
+            minimal_response,
+            not significant_changes_only,
+            no_attributes,
+        )
+        # Stream the rows when the period is long
+        columns.add_rows(
+            execute_stmt_lambda_element(
+                session, stmt, start_time, end_time, orm_rows=False
+            )
+        )
+    return columns.as_json(entity_ids)
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -816,3 +914,188 @@ def _sorted_states_to_dict(
 
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
+
+
+_COMPRESSED_STATE_START = f'{{"{COMPRESSED_STATE_STATE}":'.encode()
+_COMPRESSED_STATE_ATTRIBUTES = f',"{COMPRESSED_STATE_ATTRIBUTES}":'.encode()
+_COMPRESSED_STATE_LAST_UPDATED = f',"{COMPRESSED_STATE_LAST_UPDATED}":'.encode()
+_COMPRESSED_STATE_LAST_CHANGED = f',"{COMPRESSED_STATE_LAST_CHANGED}":'.encode()
+
+
+class _EntityColumns:
+    """The compressed states of an entity stored by column."""
+
+    __slots__ = ("attributes", "last_changed", "last_updated", "states")
+
+    def __init__(self) -> None:
+        """Initialize the columns."""
+        self.states: list[bytes] = []
+        self.last_updated = array("d")
+        # 0 if the last_changed is the same as the last_updated
+        self.last_changed = array("d")
+        # Only the first states have attributes with minimal response
+        self.attributes: list[bytes] = []
+
+    def as_json(self) -> bytes:
+        """Return the compressed states as a json array."""
+        # Serialize each timestamp column at once, floats contain no commas
+        last_updated = json_bytes(self.last_updated.tolist())[1:-1].split(b",")
+        last_changed = self.last_changed
+        if any(last_changed):
+            last_changed_json = json_bytes(last_changed.tolist())[1:-1].split(b",")
+        else:
+            last_changed = array("d")
+        attributes = self.attributes
+        with_attributes = len(attributes)
+        rows: list[bytes] = []
+        for idx, state in enumerate(self.states):
+            row = [_COMPRESSED_STATE_START, state]
+            if idx < with_attributes:
+                row += (_COMPRESSED_STATE_ATTRIBUTES, attributes[idx])
+            row += (_COMPRESSED_STATE_LAST_UPDATED, last_updated[idx])
+            if last_changed and last_changed[idx]:
+                row += (_COMPRESSED_STATE_LAST_CHANGED, last_changed_json[idx])
+            row.append(b"}")
+            rows.append(b"".join(row))
+        return b"[" + b",".join(rows) + b"]"
+
+
+class _HistoryColumns:
+    """Collect sorted significant states rows into columns.
+
+    This is the columnar variant of _sorted_states_to_dict with
+    compressed_state_format. Each distinct state and attributes value
+    is serialized once and shared by all the rows that have it.
+    """
+
+    __slots__ = (
+        "_attributes_json",
+        "_include_last_changed",
+        "_metadata_id_to_entity_id",
+        "_minimal_response",
+        "_no_attributes",
+        "_start_time_ts",
+        "_states_json",
+        "columns",
+    )
+
+    def __init__(
+        self,
+        start_time_ts: float | None,
+        entity_id_to_metadata_id: dict[str, int | None],
+        minimal_response: bool,
+        include_last_changed: bool,
+        no_attributes: bool,
+    ) -> None:
+        """Initialize the history columns."""
+        self._start_time_ts = start_time_ts or 0.0
+        self._metadata_id_to_entity_id = {
+            v: k for k, v in entity_id_to_metadata_id.items() if v is not None
+        }
+        self._minimal_response = minimal_response
+        self._include_last_changed = include_last_changed
+        self._no_attributes = no_attributes
+        self._states_json: dict[str | None, bytes] = {}
+        self._attributes_json: dict[str, bytes] = {}
+        self.columns: dict[str, _EntityColumns] = {}
+
+    def add_rows(self, rows: Iterable[Row]) -> None:
+        """Add rows sorted by metadata_id and last_updated."""
+        field_map = _FIELD_MAP
+        state_idx = field_map["state"]
+        last_updated_ts_idx = field_map["last_updated_ts"]
+        last_changed_ts_idx = last_updated_ts_idx + 1
+        include_last_changed = self._include_last_changed
+        no_attributes = self._no_attributes
+        start_time_ts = self._start_time_ts
+        states_json = self._states_json
+        attributes_json = self._attributes_json
+
+        for metadata_id, group in groupby(rows, itemgetter(field_map["metadata_id"])):
+            entity_id = self._metadata_id_to_entity_id[metadata_id]
+            columns = self.columns[entity_id] = _EntityColumns()
+            states = columns.states
+            last_updated = columns.last_updated
+            last_changed = columns.last_changed
+            attributes = columns.attributes
+            if (
+                not self._minimal_response
+                or split_entity_id(entity_id)[0] in NEED_ATTRIBUTE_DOMAINS
+            ):
+                for row in group:
+                    if (state_json := states_json.get(state := row[state_idx])) is None:
+                        state_json = states_json[state] = json_bytes(state)
+                    states.append(state_json)
+                    last_updated.append(
+                        row_last_updated_ts := row[last_updated_ts_idx] or start_time_ts
+                    )
+                    if include_last_changed:
+                        row_last_changed_ts = row[last_changed_ts_idx]
+                        last_changed.append(
+                            row_last_changed_ts
+                            if row_last_changed_ts
+                            and row_last_changed_ts != row_last_updated_ts
+                            else 0.0
+                        )
+                    attributes.append(
+                        b"{}"
+                        if no_attributes
+                        else encode_attributes_from_source(row[-1], attributes_json)
+                    )
+                continue
+
+            # With minimal response only the first state has the attributes
+            # and the last_changed, the other states are only added
+            # when the state changes
+            if (first_row := next(group, None)) is None:
+                continue
+            prev_state: str | None = first_row[state_idx]
+            states.append(json_bytes(prev_state))
+            last_updated.append(
+                row_last_updated_ts := first_row[last_updated_ts_idx] or start_time_ts
+            )
+            if include_last_changed:
+                row_last_changed_ts = first_row[last_changed_ts_idx]
+                last_changed.append(
+                    row_last_changed_ts
+                    if row_last_changed_ts
+                    and row_last_changed_ts != row_last_updated_ts
+                    else 0.0
+                )
+            if not no_attributes:
+                attributes.append(
+                    encode_attributes_from_source(first_row[-1], attributes_json)
+                )
+            for row in group:
+                if (state := row[state_idx]) == prev_state:
+                    continue
+                prev_state = state
+                if (state_json := states_json.get(state)) is None:
+                    state_json = states_json[state] = json_bytes(state)
+                states.append(state_json)
+                last_updated.append(row[last_updated_ts_idx])
+                if include_last_changed:
+                    last_changed.append(0.0)
+
+    def as_json(self, entity_ids: list[str]) -> tuple[json_fragment, float]:
+        """Return the compressed states json and the newest last_updated.
+
+        The entities are in the order of entity_ids.
+        """
+        columns = self.columns
+        last_time_ts = max(
+            (entity_columns.last_updated[-1] for entity_columns in columns.values()),
+            default=0.0,
+        )
+        return (
+            json_fragment(
+                b"{"
+                + b",".join(
+                    json_bytes(entity_id) + b":" + columns[entity_id].as_json()
+                    for entity_id in dict.fromkeys(entity_ids)
+                    if entity_id in columns
+                )
+                + b"}"
+            ),
+            last_time_ts,
+        )
@@ -0,0 +1,324 @@
+"""Append only journal of the events spilled from the recorder queue."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import struct
+import threading
+from typing import Any, TypedDict, cast
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State
+from homeassistant.helpers.json import json_bytes, json_fragment
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS, json_loads
+
+from .const import SupportedDialect
+from .db_schema import EventData, StateAttributes
+
+_LOGGER = logging.getLogger(__name__)
+
+# Each record is prefixed with its length
+_RECORD_HEADER = struct.Struct(">I")
+
+
+def _encode_state(state: State, shared_attrs: bytes | None) -> list[Any]:
+    """Encode a state with the attributes that are recorded."""
+    context = state.context
+    return [
+        state.state,
+        None if shared_attrs is None else json_fragment(shared_attrs),
+        state.last_changed_timestamp,
+        state.last_reported_timestamp,
+        state.last_updated_timestamp,
+        context.id,
+        context.user_id,
+        context.parent_id,
+    ]
+
+
+def encode_event(event: Event[Any], dialect: SupportedDialect | None) -> bytes | None:
+    """Encode an event into a journal record.
+
+    Only the parts of the event which are recorded are kept. The
+    attributes of a state are stored as they are recorded and only the
+    last reported time of the old state is kept. Returns None when the
+    event data is not JSON serializable.
+    """
+    context = event.context
+    record: list[Any] = [
+        event.event_type,
+        event.origin.value,
+        event.time_fired_timestamp,
+        context.id,
+        context.user_id,
+        context.parent_id,
+    ]
+    if event.event_type == EVENT_STATE_CHANGED:
+        data = event.data
+        old_state: State | None = data["old_state"]
+        new_state: State | None = data["new_state"]
+        record.append(data["entity_id"])
+        record.append(old_state.last_reported_timestamp if old_state else None)
+        if new_state is None:
+            record.append(None)
+        else:
+            try:
+                shared_attrs: bytes | None = (
+                    StateAttributes.shared_attrs_bytes_from_event(event, dialect)
+                )
+            except JSON_ENCODE_EXCEPTIONS as ex:
+                _LOGGER.warning("State is not JSON serializable: %s: %s", new_state, ex)
+                shared_attrs = None
+            record.append(_encode_state(new_state, shared_attrs))
+    else:
+        try:
+            shared_data = EventData.shared_data_bytes_from_event(event, dialect)
+        except JSON_ENCODE_EXCEPTIONS as ex:
+            _LOGGER.warning("Event is not JSON serializable: %s: %s", event, ex)
+            return None
+        record.append(json_fragment(shared_data))
+    return json_bytes(record)
+
+
+def decode_event(record: bytes) -> Event:
+    """Decode a journal record into an event."""
+    event_type, origin, time_fired_ts, context_id, user_id, parent_id, *data = cast(
+        list[Any], json_loads(record)
+    )
+    context = Context(user_id=user_id, parent_id=parent_id, id=context_id)
+    if event_type != EVENT_STATE_CHANGED:
+        return Event(event_type, data[0], EventOrigin(origin), time_fired_ts, context)
+    entity_id, old_last_reported_ts, new_state = data
+    old_state = None
+    if old_last_reported_ts is not None:
+        old_last_reported = dt_util.utc_from_timestamp(old_last_reported_ts)
+        # Only the last reported time of the old state is recorded
+        old_state = State(
+            entity_id,
+            "",
+            last_changed=old_last_reported,
+            last_reported=old_last_reported,
+            last_updated=old_last_reported,
+            validate_entity_id=False,
+        )
+    if new_state is not None:
+        (
+            state,
+            attributes,
+            last_changed_ts,
+            last_reported_ts,
+            last_updated_ts,
+            state_context_id,
+            state_user_id,
+            state_parent_id,
+        ) = new_state
+        new_state = State(
+            entity_id,
+            state,
+            attributes,
+            last_changed=dt_util.utc_from_timestamp(last_changed_ts),
+            last_reported=dt_util.utc_from_timestamp(last_reported_ts),
+            last_updated=dt_util.utc_from_timestamp(last_updated_ts),
+            context=(
+                context
+                if state_context_id == context_id
+                else Context(
+                    user_id=state_user_id,
+                    parent_id=state_parent_id,
+                    id=state_context_id,
+                )
+            ),
+            validate_entity_id=False,
+            last_updated_timestamp=last_updated_ts,
+        )
+    return Event(
+        event_type,
+        {"entity_id": entity_id, "old_state": old_state, "new_state": new_state},
+        EventOrigin(origin),
+        time_fired_ts,
+        context,
+    )
+
+
+class SpillJournalStats(TypedDict):
+    """Size and replay rate of the spill journal."""
+
+    spilling: bool
+    size: int
+    spilled: int
+    replayed: int
+    replay_rate: float | None
+
+
+class SpillJournal:
+    """Append only journal of events spilled from the recorder queue.
+
+    Records are appended from the executor and read back in order from
+    the recorder thread. A batch of records is only marked as read once
+    it has been committed to the database, the offset of the records
+    which have been read is kept in a file next to the journal so a
+    restart resumes the replay after the committed records. The journal
+    is truncated once every record has been read, so it only grows while
+    the recorder is behind.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the journal."""
+        self.path = path
+        self.offset_path = f"{path}.offset"
+        self._lock = threading.Lock()
+        self._size = 0
+        self._read_offset = 0
+        # The offset and number of records after the batch returned by read
+        self._batch_end = 0
+        self._batch_records = 0
+        self.records_written = 0
+        self.records_read = 0
+
+    @property
+    def pending_bytes(self) -> int:
+        """Return the size of the records which have not been read."""
+        return self._size - self._read_offset
+
+    def _load_read_offset(self) -> int:
+        """Return the read offset saved by a previous run."""
+        try:
+            with open(self.offset_path, "rb") as offset_file:
+                return int(offset_file.read())
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            _LOGGER.warning("Ignoring the invalid read offset in %s", self.offset_path)
+            return 0
+
+    def _save_read_offset(self) -> None:
+        """Save the read offset, it is replaced atomically."""
+        temp_path = f"{self.offset_path}.tmp"
+        with open(temp_path, "wb") as offset_file:
+            offset_file.write(str(self._read_offset).encode())
+            offset_file.flush()
+            os.fsync(offset_file.fileno())
+        os.replace(temp_path, self.offset_path)
+
+    def open(self) -> None:
+        """Pick up the records left by a previous run.
+
+        A record which was only partly written when the previous run
+        ended is cut off. The records before the saved read offset were
+        committed by the previous run and are skipped.
+
+        This call does blocking I/O.
+        """
+        header_size = _RECORD_HEADER.size
+        unpack = _RECORD_HEADER.unpack
+        read_offset = self._load_read_offset()
+        boundaries = {0}
+        with self._lock:
+            self._size = self._read_offset = self._batch_end = 0
+            try:
+                journal = open(self.path, "rb+")  # noqa: SIM115
+            except FileNotFoundError:
+                journal = None
+            if journal is not None:
+                with journal:
+                    file_size = os.fstat(journal.fileno()).st_size
+                    while len(header := journal.read(header_size)) == header_size:
+                        end = journal.tell() + unpack(header)[0]
+                        if end > file_size:
+                            break
+                        self._size = end
+                        boundaries.add(end)
+                        journal.seek(end)
+                    if self._size < file_size:
+                        _LOGGER.warning(
+                            "Cutting off a partly written record in %s", self.path
+                        )
+                        journal.truncate(self._size)
+                if read_offset in boundaries:
+                    self._read_offset = read_offset
+                else:
+                    _LOGGER.warning(
+                        "The read offset %s does not match a record in %s, "
+                        "replaying it from the start",
+                        read_offset,
+                        self.path,
+                    )
+            if self._read_offset == self._size:
+                self._truncate()
+        if pending := self.pending_bytes:
+            _LOGGER.warning(
+                "Replaying %s bytes of events spilled to %s by a previous run",
+                pending,
+                self.path,
+            )
+
+    def append(self, records: list[bytes]) -> None:
+        """Append records to the journal.
+
+        This call does blocking I/O.
+        """
+        pack = _RECORD_HEADER.pack
+        data = b"".join(pack(len(record)) + record for record in records)
+        with self._lock, open(self.path, "ab") as journal:
+            journal.write(data)
+            journal.flush()
+            os.fsync(journal.fileno())
+            self._size = journal.tell()
+            self.records_written += len(records)
+
+    def read(self, max_records: int) -> list[bytes]:
+        """Read the next records from the journal.
+
+        The records are read again by the next call until they are
+        marked as read with mark_read, once they have been committed.
+
+        This call does blocking I/O.
+        """
+        records: list[bytes] = []
+        header_size = _RECORD_HEADER.size
+        unpack = _RECORD_HEADER.unpack
+        with self._lock:
+            if not self.pending_bytes:
+                return records
+            with open(self.path, "rb") as journal:
+                journal.seek(self._read_offset)
+                while len(records) < max_records and journal.tell() < self._size:
+                    (length,) = unpack(journal.read(header_size))
+                    records.append(journal.read(length))
+                self._batch_end = journal.tell()
+            self._batch_records = len(records)
+        return records
+
+    def mark_read(self) -> None:
+        """Mark the records returned by the last read as read.
+
+        The read offset is saved and the journal is truncated once every
+        record has been read.
+
+        This call does blocking I/O.
+        """
+        with self._lock:
+            if self._batch_end <= self._read_offset:
+                return
+            self._read_offset = self._batch_end
+            self.records_read += self._batch_records
+            self._batch_records = 0
+            if self._read_offset >= self._size:
+                self._truncate()
+            else:
+                self._save_read_offset()
+
+    def _truncate(self) -> None:
+        """Truncate the journal and remove the read offset.
+
+        The journal is truncated first so a crash in between never
+        replays the records again.
+        """
+        if self._size:
+            os.truncate(self.path, 0)
+        self._size = self._read_offset = self._batch_end = 0
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.offset_path)
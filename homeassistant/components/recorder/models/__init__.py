@@ -11,6 +11,7 @@ from .context import (
 from .database import DatabaseEngine, DatabaseOptimizer, UnsupportedDialect
 from .event import extract_event_type_ids
 from .state import LazyState, extract_metadata_ids, row_to_compressed_state
+from .state_attributes import encode_attributes_from_source
 from .statistics import (
     CalendarStatisticPeriod,
     FixedStatisticPeriod,
@@ -44,6 +45,7 @@ __all__ = [
     "bytes_to_ulid_or_none",
     "bytes_to_uuid_hex_or_none",
     "datetime_to_timestamp_or_none",
+    "encode_attributes_from_source",
     "extract_event_type_ids",
     "extract_metadata_ids",
     "process_timestamp",
@@ -77,6 +77,11 @@ class LazyState(State):
             self._last_changed_ts or self._last_updated_ts  # type: ignore[arg-type]
         )
 
+    @cached_property
+    def last_changed_timestamp(self) -> float:
+        """Timestamp of last change."""
+        return self._last_changed_ts or self._last_updated_ts  # type: ignore[return-value]
+
     @cached_property
     def _last_reported_ts(self) -> float | None:
         """Last reported timestamp."""
@@ -96,6 +101,13 @@ class LazyState(State):
             assert self._last_updated_ts is not None
         return dt_util.utc_from_timestamp(self._last_updated_ts)
 
+    @cached_property
+    def last_updated_timestamp(self) -> float:  # type: ignore[override]
+        """Timestamp of last update."""
+        if TYPE_CHECKING:
+            assert self._last_updated_ts is not None
+        return self._last_updated_ts
+
     def as_dict(self) -> dict[str, Any]:  # type: ignore[override]
         """Return a dict representation of the LazyState.
 
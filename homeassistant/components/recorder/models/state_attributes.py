@@ -25,3 +25,24 @@ def decode_attributes_from_source(
         _LOGGER.exception("Error converting row to state attributes: %s", source)
         attr_cache[source] = attributes = {}
     return attributes
+
+
+def encode_attributes_from_source(source: Any, json_cache: dict[str, bytes]) -> bytes:
+    """Return the attributes of a row source as json.
+
+    The source is already json so it is passed through once it is
+    known to decode to an object.
+    """
+    if not source or source == EMPTY_JSON_OBJECT:
+        return b"{}"
+    if (attributes_json := json_cache.get(source)) is not None:
+        return attributes_json
+    try:
+        json_loads_object(source)
+    except ValueError:
+        _LOGGER.exception("Error converting row to state attributes: %s", source)
+        attributes_json = b"{}"
+    else:
+        attributes_json = source.encode()
+    json_cache[source] = attributes_json
+    return attributes_json
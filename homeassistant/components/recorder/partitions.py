@@ -0,0 +1,237 @@
+"""Time partitioned states and events tables."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+import re
+
+from sqlalchemy import Column, Index, MetaData, Sequence, Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from homeassistant.util import dt as dt_util
+
+from .const import SupportedDialect
+from .db_schema import TABLE_EVENTS, TABLE_STATES, Base
+
+_LOGGER = logging.getLogger(__name__)
+
+PARTITION_INTERVAL_DAILY = "daily"
+PARTITION_INTERVAL_WEEKLY = "weekly"
+PARTITION_INTERVALS = {
+    PARTITION_INTERVAL_DAILY: timedelta(days=1),
+    PARTITION_INTERVAL_WEEKLY: timedelta(weeks=1),
+}
+
+# The column each partitioned table is partitioned by
+PARTITION_COLUMNS = {TABLE_STATES: "last_updated_ts", TABLE_EVENTS: "time_fired_ts"}
+
+# Partitions are created this far ahead so rows never have to go to the
+# default partition when the nightly maintenance is missed for a few days
+PARTITIONS_AHEAD = timedelta(days=7)
+
+_PARTITION_BOUND = re.compile(r"FOR VALUES FROM \('?([^')]+)'?\) TO \('?([^')]+)'?\)")
+
+
+def _partitioned_table(table: Table, metadata: MetaData) -> Table:
+    """Return a copy of a table which is partitioned by time.
+
+    The primary key of a partitioned table has to include the partition
+    column and identity columns are not supported on partitioned tables
+    before PostgreSQL 17, so the id is taken from a sequence instead.
+
+    Foreign keys are left out as a row in a partitioned table cannot be
+    referenced by its id alone.
+    """
+    partition_column = PARTITION_COLUMNS[table.name]
+    columns: list[Column] = []
+    for column in table.columns:
+        if column.primary_key:
+            sequence = Sequence(f"{table.name}_{column.name}_seq", metadata=metadata)
+            columns.append(
+                Column(
+                    column.name,
+                    column.type,
+                    sequence,
+                    server_default=sequence.next_value(),
+                    primary_key=True,
+                    autoincrement=False,
+                )
+            )
+        elif column.name == partition_column:
+            columns.append(Column(column.name, column.type, primary_key=True))
+        else:
+            columns.append(Column(column.name, column.type, nullable=column.nullable))
+    partitioned = Table(
+        table.name,
+        metadata,
+        *columns,
+        postgresql_partition_by=f"RANGE ({partition_column})",
+    )
+    for index in table.indexes:
+        Index(index.name, *(partitioned.c[column.name] for column in index.columns))
+    return partitioned
+
+
+def partition_start(point_in_time: datetime, interval: str) -> datetime:
+    """Return the start of the partition a point in time belongs to.
+
+    Weekly partitions start on Monday.
+    """
+    start = point_in_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == PARTITION_INTERVAL_WEEKLY:
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def partition_name(table: str, start: datetime) -> str:
+    """Return the name of the partition of a table starting at start."""
+    return f"{table}_p{start:%Y%m%d}"
+
+
+def _is_partitioned(connection: Connection, table: str) -> bool:
+    """Return if a table is partitioned."""
+    return bool(
+        connection.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table JOIN pg_class"
+                " ON pg_class.oid = pg_partitioned_table.partrelid"
+                " WHERE pg_class.relname = :table"
+            ),
+            {"table": table},
+        ).scalar()
+    )
+
+
+def get_partitions(
+    connection: Connection, table: str
+) -> list[tuple[str, float, float]]:
+    """Return the name, start and end timestamp of the partitions of a table.
+
+    The default partition is not included.
+    """
+    partitions: list[tuple[str, float, float]] = []
+    for name, bound in connection.execute(
+        text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)"
+            " FROM pg_inherits"
+            " JOIN pg_class parent ON pg_inherits.inhparent = parent.oid"
+            " JOIN pg_class child ON pg_inherits.inhrelid = child.oid"
+            " WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    ):
+        if match := _PARTITION_BOUND.match(bound):
+            partitions.append((name, float(match[1]), float(match[2])))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def ensure_partitions(connection: Connection, interval: str, now: datetime) -> None:
+    """Create the partitions from the current one until PARTITIONS_AHEAD.
+
+    A partition which would overlap an existing one, for example after
+    the interval was changed, is not created.
+    """
+    step = PARTITION_INTERVALS[interval]
+    end = now + PARTITIONS_AHEAD
+    for table in PARTITION_COLUMNS:
+        partitions = get_partitions(connection, table)
+        next_start = partition_start(now, interval)
+        while next_start < end:
+            start, next_start = next_start, next_start + step
+            start_ts = start.timestamp()
+            end_ts = next_start.timestamp()
+            if any(
+                start_ts < existing_end_ts and existing_start_ts < end_ts
+                for _, existing_start_ts, existing_end_ts in partitions
+            ):
+                continue
+            name = partition_name(table, start)
+            _LOGGER.debug("Creating partition %s", name)
+            try:
+                with connection.begin_nested():
+                    connection.execute(
+                        text(
+                            f"CREATE TABLE {name} PARTITION OF {table}"
+                            f" FOR VALUES FROM ({start_ts}) TO ({end_ts})"
+                        )
+                    )
+            except SQLAlchemyError:
+                # This happens when the default partition already
+                # holds rows for the range of the new partition
+                _LOGGER.exception("Error creating partition %s", name)
+
+
+def setup_partitioned_tables(engine: Engine, interval: str) -> str | None:
+    """Create the states and events tables partitioned by time.
+
+    The tables are only partitioned when the database is created, existing
+    tables are left as they are. Returns the interval when the tables are
+    partitioned and None otherwise.
+
+    This must be called before Base.metadata.create_all.
+    """
+    if engine.dialect.name != SupportedDialect.POSTGRESQL:
+        _LOGGER.warning(
+            "Partitioned states and events tables are only supported with PostgreSQL"
+        )
+        return None
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        if not any(inspector.has_table(table) for table in PARTITION_COLUMNS):
+            metadata = MetaData()
+            for table in PARTITION_COLUMNS:
+                _partitioned_table(Base.metadata.tables[table], metadata)
+            metadata.create_all(connection)
+            for table in PARTITION_COLUMNS:
+                # Rows outside of the created partitions end up here
+                connection.execute(
+                    text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+                )
+        elif not all(_is_partitioned(connection, table) for table in PARTITION_COLUMNS):
+            _LOGGER.warning(
+                "The states and events tables were created without partitions,"
+                " partitioning is only possible for a new database"
+            )
+            return None
+        ensure_partitions(connection, interval, dt_util.utcnow())
+    return interval
+
+
+def expired_partitions(
+    connection: Connection, table: str, purge_before: float
+) -> list[str]:
+    """Return the partitions of a table which only hold rows before purge_before."""
+    return [
+        name
+        for name, _, end_ts in get_partitions(connection, table)
+        if end_ts <= purge_before
+    ]
+
+
+def select_distinct_ids(
+    connection: Connection, partition: str, column: str
+) -> set[int]:
+    """Return the distinct ids of a column in a partition."""
+    return {
+        row_id
+        for (row_id,) in connection.execute(
+            text(
+                f"SELECT DISTINCT {column} FROM {partition} WHERE {column} IS NOT NULL"  # noqa: S608
+            )
+        )
+    }
+
+
+def select_max_id(connection: Connection, partition: str, column: str) -> int | None:
+    """Return the largest id of a column in a partition."""
+    return connection.execute(
+        text(f"SELECT max({column}) FROM {partition}")  # noqa: S608
+    ).scalar()
+
+
+def drop_partition(connection: Connection, partition: str) -> None:
+    """Drop a partition."""
+    _LOGGER.debug("Dropping partition %s", partition)
+    connection.execute(text(f"DROP TABLE {partition}"))
@@ -3,17 +3,20 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime
 from itertools import zip_longest
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.orm.session import Session
 
+from homeassistant.util import dt as dt_util
 from homeassistant.util.collection import chunked_or_all
 
-from .db_schema import Events, States, StatesMeta
+from . import partitions
+from .db_schema import TABLE_EVENTS, TABLE_STATES, Events, States, StatesMeta
 from .models import DatabaseEngine
 from .queries import (
     attributes_ids_exist_in_states,
@@ -37,6 +40,8 @@ from .queries import (
     find_legacy_detached_states_and_attributes_to_purge,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
+    find_oldest_event_ts,
+    find_oldest_state_ts,
     find_short_term_statistics_to_purge,
     find_states_to_purge,
     find_statistics_runs_to_purge,
@@ -54,6 +59,63 @@ DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
 
+@dataclass(slots=True)
+class PurgeProgress:
+    """Progress of purging the states and events before a point in time.
+
+    The watermarks are the newest purged row of each table. A table
+    which has nothing left to purge has its watermark at purge_before.
+    """
+
+    purge_before: float
+    oldest_ts: float | None = None
+    started: float = field(default_factory=time.monotonic)
+    rows_purged: int = 0
+    # Rows purged by the last purge cycle
+    cycle_rows_purged: int = 0
+    last_state_id: int | None = None
+    last_event_id: int | None = None
+    states_watermark_ts: float | None = None
+    events_watermark_ts: float | None = None
+
+    @property
+    def watermark_ts(self) -> float | None:
+        """Return the point in time up to which everything is purged."""
+        if self.states_watermark_ts is None or self.events_watermark_ts is None:
+            return None
+        return min(self.states_watermark_ts, self.events_watermark_ts)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress with an estimate of the remaining rows and time.
+
+        The estimate assumes the rows are spread evenly between the
+        oldest row and purge_before.
+        """
+        rows_remaining: int | None = None
+        eta: float | None = None
+        watermark_ts = self.watermark_ts
+        if (
+            watermark_ts is not None
+            and (oldest_ts := self.oldest_ts) is not None
+            and (done := (watermark_ts - oldest_ts) / (self.purge_before - oldest_ts))
+            > 0
+        ):
+            remaining = max(1 - done, 0) / done
+            rows_remaining = round(self.rows_purged * remaining)
+            eta = round((time.monotonic() - self.started) * remaining, 1)
+        return {
+            "purge_before": dt_util.utc_from_timestamp(self.purge_before).isoformat(),
+            "watermark": dt_util.utc_from_timestamp(watermark_ts).isoformat()
+            if watermark_ts is not None
+            else None,
+            "last_state_id": self.last_state_id,
+            "last_event_id": self.last_event_id,
+            "rows_purged": self.rows_purged,
+            "rows_remaining": rows_remaining,
+            "eta": eta,
+        }
+
+
 @retryable_database_job("purge")
 def purge_old_data(
     instance: Recorder,
@@ -66,11 +128,18 @@ def purge_old_data(
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
+    The progress is kept in instance.purge_progress until the purge
+    is finished.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
+    purge_before_ts = purge_before.timestamp()
+    progress = instance.purge_progress
+    if progress is None or progress.purge_before != purge_before_ts:
+        progress = instance.purge_progress = PurgeProgress(purge_before_ts)
+    progress.cycle_rows_purged = 0
     with session_scope(session=instance.get_session()) as session:
         # Purge a max of max_bind_vars, based on the oldest states or events record
         has_more_to_purge = False
@@ -86,11 +155,15 @@ def purge_old_data(
                 " remaining"
             )
             # Once we are done purging legacy rows, we use the new method
+            if instance.partition_interval:
+                _drop_expired_partitions(instance, session, purge_before_ts)
+            if progress.oldest_ts is None:
+                progress.oldest_ts = _select_oldest_ts(session)
             has_more_to_purge |= _purge_states_and_attributes_ids(
-                instance, session, states_batch_size, purge_before
+                instance, session, states_batch_size, progress
             )
             has_more_to_purge |= _purge_events_and_data_ids(
-                instance, session, events_batch_size, purge_before
+                instance, session, events_batch_size, progress
             )
 
         statistics_runs = _select_statistics_runs_to_purge(
@@ -123,6 +196,7 @@ def purge_old_data(
             _purge_old_entity_ids(instance, session)
 
         _purge_old_recorder_runs(instance, session, purge_before)
+    instance.purge_progress = None
     if repack:
         repack_database(instance)
     return True
@@ -173,11 +247,50 @@ def _purge_legacy_format(
     )
 
 
+def _drop_expired_partitions(
+    instance: Recorder, session: Session, purge_before: float
+) -> None:
+    """Drop the partitions of the states and events tables before purge_before.
+
+    The attributes and event data only used by the dropped rows are purged
+    as well. The rows before purge_before in the remaining partitions are
+    deleted in batches as usual.
+    """
+    connection = session.connection()
+    for partition in partitions.expired_partitions(
+        connection, TABLE_STATES, purge_before
+    ):
+        attributes_ids = partitions.select_distinct_ids(
+            connection, partition, "attributes_id"
+        )
+        max_state_id = partitions.select_max_id(connection, partition, "state_id")
+        partitions.drop_partition(connection, partition)
+        if max_state_id is not None:
+            instance.states_manager.evict_purged_state_ids_up_to(max_state_id)
+        _purge_unused_attributes_ids(instance, session, attributes_ids)
+    for partition in partitions.expired_partitions(
+        connection, TABLE_EVENTS, purge_before
+    ):
+        data_ids = partitions.select_distinct_ids(connection, partition, "data_id")
+        partitions.drop_partition(connection, partition)
+        _purge_unused_data_ids(instance, session, data_ids)
+
+
+def _select_oldest_ts(session: Session) -> float | None:
+    """Return the timestamp of the oldest state or event."""
+    oldest = [
+        oldest_ts
+        for stmt in (find_oldest_state_ts(), find_oldest_event_ts())
+        if (oldest_ts := session.execute(stmt).scalar()) is not None
+    ]
+    return min(oldest, default=None)
+
+
 def _purge_states_and_attributes_ids(
     instance: Recorder,
     session: Session,
     states_batch_size: int,
-    purge_before: datetime,
+    progress: PurgeProgress,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -193,14 +306,19 @@ def _purge_states_and_attributes_ids(
     attributes_ids_batch: set[int] = set()
     max_bind_vars = instance.max_bind_vars
     for _ in range(states_batch_size):
-        state_ids, attributes_ids = _select_state_attributes_ids_to_purge(
-            session, purge_before, max_bind_vars
+        state_ids, attributes_ids, watermark_ts = _select_state_attributes_ids_to_purge(
+            session, progress.purge_before, max_bind_vars
         )
         if not state_ids:
             has_remaining_state_ids_to_purge = False
+            progress.states_watermark_ts = progress.purge_before
             break
         _purge_state_ids(instance, session, state_ids)
         attributes_ids_batch = attributes_ids_batch | attributes_ids
+        progress.last_state_id = max(state_ids)
+        progress.states_watermark_ts = watermark_ts
+        progress.rows_purged += len(state_ids)
+        progress.cycle_rows_purged += len(state_ids)
 
     _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
     _LOGGER.debug(
@@ -214,7 +332,7 @@ def _purge_events_and_data_ids(
     instance: Recorder,
     session: Session,
     events_batch_size: int,
-    purge_before: datetime,
+    progress: PurgeProgress,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -228,14 +346,19 @@ def _purge_events_and_data_ids(
     data_ids_batch: set[int] = set()
     max_bind_vars = instance.max_bind_vars
     for _ in range(events_batch_size):
-        event_ids, data_ids = _select_event_data_ids_to_purge(
-            session, purge_before, max_bind_vars
+        event_ids, data_ids, watermark_ts = _select_event_data_ids_to_purge(
+            session, progress.purge_before, max_bind_vars
         )
         if not event_ids:
             has_remaining_event_ids_to_purge = False
+            progress.events_watermark_ts = progress.purge_before
             break
         _purge_event_ids(session, event_ids)
         data_ids_batch = data_ids_batch | data_ids
+        progress.last_event_id = max(event_ids)
+        progress.events_watermark_ts = watermark_ts
+        progress.rows_purged += len(event_ids)
+        progress.cycle_rows_purged += len(event_ids)
 
     _purge_unused_data_ids(instance, session, data_ids_batch)
     _LOGGER.debug(
@@ -246,41 +369,53 @@ def _purge_events_and_data_ids(
 
 
 def _select_state_attributes_ids_to_purge(
-    session: Session, purge_before: datetime, max_bind_vars: int
-) -> tuple[set[int], set[int]]:
-    """Return sets of state and attribute ids to purge."""
+    session: Session, purge_before: float, max_bind_vars: int
+) -> tuple[set[int], set[int], float | None]:
+    """Return sets of state and attribute ids to purge.
+
+    The newest last_updated_ts of the states is returned as well.
+    """
     state_ids = set()
     attributes_ids = set()
-    for state_id, attributes_id in session.execute(
-        find_states_to_purge(purge_before.timestamp(), max_bind_vars)
+    watermark_ts: float | None = None
+    for state_id, attributes_id, last_updated_ts in session.execute(
+        find_states_to_purge(purge_before, max_bind_vars)
     ).all():
         state_ids.add(state_id)
         if attributes_id:
             attributes_ids.add(attributes_id)
+        if watermark_ts is None or last_updated_ts > watermark_ts:
+            watermark_ts = last_updated_ts
     _LOGGER.debug(
         "Selected %s state ids and %s attributes_ids to remove",
         len(state_ids),
         len(attributes_ids),
     )
-    return state_ids, attributes_ids
+    return state_ids, attributes_ids, watermark_ts
 
 
 def _select_event_data_ids_to_purge(
-    session: Session, purge_before: datetime, max_bind_vars: int
-) -> tuple[set[int], set[int]]:
-    """Return sets of event and data ids to purge."""
+    session: Session, purge_before: float, max_bind_vars: int
+) -> tuple[set[int], set[int], float | None]:
+    """Return sets of event and data ids to purge.
+
+    The newest time_fired_ts of the events is returned as well.
+    """
     event_ids = set()
     data_ids = set()
-    for event_id, data_id in session.execute(
-        find_events_to_purge(purge_before.timestamp(), max_bind_vars)
+    watermark_ts: float | None = None
+    for event_id, data_id, time_fired_ts in session.execute(
+        find_events_to_purge(purge_before, max_bind_vars)
     ).all():
         event_ids.add(event_id)
         if data_id:
             data_ids.add(data_id)
+        if watermark_ts is None or time_fired_ts > watermark_ts:
+            watermark_ts = time_fired_ts
     _LOGGER.debug(
         "Selected %s event ids and %s data_ids to remove", len(event_ids), len(data_ids)
     )
-    return event_ids, data_ids
+    return event_ids, data_ids, watermark_ts
 
 
 def _select_unused_attributes_ids(
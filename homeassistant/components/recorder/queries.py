@@ -5,7 +5,16 @@ from __future__ import annotations
 from collections.abc import Iterable
 from datetime import datetime
 
-from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, update
+from sqlalchemy import (
+    and_,
+    delete,
+    distinct,
+    func,
+    lambda_stmt,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
@@ -76,6 +85,52 @@ def find_states_metadata_ids(entity_ids: Iterable[str]) -> StatementLambdaElemen
     )
 
 
+def find_max_state_id() -> StatementLambdaElement:
+    """Find the highest state_id."""
+    return lambda_stmt(lambda: select(func.max(States.state_id)))
+
+
+def find_latest_states_meta_and_attributes(
+    start_ts: float, min_state_id: int, limit: int
+) -> StatementLambdaElement:
+    """Find the ids of the entity_id and attributes of the latest state of each entity.
+
+    Only states updated after start_ts with a state_id above min_state_id
+    are considered and the most recently updated entities are returned first.
+    """
+    return lambda_stmt(
+        lambda: select(
+            StatesMeta.metadata_id,
+            StatesMeta.entity_id,
+            StateAttributes.attributes_id,
+            StateAttributes.shared_attrs,
+        )
+        .join(
+            latest := select(
+                States.metadata_id.label("latest_metadata_id"),
+                func.max(States.last_updated_ts).label("latest_last_updated_ts"),
+            )
+            .filter(States.state_id > min_state_id)
+            .filter(States.last_updated_ts > start_ts)
+            .group_by(States.metadata_id)
+            .subquery(),
+            StatesMeta.metadata_id == latest.c.latest_metadata_id,
+        )
+        .join(
+            States,
+            and_(
+                States.metadata_id == latest.c.latest_metadata_id,
+                States.last_updated_ts == latest.c.latest_last_updated_ts,
+            ),
+        )
+        .outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
+        .order_by(latest.c.latest_last_updated_ts.desc())
+        .limit(limit)
+    )
+
+
 def _state_attrs_exist(attr: int | None) -> Select:
     """Check if a state attributes id exists in the states table."""
     return select(func.min(States.attributes_id)).where(States.attributes_id == attr)
@@ -619,7 +674,7 @@ def find_events_to_purge(
 ) -> StatementLambdaElement:
     """Find events to purge."""
     return lambda_stmt(
-        lambda: select(Events.event_id, Events.data_id)
+        lambda: select(Events.event_id, Events.data_id, Events.time_fired_ts)
         .filter(Events.time_fired_ts < purge_before)
         .limit(max_bind_vars)
     )
@@ -630,12 +685,22 @@ def find_states_to_purge(
 ) -> StatementLambdaElement:
     """Find states to purge."""
     return lambda_stmt(
-        lambda: select(States.state_id, States.attributes_id)
+        lambda: select(States.state_id, States.attributes_id, States.last_updated_ts)
         .filter(States.last_updated_ts < purge_before)
         .limit(max_bind_vars)
     )
 
 
+def find_oldest_state_ts() -> StatementLambdaElement:
+    """Find the last_updated_ts of the oldest state."""
+    return lambda_stmt(lambda: select(func.min(States.last_updated_ts)))
+
+
+def find_oldest_event_ts() -> StatementLambdaElement:
+    """Find the time_fired_ts of the oldest event."""
+    return lambda_stmt(lambda: select(func.min(Events.time_fired_ts)))
+
+
 def find_short_term_statistics_to_purge(
     purge_before: datetime, max_bind_vars: int
 ) -> StatementLambdaElement:
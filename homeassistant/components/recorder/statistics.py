@@ -11,8 +11,10 @@ from itertools import chain, groupby
 import logging
 from operator import itemgetter
 import re
-from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
+import threading
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypedDict, cast
 
+from lru import LRU
 from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError
@@ -163,6 +165,11 @@ UNIT_CLASSES = {
 }
 
 DATA_SHORT_TERM_STATISTICS_RUN_CACHE = "recorder_short_term_statistics_run_cache"
+DATA_STATISTICS_ROLLUP_CACHE = "recorder_statistics_rollup_cache"
+
+# Number of reduced statistics kept by the rollup cache, an entry is
+# kept for each statistic_id, period, unit and set of requested types
+STATISTICS_ROLLUP_CACHE_SIZE = 4096
 
 
 def mean(values: list[float]) -> float | None:
@@ -225,6 +232,88 @@ class StatisticsRow(BaseStatisticsRow, total=False):
     change: float | None
 
 
+class StatisticsRollup(NamedTuple):
+    """Daily, weekly or monthly statistics reduced from hourly statistics."""
+
+    # The reduced rows cover all periods from start_ts until end_ts
+    start_ts: float
+    end_ts: float
+    rows: list[StatisticsRow]
+
+
+class StatisticsRollupCache:
+    """Cache for daily, weekly and monthly statistics.
+
+    Only periods which ended before the last compiled hour are cached
+    since they do not change unless the hourly statistics are imported,
+    adjusted or converted to another unit. The statistics of a
+    statistic_id are dropped from the cache when that happens.
+
+    Rollups are read and stored from the executor and dropped from
+    the recorder thread.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the rollup cache."""
+        self._lock = threading.Lock()
+        self._rollups: LRU[tuple[Any, ...], StatisticsRollup] = LRU(
+            STATISTICS_ROLLUP_CACHE_SIZE
+        )
+        # Bumped when the statistics of a statistic_id change so a rollup
+        # reduced from rows read before the change is not stored
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self.compiled_until_ts: float | None = None
+
+    def get(self, key: tuple[Any, ...]) -> StatisticsRollup | None:
+        """Return the cached rollup for a key."""
+        with self._lock:
+            return self._rollups.get(key)
+
+    def generation(self, statistic_id: str) -> int:
+        """Return the generation of the statistics of a statistic_id."""
+        return self._epoch + self._generations.get(statistic_id, 0)
+
+    def set(
+        self, key: tuple[Any, ...], rollup: StatisticsRollup, generation: int
+    ) -> None:
+        """Cache a rollup if the statistics did not change since generation."""
+        with self._lock:
+            if self.generation(key[0]) == generation:
+                self._rollups[key] = rollup
+
+    def set_compiled_until(self, timestamp: float) -> None:
+        """Set the end of the last compiled hour.
+
+        This must be called after the hourly statistics are committed.
+        """
+        if self.compiled_until_ts is None or timestamp > self.compiled_until_ts:
+            self.compiled_until_ts = timestamp
+
+    def invalidate(self, statistic_ids: Iterable[str]) -> None:
+        """Drop the rollups of statistic_ids.
+
+        This must be called after the change to the statistics is committed.
+        """
+        statistic_ids = set(statistic_ids)
+        with self._lock:
+            for statistic_id in statistic_ids:
+                self._generations[statistic_id] = (
+                    self._generations.get(statistic_id, 0) + 1
+                )
+            # LRU is not iterable, keys() returns a list
+            for key in self._rollups.keys():  # noqa: SIM118
+                if key[0] in statistic_ids:
+                    del self._rollups[key]
+
+    def clear(self) -> None:
+        """Drop all rollups."""
+        with self._lock:
+            self._epoch += 1
+            self._rollups.clear()
+            self.compiled_until_ts = None
+
+
 def get_display_unit(
     hass: HomeAssistant,
     statistic_id: str,
@@ -463,6 +552,7 @@ def compile_missing_statistics(instance: Recorder) -> bool:
     start = start.replace(minute=0, second=0, microsecond=0)
     # Commit every 12 hours of data
     commit_interval = 60 / period_size * 12
+    all_modified_statistic_ids: set[str] = set()
 
     with session_scope(
         session=instance.get_session(),
@@ -484,12 +574,16 @@ def compile_missing_statistics(instance: Recorder) -> bool:
             modified_statistic_ids = _compile_statistics(
                 instance, session, start, end >= last_period
             )
+            all_modified_statistic_ids |= modified_statistic_ids
             if periods_without_commit == commit_interval or modified_statistic_ids:
                 session.commit()
                 session.expunge_all()
                 periods_without_commit = 0
             start = end
 
+    rollup_cache = get_statistics_rollup_cache(instance.hass)
+    rollup_cache.invalidate(all_modified_statistic_ids)
+    rollup_cache.set_compiled_until(last_period.replace(minute=0).timestamp())
     return True
 
 
@@ -516,7 +610,13 @@ def compile_statistics(instance: Recorder, start: datetime, fire_events: bool) -
             instance, session, start, fire_events
         )
 
+    rollup_cache = get_statistics_rollup_cache(instance.hass)
+    if start.minute == 55:
+        rollup_cache.set_compiled_until(
+            (start + StatisticsShortTerm.duration).timestamp()
+        )
     if modified_statistic_ids:
+        rollup_cache.invalidate(modified_statistic_ids)
         # In the rare case that we have modified statistic_ids, we reload the modified
         # statistics meta data into the cache in a fresh session to ensure that the
         # cache is up to date and future calls to get statistics meta data will
@@ -754,6 +854,7 @@ def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
     """Clear statistics for a list of statistic_ids."""
     with session_scope(session=instance.get_session()) as session:
         instance.statistics_meta_manager.delete(session, statistic_ids)
+    get_statistics_rollup_cache(instance.hass).invalidate(statistic_ids)
 
 
 def update_statistics_metadata(
@@ -779,6 +880,11 @@ def update_statistics_metadata(
             statistics_meta_manager.update_statistic_id(
                 session, DOMAIN, statistic_id, new_statistic_id
             )
+    get_statistics_rollup_cache(instance.hass).invalidate(
+        {statistic_id}
+        if new_statistic_id is UNDEFINED or new_statistic_id is None
+        else {statistic_id, new_statistic_id}
+    )
 
 
 async def async_list_statistic_ids(
@@ -1004,17 +1110,6 @@ def reduce_day_ts_factory() -> (
     return _same_day_ts, _day_start_end_ts_cached
 
 
-def _reduce_statistics_per_day(
-    stats: dict[str, list[StatisticsRow]],
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to daily statistics."""
-    _same_day_ts, _day_start_end_ts = reduce_day_ts_factory()
-    return _reduce_statistics(
-        stats, _same_day_ts, _day_start_end_ts, timedelta(days=1), types
-    )
-
-
 def reduce_week_ts_factory() -> (
     tuple[
         Callable[[float, float], bool],
@@ -1054,17 +1149,6 @@ def reduce_week_ts_factory() -> (
     return _same_week_ts, _week_start_end_ts_cached
 
 
-def _reduce_statistics_per_week(
-    stats: dict[str, list[StatisticsRow]],
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to weekly statistics."""
-    _same_week_ts, _week_start_end_ts = reduce_week_ts_factory()
-    return _reduce_statistics(
-        stats, _same_week_ts, _week_start_end_ts, timedelta(days=7), types
-    )
-
-
 def _find_month_end_time(timestamp: datetime) -> datetime:
     """Return the end of the month (midnight at the first day of the next month)."""
     # We add 4 days to the end to make sure we are in the next month
@@ -1109,15 +1193,23 @@ def reduce_month_ts_factory() -> (
     return _same_month_ts, _month_start_end_ts_cached
 
 
-def _reduce_statistics_per_month(
-    stats: dict[str, list[StatisticsRow]],
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to monthly statistics."""
-    _same_month_ts, _month_start_end_ts = reduce_month_ts_factory()
-    return _reduce_statistics(
-        stats, _same_month_ts, _month_start_end_ts, timedelta(days=31), types
-    )
+_REDUCE_FACTORIES: dict[
+    str,
+    tuple[
+        Callable[
+            [],
+            tuple[
+                Callable[[float, float], bool],
+                Callable[[float], tuple[float, float]],
+            ],
+        ],
+        timedelta,
+    ],
+] = {
+    "day": (reduce_day_ts_factory, timedelta(days=1)),
+    "week": (reduce_week_ts_factory, timedelta(days=7)),
+    "month": (reduce_month_ts_factory, timedelta(days=31)),
+}
 
 
 def _generate_statistics_during_period_stmt(
@@ -1705,6 +1797,140 @@ def _augment_result_with_change(
             prev_sum = _sum
 
 
+def _rollup_key(
+    hass: HomeAssistant,
+    statistic_id: str,
+    stats_metadata: StatisticMetaData,
+    period: str,
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> tuple[Any, ...]:
+    """Return the rollup cache key of a statistic.
+
+    The reduced rows are converted to the display unit, which depends on
+    the unit of the state, and the periods start at local midnight.
+    """
+    state_unit = unit = stats_metadata["unit_of_measurement"]
+    if state := hass.states.get(statistic_id):
+        state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    return (
+        statistic_id,
+        period,
+        str(dt_util.get_default_time_zone()),
+        unit,
+        state_unit,
+        tuple(sorted(units.items())) if units else None,
+        tuple(sorted(types)),
+    )
+
+
+def _reduced_statistics_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    period: Literal["day", "week", "month"],
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, list[StatisticsRow]]:
+    """Return daily, weekly or monthly statistics during start_time - end_time.
+
+    start_time and end_time must be aligned with the period. Periods which
+    are in the rollup cache are not reduced again, only the hourly
+    statistics after them are read from the database. The reduced periods
+    which ended before the last compiled hour are added to the cache.
+    """
+    rollup_cache = get_statistics_rollup_cache(hass)
+    # Read before the statistics so every hour until then is in the database
+    compiled_until_ts = rollup_cache.compiled_until_ts
+    reduce_factory, period_duration = _REDUCE_FACTORIES[period]
+    same_period, period_start_end = reduce_factory()
+    start_ts = start_time.timestamp()
+    end_ts = end_time.timestamp() if end_time is not None else None
+
+    result: dict[str, list[StatisticsRow]] = {}
+    rollups: dict[str, tuple[tuple[Any, ...], int, StatisticsRollup | None]] = {}
+    # The metadata_ids to read the hourly statistics of by start timestamp
+    to_read: defaultdict[float, list[int]] = defaultdict(list)
+    for statistic_id, (metadata_id, stats_metadata) in metadata.items():
+        key = _rollup_key(hass, statistic_id, stats_metadata, period, units, types)
+        generation = rollup_cache.generation(statistic_id)
+        rollup = rollup_cache.get(key)
+        if rollup is None or not rollup.start_ts <= start_ts <= rollup.end_ts:
+            rollups[statistic_id] = (key, generation, None)
+            to_read[start_ts].append(metadata_id)
+            continue
+        rollups[statistic_id] = (key, generation, rollup)
+        if rows := [
+            row.copy()
+            for row in rollup.rows
+            if start_ts <= row["start"] and (end_ts is None or row["start"] < end_ts)
+        ]:
+            result[statistic_id] = rows
+        if end_ts is None or rollup.end_ts < end_ts:
+            to_read[rollup.end_ts].append(metadata_id)
+
+    reduced: dict[str, list[StatisticsRow]] = {}
+    for read_start_ts, metadata_ids in to_read.items():
+        stmt = _generate_statistics_during_period_stmt(
+            dt_util.utc_from_timestamp(read_start_ts),
+            end_time,
+            metadata_ids,
+            Statistics,
+            types,
+        )
+        if not (
+            stats := cast(
+                Sequence[Row],
+                execute_stmt_lambda_element(session, stmt, orm_rows=False),
+            )
+        ):
+            continue
+        reduced.update(
+            _reduce_statistics(
+                _sorted_statistics_to_dict(
+                    hass, stats, None, metadata, True, Statistics, units, types
+                ),
+                same_period,
+                period_start_end,
+                period_duration,
+                types,
+            )
+        )
+    for statistic_id, rows in reduced.items():
+        result.setdefault(statistic_id, []).extend(rows)
+
+    if compiled_until_ts is None:
+        return result
+    # Periods ending after the last compiled hour may still change
+    cacheable_end_ts = period_start_end(
+        compiled_until_ts if end_ts is None else min(compiled_until_ts, end_ts)
+    )[0]
+    for statistic_id, (key, generation, rollup) in rollups.items():
+        new_rows = [
+            row.copy()
+            for row in reduced.get(statistic_id, ())
+            if row["end"] <= cacheable_end_ts
+        ]
+        if rollup is None:
+            if cacheable_end_ts > start_ts:
+                rollup_cache.set(
+                    key,
+                    StatisticsRollup(start_ts, cacheable_end_ts, new_rows),
+                    generation,
+                )
+        elif cacheable_end_ts > rollup.end_ts:
+            rollup_cache.set(
+                key,
+                StatisticsRollup(
+                    rollup.start_ts, cacheable_end_ts, [*rollup.rows, *new_rows]
+                ),
+                generation,
+            )
+    return result
+
+
 def _statistics_during_period_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -1775,35 +2001,34 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
-
-    if not stats:
-        return {}
-
-    result = _sorted_statistics_to_dict(
-        hass,
-        stats,
-        statistic_ids,
-        metadata,
-        True,
-        table,
-        units,
-        types,
-    )
-
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
+    if period in ("day", "week", "month"):
+        if not (
+            result := _reduced_statistics_during_period(
+                hass, session, start_time, end_time, metadata, period, units, types
+            )
+        ):
+            return {}
+    else:
+        stmt = _generate_statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
 
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
+        if not stats:
+            return {}
 
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+        result = _sorted_statistics_to_dict(
+            hass,
+            stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            units,
+            types,
+        )
 
     if "change" in _types:
         _augment_result_with_change(
@@ -2374,6 +2599,12 @@ def get_short_term_statistics_run_cache(
     return ShortTermStatisticsRunCache()
 
 
+@singleton(DATA_STATISTICS_ROLLUP_CACHE)
+def get_statistics_rollup_cache(hass: HomeAssistant) -> StatisticsRollupCache:
+    """Get the statistics rollup cache."""
+    return StatisticsRollupCache()
+
+
 def cache_latest_short_term_statistic_id_for_metadata_id(
     run_cache: ShortTermStatisticsRunCache,
     session: Session,
@@ -2439,9 +2670,11 @@ def import_statistics(
             instance, "statistic"
         ),
     ) as session:
-        return _import_statistics_with_session(
+        imported = _import_statistics_with_session(
             instance, session, metadata, statistics, table
         )
+    get_statistics_rollup_cache(instance.hass).invalidate({metadata["statistic_id"]})
+    return imported
 
 
 @retryable_database_job("adjust_statistics")
@@ -2482,6 +2715,7 @@ def adjust_statistics(
             start_time.replace(minute=0),
             sum_adjustment,
         )
+    get_statistics_rollup_cache(instance.hass).invalidate({statistic_id})
 
     return True
 
@@ -2550,6 +2784,7 @@ def change_statistics_unit(
         statistics_meta_manager.update_unit_of_measurement(
             session, statistic_id, new_unit
         )
+    get_statistics_rollup_cache(instance.hass).invalidate({statistic_id})
 
 
 @callback
@@ -55,6 +55,21 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_spill_journal_info(instance: Recorder) -> dict[str, Any]:
+    """Get the size and replay rate of the spill journal while it is used."""
+    spill_journal_info: dict[str, Any] = {}
+    if (stats := instance.async_spill_journal_stats()) and (
+        stats["spilling"] or stats["size"]
+    ):
+        spill_journal_info["spill_journal_size"] = f"{stats['size']/1024/1024:.2f} MiB"
+        if (replay_rate := stats["replay_rate"]) is not None:
+            spill_journal_info["spill_journal_replay_rate"] = (
+                f"{replay_rate:.0f} events/s"
+            )
+    return spill_journal_info
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -62,6 +77,7 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     recorder_runs_manager = instance.recorder_runs_manager
     database_name = urlparse(instance.db_url).path.lstrip("/")
     db_engine_info = _async_get_db_engine_info(instance)
+    spill_journal_info = _async_get_spill_journal_info(instance)
     db_stats: dict[str, Any] = {}
 
     if instance.async_db_ready.done():
@@ -72,4 +88,4 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return db_runs | db_stats | db_engine_info | spill_journal_info
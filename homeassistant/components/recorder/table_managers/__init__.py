@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, TypedDict
 
 from lru import LRU
 
@@ -12,6 +13,16 @@ if TYPE_CHECKING:
     from ..core import Recorder
 
 
+class LRUCacheStats(TypedDict):
+    """Usage of the cache of an LRU table manager."""
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
 class BaseTableManager[_DataT]:
     """Base class for table managers."""
 
@@ -64,6 +75,42 @@ class BaseLRUTableManager[_DataT](BaseTableManager[_DataT]):
         """
         super().__init__(recorder)
         self._id_map = LRU(lru_size)
+        self._id_map.set_callback(self._evicted)
+        self._evictions = 0
+        # The evictions and misses at the last adaptation of the size
+        self._adapted_evictions = 0
+        self._adapted_misses = 0
+
+    def _evicted(self, key: EventType[Any] | str, value: int) -> None:
+        """Count an item evicted from the LRU cache."""
+        self._evictions += 1
+
+    def prime(self, id_map: Iterable[tuple[EventType[Any] | str, int]]) -> None:
+        """Add known ids to the cache without counting them as misses.
+
+        The last items are the most recently used ones.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        lru = self._id_map
+        for data, data_id in id_map:
+            lru[data] = data_id
+
+    def cache_stats(self) -> LRUCacheStats:
+        """Return the usage of the cache.
+
+        Lookups from the cache count as hits and misses.
+        """
+        lru = self._id_map
+        hits, misses = lru.get_stats()
+        return {
+            "size": len(lru),
+            "max_size": lru.get_size(),
+            "hits": hits,
+            "misses": misses,
+            "evictions": self._evictions,
+        }
 
     def adjust_lru_size(self, new_size: int) -> None:
         """Adjust the LRU cache size.
@@ -74,3 +121,24 @@ class BaseLRUTableManager[_DataT](BaseTableManager[_DataT]):
         lru = self._id_map
         if new_size > lru.get_size():
             lru.set_size(new_size)
+
+    def adapt_lru_size(self, min_size: int, max_size: int) -> None:
+        """Adapt the LRU cache size to the observed working set.
+
+        Items which are evicted and looked up again since the last
+        adaptation show the working set does not fit in the cache, so
+        the cache grows by that many items up to max_size. The cache
+        never shrinks below min_size.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        _, misses = self._id_map.get_stats()
+        thrashed = min(
+            self._evictions - self._adapted_evictions, misses - self._adapted_misses
+        )
+        self._adapted_evictions = self._evictions
+        self._adapted_misses = misses
+        self.adjust_lru_size(
+            max(min_size, min(self._id_map.get_size() + thrashed, max_size))
+        )
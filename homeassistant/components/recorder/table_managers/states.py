@@ -2,7 +2,107 @@
 
 from __future__ import annotations
 
-from ..db_schema import States
+from typing import Any
+
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import Event, EventStateChangedData
+
+from ..const import DEFAULT_MAX_BIND_VARS, SupportedDialect
+from ..db_schema import StateAttributes, States, StatesMeta
+from ..models import ulid_to_bytes_or_none, uuid_hex_to_bytes_or_none
+
+
+class PendingState:
+    """A states row that is inserted with the next commit.
+
+    The row holds the column values of the states table. The
+    old_state, states_meta and state_attributes are resolved to
+    their ids when the row is inserted as they may not have been
+    written to the database yet.
+    """
+
+    __slots__ = (
+        "depth",
+        "old_state",
+        "row",
+        "state_attributes",
+        "state_id",
+        "states_meta",
+    )
+
+    def __init__(self, row: dict[str, Any]) -> None:
+        """Initialize the pending state."""
+        self.row = row
+        self.state_id: int | None = None
+        # Number of pending states before this one for the same entity,
+        # -1 if the row is not queued to be inserted
+        self.depth = -1
+        self.old_state: PendingState | None = None
+        self.states_meta: StatesMeta | None = None
+        self.state_attributes: StateAttributes | None = None
+
+    @classmethod
+    def from_event(cls, event: Event[EventStateChangedData]) -> PendingState:
+        """Create a pending state from a state_changed event."""
+        state = event.data["new_state"]
+        # None state means the state was removed from the state machine
+        if state is None:
+            state_value: str | None = ""
+            last_updated_ts = event.time_fired_timestamp
+            last_changed_ts = None
+            last_reported_ts = None
+        else:
+            state_value = state.state
+            last_updated_ts = state.last_updated_timestamp
+            if state.last_updated == state.last_changed:
+                last_changed_ts = None
+            else:
+                last_changed_ts = state.last_changed_timestamp
+            if state.last_updated == state.last_reported:
+                last_reported_ts = None
+            else:
+                last_reported_ts = state.last_reported_timestamp
+        context = event.context
+        return cls(
+            {
+                "entity_id": event.data["entity_id"],
+                "state": state_value,
+                "last_updated_ts": last_updated_ts,
+                "last_changed_ts": last_changed_ts,
+                "last_reported_ts": last_reported_ts,
+                "old_state_id": None,
+                "attributes_id": None,
+                "metadata_id": None,
+                "origin_idx": event.origin.idx,
+                "context_id_bin": ulid_to_bytes_or_none(context.id),
+                "context_user_id_bin": uuid_hex_to_bytes_or_none(context.user_id),
+                "context_parent_id_bin": ulid_to_bytes_or_none(context.parent_id),
+            }
+        )
+
+
+def _insert_multi_row(
+    connection: Connection,
+    wave: list[PendingState],
+    rows: list[dict[str, Any]],
+    auto_increment_increment: int,
+) -> None:
+    """Insert rows with multi-row INSERT statements on MySQL and MariaDB.
+
+    The id of the first row of a multi-row INSERT is returned by
+    LAST_INSERT_ID(). InnoDB allocates the ids of an INSERT with a
+    known number of rows in one go, so the ids of the other rows
+    follow it by auto_increment_increment.
+    """
+    chunk_size = DEFAULT_MAX_BIND_VARS // len(rows[0])
+    for start in range(0, len(rows), chunk_size):
+        end = start + chunk_size
+        first_id = connection.execute(insert(States).values(rows[start:end])).lastrowid
+        for idx, pending in enumerate(wave[start:end]):
+            pending.state_id = first_id + idx * auto_increment_increment
 
 
 class StatesManager:
@@ -10,11 +110,12 @@ class StatesManager:
 
     def __init__(self) -> None:
         """Initialize the states manager for linking old_state_id."""
-        self._pending: dict[str, States] = {}
+        self._pending: dict[str, States | PendingState] = {}
+        self._pending_inserts: list[PendingState] = []
         self._last_committed_id: dict[str, int] = {}
         self._last_reported: dict[int, float] = {}
 
-    def pop_pending(self, entity_id: str) -> States | None:
+    def pop_pending(self, entity_id: str) -> States | PendingState | None:
         """Pop a pending state.
 
         Pending states are states that are in the session but not yet committed.
@@ -35,7 +136,7 @@ class StatesManager:
         """
         return self._last_committed_id.pop(entity_id, None)
 
-    def add_pending(self, entity_id: str, state: States) -> None:
+    def add_pending(self, entity_id: str, state: States | PendingState) -> None:
         """Add a pending state.
 
         Pending states are states that are in the session but not yet committed.
@@ -45,6 +146,84 @@ class StatesManager:
         """
         self._pending[entity_id] = state
 
+    def queue_insert(self, state: PendingState) -> None:
+        """Queue a pending state to be inserted with the next commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        old_state = state.old_state
+        if old_state is not None and old_state.depth < 0:
+            # The old state was never queued so there is nothing to link to
+            state.old_state = old_state = None
+        state.depth = 0 if old_state is None else old_state.depth + 1
+        self._pending_inserts.append(state)
+
+    def insert_pending(self, session: Session) -> None:
+        """Insert the queued pending states.
+
+        The ids of pending states_meta and state_attributes rows must
+        be known, so the session has to be flushed before.
+
+        Rows are inserted with one executemany per depth so the state_id
+        of the old state is known when a row is inserted. A state that
+        changes once per commit interval is always inserted with the
+        first executemany. MySQL and MariaDB cannot return the ids of an
+        executemany, the rows of a depth are inserted with multi-row
+        INSERT statements instead.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending_inserts:
+            return
+        waves: list[list[PendingState]] = []
+        for pending in self._pending_inserts:
+            if pending.depth == len(waves):
+                waves.append([])
+            waves[pending.depth].append(pending)
+
+        connection = session.connection()
+        returning = (
+            connection.dialect.insert_executemany_returning_sort_by_parameter_order
+        )
+        multi_row = not returning and connection.dialect.name == SupportedDialect.MYSQL
+        auto_increment_increment = 1
+        if multi_row:
+            auto_increment_increment = connection.execute(
+                text("SELECT @@auto_increment_increment")
+            ).scalar_one()
+        for wave in waves:
+            rows: list[dict[str, Any]] = []
+            for pending in wave:
+                row = pending.row
+                if (old_state := pending.old_state) is not None:
+                    row["old_state_id"] = old_state.state_id
+                if (states_meta := pending.states_meta) is not None:
+                    row["metadata_id"] = states_meta.metadata_id
+                if (state_attributes := pending.state_attributes) is not None:
+                    row["attributes_id"] = state_attributes.attributes_id
+                rows.append(row)
+            if returning:
+                result = connection.execute(
+                    insert(States).returning(
+                        States.state_id, sort_by_parameter_order=True
+                    ),
+                    rows,
+                )
+                for pending, state_id in zip(wave, result.scalars(), strict=True):
+                    pending.state_id = state_id
+                continue
+            if multi_row:
+                _insert_multi_row(connection, wave, rows, auto_increment_increment)
+                continue
+            # Other dialects that cannot return the ids of an
+            # executemany insert the rows one by one
+            for pending, row in zip(wave, rows, strict=True):
+                pending.state_id = connection.execute(
+                    insert(States), row
+                ).inserted_primary_key[0]
+
     def update_pending_last_reported(
         self, state_id: int, last_reported_timestamp: float
     ) -> None:
@@ -62,8 +241,9 @@ class StatesManager:
         recorder thread.
         """
         for entity_id, db_states in self._pending.items():
-            self._last_committed_id[entity_id] = db_states.state_id
+            self._last_committed_id[entity_id] = db_states.state_id  # type: ignore[assignment]
         self._pending.clear()
+        self._pending_inserts.clear()
         self._last_reported.clear()
 
     def reset(self) -> None:
@@ -74,6 +254,7 @@ class StatesManager:
         """
         self._last_committed_id.clear()
         self._pending.clear()
+        self._pending_inserts.clear()
 
     def evict_purged_state_ids(self, purged_state_ids: set[int]) -> None:
         """Evict purged states from the committed states.
@@ -93,6 +274,17 @@ class StatesManager:
         ):
             last_committed_ids.pop(last_committed_ids_reversed[purged_state_id], None)
 
+    def evict_purged_state_ids_up_to(self, max_state_id: int) -> None:
+        """Evict the committed states with a state_id up to max_state_id.
+
+        This is used when the states are purged by dropping a partition
+        and the individual state_ids are not known.
+        """
+        last_committed_ids = self._last_committed_id
+        for entity_id, state_id in list(last_committed_ids.items()):
+            if state_id <= max_state_id:
+                del last_committed_ids[entity_id]
+
     def evict_purged_entity_ids(self, purged_entity_ids: set[str]) -> None:
         """Evict purged entity_ids from the committed states.
 
@@ -9,13 +9,14 @@ from dataclasses import dataclass
 from datetime import datetime
 import logging
 import threading
+import time
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.helpers.typing import UndefinedType
 from homeassistant.util.event_type import EventType
 
 from . import entity_registry, purge, statistics
-from .const import DOMAIN
+from .const import DOMAIN, PURGE_YIELD_DELAY
 from .db_schema import Statistics, StatisticsShortTerm
 from .models import StatisticData, StatisticMetaData
 from .util import periodic_db_cleanups, session_scope
@@ -116,9 +117,38 @@ class PurgeTask(RecorderTask):
     apply_filter: bool
 
     def run(self, instance: Recorder) -> None:
-        """Purge the database."""
+        """Purge the database.
+
+        The purge yields to the live writes while the backlog is above
+        purge_yield_backlog. With purge_max_rows_per_second set, each purge
+        cycle deletes about one commit interval worth of rows and the next
+        cycle is delayed to keep to the rate.
+        """
+        next_task = PurgeTask(self.purge_before, self.repack, self.apply_filter)
+        if instance.backlog > instance.purge_yield_backlog:
+            _LOGGER.debug(
+                "Purge yielding to %s queued events and states", instance.backlog
+            )
+            instance.queue_task_later(PURGE_YIELD_DELAY, next_task)
+            return
+        batch_sizes: dict[str, int] = {}
+        if rows_per_second := instance.purge_max_rows_per_second:
+            batches = max(
+                int(rows_per_second * max(instance.commit_interval, 1))
+                // instance.max_bind_vars,
+                1,
+            )
+            batch_sizes = {
+                "events_batch_size": min(
+                    batches, purge.DEFAULT_EVENTS_BATCHES_PER_PURGE
+                ),
+                "states_batch_size": min(
+                    batches, purge.DEFAULT_STATES_BATCHES_PER_PURGE
+                ),
+            }
+        started = time.monotonic()
         if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
+            instance, self.purge_before, self.repack, self.apply_filter, **batch_sizes
         ):
             with instance.get_session() as session:
                 instance.recorder_runs_manager.load_from_db(session)
@@ -128,9 +158,18 @@ class PurgeTask(RecorderTask):
             periodic_db_cleanups(instance)
             return
         # Schedule a new purge task if this one didn't finish
-        instance.queue_task(
-            PurgeTask(self.purge_before, self.repack, self.apply_filter)
-        )
+        if (
+            rows_per_second
+            and (progress := instance.purge_progress) is not None
+            and (
+                delay := progress.cycle_rows_purged / rows_per_second
+                - (time.monotonic() - started)
+            )
+            > 0
+        ):
+            instance.queue_task_later(delay, next_task)
+            return
+        instance.queue_task(next_task)
 
 
 @dataclass(slots=True)
@@ -339,6 +378,17 @@ class AdjustLRUSizeTask(RecorderTask):
         instance._adjust_lru_size()  # noqa: SLF001
 
 
+@dataclass(slots=True)
+class ReplaySpillJournalTask(RecorderTask):
+    """An object to insert into the recorder queue to replay spilled events."""
+
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task to replay the next events of the spill journal."""
+        instance._replay_spill_journal()  # noqa: SLF001
+
+
 @dataclass(slots=True)
 class RefreshEventTypesTask(RecorderTask):
     """An object to insert into the recorder queue to refresh event types."""
@@ -57,6 +57,7 @@ from .models import (
     UnsupportedDialect,
     process_timestamp,
 )
+from .partitions import ensure_partitions
 
 if TYPE_CHECKING:
     from sqlite3.dbapi2 import Cursor as SQLiteCursor
@@ -343,6 +344,22 @@ def query_on_connection(dbapi_connection: DBAPIConnection, statement: str) -> An
     return result
 
 
+def setup_read_only_connection(
+    dialect_name: str, dbapi_connection: DBAPIConnection
+) -> None:
+    """Make a connection refuse writes."""
+    if dialect_name == SupportedDialect.SQLITE:
+        execute_on_connection(dbapi_connection, "PRAGMA query_only = ON")
+    elif dialect_name == SupportedDialect.MYSQL:
+        execute_on_connection(dbapi_connection, "SET SESSION TRANSACTION READ ONLY")
+    elif dialect_name == SupportedDialect.POSTGRESQL:
+        execute_on_connection(
+            dbapi_connection, "SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY"
+        )
+        # The setting is rolled back with the transaction it was made in
+        dbapi_connection.commit()
+
+
 def _fail_unsupported_dialect(dialect_name: str) -> NoReturn:
     """Warn about unsupported database version."""
     _LOGGER.error(
@@ -786,6 +803,9 @@ def periodic_db_cleanups(instance: Recorder) -> None:
         with instance.engine.connect() as connection:
             connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE);"))
             connection.execute(text("PRAGMA OPTIMIZE;"))
+    if instance.partition_interval:
+        with instance.engine.begin() as connection:
+            ensure_partitions(connection, instance.partition_interval, dt_util.utcnow())
 
 
 @contextmanager
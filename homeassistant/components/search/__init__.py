@@ -18,6 +18,7 @@ from homeassistant.helpers import (
     config_validation as cv,
     device_registry as dr,
     entity_registry as er,
+    target_index,
 )
 from homeassistant.helpers.entity import (
     EntityInfo,
@@ -92,6 +93,7 @@ class Searcher:
         self._area_registry = ar.async_get(hass)
         self._device_registry = dr.async_get(hass)
         self._entity_registry = er.async_get(hass)
+        self._target_index = target_index.async_get(hass)
         self._entity_sources = entity_sources
         self.results: defaultdict[ItemType, set[str]] = defaultdict(set)
 
@@ -137,37 +139,28 @@ class Searcher:
         # Scripts referencing this area
         self._add(ItemType.SCRIPT, script.scripts_with_area(self.hass, area_id))
 
-        # Entity in this area, will extend this with the entities of the devices in this area
-        entity_entries = er.async_entries_for_area(self._entity_registry, area_id)
-
         # Devices in this area
-        for device in dr.async_entries_for_area(self._device_registry, area_id):
-            self._add(ItemType.DEVICE, device.id)
+        for device_id in self._target_index.async_area_devices(area_id):
+            self._add(ItemType.DEVICE, device_id)
 
             # Config entries for devices in this area
-            if device_entry := self._device_registry.async_get(device.id):
+            if device_entry := self._device_registry.async_get(device_id):
                 self._add(ItemType.CONFIG_ENTRY, device_entry.config_entries)
 
             # Automations referencing this device
             self._add(
                 ItemType.AUTOMATION,
-                automation.automations_with_device(self.hass, device.id),
+                automation.automations_with_device(self.hass, device_id),
             )
 
             # Scripts referencing this device
-            self._add(ItemType.SCRIPT, script.scripts_with_device(self.hass, device.id))
-
-            # Entities of this device
-            for entity_entry in er.async_entries_for_device(
-                self._entity_registry, device.id
-            ):
-                # Skip the entity if it's in a different area
-                if entity_entry.area_id is not None:
-                    continue
-                entity_entries.append(entity_entry)
+            self._add(ItemType.SCRIPT, script.scripts_with_device(self.hass, device_id))
 
-        # Process entities in this area
-        for entity_entry in entity_entries:
+        # Entities in this area, including the entities of the devices
+        # in this area which are not in a different area themselves
+        for entity_id in self._target_index.async_area_entities(area_id):
+            if not (entity_entry := self._entity_registry.async_get(entity_id)):
+                continue
             self._add(ItemType.ENTITY, entity_entry.entity_id)
 
             # If this entity also exists as a resource, we add it.
@@ -358,9 +351,9 @@ class Searcher:
         # Scripts referencing this floor
         self._add(ItemType.SCRIPT, script.scripts_with_floor(self.hass, floor_id))
 
-        for area_entry in ar.async_entries_for_floor(self._area_registry, floor_id):
-            self._add(ItemType.AREA, area_entry.id)
-            self._async_search_area(area_entry.id, entry_point=False)
+        for area_id in self._target_index.async_floor_areas(floor_id):
+            self._add(ItemType.AREA, area_id)
+            self._async_search_area(area_id, entry_point=False)
 
     @callback
     def _async_search_group(self, group_entity_id: str) -> None:
@@ -393,21 +386,19 @@ class Searcher:
         """Find results for a label."""
 
         # Areas with this label
-        for area_entry in ar.async_entries_for_label(self._area_registry, label_id):
-            self._add(ItemType.AREA, area_entry.id)
+        self._add(ItemType.AREA, self._target_index.async_label_areas(label_id))
 
         # Devices with this label
-        for device in dr.async_entries_for_label(self._device_registry, label_id):
-            self._add(ItemType.DEVICE, device.id)
+        self._add(ItemType.DEVICE, self._target_index.async_label_devices(label_id))
 
         # Entities with this label
-        for entity_entry in er.async_entries_for_label(self._entity_registry, label_id):
-            self._add(ItemType.ENTITY, entity_entry.entity_id)
+        for entity_id in self._target_index.async_label_entities(label_id):
+            self._add(ItemType.ENTITY, entity_id)
 
             # If this entity also exists as a resource, we add it.
-            domain = split_entity_id(entity_entry.entity_id)[0]
+            domain = split_entity_id(entity_id)[0]
             if domain in self.EXIST_AS_ENTITY:
-                self._add(ItemType(domain), entity_entry.entity_id)
+                self._add(ItemType(domain), entity_id)
 
         # Automations referencing this label
         self._add(
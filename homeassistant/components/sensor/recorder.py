@@ -9,6 +9,7 @@ import datetime
 import itertools
 import logging
 import math
+import operator
 from typing import Any
 
 from sqlalchemy.orm.session import Session
@@ -35,7 +36,6 @@ from homeassistant.core import HomeAssistant, State, callback, split_entity_id
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.entity import entity_sources
-from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 from homeassistant.loader import async_suggest_report_issue
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
@@ -100,41 +100,29 @@ def _get_sensor_states(hass: HomeAssistant) -> list[State]:
 
 
 def _time_weighted_average(
-    fstates: list[tuple[float, State]], start: datetime.datetime, end: datetime.datetime
+    values: list[float], timestamps: list[float], start_ts: float, end_ts: float
 ) -> float:
     """Calculate a time weighted average.
 
-    The average is calculated by weighting the states by duration in seconds between
-    state changes.
+    The average is calculated by weighting the values by duration in seconds between
+    state changes. The values and the last updated timestamps of the states are
+    passed as columns so the weighting is done in one pass over each column.
     Note: there's no interpolation of values between state changes.
     """
-    old_fstate: float | None = None
-    old_start_time: datetime.datetime | None = None
-    accumulated = 0.0
-
-    for fstate, state in fstates:
-        # The recorder will give us the last known state, which may be well
-        # before the requested start time for the statistics
-        start_time = max(state.last_updated, start)
-        if old_start_time is None:
-            # Adjust start time, if there was no last known state
-            start = start_time
-        else:
-            duration = start_time - old_start_time
-            # Accumulate the value, weighted by duration until next state change
-            assert old_fstate is not None
-            accumulated += old_fstate * duration.total_seconds()
-
-        old_fstate = fstate
-        old_start_time = start_time
-
-    if old_fstate is not None:
-        # Accumulate the value, weighted by duration until end of the period
-        assert old_start_time is not None
-        duration = end - old_start_time
-        accumulated += old_fstate * duration.total_seconds()
-
-    period_seconds = (end - start).total_seconds()
+    if not values:
+        return 0.0
+    # The recorder will give us the last known state, which may be well
+    # before the requested start time for the statistics
+    start_times = [max(start_ts, ts) for ts in timestamps]
+    # Each value is weighted by the duration until the next state change
+    # or until the end of the period
+    end_times = start_times[1:]
+    end_times.append(end_ts)
+    accumulated = math.fsum(
+        map(operator.mul, values, map(operator.sub, end_times, start_times))
+    )
+    # The period starts at the first state if there was no last known state
+    period_seconds = end_ts - start_times[0]
     if period_seconds == 0:
         # If the only state changed that happened was at the exact moment
         # at the end of the period, we can't calculate a meaningful average
@@ -180,6 +168,20 @@ def _entity_history_to_float_and_state(
     return float_states
 
 
+def _significant_states(entity_history: list[State]) -> list[State]:
+    """Return the states which are significant changes.
+
+    This matches the states the history would return with
+    significant_changes_only, the state at the start of the
+    period is always kept as its last_changed is not recorded.
+    """
+    return [
+        state
+        for state in entity_history
+        if state.last_changed_timestamp == state.last_updated_timestamp
+    ]
+
+
 def _is_numeric(state: State) -> bool:
     """Return if the state is numeric."""
     with suppress(ValueError, TypeError):
@@ -237,14 +239,20 @@ def _normalize_states(
 
         return state_unit, fstates
 
+    units = [state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) for _, state in fstates]
+    if units.count(statistics_unit) == len(units):
+        # The unit rarely changes, there is nothing to convert
+        return statistics_unit, fstates
+
     converter = statistics.STATISTIC_UNIT_TO_UNIT_CONVERTER[statistics_unit]
     valid_fstates: list[tuple[float, State]] = []
-    convert: Callable[[float], float] | None = None
-    last_unit: str | None | UndefinedType = UNDEFINED
     valid_units = converter.VALID_UNITS
 
-    for fstate, state in fstates:
-        state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    # The states are converted in runs which share the same unit
+    # with a single converter for each run
+    for state_unit, run in itertools.groupby(
+        zip(units, fstates, strict=True), operator.itemgetter(0)
+    ):
         # Exclude states with unsupported unit from statistics
         if state_unit not in valid_units:
             if WARN_UNSUPPORTED_UNIT not in hass.data:
@@ -266,19 +274,11 @@ def _normalize_states(
                 )
             continue
 
-        if state_unit != last_unit:
-            # The unit of measurement has changed since the last state change
-            # recreate the converter factory
-            if state_unit == statistics_unit:
-                convert = None
-            else:
-                convert = converter.converter_factory(state_unit, statistics_unit)
-            last_unit = state_unit
-
-        if convert is not None:
-            fstate = convert(fstate)
-
-        valid_fstates.append((fstate, state))
+        if state_unit == statistics_unit:
+            valid_fstates.extend([fstate for _, fstate in run])
+            continue
+        convert = converter.converter_factory(state_unit, statistics_unit)
+        valid_fstates.extend([(convert(fstate), state) for _, (fstate, state) in run])
 
     return statistics_unit, valid_fstates
 
@@ -410,44 +410,36 @@ def compile_statistics(  # noqa: C901
 ) -> statistics.PlatformCompiledStatistics:
     """Compile statistics for all entities during start-end."""
     result: list[StatisticResult] = []
+    start_ts = start.timestamp()
+    end_ts = end.timestamp()
 
     sensor_states = _get_sensor_states(hass)
     wanted_statistics = _wanted_statistics(sensor_states)
-    # Get history between start and end
-    entities_full_history = [
-        i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
-    ]
+    # Get history between start and end with a single query. Entities
+    # compiling a sum need every state while the other entities only
+    # need the significant states, which are picked from the result.
     history_list: dict[str, list[State]] = {}
-    if entities_full_history:
+    if sensor_states:
         history_list = history.get_full_significant_states_with_session(
             hass,
             session,
             start - datetime.timedelta.resolution,
             end,
-            entity_ids=entities_full_history,
+            entity_ids=[i.entity_id for i in sensor_states],
             significant_changes_only=False,
         )
-    entities_significant_history = [
-        i.entity_id
-        for i in sensor_states
-        if "sum" not in wanted_statistics[i.entity_id]
-    ]
-    if entities_significant_history:
-        _history_list = history.get_full_significant_states_with_session(
-            hass,
-            session,
-            start - datetime.timedelta.resolution,
-            end,
-            entity_ids=entities_significant_history,
-        )
-        history_list = {**history_list, **_history_list}
 
     entities_with_float_states: dict[str, list[tuple[float, State]]] = {}
     for _state in sensor_states:
         entity_id = _state.entity_id
-        # If there are no recent state changes, the sensor's state may already be pruned
-        # from the recorder. Get the state from the state machine instead.
-        if not (entity_history := history_list.get(entity_id, [_state])):
+        if (entity_history := history_list.get(entity_id)) is None:
+            # If there are no recent state changes, the sensor's state may already
+            # be pruned from the recorder. Get the state from the state machine
+            # instead.
+            entity_history = [_state]
+        elif "sum" not in wanted_statistics[entity_id]:
+            entity_history = _significant_states(entity_history)
+        if not entity_history:
             continue
         if not (float_states := _entity_history_to_float_and_state(entity_history)):
             continue
@@ -525,19 +517,22 @@ def compile_statistics(  # noqa: C901
 
         # Make calculations
         stat: StatisticData = {"start": start}
-        if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(
-                *itertools.islice(zip(*valid_float_states, strict=False), 1)
-            )
-        if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(
-                *itertools.islice(zip(*valid_float_states, strict=False), 1)
-            )
-
-        if "mean" in wanted_statistics[entity_id]:
-            stat["mean"] = _time_weighted_average(valid_float_states, start, end)
+        wanted = wanted_statistics[entity_id]
+        if "max" in wanted or "min" in wanted or "mean" in wanted:
+            values = [fstate for fstate, _ in valid_float_states]
+            if "max" in wanted:
+                stat["max"] = max(values)
+            if "min" in wanted:
+                stat["min"] = min(values)
+            if "mean" in wanted:
+                stat["mean"] = _time_weighted_average(
+                    values,
+                    [state.last_updated_timestamp for _, state in valid_float_states],
+                    start_ts,
+                    end_ts,
+                )
 
-        if "sum" in wanted_statistics[entity_id]:
+        if "sum" in wanted:
             last_reset = old_last_reset = None
             new_state = old_state = None
             _sum = 0.0
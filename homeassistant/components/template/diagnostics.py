@@ -0,0 +1,38 @@
+"""Diagnostics support for template."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from .const import DOMAIN
+from .template_entity import TemplateEntity
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entities: dict[str, Any] = {}
+    for platform in async_get_platforms(hass, DOMAIN):
+        if platform.config_entry is not entry:
+            continue
+        for entity in platform.entities.values():
+            if not isinstance(entity, TemplateEntity):
+                continue
+            entities[entity.entity_id] = {
+                "templates": [
+                    {
+                        "template": template.template,
+                        "renders": stats.renders,
+                        "render_time": stats.render_time,
+                        "last_render_time": stats.last_render_time,
+                        "worker_renders": stats.worker_renders,
+                    }
+                    for template, stats in entity.template_render_stats.items()
+                ]
+            }
+    return {"options": dict(entry.options), "entities": entities}
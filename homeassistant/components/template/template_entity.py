@@ -36,6 +36,7 @@ from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import (
+    TemplateRenderStats,
     TrackTemplate,
     TrackTemplateResult,
     TrackTemplateResultInfo,
@@ -60,6 +61,7 @@ from .const import (
     CONF_AVAILABILITY,
     CONF_AVAILABILITY_TEMPLATE,
     CONF_PICTURE,
+    CONF_RENDER_IN_WORKER,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -80,6 +82,7 @@ TEMPLATE_ENTITY_COMMON_SCHEMA = vol.Schema(
     {
         vol.Optional(CONF_ATTRIBUTES): vol.Schema({cv.string: cv.template}),
         vol.Optional(CONF_AVAILABILITY): cv.template,
+        vol.Optional(CONF_RENDER_IN_WORKER): cv.boolean,
         vol.Optional(CONF_VARIABLES): cv.SCRIPT_VARIABLES_SCHEMA,
     }
 ).extend(TEMPLATE_ENTITY_BASE_SCHEMA.schema)
@@ -91,6 +94,7 @@ def make_template_entity_common_schema(default_name: str) -> vol.Schema:
         {
             vol.Optional(CONF_ATTRIBUTES): vol.Schema({cv.string: cv.template}),
             vol.Optional(CONF_AVAILABILITY): cv.template,
+            vol.Optional(CONF_RENDER_IN_WORKER): cv.boolean,
         }
     ).extend(make_template_entity_base_schema(default_name).schema)
 
@@ -293,6 +297,7 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
             self._friendly_name_template = None
             self._run_variables = {}
             self._blueprint_inputs = None
+            self._render_in_worker = False
         else:
             self._attribute_templates = config.get(CONF_ATTRIBUTES)
             self._availability_template = config.get(CONF_AVAILABILITY)
@@ -301,6 +306,7 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
             self._friendly_name_template = config.get(CONF_NAME)
             self._run_variables = config.get(CONF_VARIABLES, {})
             self._blueprint_inputs = config.get("raw_blueprint_inputs")
+            self._render_in_worker = config.get(CONF_RENDER_IN_WORKER, False)
 
         class DummyState(State):
             """None-state for template entities not yet added to the state machine."""
@@ -424,6 +430,13 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
         self._template_attrs.setdefault(template, [])
         self._template_attrs[template].append(template_attribute)
 
+    @property
+    def template_render_stats(self) -> dict[Template, TemplateRenderStats]:
+        """Return the number of renders and time spent rendering per template."""
+        if self._template_result_info is None:
+            return {}
+        return self._template_result_info.render_stats
+
     @callback
     def _handle_results(
         self,
@@ -511,6 +524,8 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
             self._handle_results,
             log_fn=log_fn,
             has_super_template=has_availability_template,
+            entity_id=self.entity_id,
+            render_in_worker=self._render_in_worker,
         )
         self.async_on_remove(result_info.async_remove)
         self._template_result_info = result_info
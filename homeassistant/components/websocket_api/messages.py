@@ -119,12 +119,7 @@ def cached_event_message(message_id_as_bytes: bytes, event: Event) -> bytes:
     we can avoid serializing the same data for each connection.
     """
     return b"".join(
-        (
-            _partial_cached_event_message(event)[:-1],
-            b',"id":',
-            message_id_as_bytes,
-            b"}",
-        )
+        (b'{"id":', message_id_as_bytes, _partial_cached_event_message(event))
     )
 
 
@@ -132,12 +127,11 @@ def cached_event_message(message_id_as_bytes: bytes, event: Event) -> bytes:
 def _partial_cached_event_message(event: Event) -> bytes:
     """Cache and serialize the event to json.
 
-    The message is constructed without the id which appended
-    in cached_event_message.
+    The message is constructed without the id and the opening
+    brace which are prepended in cached_event_message.
     """
-    return (
+    return _message_body(
         _message_to_json_bytes_or_none({"type": "event", "event": event.json_fragment})
-        or INVALID_JSON_PARTIAL_MESSAGE
     )
 
 
@@ -153,12 +147,7 @@ def cached_state_diff_message(
     we can avoid serializing the same data for each connection.
     """
     return b"".join(
-        (
-            _partial_cached_state_diff_message(event)[:-1],
-            b',"id":',
-            message_id_as_bytes,
-            b"}",
-        )
+        (b'{"id":', message_id_as_bytes, _partial_cached_state_diff_message(event))
     )
 
 
@@ -166,17 +155,26 @@ def cached_state_diff_message(
 def _partial_cached_state_diff_message(event: Event[EventStateChangedData]) -> bytes:
     """Cache and serialize the event to json.
 
-    The message is constructed without the id which
-    will be appended in cached_state_diff_message
+    The message is constructed without the id and the opening
+    brace which are prepended in cached_state_diff_message.
     """
-    return (
+    return _message_body(
         _message_to_json_bytes_or_none(
             {"type": "event", "event": _state_diff_event(event)}
         )
-        or INVALID_JSON_PARTIAL_MESSAGE
     )
 
 
+def _message_body(message_json: bytes | None) -> bytes:
+    """Return a serialized message without its opening brace.
+
+    The body starts with a comma so the id of the subscription
+    only has to be prepended to complete the message. Slicing
+    here happens once per event instead of once per subscriber.
+    """
+    return b"," + (message_json or INVALID_JSON_PARTIAL_MESSAGE)[1:]
+
+
 def _state_diff_event(
     event: Event[EventStateChangedData],
 ) -> dict[
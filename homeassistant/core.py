@@ -12,12 +12,14 @@ from collections.abc import (
     Callable,
     Collection,
     Coroutine,
+    Generator,
     Iterable,
     KeysView,
     Mapping,
     ValuesView,
 )
 import concurrent.futures
+from contextlib import contextmanager
 from dataclasses import dataclass
 import datetime
 import enum
@@ -39,6 +41,7 @@ from typing import (
     cast,
     overload,
 )
+import weakref
 
 from propcache import cached_property, under_cached_property
 from typing_extensions import TypeVar
@@ -101,7 +104,11 @@ from .util.async_ import (
     shutdown_run_callback_threadsafe,
 )
 from .util.event_type import EventType
-from .util.executor import InterruptibleThreadPoolExecutor
+from .util.executor import (
+    ExecutorStats,
+    InstrumentedThreadPoolExecutor,
+    InterruptibleThreadPoolExecutor,
+)
 from .util.hass_dict import HassDict
 from .util.json import JsonObjectType
 from .util.read_only_dict import ReadOnlyDict
@@ -207,6 +214,16 @@ EVENTS_EXCLUDED_FROM_MATCH_ALL = {
     EVENT_STATE_REPORTED,
 }
 
+# Attribute value types that can be part of an interned attributes mapping
+_INTERNABLE_ATTRIBUTE_TYPES = {str, int, float, bool, type(None)}
+
+# Events that carry an entity_id and can be dispatched
+# through the entity keyed listener index of the event bus
+ENTITY_KEYED_EVENTS = {
+    EVENT_STATE_CHANGED,
+    EVENT_STATE_REPORTED,
+}
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -333,6 +350,29 @@ class HassJobType(enum.Enum):
     Executor = 3
 
 
+class ExecutorLane(enum.StrEnum):
+    """Executor lanes for blocking jobs of core subsystems.
+
+    Each lane has its own thread pool so a saturated default
+    executor can not starve the jobs running in a lane.
+    """
+
+    CAMERA = "camera"
+    LOADER = "loader"
+    STORAGE = "storage"
+    TRANSLATIONS = "translations"
+
+
+DEFAULT_EXECUTOR_LANE_WORKERS: Final[dict[str, int]] = {
+    ExecutorLane.CAMERA: 4,
+    ExecutorLane.LOADER: 2,
+    ExecutorLane.STORAGE: 2,
+    ExecutorLane.TRANSLATIONS: 2,
+}
+# Number of workers for lanes without a configured size
+DEFAULT_EXECUTOR_LANE_MAX_WORKERS = 2
+
+
 class HassJob[**_P, _R_co]:
     """Represent a job to be run later.
 
@@ -463,6 +503,8 @@ class HomeAssistant:
         self.import_executor = InterruptibleThreadPoolExecutor(
             max_workers=1, thread_name_prefix="ImportExecutor"
         )
+        self.executor_lane_workers: dict[str, int] = dict(DEFAULT_EXECUTOR_LANE_WORKERS)
+        self._executor_lanes: dict[str, InstrumentedThreadPoolExecutor] = {}
         self.loop_thread_id = getattr(self.loop, "_thread_id")
 
     def verify_event_loop_thread(self, what: str) -> None:
@@ -895,6 +937,53 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_add_lane_executor_job[*_Ts, _T](
+        self, lane: str, target: Callable[[*_Ts], _T], *args: *_Ts
+    ) -> asyncio.Future[_T]:
+        """Add an executor job to a named executor lane from within the event loop.
+
+        The thread pool of a lane is created on first use and sized from
+        executor_lane_workers. The lanes are shut down when Home Assistant
+        stops, jobs added after that run in the default executor.
+        """
+        if (executor := self._executor_lanes.get(lane)) is None:
+            if self.state is CoreState.stopped:
+                return self.async_add_executor_job(target, *args)
+            executor = self._executor_lanes[lane] = InstrumentedThreadPoolExecutor(
+                max_workers=self.executor_lane_workers.get(
+                    lane, DEFAULT_EXECUTOR_LANE_MAX_WORKERS
+                ),
+                thread_name_prefix=f"{lane.title()}Executor",
+            )
+        task = self.loop.run_in_executor(executor, target, *args)
+
+        tracked = asyncio.current_task() in self._tasks
+        task_bucket = self._tasks if tracked else self._background_tasks
+        task_bucket.add(task)
+        task.add_done_callback(task_bucket.remove)
+
+        return task
+
+    @callback
+    def async_set_executor_lane_workers(self, lane_workers: Mapping[str, int]) -> None:
+        """Set the number of worker threads of executor lanes.
+
+        Lanes which are in use already are resized, a lower number only
+        limits the threads started from now on.
+        """
+        self.executor_lane_workers.update(lane_workers)
+        for lane, max_workers in lane_workers.items():
+            if (executor := self._executor_lanes.get(lane)) is not None:
+                executor.set_max_workers(max_workers)
+
+    @callback
+    def async_executor_lane_stats(self) -> dict[str, ExecutorStats]:
+        """Return queue depth and latency stats of the executor lanes in use."""
+        return {
+            lane: executor.stats() for lane, executor in self._executor_lanes.items()
+        }
+
     @callback
     def async_add_import_executor_job[*_Ts, _T](
         self, target: Callable[[*_Ts], _T], *args: *_Ts
@@ -1108,6 +1197,9 @@ class HomeAssistant:
             # Some tests require async_stop to run,
             # regardless of the state of the loop.
             if self.state is CoreState.not_running:  # just ignore
+                # Lanes may have been used without starting, such as by
+                # the scripts, their threads would be left behind
+                self._shutdown_executor_lanes()
                 return
             if self.state in [CoreState.stopping, CoreState.final_write]:
                 _LOGGER.info("Additional call to async_stop was ignored")
@@ -1232,10 +1324,22 @@ class HomeAssistant:
 
         self.set_state(CoreState.stopped)
         self.import_executor.shutdown()
+        self._shutdown_executor_lanes()
 
         if self._stopped is not None:
             self._stopped.set()
 
+    def _shutdown_executor_lanes(self) -> None:
+        """Shut down the executor lanes, they are recreated on next use."""
+        executors = list(self._executor_lanes.values())
+        self._executor_lanes.clear()
+        # Stop all lanes before joining any of them so their threads
+        # wind down in parallel
+        for executor in executors:
+            executor.shutdown(join_threads_or_timeout=False)
+        for executor in executors:
+            executor.join_threads_or_timeout()
+
     def _cancel_cancellable_timers(self) -> None:
         """Cancel timer handles marked as cancellable."""
         for handle in get_scheduled_timer_handles(self.loop):
@@ -1459,6 +1563,86 @@ class _OneTimeListener(Generic[_DataT]):
 EMPTY_LIST: list[Any] = []
 
 
+class _EntityKeyedListeners(Generic[_DataT]):
+    """Index of listeners for an event type keyed by entity_id and domain.
+
+    The listeners of a key are kept in a tuple which is replaced when a
+    listener is added or removed, so the tuple returned by async_match
+    can be dispatched without copying it first.
+    """
+
+    __slots__ = ("by_domain", "by_entity_id", "jobs")
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self.by_entity_id: dict[str, tuple[_FilterableJobType[_DataT], ...]] = {}
+        self.by_domain: dict[str, tuple[_FilterableJobType[_DataT], ...]] = {}
+        # The number of additions of every job, a job which was added
+        # for more keys is counted as a single listener
+        self.jobs: dict[_FilterableJobType[_DataT], int] = {}
+
+    @property
+    def count(self) -> int:
+        """Return the number of listeners in the index."""
+        return len(self.jobs)
+
+    @callback
+    def async_match(self, entity_id: str) -> tuple[_FilterableJobType[_DataT], ...]:
+        """Return the listeners matching an entity_id."""
+        entity_jobs = self.by_entity_id.get(entity_id, ())
+        if not self.by_domain:
+            return entity_jobs
+        domain_jobs = self.by_domain.get(split_entity_id(entity_id)[0], ())
+        if not entity_jobs:
+            return domain_jobs
+        if not domain_jobs:
+            return entity_jobs
+        # A listener may be registered for both the entity_id and its domain,
+        # make sure it only runs once.
+        return tuple(dict.fromkeys(entity_jobs + domain_jobs))
+
+    @callback
+    def async_add(
+        self,
+        entity_ids: Iterable[str],
+        domains: Iterable[str],
+        filterable_job: _FilterableJobType[_DataT],
+    ) -> None:
+        """Add a listener to the index."""
+        for index, keys in (
+            (self.by_entity_id, entity_ids),
+            (self.by_domain, domains),
+        ):
+            for key in keys:
+                index[key] = (*index.get(key, ()), filterable_job)
+        self.jobs[filterable_job] = self.jobs.get(filterable_job, 0) + 1
+
+    @callback
+    def async_remove(
+        self,
+        entity_ids: Iterable[str],
+        domains: Iterable[str],
+        filterable_job: _FilterableJobType[_DataT],
+    ) -> None:
+        """Remove a listener from the index."""
+        for index, keys in (
+            (self.by_entity_id, entity_ids),
+            (self.by_domain, domains),
+        ):
+            for key in keys:
+                if (jobs := index.get(key)) is None:
+                    raise ValueError(f"No listeners for {key}")
+                position = jobs.index(filterable_job)
+                if len(jobs) == 1:
+                    del index[key]
+                else:
+                    index[key] = jobs[:position] + jobs[position + 1 :]
+        if (additions := self.jobs[filterable_job]) == 1:
+            del self.jobs[filterable_job]
+        else:
+            self.jobs[filterable_job] = additions - 1
+
+
 @functools.lru_cache
 def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> None:
     """Verify the length of the event type and raise if too long."""
@@ -1469,13 +1653,22 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_debug",
+        "_entity_keyed_listeners",
+        "_hass",
+        "_listeners",
+        "_match_all_listeners",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: defaultdict[
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
+        self._entity_keyed_listeners: dict[
+            EventType[Any] | str, _EntityKeyedListeners[Any]
+        ] = {}
         self._match_all_listeners: list[_FilterableJobType[Any]] = []
         self._listeners[MATCH_ALL] = self._match_all_listeners
         self._hass = hass
@@ -1493,7 +1686,10 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for key, keyed_listeners in self._entity_keyed_listeners.items():
+            listeners[key] = listeners.get(key, 0) + keyed_listeners.count
+        return listeners
 
     @property
     def listeners(self) -> dict[EventType[Any] | str, int]:
@@ -1588,6 +1784,35 @@ class EventBus:
             except Exception:
                 _LOGGER.exception("Error running job: %s", job)
 
+        # The listeners keyed by entity_id run after the other listeners
+        if (
+            event_data is None
+            or (keyed_listeners := self._entity_keyed_listeners.get(event_type)) is None
+        ):
+            return
+        for job, event_filter in keyed_listeners.async_match(event_data["entity_id"]):
+            if event_filter is not None:
+                try:
+                    if not event_filter(event_data):
+                        continue
+                except Exception:
+                    _LOGGER.exception("Error in event filter")
+                    continue
+
+            if not event:
+                event = Event(
+                    event_type,
+                    event_data,
+                    origin,
+                    time_fired,
+                    context,
+                )
+
+            try:
+                self._hass.async_run_hass_job(job, event)
+            except Exception:
+                _LOGGER.exception("Error running job: %s", job)
+
     def listen(
         self,
         event_type: EventType[_DataT] | str,
@@ -1651,6 +1876,123 @@ class EventBus:
                 )
         return self._async_listen_filterable_job(event_type, filterable_job)
 
+    @callback
+    def async_listen_entities(
+        self,
+        event_type: EventType[_DataT] | str,
+        listener: Callable[[Event[_DataT]], Coroutine[Any, Any, None] | None],
+        entity_ids: Iterable[str] | None = None,
+        domains: Iterable[str] | None = None,
+        event_filter: Callable[[_DataT], bool] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type restricted to entities.
+
+        Only event types in ENTITY_KEYED_EVENTS are supported. The listener
+        is called for events where the entity_id matches one of the passed
+        entity_ids or its domain matches one of the passed domains, and
+        event_filter, if passed, returns True.
+
+        Dispatching uses an index keyed by entity_id and domain so the cost
+        of firing an event only depends on the number of matching listeners
+        and not on the number of listeners registered for the event type.
+
+        This method must be run in the event loop.
+        """
+        if event_type not in ENTITY_KEYED_EVENTS:
+            raise HomeAssistantError(
+                f"Event {event_type} does not support entity keyed listeners"
+            )
+        entity_ids = {entity_id.lower() for entity_id in entity_ids or ()}
+        domains = {domain.lower() for domain in domains or ()}
+        if not entity_ids and not domains:
+            raise HomeAssistantError("At least one entity_id or domain is required")
+        filterable_job: _FilterableJobType[_DataT] = (
+            HassJob(listener, f"listen entities {event_type}"),
+            event_filter,
+        )
+        self.async_listen_entities_internal(
+            event_type, entity_ids, domains, filterable_job
+        )
+        return functools.partial(
+            self._async_remove_entities_listener,
+            event_type,
+            entity_ids,
+            domains,
+            filterable_job,
+        )
+
+    @callback
+    def async_listen_entities_internal(
+        self,
+        event_type: EventType[_DataT] | str,
+        entity_ids: Iterable[str],
+        domains: Iterable[str],
+        filterable_job: _FilterableJobType[_DataT],
+    ) -> None:
+        """Add a job to the entity keyed listener index, for internal use only.
+
+        The entity_ids and domains must be lower case. The same job can be
+        added for more keys later on, it counts as a single listener until
+        every addition is removed with async_remove_entities_internal.
+
+        This method is intended to only be used by core internally
+        and should not be considered a stable API. We will make
+        breaking changes to this function in the future and it
+        should not be used in integrations.
+
+        This method must be run in the event loop.
+        """
+        if (keyed_listeners := self._entity_keyed_listeners.get(event_type)) is None:
+            keyed_listeners = _EntityKeyedListeners()
+            self._entity_keyed_listeners[event_type] = keyed_listeners
+        keyed_listeners.async_add(entity_ids, domains, filterable_job)
+
+    @callback
+    def async_remove_entities_internal(
+        self,
+        event_type: EventType[_DataT] | str,
+        entity_ids: Iterable[str],
+        domains: Iterable[str],
+        filterable_job: _FilterableJobType[_DataT],
+    ) -> None:
+        """Remove a job from the entity keyed listener index.
+
+        Raises KeyError or ValueError when the job was not added for the
+        keys.
+
+        This method is intended to only be used by core internally
+        and should not be considered a stable API. We will make
+        breaking changes to this function in the future and it
+        should not be used in integrations.
+
+        This method must be run in the event loop.
+        """
+        keyed_listeners = self._entity_keyed_listeners[event_type]
+        keyed_listeners.async_remove(entity_ids, domains, filterable_job)
+        if not keyed_listeners.count:
+            del self._entity_keyed_listeners[event_type]
+
+    @callback
+    def _async_remove_entities_listener(
+        self,
+        event_type: EventType[_DataT] | str,
+        entity_ids: set[str],
+        domains: set[str],
+        filterable_job: _FilterableJobType[_DataT],
+    ) -> None:
+        """Remove an entity keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            self.async_remove_entities_internal(
+                event_type, entity_ids, domains, filterable_job
+            )
+        except (KeyError, ValueError):
+            _LOGGER.exception(
+                "Unable to remove unknown job listener %s", filterable_job
+            )
+
     @callback
     def _async_listen_filterable_job(
         self,
@@ -1919,10 +2261,21 @@ class State:
             as_dict["context"] = ReadOnlyDict(context)
         return ReadOnlyDict(as_dict)
 
+    @under_cached_property
+    def attributes_json_fragment(self) -> json_fragment:
+        """Return a JSON fragment of the attributes of the State.
+
+        The fragment is shared with the next State of the entity
+        if the attributes do not change.
+        """
+        return json_fragment(json_bytes(self.attributes))
+
     @under_cached_property
     def as_dict_json(self) -> bytes:
         """Return a JSON string of the State."""
-        return json_bytes(self._as_dict)
+        return json_bytes(
+            {**self._as_dict, "attributes": self.attributes_json_fragment}
+        )
 
     @under_cached_property
     def json_fragment(self) -> json_fragment:
@@ -2073,10 +2426,25 @@ class States(UserDict[str, State]):
         return self._domain_index[key].values()
 
 
+# The event type, data, context and time fired of an event deferred
+# by StateMachine.async_batch_writes
+type _DeferredStateEvent = tuple[
+    EventType[Any], Mapping[str, Any], Context | None, float | None
+]
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
-    __slots__ = ("_states", "_states_data", "_reservations", "_bus", "_loop")
+    __slots__ = (
+        "_states",
+        "_states_data",
+        "_reservations",
+        "_bus",
+        "_loop",
+        "_batch",
+        "_interned_attributes",
+    )
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
@@ -2087,6 +2455,12 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        self._batch: list[_DeferredStateEvent] | None = None
+        # Attribute mappings are shared between all states that have the
+        # same attributes, as long as one of those states is alive
+        self._interned_attributes: weakref.WeakValueDictionary[
+            tuple[Any, ...], ReadOnlyDict[str, Any]
+        ] = weakref.WeakValueDictionary()
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
@@ -2204,6 +2578,9 @@ class StateMachine:
             "old_state": old_state,
             "new_state": None,
         }
+        if self._batch is not None:
+            self._batch.append((EVENT_STATE_CHANGED, state_changed_data, context, None))
+            return True
         self._bus.async_fire_internal(
             EVENT_STATE_CHANGED,
             state_changed_data,
@@ -2292,6 +2669,108 @@ class StateMachine:
             timestamp or time.time(),
         )
 
+    @callback
+    def _async_intern_attributes(
+        self, attributes: Mapping[str, Any]
+    ) -> ReadOnlyDict[str, Any]:
+        """Return a shared ReadOnlyDict for the attributes if possible.
+
+        Only mappings with scalar values are interned. The type of each value
+        is part of the key to avoid 1, 1.0 and True being considered the same.
+        """
+        key: list[Any] = []
+        for attr, value in attributes.items():
+            value_type = type(value)
+            if value_type not in _INTERNABLE_ATTRIBUTE_TYPES or (
+                # 0.0 and -0.0 are equal but serialize differently
+                value_type is float and not value
+            ):
+                break
+            key.append((attr, value_type, value))
+        else:
+            interned_key = tuple(key)
+            if (interned := self._interned_attributes.get(interned_key)) is None:
+                interned = (
+                    attributes
+                    if type(attributes) is ReadOnlyDict
+                    else ReadOnlyDict(attributes)
+                )
+                self._interned_attributes[interned_key] = interned
+            return interned
+        if type(attributes) is ReadOnlyDict:
+            return attributes
+        return ReadOnlyDict(attributes)
+
+    @callback
+    def async_attributes_stats(self) -> dict[str, int]:
+        """Return stats about the attribute mappings of the current states.
+
+        This method must be run in the event loop.
+        """
+        return {
+            "states": len(self._states_data),
+            "unique_attributes": len(
+                {id(state.attributes) for state in self._states_data.values()}
+            ),
+            "interned_attributes": len(self._interned_attributes),
+        }
+
+    @contextmanager
+    def async_batch_writes(self) -> Generator[None]:
+        """Defer the events of the state writes in the block until it exits.
+
+        States written inside the block are applied to the state machine
+        immediately, but their state_changed and state_reported events are
+        only fired when the block exits, in the order the writes happened.
+        Listeners of the first write thus already see all the states of the
+        block. Each event is still fired and dispatched on its own.
+
+        Nested blocks join the outermost batch. The block must not await
+        as events would be delayed for other writers as well.
+
+        This method must be run in the event loop.
+        """
+        if self._batch is not None:
+            yield
+            return
+        batch: list[_DeferredStateEvent] = []
+        self._batch = batch
+        try:
+            yield
+        finally:
+            self._batch = None
+            fire = self._bus.async_fire_internal
+            for event_type, event_data, context, time_fired in batch:
+                fire(event_type, event_data, context=context, time_fired=time_fired)
+
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[tuple[str, str, Mapping[str, Any] | None]],
+        force_update: bool = False,
+        context: Context | None = None,
+    ) -> None:
+        """Set the state of multiple entities with the same timestamp.
+
+        states is an iterable of (entity_id, new_state, attributes) tuples.
+        The events are deferred until all states are set, as with
+        async_batch_writes.
+
+        This method must be run in the event loop.
+        """
+        timestamp = time.time()
+        with self.async_batch_writes():
+            for entity_id, new_state, attributes in states:
+                self.async_set_internal(
+                    entity_id.lower(),
+                    str(new_state),
+                    attributes or {},
+                    force_update,
+                    context,
+                    None,
+                    timestamp,
+                )
+
     @callback
     def async_set_internal(
         self,
@@ -2345,19 +2824,26 @@ class StateMachine:
         if context is None:
             context = Context(id=ulid_at_time(timestamp))
 
+        batch = self._batch
         if same_state and same_attr:
             # mypy does not understand this is only possible if old_state is not None
             old_last_reported = old_state.last_reported  # type: ignore[union-attr]
             old_state.last_reported = now  # type: ignore[union-attr]
             old_state._cache["last_reported_timestamp"] = timestamp  # type: ignore[union-attr] # noqa: SLF001
             # Avoid creating an EventStateReportedData
+            state_reported_data = {
+                "entity_id": entity_id,
+                "old_last_reported": old_last_reported,
+                "new_state": old_state,
+            }
+            if batch is not None:
+                batch.append(
+                    (EVENT_STATE_REPORTED, state_reported_data, context, timestamp)
+                )
+                return
             self._bus.async_fire_internal(  # type: ignore[misc]
                 EVENT_STATE_REPORTED,
-                {
-                    "entity_id": entity_id,
-                    "old_last_reported": old_last_reported,
-                    "new_state": old_state,
-                },
+                state_reported_data,
                 context=context,
                 time_fired=timestamp,
             )
@@ -2367,6 +2853,13 @@ class StateMachine:
             if TYPE_CHECKING:
                 assert old_state is not None
             attributes = old_state.attributes
+        else:
+            attributes = attributes or {}
+            # Only intern the attributes of new entities or attributes which
+            # changed shape, attributes whose values change on their own are
+            # rarely shared with other entities and not worth the lookup
+            if old_state is None or old_state.attributes.keys() != attributes.keys():
+                attributes = self._async_intern_attributes(attributes)
 
         # This is intentionally called with positional only arguments for performance
         # reasons
@@ -2384,12 +2877,21 @@ class StateMachine:
         )
         if old_state is not None:
             old_state.expire()
+            if same_attr and (
+                attributes_fragment := old_state._cache.get(  # noqa: SLF001
+                    "attributes_json_fragment"
+                )
+            ):
+                state._cache["attributes_json_fragment"] = attributes_fragment  # noqa: SLF001
         self._states[entity_id] = state
         state_changed_data: EventStateChangedData = {
             "entity_id": entity_id,
             "old_state": old_state,
             "new_state": state,
         }
+        if batch is not None:
+            batch.append((EVENT_STATE_CHANGED, state_changed_data, context, timestamp))
+            return
         self._bus.async_fire_internal(
             EVENT_STATE_CHANGED,
             state_changed_data,
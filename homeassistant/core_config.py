@@ -84,6 +84,7 @@ _LOGGER = logging.getLogger(__name__)
 DATA_CUSTOMIZE: HassKey[EntityValues] = HassKey("hass_customize")
 
 CONF_CREDENTIAL: Final = "credential"
+CONF_EXECUTOR_LANES: Final = "executor_lanes"
 CONF_ICE_SERVERS: Final = "ice_servers"
 CONF_WEBRTC: Final = "webrtc"
 
@@ -300,6 +301,9 @@ CORE_CONFIG_SCHEMA = vol.All(
             vol.Optional(CONF_COUNTRY): cv.country,
             vol.Optional(CONF_LANGUAGE): cv.language,
             vol.Optional(CONF_DEBUG): cv.boolean,
+            vol.Optional(CONF_EXECUTOR_LANES): cv.schema_with_slug_keys(
+                vol.All(vol.Coerce(int), vol.Range(min=1))
+            ),
             vol.Optional(CONF_WEBRTC): vol.Schema(
                 {
                     vol.Required(CONF_ICE_SERVERS): vol.All(
@@ -389,6 +393,9 @@ async def async_process_ha_core_config(hass: HomeAssistant, config: dict) -> Non
     if config.get(CONF_DEBUG):
         hac.debug = True
 
+    if CONF_EXECUTOR_LANES in config:
+        hass.async_set_executor_lane_workers(config[CONF_EXECUTOR_LANES])
+
     if CONF_WEBRTC in config:
         hac.webrtc.ice_servers = [
             RTCIceServer(
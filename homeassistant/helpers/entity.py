@@ -16,7 +16,16 @@ import sys
 import threading
 import time
 from types import FunctionType
-from typing import TYPE_CHECKING, Any, Final, Literal, NotRequired, TypedDict, final
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Final,
+    Literal,
+    NotRequired,
+    Self,
+    TypedDict,
+    final,
+)
 
 from propcache import cached_property
 import voluptuous as vol
@@ -41,6 +50,7 @@ from homeassistant.core import (
     CALLBACK_TYPE,
     Context,
     Event,
+    HassJob,
     HassJobType,
     HomeAssistant,
     ReleaseChannel,
@@ -511,6 +521,10 @@ class Entity(
     __combined_unrecorded_attributes: frozenset[str] = (
         _entity_component_unrecorded_attributes | _unrecorded_attributes
     )
+    # Entity service methods, e.g. async_turn_off, that the entity class
+    # handles for all targeted entities of the class at once with
+    # async_handle_entity_service_batch, set by platforms
+    _entity_service_batch_methods: frozenset[str] = frozenset()
     # Job type cache
     _job_types: dict[str, HassJobType] | None = None
 
@@ -917,6 +931,37 @@ class Entity(
         """
         return self.registry_entry is None or not self.registry_entry.disabled
 
+    @classmethod
+    async def async_handle_entity_service_batch(
+        cls, method: str, entities: list[Self], data: dict[str, Any]
+    ) -> None:
+        """Handle an entity service call for a batch of entities of the class.
+
+        Called instead of the entity service method of each entity when the
+        method is in _entity_service_batch_methods and more than one entity
+        of the class is targeted, e.g. to send a single group command.
+        The states the handler did not write are written in one batch
+        afterwards.
+
+        Calls the entity service method of each entity by default.
+        """
+        hass = entities[0].hass
+        tasks = [
+            task
+            for entity in entities
+            if (
+                task := hass.async_run_hass_job(
+                    HassJob(
+                        ft.partial(getattr(entity, method), **data),
+                        job_type=entity.get_hassjob_type(method),
+                    )
+                )
+            )
+            is not None
+        ]
+        if tasks:
+            await asyncio.gather(*tasks)
+
     @callback
     def async_set_context(self, context: Context) -> None:
         """Set the context the entity currently operates under."""
@@ -4,15 +4,18 @@ from __future__ import annotations
 
 import asyncio
 from collections import defaultdict
-from collections.abc import Callable, Coroutine, Iterable, Mapping, Sequence
+from collections.abc import Callable, Coroutine, Iterable, Iterator, Mapping, Sequence
 import copy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from functools import partial, wraps
+from heapq import heapify, heappop, heappush
+from itertools import count
 import logging
+from operator import itemgetter
 from random import randint
 import time
-from typing import TYPE_CHECKING, Any, Concatenate, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Concatenate, Generic, Literal, TypeVar
 
 from homeassistant.const import (
     EVENT_CORE_CONFIG_UPDATE,
@@ -37,13 +40,16 @@ from homeassistant.core import (
     split_entity_id,
 )
 from homeassistant.exceptions import TemplateError
-from homeassistant.loader import bind_hass
+from homeassistant.loader import bind_hass, integration_domain_from_module
 from homeassistant.util import dt as dt_util
-from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.async_ import (
+    get_scheduled_timer_handles,
+    run_callback_threadsafe,
+)
 from homeassistant.util.event_type import EventType
 from homeassistant.util.hass_dict import HassKey
 
-from . import frame
+from . import frame, template_worker
 from .device_registry import (
     EVENT_DEVICE_REGISTRY_UPDATED,
     EventDeviceRegistryUpdatedData,
@@ -115,6 +121,9 @@ class _KeyedEventTracker(Generic[_TypedDictT]):
         ],
         bool,
     ]
+    # Trackers of state events add their keys to the entity keyed listener
+    # index of the event bus instead of filtering every event of the type
+    index_by: Literal["entity_id", "domain"] | None = None
 
 
 @dataclass(slots=True, frozen=True)
@@ -123,6 +132,13 @@ class _KeyedEventData(Generic[_TypedDictT]):
 
     listener: CALLBACK_TYPE
     callbacks: defaultdict[str, list[HassJob[[Event[_TypedDictT]], Any]]]
+    # The job every key is added to the event bus index with
+    index_job: (
+        tuple[HassJob[[Event[_TypedDictT]], None], Callable[[_TypedDictT], bool] | None]
+        | None
+    ) = None
+    # Removes the listener of MATCH_ALL from the event bus
+    key_listeners: dict[str, CALLBACK_TYPE] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
@@ -172,6 +188,26 @@ class TrackTemplateResult:
     result: Any
 
 
+@dataclass(slots=True)
+class TemplateRenderStats:
+    """Class for the number of renders of a tracked template.
+
+    renders
+        The number of times the template was rendered.
+    render_time
+        The total time in seconds spent rendering the template.
+    last_render_time
+        The time in seconds the last render took.
+    worker_renders
+        The number of renders done in the template worker process.
+    """
+
+    renders: int = 0
+    render_time: float = 0.0
+    last_render_time: float = 0.0
+    worker_renders: int = 0
+
+
 def threaded_listener_factory[**_P](
     async_factory: Callable[Concatenate[HomeAssistant, _P], Any],
 ) -> Callable[Concatenate[HomeAssistant, _P], CALLBACK_TYPE]:
@@ -377,6 +413,7 @@ _KEYED_TRACK_STATE_CHANGE = _KeyedEventTracker(
     event_type=EVENT_STATE_CHANGED,
     dispatcher_callable=_async_dispatch_entity_id_event_soon,
     filter_callable=_async_state_filter,
+    index_by="entity_id",
 )
 
 
@@ -401,6 +438,7 @@ _KEYED_TRACK_STATE_REPORT = _KeyedEventTracker(
     event_type=EVENT_STATE_REPORTED,
     dispatcher_callable=_async_dispatch_entity_id_event,
     filter_callable=_async_state_filter,
+    index_by="entity_id",
 )
 
 
@@ -425,19 +463,76 @@ def _remove_empty_listener() -> None:
     """Remove a listener that does nothing."""
 
 
+@callback
+def _async_add_key(
+    hass: HomeAssistant,
+    tracker: _KeyedEventTracker[_TypedDictT],
+    event_data: _KeyedEventData[_TypedDictT],
+    key: str,
+) -> None:
+    """Add a key to the entity keyed listener index of the event bus."""
+    if TYPE_CHECKING:
+        assert event_data.index_job is not None
+    if tracker.index_by == "entity_id":
+        hass.bus.async_listen_entities_internal(
+            tracker.event_type, (key,), (), event_data.index_job
+        )
+    elif key != MATCH_ALL:
+        hass.bus.async_listen_entities_internal(
+            tracker.event_type, (), (key,), event_data.index_job
+        )
+    else:
+        # The job of the index runs the MATCH_ALL callbacks as well for
+        # the domains it was added for
+        event_data.key_listeners[key] = hass.bus.async_listen(
+            tracker.event_type,
+            partial(
+                tracker.dispatcher_callable, hass, {key: event_data.callbacks[key]}
+            ),
+            event_filter=partial(
+                _async_match_all_filter, event_data.callbacks, event_data.index_job[1]
+            ),
+        )
+
+
+@callback
+def _async_match_all_filter(
+    callbacks: dict[str, list[HassJob[[Event[Any]], Any]]],
+    event_filter: Callable[[Any], bool] | None,
+    event_data: Mapping[str, Any],
+) -> bool:
+    """Filter events of domains which are not tracked in the index."""
+    return split_entity_id(event_data["entity_id"])[0] not in callbacks and (
+        event_filter is None or event_filter(event_data)
+    )
+
+
 @callback
 def _remove_listener(
     hass: HomeAssistant,
     tracker: _KeyedEventTracker[_TypedDictT],
     keys: Iterable[str],
     job: HassJob[[Event[_TypedDictT]], Any],
-    callbacks: dict[str, list[HassJob[[Event[_TypedDictT]], Any]]],
+    event_data: _KeyedEventData[_TypedDictT],
 ) -> None:
     """Remove listener."""
+    callbacks = event_data.callbacks
     for key in keys:
         callbacks[key].remove(job)
         if not callbacks[key]:
             del callbacks[key]
+            if (index_job := event_data.index_job) is None:
+                continue
+            if tracker.index_by == "entity_id":
+                hass.bus.async_remove_entities_internal(
+                    tracker.event_type, (key,), (), index_job
+                )
+            elif key != MATCH_ALL:
+                hass.bus.async_remove_entities_internal(
+                    tracker.event_type, (), (key,), index_job
+                )
+            else:
+                event_data.key_listeners.pop(key)()
 
     if not callbacks:
         hass.data.pop(tracker.key).listener()
@@ -466,15 +561,26 @@ def _async_track_event(
         callbacks = event_data.callbacks
     else:
         callbacks = defaultdict(list)
-        listener = hass.bus.async_listen(
-            tracker.event_type,
-            partial(tracker.dispatcher_callable, hass, callbacks),
-            event_filter=partial(tracker.filter_callable, hass, callbacks),
-        )
-        event_data = _KeyedEventData(listener, callbacks)
+        dispatcher = partial(tracker.dispatcher_callable, hass, callbacks)
+        event_filter = partial(tracker.filter_callable, hass, callbacks)
+        if tracker.index_by is None:
+            listener = hass.bus.async_listen(
+                tracker.event_type, dispatcher, event_filter=event_filter
+            )
+            event_data = _KeyedEventData(listener, callbacks)
+        else:
+            # The keys are added to the index of the event bus as they
+            # are tracked, the index only holds the entity ids with
+            # callbacks so their events do not need to be filtered
+            index_job = (
+                HassJob(dispatcher, f"track {tracker.event_type} event"),
+                None if tracker.index_by == "entity_id" else event_filter,
+            )
+            event_data = _KeyedEventData(_remove_empty_listener, callbacks, index_job)
         hass_data[tracker_key] = event_data
 
     job = HassJob(action, f"track {tracker.event_type} event {keys}", job_type=job_type)
+    indexed = tracker.index_by is not None
 
     if isinstance(keys, str):
         # Almost all calls to this function use a single key
@@ -482,13 +588,17 @@ def _async_track_event(
         # here because this function gets called ~20000 times
         # during startup, and we want to avoid the overhead of
         # creating empty lists and throwing them away.
+        if indexed and keys not in callbacks:
+            _async_add_key(hass, tracker, event_data, keys)
         callbacks[keys].append(job)
         keys = (keys,)
     else:
         for key in keys:
+            if indexed and key not in callbacks:
+                _async_add_key(hass, tracker, event_data, key)
             callbacks[key].append(job)
 
-    return partial(_remove_listener, hass, tracker, keys, job, callbacks)
+    return partial(_remove_listener, hass, tracker, keys, job, event_data)
 
 
 @callback
@@ -657,6 +767,7 @@ _KEYED_TRACK_STATE_ADDED_DOMAIN = _KeyedEventTracker(
     event_type=EVENT_STATE_CHANGED,
     dispatcher_callable=_async_dispatch_domain_event,
     filter_callable=_async_domain_added_filter,
+    index_by="domain",
 )
 
 
@@ -694,6 +805,7 @@ _KEYED_TRACK_STATE_REMOVED_DOMAIN = _KeyedEventTracker(
     event_type=EVENT_STATE_CHANGED,
     dispatcher_callable=_async_dispatch_domain_event,
     filter_callable=_async_domain_removed_filter,
+    index_by="domain",
 )
 
 
@@ -982,6 +1094,8 @@ class TrackTemplateResultInfo:
         track_templates: Sequence[TrackTemplate],
         action: TrackTemplateResultListener,
         has_super_template: bool = False,
+        entity_id: str | None = None,
+        render_in_worker: bool = False,
     ) -> None:
         """Handle removal / refresh of tracker init."""
         self.hass = hass
@@ -989,6 +1103,8 @@ class TrackTemplateResultInfo:
 
         self._track_templates = track_templates
         self._has_super_template = has_super_template
+        self.entity_id = entity_id
+        self._render_in_worker = render_in_worker
 
         self._last_result: dict[Template, bool | str | TemplateError] = {}
 
@@ -1004,9 +1120,16 @@ class TrackTemplateResultInfo:
             track_template_.template.hass = hass
 
         self._rate_limit = KeyedRateLimit(hass)
+        self._scheduler = _async_get_template_render_scheduler(hass)
         self._info: dict[Template, RenderInfo] = {}
+        self._render_stats: dict[Template, TemplateRenderStats] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
+        self._worker_renders: dict[Template, asyncio.Task[None]] = {}
+        # The event of a refresh while the template was rendered in the worker
+        self._worker_pending: dict[Template, Event[EventStateChangedData] | None] = {}
+        self._worker_results: dict[Template, RenderInfo] = {}
+        self._render_in_loop: set[Template] = set()
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -1023,10 +1146,8 @@ class TrackTemplateResultInfo:
 
         # Render the super template first
         if super_template is not None:
-            template = super_template.template
-            variables = super_template.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict, log_fn=log_fn
+            info = self._async_render_in_loop(
+                super_template, strict=strict, log_fn=log_fn
             )
 
             # If the super template did not render to True, don't update other templates
@@ -1044,10 +1165,8 @@ class TrackTemplateResultInfo:
         for track_template_ in self._track_templates:
             if block_render or track_template_ == super_template:
                 continue
-            template = track_template_.template
-            variables = track_template_.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict, log_fn=log_fn
+            info = self._async_render_in_loop(
+                track_template_, strict=strict, log_fn=log_fn
             )
 
             if info.exception:
@@ -1060,8 +1179,15 @@ class TrackTemplateResultInfo:
                 else:
                     log_fn(logging.ERROR, str(info.exception))
 
+        # Only the trackers of entities combine the state changes of a loop
+        # iteration, triggers and conditions must see every state change
+        track_states = _render_infos_to_track_states(self._info.values())
+        if self.entity_id is not None:
+            self._scheduler.async_set_dependencies(self, track_states)
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass,
+            track_states,
+            self._refresh if self.entity_id is None else self._async_schedule_refresh,
         )
         self._update_time_listeners()
         _LOGGER.debug(
@@ -1074,6 +1200,11 @@ class TrackTemplateResultInfo:
             block_render,
         )
 
+    @property
+    def render_stats(self) -> dict[Template, TemplateRenderStats]:
+        """Number of renders and time spent rendering per template."""
+        return self._render_stats
+
     @property
     def listeners(self) -> dict[str, bool | set[str]]:
         """State changes that will cause a re-render."""
@@ -1118,15 +1249,113 @@ class TrackTemplateResultInfo:
         """Cancel the listener."""
         assert self._track_state_changes
         self._track_state_changes.async_remove()
+        self._scheduler.async_cancel(self)
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
+        for task in self._worker_renders.values():
+            task.cancel()
 
     @callback
     def async_refresh(self) -> None:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def _async_schedule_refresh(self, event: Event[EventStateChangedData]) -> None:
+        """Refresh the templates once the state changes have been dispatched."""
+        self._scheduler.async_schedule(self, event)
+
+    @callback
+    def _async_render_in_loop(
+        self,
+        track_template_: TrackTemplate,
+        strict: bool = False,
+        log_fn: Callable[[int, str], None] | None = None,
+    ) -> RenderInfo:
+        """Render a template and keep track of the time spent rendering it."""
+        template = track_template_.template
+        if (stats := self._render_stats.get(template)) is None:
+            stats = self._render_stats[template] = TemplateRenderStats()
+        start = time.perf_counter()
+        self._info[template] = info = template.async_render_to_info(
+            track_template_.variables, strict=strict, log_fn=log_fn
+        )
+        render_time = time.perf_counter() - start
+        stats.renders += 1
+        stats.render_time += render_time
+        stats.last_render_time = render_time
+        return info
+
+    @callback
+    def _async_render_to_info(
+        self,
+        track_template_: TrackTemplate,
+        event: Event[EventStateChangedData] | None,
+    ) -> RenderInfo | None:
+        """Render a template on the event loop or in the template worker.
+
+        Returns None when the template is rendered in the worker, the
+        template is refreshed once the worker is done.
+        """
+        template = track_template_.template
+        if (info := self._worker_results.pop(template, None)) is not None:
+            self._info[template] = info
+            return info
+        if template in self._worker_renders:
+            self._worker_pending[template] = event
+            return None
+        if (
+            self._render_in_worker
+            and template not in self._render_in_loop
+            and (stats := self._render_stats.get(template)) is not None
+            and stats.last_render_time >= template_worker.RENDER_IN_WORKER_THRESHOLD
+            and template_worker.async_can_render_in_worker(template)
+            and template_worker.async_can_send_states(self.hass, self._info[template])
+        ):
+            self._worker_renders[template] = self.hass.async_create_background_task(
+                self._async_render_in_worker(track_template_, event),
+                f"render template in worker {template.template}",
+                eager_start=False,
+            )
+            return None
+        self._render_in_loop.discard(template)
+        return self._async_render_in_loop(track_template_)
+
+    async def _async_render_in_worker(
+        self,
+        track_template_: TrackTemplate,
+        event: Event[EventStateChangedData] | None,
+    ) -> None:
+        """Render a template in the template worker and refresh it."""
+        template = track_template_.template
+        try:
+            rendered = await template_worker.async_get(self.hass).async_render_to_info(
+                template, track_template_.variables, self._info[template]
+            )
+        finally:
+            del self._worker_renders[template]
+        if rendered is None:
+            # The template could not be rendered in the worker, render it
+            # on the event loop this time
+            self._render_in_loop.add(template)
+        else:
+            info, render_time = rendered
+            stats = self._render_stats[template]
+            stats.renders += 1
+            stats.worker_renders += 1
+            stats.render_time += render_time
+            stats.last_render_time = render_time
+            self._worker_results[template] = info
+        self._refresh(event, track_templates=(track_template_,), replayed=True)
+        if template in self._worker_pending:
+            # The states changed while the template was rendered
+            self._refresh(
+                self._worker_pending.pop(template),
+                track_templates=(track_template_,),
+                replayed=True,
+            )
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
@@ -1145,7 +1374,9 @@ class TrackTemplateResultInfo:
         """
         template = track_template_.template
 
-        if event:
+        # A template rendered in the worker is refreshed with the event
+        # which triggered it, it has passed the checks already
+        if event and template not in self._worker_results:
             info = self._info[template]
 
             if not _event_triggers_rerender(event, info):
@@ -1171,12 +1402,11 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
-        )
+        if (render_info := self._async_render_to_info(track_template_, event)) is None:
+            return False
 
         try:
-            result: str | TemplateError = info.result()
+            result: str | TemplateError = render_info.result()
         except TemplateError as ex:
             result = ex
 
@@ -1236,6 +1466,69 @@ class TrackTemplateResultInfo:
         replayed is True if the event is being replayed because the
         rate limit was hit.
         """
+        track_templates = track_templates or self._track_templates
+        self._async_refresh_templates(
+            event,
+            [(track_template_, event) for track_template_ in track_templates],
+            replayed,
+            super_template_triggered=True,
+        )
+
+    @callback
+    def async_refresh_events(self, events: list[Event[EventStateChangedData]]) -> None:
+        """Refresh the templates for the state changes of one loop iteration.
+
+        Each template is re-rendered at most once, for the last of the
+        events which trigger it. Events of entities the template refers
+        to directly are preferred as they are not rate limited. Templates
+        are re-rendered in the order of their events, so the results are
+        passed to the action in the order they would have been without
+        combining the events.
+        """
+        event = events[-1]
+        if len(events) == 1:
+            self._refresh(event)
+            return
+
+        triggers: list[tuple[int, TrackTemplate]] = []
+        for track_template_ in self._track_templates:
+            if (info := self._info.get(track_template_.template)) is None:
+                continue
+            trigger: int | None = None
+            for index in range(len(events) - 1, -1, -1):
+                candidate = events[index]
+                if not _event_triggers_rerender(candidate, info):
+                    continue
+                if candidate.data["entity_id"] in info.entities:
+                    trigger = index
+                    break
+                if trigger is None:
+                    trigger = index
+            if trigger is not None:
+                triggers.append((trigger, track_template_))
+        triggers.sort(key=itemgetter(0))
+
+        template_events = [
+            (track_template_, events[index]) for index, track_template_ in triggers
+        ]
+        self._async_refresh_templates(event, template_events)
+
+    @callback
+    def _async_refresh_templates(
+        self,
+        event: Event[EventStateChangedData] | None,
+        template_events: Sequence[
+            tuple[TrackTemplate, Event[EventStateChangedData] | None]
+        ],
+        replayed: bool | None = False,
+        super_template_triggered: bool = False,
+    ) -> None:
+        """Refresh templates for the event which triggers each of them.
+
+        The event is passed to the action. The super template is always
+        considered when super_template_triggered is True, otherwise only
+        when it is in template_events.
+        """
         updates: list[TrackTemplateResult] = []
         info_changed = False
         now = event.time_fired_timestamp if not replayed and event else time.time()
@@ -1243,11 +1536,19 @@ class TrackTemplateResultInfo:
         block_updates = False
         super_template = self._track_templates[0] if self._has_super_template else None
 
-        track_templates = track_templates or self._track_templates
-
         # Update the super template first
         if super_template is not None:
-            update = self._render_template_if_ready(super_template, now, event)
+            super_event = event
+            for track_template_, template_event in template_events:
+                if track_template_ is super_template:
+                    super_template_triggered = True
+                    super_event = template_event
+                    break
+            update: bool | TrackTemplateResult = False
+            if super_template_triggered:
+                update = self._render_template_if_ready(
+                    super_template, now, super_event
+                )
             info_changed |= self._apply_update(updates, update, super_template.template)
 
             if isinstance(update, TrackTemplateResult):
@@ -1270,31 +1571,36 @@ class TrackTemplateResultInfo:
                 # Super template changed from not True to True, force re-render
                 # of all templates in the group
                 event = None
-                track_templates = self._track_templates
+                template_events = [
+                    (track_template_, None) for track_template_ in self._track_templates
+                ]
 
         # Then update the remaining templates unless blocked by the super template
         if not block_updates:
-            for track_template_ in track_templates:
+            for track_template_, template_event in template_events:
                 if track_template_ == super_template:
                     continue
 
-                update = self._render_template_if_ready(track_template_, now, event)
+                update = self._render_template_if_ready(
+                    track_template_, now, template_event
+                )
                 info_changed |= self._apply_update(
                     updates, update, track_template_.template
                 )
 
         if info_changed:
             assert self._track_state_changes
-            self._track_state_changes.async_update_listeners(
-                _render_infos_to_track_states(
-                    [
-                        _suppress_domain_all_in_render_info(info)
-                        if self._rate_limit.async_has_timer(template)
-                        else info
-                        for template, info in self._info.items()
-                    ]
-                )
+            track_states = _render_infos_to_track_states(
+                [
+                    _suppress_domain_all_in_render_info(info)
+                    if self._rate_limit.async_has_timer(template)
+                    else info
+                    for template, info in self._info.items()
+                ]
             )
+            if self.entity_id is not None:
+                self._scheduler.async_set_dependencies(self, track_states)
+            self._track_state_changes.async_update_listeners(track_states)
             _LOGGER.debug(
                 (
                     "Template group %s listens for %s, re-render blocked by super"
@@ -1342,6 +1648,8 @@ def async_track_template_result(
     strict: bool = False,
     log_fn: Callable[[int, str], None] | None = None,
     has_super_template: bool = False,
+    entity_id: str | None = None,
+    render_in_worker: bool = False,
 ) -> TrackTemplateResultInfo:
     """Add a listener that fires when the result of a template changes.
 
@@ -1373,17 +1681,192 @@ def async_track_template_result(
     has_super_template
         When set to True, the first template will block rendering of other
         templates if it doesn't render as True.
+    entity_id
+        The entity the results are written to. When set, the templates are
+        re-rendered once for the state changes of an event loop iteration
+        instead of for every state change, and templates which depend on
+        the entity are re-rendered after the templates of this entity.
+    render_in_worker
+        When set to True, templates which take long to render are rendered
+        in the template worker process instead of on the event loop.
 
     Returns
     -------
     Info object used to unregister the listener, and refresh the template.
 
     """
-    tracker = TrackTemplateResultInfo(hass, track_templates, action, has_super_template)
+    tracker = TrackTemplateResultInfo(
+        hass, track_templates, action, has_super_template, entity_id, render_in_worker
+    )
     tracker.async_setup(strict=strict, log_fn=log_fn)
     return tracker
 
 
+class _TemplateRenderScheduler:
+    """Refresh tracked templates once per event loop iteration.
+
+    The state changes dispatched in one iteration are collected per
+    tracker and each tracker is refreshed once after they have all been
+    dispatched. Only trackers which write the state of an entity are
+    scheduled. Trackers which write the state of an entity are refreshed
+    before the trackers which depend on that entity, so these render with
+    the new state instead of re-rendering in the next iteration.
+
+    The trackers are indexed by the state changes they listen for to find
+    the trackers depending on an entity without checking every template.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._pending: dict[
+            TrackTemplateResultInfo, list[Event[EventStateChangedData]]
+        ] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._track_states: dict[TrackTemplateResultInfo, TrackStates] = {}
+        self._entity_dependents: defaultdict[str, set[TrackTemplateResultInfo]] = (
+            defaultdict(set)
+        )
+        self._domain_dependents: defaultdict[str, set[TrackTemplateResultInfo]] = (
+            defaultdict(set)
+        )
+        self._all_dependents: set[TrackTemplateResultInfo] = set()
+
+    @callback
+    def async_schedule(
+        self, tracker: TrackTemplateResultInfo, event: Event[EventStateChangedData]
+    ) -> None:
+        """Schedule a refresh of a tracker for a state change."""
+        if (events := self._pending.get(tracker)) is None:
+            self._pending[tracker] = [event]
+        else:
+            events.append(event)
+        if self._task is None:
+            # A task instead of call_soon so async_block_till_done
+            # waits for the refresh
+            self._task = self.hass.async_create_task_internal(
+                self._async_refresh(), "refresh tracked templates", eager_start=False
+            )
+
+    @callback
+    def async_cancel(self, tracker: TrackTemplateResultInfo) -> None:
+        """Cancel the pending refresh of a tracker and forget it."""
+        self._pending.pop(tracker, None)
+        self._async_remove_dependencies(tracker)
+
+    @callback
+    def async_set_dependencies(
+        self, tracker: TrackTemplateResultInfo, track_states: TrackStates
+    ) -> None:
+        """Set the state changes a tracker listens for."""
+        self._async_remove_dependencies(tracker)
+        self._track_states[tracker] = track_states
+        if track_states.all_states:
+            self._all_dependents.add(tracker)
+            return
+        for entity_id in track_states.entities:
+            self._entity_dependents[entity_id].add(tracker)
+        for domain in track_states.domains:
+            self._domain_dependents[domain].add(tracker)
+
+    @callback
+    def _async_remove_dependencies(self, tracker: TrackTemplateResultInfo) -> None:
+        """Remove a tracker from the index of dependents."""
+        if (track_states := self._track_states.pop(tracker, None)) is None:
+            return
+        if track_states.all_states:
+            self._all_dependents.discard(tracker)
+            return
+        for key, index in (
+            (track_states.entities, self._entity_dependents),
+            (track_states.domains, self._domain_dependents),
+        ):
+            for item in key:
+                dependents = index[item]
+                dependents.discard(tracker)
+                if not dependents:
+                    del index[item]
+
+    @callback
+    def _async_dependents(self, entity_id: str) -> Iterator[TrackTemplateResultInfo]:
+        """Return the trackers listening for state changes of an entity."""
+        if dependents := self._entity_dependents.get(entity_id):
+            yield from dependents
+        if dependents := self._domain_dependents.get(split_entity_id(entity_id)[0]):
+            yield from dependents
+        yield from self._all_dependents
+
+    async def _async_refresh(self) -> None:
+        """Refresh the trackers with pending state changes."""
+        self._task = None
+        pending = self._pending
+        for tracker in self._async_ordered(list(pending)):
+            # Trackers are removed when their entity is removed
+            if (events := pending.pop(tracker, None)) is None:
+                continue
+            try:
+                tracker.async_refresh_events(events)
+            except Exception:
+                _LOGGER.exception("Error while refreshing %s", tracker)
+
+    def _async_ordered(
+        self, trackers: list[TrackTemplateResultInfo]
+    ) -> list[TrackTemplateResultInfo]:
+        """Order trackers so the trackers they depend on come first.
+
+        Dependency cycles are broken in the order the trackers were
+        scheduled.
+        """
+        dependencies: dict[TrackTemplateResultInfo, list[TrackTemplateResultInfo]] = {
+            tracker: [] for tracker in trackers
+        }
+        for producer in trackers:
+            if producer.entity_id is None:
+                continue
+            for tracker in self._async_dependents(producer.entity_id):
+                if (
+                    tracker is not producer
+                    and (tracker_dependencies := dependencies.get(tracker)) is not None
+                ):
+                    tracker_dependencies.append(producer)
+
+        ordered: list[TrackTemplateResultInfo] = []
+        visited: set[TrackTemplateResultInfo] = set()
+        for root in trackers:
+            if root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, iter(dependencies[root]))]
+            while stack:
+                tracker, remaining = stack[-1]
+                for dependency in remaining:
+                    if dependency not in visited:
+                        visited.add(dependency)
+                        stack.append((dependency, iter(dependencies[dependency])))
+                        break
+                else:
+                    stack.pop()
+                    ordered.append(tracker)
+        return ordered
+
+
+_TEMPLATE_RENDER_SCHEDULER: HassKey[_TemplateRenderScheduler] = HassKey(
+    "template_render_scheduler"
+)
+
+
+@callback
+def _async_get_template_render_scheduler(
+    hass: HomeAssistant,
+) -> _TemplateRenderScheduler:
+    """Return the template render scheduler of the instance."""
+    if (scheduler := hass.data.get(_TEMPLATE_RENDER_SCHEDULER)) is None:
+        scheduler = hass.data[_TEMPLATE_RENDER_SCHEDULER] = _TemplateRenderScheduler(
+            hass
+        )
+    return scheduler
+
+
 @callback
 @bind_hass
 def async_track_same_state(
@@ -1487,20 +1970,207 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
+class _TimerWheel:
+    """Coalesce point in time timers into buckets of one second.
+
+    Each bucket keeps its timers in a heap and only holds a single
+    loop timer handle for the earliest timer it contains, so the
+    event loop heap has one entry per pending second instead of one
+    per timer. Timers still fire at their exact point in time.
+    """
+
+    __slots__ = ("hass", "buckets", "_sequence")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timer wheel."""
+        self.hass = hass
+        self.buckets: dict[int, _TimerBucket] = {}
+        self._sequence = count()
+
+    @callback
+    def async_add(self, track: _TrackPointUTCTime) -> None:
+        """Add a timer to the bucket of the second it fires in."""
+        second = int(track.expected_fire_timestamp)
+        if (bucket := self.buckets.get(second)) is None:
+            bucket = self.buckets[second] = _TimerBucket(self, second)
+        bucket.async_add(track, next(self._sequence))
+
+
+class _TimerBucket:
+    """Point in time timers that fire within the same second."""
+
+    __slots__ = ("wheel", "second", "timers", "live", "when", "handle")
+
+    def __init__(self, wheel: _TimerWheel, second: int) -> None:
+        """Initialize the bucket."""
+        self.wheel = wheel
+        self.second = second
+        self.timers: list[tuple[float, int, _TrackPointUTCTime]] = []
+        self.live = 0
+        self.when = 0.0
+        self.handle: asyncio.TimerHandle | None = None
+
+    def __repr__(self) -> str:
+        """Return the representation."""
+        return f"<_TimerBucket {self.second} timers={self.async_tracks()}>"
+
+    @callback
+    def async_tracks(self) -> list[_TrackPointUTCTime]:
+        """Return the timers in the bucket that have not been cancelled."""
+        return [track for _, _, track in self.timers if track.bucket is self]
+
+    @callback
+    def async_add(self, track: _TrackPointUTCTime, sequence: int) -> None:
+        """Add a timer to the bucket."""
+        track.bucket = self
+        when = track.expected_fire_timestamp
+        heappush(self.timers, (when, sequence, track))
+        self.live += 1
+        if self.handle is None or when < self.when:
+            self._async_arm(when - time.time())
+
+    @callback
+    def async_remove(self) -> None:
+        """Account for a cancelled timer.
+
+        Cancelled timers are dropped lazily when they reach the
+        top of the heap or when the whole bucket is empty.
+        """
+        self.live -= 1
+        if not self.live:
+            self._async_discard()
+        elif len(self.timers) > 2 * self.live + 64:
+            self.timers = [entry for entry in self.timers if entry[2].bucket is self]
+            heapify(self.timers)
+
+    def _async_arm(self, delay: float) -> None:
+        """Schedule the loop timer for the earliest timer."""
+        if self.handle is not None:
+            self.handle.cancel()
+        self.when = self.timers[0][0]
+        loop = self.wheel.hass.loop
+        self.handle = loop.call_at(loop.time() + delay, self)
+
+    def _async_discard(self) -> None:
+        """Remove the bucket from the wheel."""
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        self.timers.clear()
+        buckets = self.wheel.buckets
+        if buckets.get(self.second) is self:
+            del buckets[self.second]
+
+    @callback
+    def __call__(self) -> None:
+        """Fire the timers that are due.
+
+        Depending on the available clock support (including timer hardware
+        and the OS kernel) it can happen that we fire a little bit too early
+        as measured by utcnow(). That is bad when callbacks have assumptions
+        about the current time. Thus, we rearm the timer for the remaining
+        time.
+        """
+        self.handle = None
+        now = time_tracker_timestamp()
+        timers = self.timers
+        due: list[_TrackPointUTCTime] = []
+        while timers and timers[0][0] <= now:
+            track = heappop(timers)[2]
+            if track.bucket is self:
+                track.bucket = None
+                due.append(track)
+        self.live -= len(due)
+        while timers and timers[0][2].bucket is not self:
+            heappop(timers)
+        if not self.live:
+            self._async_discard()
+        else:
+            if not due:
+                _LOGGER.debug(
+                    "Called %f seconds too early, rearming", timers[0][0] - now
+                )
+            self._async_arm(timers[0][0] - now)
+
+        loop = self.wheel.hass.loop
+        for track in due:
+            # A callback that ran before may have cancelled the timer
+            if track.cancelled:
+                continue
+            try:
+                track()
+            except Exception as exc:  # noqa: BLE001
+                loop.call_exception_handler(
+                    {
+                        "message": f"Exception in callback {track!r}",
+                        "exception": exc,
+                        "handle": self,
+                    }
+                )
+
+
+_TIMER_WHEEL: HassKey[_TimerWheel] = HassKey("timer_wheel")
+
+
+@callback
+def _async_get_timer_wheel(hass: HomeAssistant) -> _TimerWheel:
+    """Return the timer wheel of the instance."""
+    if (wheel := hass.data.get(_TIMER_WHEEL)) is None:
+        wheel = hass.data[_TIMER_WHEEL] = _TimerWheel(hass)
+    return wheel
+
+
+def _integration_from_target(target: Any) -> str:
+    """Return the integration that owns the target of a timer."""
+    while True:
+        while isinstance(target, partial):
+            target = target.func
+        owner = getattr(target, "__self__", target)
+        if isinstance(owner, HassJob):
+            target = owner.target
+        elif isinstance(owner, (_TrackPointUTCTime, _TrackUTCTimeChange)):
+            target = owner.job.target
+        elif isinstance(owner, _TrackTimeInterval):
+            target = owner.action
+        else:
+            break
+    # Methods are attributed to the class of the instance they are bound
+    # to so inherited methods count for the integration subclassing them
+    if owner is not target or not (module := getattr(target, "__module__", None)):
+        module = type(owner).__module__
+    return integration_domain_from_module(module)
+
+
+@callback
+def async_pending_timer_counts(hass: HomeAssistant) -> dict[str, int]:
+    """Return the number of pending timers per integration."""
+    counts: defaultdict[str, int] = defaultdict(int)
+    for handle in get_scheduled_timer_handles(hass.loop):
+        if handle.cancelled():
+            continue
+        target = handle._callback  # type: ignore[attr-defined]  # noqa: SLF001
+        if isinstance(target, _TimerBucket):
+            for track in target.async_tracks():
+                counts[_integration_from_target(track)] += 1
+            continue
+        if (args := handle._args) and isinstance(args[-1], HassJob):  # noqa: SLF001
+            target = args[-1]
+        counts[_integration_from_target(target)] += 1
+    return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+
 @dataclass(slots=True)
 class _TrackPointUTCTime:
     hass: HomeAssistant
     job: HassJob[[datetime], Coroutine[Any, Any, None] | None]
     utc_point_in_time: datetime
     expected_fire_timestamp: float
-    _cancel_callback: asyncio.TimerHandle | None = None
+    bucket: _TimerBucket | None = None
+    cancelled: bool = False
 
     def async_attach(self) -> None:
         """Initialize track job."""
-        loop = self.hass.loop
-        self._cancel_callback = loop.call_at(
-            loop.time() + self.expected_fire_timestamp - time.time(), self
-        )
+        _async_get_timer_wheel(self.hass).async_add(self)
 
     @callback
     def __call__(self) -> None:
@@ -1511,25 +2181,15 @@ class _TrackPointUTCTime:
         debug logging is enabled as we can see the name of the job that is
         being called that is blocking the event loop.
         """
-        # Depending on the available clock support (including timer hardware
-        # and the OS kernel) it can happen that we fire a little bit too early
-        # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        if (delta := (self.expected_fire_timestamp - time_tracker_timestamp())) > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
-            loop = self.hass.loop
-            self._cancel_callback = loop.call_at(loop.time() + delta, self)
-            return
-
         self.hass.async_run_hass_job(self.job, self.utc_point_in_time)
 
     @callback
     def async_cancel(self) -> None:
-        """Cancel the call_at."""
-        if TYPE_CHECKING:
-            assert self._cancel_callback is not None
-        self._cancel_callback.cancel()
+        """Cancel the timer."""
+        self.cancelled = True
+        if (bucket := self.bucket) is not None:
+            self.bucket = None
+            bucket.async_remove()
 
 
 @callback
@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Awaitable, Callable, Coroutine, Iterable
 import dataclasses
+from datetime import datetime
 from enum import Enum
 from functools import cache, partial
 import logging
@@ -59,11 +60,13 @@ from . import (
     entity_registry,
     floor_registry,
     label_registry,
+    target_index,
     template,
     translation,
 )
 from .group import expand_entity_ids
 from .selector import TargetSelector
+from .trace import trace_update_result
 from .typing import ConfigType, TemplateVarsType, VolDictType, VolSchemaType
 
 if TYPE_CHECKING:
@@ -502,7 +505,7 @@ def _has_match(ids: str | list[str] | None) -> TypeGuard[str | list[str]]:
 
 
 @bind_hass
-def async_extract_referenced_entity_ids(  # noqa: C901
+def async_extract_referenced_entity_ids(
     hass: HomeAssistant, service_call: ServiceCall, expand_group: bool = True
 ) -> SelectedEntities:
     """Extract referenced entity IDs from a service call."""
@@ -526,9 +529,9 @@ def async_extract_referenced_entity_ids(  # noqa: C901
     ):
         return selected
 
-    entities = entity_registry.async_get(hass).entities
     dev_reg = device_registry.async_get(hass)
     area_reg = area_registry.async_get(hass)
+    index = target_index.async_get(hass)
 
     if selector.floor_ids:
         floor_reg = floor_registry.async_get(hass)
@@ -550,26 +553,15 @@ def async_extract_referenced_entity_ids(  # noqa: C901
             if label_id not in label_reg.labels:
                 selected.missing_labels.add(label_id)
 
-            for entity_entry in entities.get_entries_for_label(label_id):
-                if (
-                    entity_entry.entity_category is None
-                    and entity_entry.hidden_by is None
-                ):
-                    selected.indirectly_referenced.add(entity_entry.entity_id)
-
-            for device_entry in dev_reg.devices.get_devices_for_label(label_id):
-                selected.referenced_devices.add(device_entry.id)
-
-            for area_entry in area_reg.areas.get_areas_for_label(label_id):
-                selected.referenced_areas.add(area_entry.id)
+            selected.indirectly_referenced.update(
+                index.async_label_target_entities(label_id)
+            )
+            selected.referenced_devices.update(index.async_label_devices(label_id))
+            selected.referenced_areas.update(index.async_label_areas(label_id))
 
     # Find areas for targeted floors
-    if selector.floor_ids:
-        selected.referenced_areas.update(
-            area_entry.id
-            for floor_id in selector.floor_ids
-            for area_entry in area_reg.areas.get_areas_for_floor(floor_id)
-        )
+    for floor_id in selector.floor_ids:
+        selected.referenced_areas.update(index.async_floor_areas(floor_id))
 
     selected.referenced_areas.update(selector.area_ids)
     selected.referenced_devices.update(selector.device_ids)
@@ -578,53 +570,17 @@ def async_extract_referenced_entity_ids(  # noqa: C901
         return selected
 
     # Add indirectly referenced by device
-    selected.indirectly_referenced.update(
-        entry.entity_id
-        for device_id in selected.referenced_devices
-        for entry in entities.get_entries_for_device_id(device_id)
-        # Do not add entities which are hidden or which are config
-        # or diagnostic entities.
-        if (entry.entity_category is None and entry.hidden_by is None)
-    )
-
-    # Find devices for targeted areas
-    referenced_devices_by_area: set[str] = set()
-    if selected.referenced_areas:
-        for area_id in selected.referenced_areas:
-            referenced_devices_by_area.update(
-                device_entry.id
-                for device_entry in dev_reg.devices.get_devices_for_area_id(area_id)
-            )
-    selected.referenced_devices.update(referenced_devices_by_area)
-
-    # Add indirectly referenced by area
-    selected.indirectly_referenced.update(
-        entry.entity_id
-        for area_id in selected.referenced_areas
-        # The entity's area matches a targeted area
-        for entry in entities.get_entries_for_area_id(area_id)
-        # Do not add entities which are hidden or which are config
-        # or diagnostic entities.
-        if entry.entity_category is None and entry.hidden_by is None
-    )
-    # Add indirectly referenced by area through device
-    selected.indirectly_referenced.update(
-        entry.entity_id
-        for device_id in referenced_devices_by_area
-        for entry in entities.get_entries_for_device_id(device_id)
-        # Do not add entities which are hidden or which are config
-        # or diagnostic entities.
-        if (
-            entry.entity_category is None
-            and entry.hidden_by is None
-            and (
-                # The entity's device matches a device referenced
-                # by an area and the entity
-                # has no explicitly set area
-                not entry.area_id
-            )
+    for device_id in selected.referenced_devices:
+        selected.indirectly_referenced.update(
+            index.async_device_target_entities(device_id)
         )
-    )
+
+    # Find devices and add indirectly referenced by targeted areas,
+    # including the entities of devices in the area that have no
+    # explicitly set area
+    for area_id in selected.referenced_areas:
+        selected.referenced_devices.update(index.async_area_devices(area_id))
+        selected.indirectly_referenced.update(index.async_area_target_entities(area_id))
 
     return selected
 
@@ -1001,6 +957,9 @@ async def entity_service_call(
             )
         return None
 
+    loop = hass.loop
+    start = loop.time()
+
     if len(entities) == 1:
         # Single entity case avoids creating task
         entity = entities[0]
@@ -1014,6 +973,8 @@ async def entity_service_call(
             await entity.async_update_ha_state(True)
         return {entity.entity_id: single_response} if return_response else None
 
+    individual, batched = _split_entity_batches(entities, func, return_response)
+
     # Use asyncio.gather here to ensure the returned results
     # are in the same order as the entities list
     results: list[ServiceResponse | BaseException] = await asyncio.gather(
@@ -1021,13 +982,28 @@ async def entity_service_call(
             entity.async_request_call(
                 _handle_entity_call(hass, entity, func, data, call.context)
             )
-            for entity in entities
+            for entity in individual
+        ],
+        *[
+            batch[0].async_request_call(
+                _handle_entity_batch_call(
+                    batch,
+                    func,  # type: ignore[arg-type]
+                    data,  # type: ignore[arg-type]
+                    call.context,
+                )
+            )
+            for batch in batched
         ],
         return_exceptions=True,
     )
+    called = loop.time()
 
     response_data: EntityServiceResponse = {}
-    for entity, result in zip(entities, results, strict=False):
+    for result in results[len(individual) :]:
+        if isinstance(result, BaseException):
+            raise result from None
+    for entity, result in zip(individual, results, strict=False):
         if isinstance(result, BaseException):
             raise result from None
         response_data[entity.entity_id] = result
@@ -1049,9 +1025,75 @@ async def entity_service_call(
         for future in done:
             future.result()  # pop exception if have
 
+    if batched:
+        _trace_entity_service_call(
+            len(entities),
+            len(entities) - len(individual),
+            called - start,
+            loop.time() - called,
+        )
     return response_data if return_response and response_data else None
 
 
+def _split_entity_batches(
+    entities: list[Entity], func: str | HassJob, return_response: bool
+) -> tuple[list[Entity], list[list[Entity]]]:
+    """Split the entities to call individually from the batches per class.
+
+    Entities whose class handles the service method for all its entities
+    at once are called as a batch, unless a response is requested.
+    """
+    if not isinstance(func, str) or return_response:
+        return entities, []
+    batches: dict[type[Entity], list[Entity]] = {}
+    for entity in entities:
+        if func in entity._entity_service_batch_methods:  # noqa: SLF001
+            batches.setdefault(type(entity), []).append(entity)
+    if not (batched := [batch for batch in batches.values() if len(batch) > 1]):
+        return entities, []
+    batched_ids = {id(entity) for batch in batched for entity in batch}
+    return [entity for entity in entities if id(entity) not in batched_ids], batched
+
+
+@callback
+def _trace_entity_service_call(
+    entities: int, batched_entities: int, call_time: float, update_time: float
+) -> None:
+    """Add the timing of an entity service call to the script trace."""
+    trace_update_result(
+        entity_service_call={
+            "entities": entities,
+            "batched_entities": batched_entities,
+            "call_time": call_time,
+            "update_time": update_time,
+        }
+    )
+
+
+async def _handle_entity_batch_call(
+    entities: list[Entity], func: str, data: dict[str, Any], context: Context
+) -> None:
+    """Handle calling service method for a batch of entities of a class.
+
+    The states the batch handler did not write itself are written
+    as a single batch afterwards.
+    """
+    states = entities[0].hass.states
+    last_reported: dict[str, datetime] = {}
+    for entity in entities:
+        entity.async_set_context(context)
+        if state := states.get(entity.entity_id):
+            last_reported[entity.entity_id] = state.last_reported
+    await type(entities[0]).async_handle_entity_service_batch(func, entities, data)
+    with states.async_batch_writes():
+        for entity in entities:
+            if not entity.should_poll and (
+                (state := states.get(entity.entity_id)) is None
+                or state.last_reported is last_reported.get(entity.entity_id)
+            ):
+                entity.async_write_ha_state()
+
+
 async def _handle_entity_call(
     hass: HomeAssistant,
     entity: Entity,
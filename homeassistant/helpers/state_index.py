@@ -0,0 +1,130 @@
+"""Index of the states in the state machine by device class."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from homeassistant.const import ATTR_DEVICE_CLASS, EVENT_STATE_CHANGED
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
+from homeassistant.util.hass_dict import HassKey
+
+from .singleton import singleton
+
+DATA_STATE_INDEX: HassKey[StateIndex] = HassKey("state_index")
+
+
+def _device_class(state: State | None) -> str | None:
+    """Return the device class of a state."""
+    if state is None:
+        return None
+    device_class = state.attributes.get(ATTR_DEVICE_CLASS)
+    return device_class if isinstance(device_class, str) else None
+
+
+@callback
+def _async_device_class_changed_filter(event_data: EventStateChangedData) -> bool:
+    """Filter state changes which do not change the device class."""
+    old_state = event_data["old_state"]
+    new_state = event_data["new_state"]
+    if old_state is None or new_state is None:
+        return True
+    return old_state.attributes is not new_state.attributes and _device_class(
+        old_state
+    ) != _device_class(new_state)
+
+
+class StateIndex:
+    """Keep the entity ids of the states in the state machine by device class.
+
+    The index is built from the state machine when it is first requested
+    and kept up to date from the state changed events.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the state index."""
+        self.hass = hass
+        # Device class -> domain -> entity ids, the entity ids are kept
+        # in a dict to preserve the order in which they were added
+        self._device_classes: dict[str, dict[str, dict[str, None]]] = {}
+        self._entity_device_class: dict[str, str] = {}
+
+    @callback
+    def async_setup(self) -> None:
+        """Index the current states and follow the state changes."""
+        for state in self.hass.states.async_all():
+            if (device_class := _device_class(state)) is not None:
+                self._async_add(state.entity_id, device_class)
+        self.hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            self._async_state_changed,
+            event_filter=_async_device_class_changed_filter,
+        )
+
+    @callback
+    def _async_add(self, entity_id: str, device_class: str) -> None:
+        """Add an entity to the index."""
+        domain = split_entity_id(entity_id)[0]
+        self._device_classes.setdefault(device_class, {}).setdefault(domain, {})[
+            entity_id
+        ] = None
+        self._entity_device_class[entity_id] = device_class
+
+    @callback
+    def _async_remove(self, entity_id: str) -> None:
+        """Remove an entity from the index."""
+        if (device_class := self._entity_device_class.pop(entity_id, None)) is None:
+            return
+        domain = split_entity_id(entity_id)[0]
+        domains = self._device_classes[device_class]
+        del domains[domain][entity_id]
+        if not domains[domain]:
+            del domains[domain]
+            if not domains:
+                del self._device_classes[device_class]
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Update the index when the device class of an entity changes."""
+        entity_id = event.data["entity_id"]
+        self._async_remove(entity_id)
+        if (device_class := _device_class(event.data["new_state"])) is not None:
+            self._async_add(entity_id, device_class)
+
+    @callback
+    def async_device_class_entities(
+        self, device_class: str, domains: Iterable[str] | None = None
+    ) -> list[str]:
+        """Return the ids of the entities with a device class.
+
+        Only the entities of domains are returned when domains is set.
+        """
+        if (by_domain := self._device_classes.get(device_class)) is None:
+            return []
+        if domains is None:
+            return [
+                entity_id
+                for entity_ids in by_domain.values()
+                for entity_id in entity_ids
+            ]
+        return [
+            entity_id
+            for domain in domains
+            if (entity_ids := by_domain.get(domain)) is not None
+            for entity_id in entity_ids
+        ]
+
+
+@callback
+@singleton(DATA_STATE_INDEX)
+def async_get(hass: HomeAssistant) -> StateIndex:
+    """Get the state index."""
+    index = StateIndex(hass)
+    index.async_setup()
+    return index
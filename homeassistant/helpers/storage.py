@@ -25,6 +25,7 @@ from homeassistant.core import (
     DOMAIN as HOMEASSISTANT_DOMAIN,
     CoreState,
     Event,
+    ExecutorLane,
     HomeAssistant,
     callback,
 )
@@ -328,8 +329,8 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
                 return None
         else:
             try:
-                data = await self.hass.async_add_executor_job(
-                    json_util.load_json, self.path
+                data = await self.hass.async_add_lane_executor_job(
+                    ExecutorLane.STORAGE, json_util.load_json, self.path
                 )
             except HomeAssistantError as err:
                 if isinstance(err.__cause__, JSONDecodeError):
@@ -340,8 +341,8 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
                     isotime = dt_util.utcnow().isoformat()
                     corrupt_postfix = f".corrupt.{isotime}"
                     corrupt_path = f"{self.path}{corrupt_postfix}"
-                    await self.hass.async_add_executor_job(
-                        os.rename, self.path, corrupt_path
+                    await self.hass.async_add_lane_executor_job(
+                        ExecutorLane.STORAGE, os.rename, self.path, corrupt_path
                     )
                     storage_key = self.key
                     _LOGGER.error(
@@ -543,7 +544,9 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
     async def _async_write_data(self, path: str, data: dict) -> None:
-        await self.hass.async_add_executor_job(self._write_data, self.path, data)
+        await self.hass.async_add_lane_executor_job(
+            ExecutorLane.STORAGE, self._write_data, self.path, data
+        )
 
     def _write_data(self, path: str, data: dict) -> None:
         """Write the data."""
@@ -572,4 +575,6 @@ class Store[_T: Mapping[str, Any] | Sequence[Any]]:
         self._async_cleanup_final_write_listener()
 
         with suppress(FileNotFoundError):
-            await self.hass.async_add_executor_job(os.unlink, self.path)
+            await self.hass.async_add_lane_executor_job(
+                ExecutorLane.STORAGE, os.unlink, self.path
+            )
@@ -0,0 +1,355 @@
+"""Reverse index to resolve floor, area, device and label targets."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from . import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+    label_registry as lr,
+)
+from .singleton import singleton
+
+DATA_TARGET_INDEX: HassKey[TargetIndex] = HassKey("target_index")
+
+# Entity registry changes which alter the result of a target lookup
+_ENTITY_INDEX_CHANGES = frozenset(
+    {"area_id", "device_id", "disabled_by", "entity_category", "hidden_by", "labels"}
+)
+# Device registry changes which alter the result of a target lookup
+_DEVICE_INDEX_CHANGES = frozenset({"area_id", "labels"})
+
+_AREA = "area"
+_DEVICE = "device"
+_FLOOR = "floor"
+_LABEL = "label"
+
+
+@callback
+def _async_entity_registry_filter(
+    event_data: er.EventEntityRegistryUpdatedData,
+) -> bool:
+    """Filter entity registry updates which do not change the index."""
+    return (
+        event_data["action"] != "update"
+        or "old_entity_id" in event_data
+        or not _ENTITY_INDEX_CHANGES.isdisjoint(event_data["changes"])
+    )
+
+
+@callback
+def _async_device_registry_filter(
+    event_data: dr.EventDeviceRegistryUpdatedData,
+) -> bool:
+    """Filter device registry updates which do not change the index."""
+    return event_data["action"] != "update" or not _DEVICE_INDEX_CHANGES.isdisjoint(
+        event_data["changes"]
+    )
+
+
+class _AreaTargets:
+    """Devices and entities resolved for an area."""
+
+    __slots__ = ("devices", "entities", "target_entities")
+
+    def __init__(
+        self,
+        devices: tuple[str, ...],
+        entities: tuple[str, ...],
+        target_entities: frozenset[str],
+    ) -> None:
+        """Initialize the area targets."""
+        self.devices = devices
+        self.entities = entities
+        self.target_entities = target_entities
+
+
+class _LabelTargets:
+    """Areas, devices and entities resolved for a label."""
+
+    __slots__ = ("areas", "devices", "entities", "target_entities")
+
+    def __init__(
+        self,
+        areas: tuple[str, ...],
+        devices: tuple[str, ...],
+        entities: tuple[str, ...],
+        target_entities: frozenset[str],
+    ) -> None:
+        """Initialize the label targets."""
+        self.areas = areas
+        self.devices = devices
+        self.entities = entities
+        self.target_entities = target_entities
+
+
+def _resolves_to(targets: Any, item_id: str) -> bool:
+    """Return if a cached lookup resolved to an area, device or entity."""
+    if isinstance(targets, _AreaTargets):
+        return item_id in targets.entities or item_id in targets.devices
+    if isinstance(targets, _LabelTargets):
+        return (
+            item_id in targets.entities
+            or item_id in targets.devices
+            or item_id in targets.areas
+        )
+    return item_id in targets
+
+
+def _is_target_entity(entry: er.RegistryEntry) -> bool:
+    """Return if an entity is included when its area, device or label is targeted.
+
+    Hidden entities and config or diagnostic entities are not included.
+    """
+    return entry.entity_category is None and entry.hidden_by is None
+
+
+class TargetIndex:
+    """Cache the resolution of floor, area, device and label targets.
+
+    Lookups are computed from the registry indices the first time they are
+    requested. A registry update drops the lookups which resolved to the
+    updated item before the update and the lookups it belongs to after it.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the target index."""
+        self.hass = hass
+        self._cache: dict[tuple[str, str], Any] = {}
+
+    @callback
+    def async_setup(self) -> None:
+        """Invalidate the affected lookups when the registries change."""
+        hass = self.hass
+        hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED,
+            self._async_entity_registry_updated,
+            event_filter=_async_entity_registry_filter,
+        )
+        hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED,
+            self._async_device_registry_updated,
+            event_filter=_async_device_registry_filter,
+        )
+        hass.bus.async_listen(
+            ar.EVENT_AREA_REGISTRY_UPDATED, self._async_area_registry_updated
+        )
+        hass.bus.async_listen(
+            fr.EVENT_FLOOR_REGISTRY_UPDATED, self._async_floor_registry_updated
+        )
+        hass.bus.async_listen(
+            lr.EVENT_LABEL_REGISTRY_UPDATED, self._async_label_registry_updated
+        )
+
+    @callback
+    def _async_invalidate_resolved(self, item_id: str) -> None:
+        """Drop the cached lookups which resolved to an area, device or entity."""
+        cache = self._cache
+        for key in [
+            key for key, targets in cache.items() if _resolves_to(targets, item_id)
+        ]:
+            del cache[key]
+
+    @callback
+    def _async_entity_registry_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Drop the lookups of an entity before and after the update."""
+        data = event.data
+        entity_id = data["entity_id"]
+        self._async_invalidate_resolved(entity_id)
+        if data["action"] == "update" and "old_entity_id" in data:
+            self._async_invalidate_resolved(data["old_entity_id"])
+        if (entry := er.async_get(self.hass).async_get(entity_id)) is None:
+            return
+        cache = self._cache
+        if device_id := entry.device_id:
+            cache.pop((_DEVICE, device_id), None)
+        if area_id := entry.area_id:
+            cache.pop((_AREA, area_id), None)
+        elif device_id and (device := dr.async_get(self.hass).async_get(device_id)):
+            # The entity inherits the area of its device
+            if device.area_id:
+                cache.pop((_AREA, device.area_id), None)
+        for label_id in entry.labels:
+            cache.pop((_LABEL, label_id), None)
+
+    @callback
+    def _async_device_registry_updated(
+        self, event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Drop the lookups of a device before and after the update."""
+        device_id = event.data["device_id"]
+        self._async_invalidate_resolved(device_id)
+        cache = self._cache
+        cache.pop((_DEVICE, device_id), None)
+        if (device := dr.async_get(self.hass).async_get(device_id)) is None:
+            return
+        if device.area_id:
+            cache.pop((_AREA, device.area_id), None)
+        for label_id in device.labels:
+            cache.pop((_LABEL, label_id), None)
+
+    @callback
+    def _async_area_registry_updated(
+        self, event: Event[ar.EventAreaRegistryUpdatedData]
+    ) -> None:
+        """Drop the lookups of an area before and after the update."""
+        area_id = event.data["area_id"]
+        self._async_invalidate_resolved(area_id)
+        cache = self._cache
+        cache.pop((_AREA, area_id), None)
+        if (area := ar.async_get(self.hass).async_get_area(area_id)) is None:
+            return
+        if area.floor_id:
+            cache.pop((_FLOOR, area.floor_id), None)
+        for label_id in area.labels:
+            cache.pop((_LABEL, label_id), None)
+
+    @callback
+    def _async_floor_registry_updated(
+        self, event: Event[fr.EventFloorRegistryUpdatedData]
+    ) -> None:
+        """Drop the lookup of a floor."""
+        self._cache.pop((_FLOOR, event.data["floor_id"]), None)
+
+    @callback
+    def _async_label_registry_updated(
+        self, event: Event[lr.EventLabelRegistryUpdatedData]
+    ) -> None:
+        """Drop the lookup of a label."""
+        self._cache.pop((_LABEL, event.data["label_id"]), None)
+
+    @callback
+    def async_floor_areas(self, floor_id: str) -> tuple[str, ...]:
+        """Return the ids of the areas on a floor."""
+        key = (_FLOOR, floor_id)
+        if (areas := self._cache.get(key)) is None:
+            areas = self._cache[key] = tuple(
+                area.id
+                for area in ar.async_get(self.hass).areas.get_areas_for_floor(floor_id)
+            )
+        return areas
+
+    @callback
+    def _async_area(self, area_id: str) -> _AreaTargets:
+        """Return the devices and entities of an area."""
+        key = (_AREA, area_id)
+        if (targets := self._cache.get(key)) is not None:
+            return targets  # type: ignore[no-any-return]
+        entities = er.async_get(self.hass).entities
+        devices = tuple(
+            device.id
+            for device in dr.async_get(self.hass).devices.get_devices_for_area_id(
+                area_id
+            )
+        )
+        entity_entries = entities.get_entries_for_area_id(area_id)
+        # Entities of a device in the area without an area of their
+        # own inherit the area from the device
+        entity_entries.extend(
+            entry
+            for device_id in devices
+            for entry in entities.get_entries_for_device_id(device_id)
+            if entry.area_id is None
+        )
+        targets = self._cache[key] = _AreaTargets(
+            devices,
+            tuple(entry.entity_id for entry in entity_entries),
+            frozenset(
+                entry.entity_id for entry in entity_entries if _is_target_entity(entry)
+            ),
+        )
+        return targets
+
+    @callback
+    def async_area_devices(self, area_id: str) -> tuple[str, ...]:
+        """Return the ids of the devices in an area."""
+        return self._async_area(area_id).devices
+
+    @callback
+    def async_area_entities(self, area_id: str) -> tuple[str, ...]:
+        """Return the ids of the entities in an area.
+
+        This includes the enabled entities of the devices in the area
+        which are not assigned to an area themselves.
+        """
+        return self._async_area(area_id).entities
+
+    @callback
+    def async_area_target_entities(self, area_id: str) -> frozenset[str]:
+        """Return the ids of the entities targeted by an area."""
+        return self._async_area(area_id).target_entities
+
+    @callback
+    def async_device_target_entities(self, device_id: str) -> frozenset[str]:
+        """Return the ids of the entities targeted by a device."""
+        key = (_DEVICE, device_id)
+        if (entity_ids := self._cache.get(key)) is None:
+            entity_ids = self._cache[key] = frozenset(
+                entry.entity_id
+                for entry in er.async_get(self.hass).entities.get_entries_for_device_id(
+                    device_id
+                )
+                if _is_target_entity(entry)
+            )
+        return entity_ids
+
+    @callback
+    def _async_label(self, label_id: str) -> _LabelTargets:
+        """Return the areas, devices and entities with a label."""
+        key = (_LABEL, label_id)
+        if (targets := self._cache.get(key)) is not None:
+            return targets  # type: ignore[no-any-return]
+        hass = self.hass
+        entity_entries = er.async_get(hass).entities.get_entries_for_label(label_id)
+        targets = self._cache[key] = _LabelTargets(
+            tuple(
+                area.id
+                for area in ar.async_get(hass).areas.get_areas_for_label(label_id)
+            ),
+            tuple(
+                device.id
+                for device in dr.async_get(hass).devices.get_devices_for_label(label_id)
+            ),
+            tuple(entry.entity_id for entry in entity_entries),
+            frozenset(
+                entry.entity_id for entry in entity_entries if _is_target_entity(entry)
+            ),
+        )
+        return targets
+
+    @callback
+    def async_label_areas(self, label_id: str) -> tuple[str, ...]:
+        """Return the ids of the areas with a label."""
+        return self._async_label(label_id).areas
+
+    @callback
+    def async_label_devices(self, label_id: str) -> tuple[str, ...]:
+        """Return the ids of the devices with a label."""
+        return self._async_label(label_id).devices
+
+    @callback
+    def async_label_entities(self, label_id: str) -> tuple[str, ...]:
+        """Return the ids of the entities with a label."""
+        return self._async_label(label_id).entities
+
+    @callback
+    def async_label_target_entities(self, label_id: str) -> frozenset[str]:
+        """Return the ids of the entities targeted by a label."""
+        return self._async_label(label_id).target_entities
+
+
+@callback
+@singleton(DATA_TARGET_INDEX)
+def async_get(hass: HomeAssistant) -> TargetIndex:
+    """Get the target index."""
+    index = TargetIndex(hass)
+    index.async_setup()
+    return index
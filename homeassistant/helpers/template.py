@@ -12,10 +12,13 @@ from contextvars import ContextVar
 from copy import deepcopy
 from datetime import date, datetime, time, timedelta
 from functools import cache, lru_cache, partial, wraps
+import hashlib
 import json
 import logging
+import marshal
 import math
 from operator import contains
+import os
 import pathlib
 import random
 import re
@@ -30,6 +33,7 @@ import weakref
 from awesomeversion import AwesomeVersion
 import jinja2
 from jinja2 import pass_context, pass_environment, pass_eval_context
+from jinja2.bccache import bc_magic
 from jinja2.runtime import AsyncLoopContext, LoopContext
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
@@ -39,19 +43,23 @@ from propcache import under_cached_property
 import voluptuous as vol
 
 from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
     ATTR_ENTITY_ID,
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_PERSONS,
     ATTR_UNIT_OF_MEASUREMENT,
-    EVENT_HOMEASSISTANT_START,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__ as ha_version,
 )
 from homeassistant.core import (
     Context,
+    Event,
     HomeAssistant,
     ServiceResponse,
     State,
@@ -69,6 +77,7 @@ from homeassistant.util import (
     slugify as slugify_util,
 )
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.file import WriteError, write_utf8_file
 from homeassistant.util.hass_dict import HassKey
 from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
 from homeassistant.util.read_only_dict import ReadOnlyDict
@@ -82,9 +91,12 @@ from . import (
     issue_registry,
     label_registry,
     location as loc_helper,
+    state_index,
+    target_index,
 )
 from .deprecation import deprecated_function
 from .singleton import singleton
+from .storage import STORAGE_DIR
 from .translation import async_translate_state
 from .typing import TemplateVarsType
 
@@ -102,6 +114,11 @@ _ENVIRONMENT_STRICT: HassKey[TemplateEnvironment] = HassKey(
     "template.environment_strict"
 )
 _HASS_LOADER = "template.hass_loader"
+_BYTECODE_CACHE: HassKey[TemplateBytecodeCache] = HassKey("template.bytecode_cache")
+
+BYTECODE_CACHE_FILE = "template.bytecode"
+# Maximum number of compiled templates kept in the bytecode cache
+BYTECODE_CACHE_SIZE = 4096
 
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -135,29 +152,24 @@ template_cv: ContextVar[tuple[str, str] | None] = ContextVar(
 )
 
 #
-# CACHED_TEMPLATE_STATES is a rough estimate of the number of entities
-# on a typical system. It is used as the initial size of the LRU cache
-# for TemplateState objects.
-#
-# If the cache is too small we will end up creating and destroying
-# TemplateState objects too often which will cause a lot of GC activity
-# and slow down the system. For systems with a lot of entities and
-# templates, this can reach 100000s of object creations and destructions
+# TemplateState objects are cached per entity_id and reused as long as
+# the entity keeps the same State object. Creating and destroying them
+# on every render causes a lot of GC activity and slows down the system;
+# for systems with a lot of entities and templates iterating over
+# states, this can reach 100000s of object creations and destructions
 # per minute.
 #
-# Since entity counts may grow over time, we will increase
-# the size if the number of entities grows via _async_adjust_lru_sizes
-# at the start of the system and every 10 minutes if needed.
+# Since there is at most one cached TemplateState per entity the caches
+# grow with the number of entities. Entities which were removed are
+# pruned via _async_prune_template_states every 10 minutes.
 #
-CACHED_TEMPLATE_STATES = 512
 EVAL_CACHE_SIZE = 512
 
 MAX_CUSTOM_TEMPLATE_SIZE = 5 * 1024 * 1024
 MAX_TEMPLATE_OUTPUT = 256 * 1024  # 256KiB
 
-CACHED_TEMPLATE_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
-CACHED_TEMPLATE_NO_COLLECT_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
-ENTITY_COUNT_GROWTH_FACTOR = 1.2
+CACHED_TEMPLATE_STATES: dict[str, TemplateState] = {}
+CACHED_TEMPLATE_NO_COLLECT_STATES: dict[str, TemplateState] = {}
 
 ORJSON_PASSTHROUGH_OPTIONS = (
     orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
@@ -166,46 +178,60 @@ ORJSON_PASSTHROUGH_OPTIONS = (
 
 def _template_state_no_collect(hass: HomeAssistant, state: State) -> TemplateState:
     """Return a TemplateState for a state without collecting."""
-    if template_state := CACHED_TEMPLATE_NO_COLLECT_LRU.get(state):
+    entity_id = state.entity_id
+    if (
+        template_state := CACHED_TEMPLATE_NO_COLLECT_STATES.get(entity_id)
+    ) is not None and template_state._state is state:  # noqa: SLF001
         return template_state
     template_state = _create_template_state_no_collect(hass, state)
-    CACHED_TEMPLATE_NO_COLLECT_LRU[state] = template_state
+    CACHED_TEMPLATE_NO_COLLECT_STATES[entity_id] = template_state
     return template_state
 
 
 def _template_state(hass: HomeAssistant, state: State) -> TemplateState:
     """Return a TemplateState for a state that collects."""
-    if template_state := CACHED_TEMPLATE_LRU.get(state):
+    entity_id = state.entity_id
+    if (
+        template_state := CACHED_TEMPLATE_STATES.get(entity_id)
+    ) is not None and template_state._state is state:  # noqa: SLF001
         return template_state
     template_state = TemplateState(hass, state)
-    CACHED_TEMPLATE_LRU[state] = template_state
+    CACHED_TEMPLATE_STATES[entity_id] = template_state
     return template_state
 
 
 def async_setup(hass: HomeAssistant) -> bool:
-    """Set up tracking the template LRUs."""
+    """Set up pruning the cached template states."""
 
     @callback
-    def _async_adjust_lru_sizes(_: Any) -> None:
-        """Adjust the lru cache sizes."""
-        new_size = int(
-            round(hass.states.async_entity_ids_count() * ENTITY_COUNT_GROWTH_FACTOR)
-        )
-        for lru in (CACHED_TEMPLATE_LRU, CACHED_TEMPLATE_NO_COLLECT_LRU):
-            # There is no typing for LRU
-            current_size = lru.get_size()
-            if new_size > current_size:
-                lru.set_size(new_size)
+    def _async_prune_template_states(_: Any, stopping: bool = False) -> None:
+        """Prune the cached template states of entities which were removed."""
+        current_states = hass.states._states  # noqa: SLF001
+        for cached_states in (
+            CACHED_TEMPLATE_STATES,
+            CACHED_TEMPLATE_NO_COLLECT_STATES,
+        ):
+            for entity_id, template_state in list(cached_states.items()):
+                if template_state._hass is hass and (  # noqa: SLF001
+                    stopping or entity_id not in current_states
+                ):
+                    del cached_states[entity_id]
 
     from .event import (  # pylint: disable=import-outside-toplevel
         async_track_time_interval,
     )
 
     cancel = async_track_time_interval(
-        hass, _async_adjust_lru_sizes, timedelta(minutes=10)
+        hass, _async_prune_template_states, timedelta(minutes=10)
     )
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, _async_adjust_lru_sizes)
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, callback(lambda _: cancel()))
+
+    @callback
+    def _async_stop(event: Event) -> None:
+        """Stop pruning and drop the cached template states."""
+        cancel()
+        _async_prune_template_states(event, stopping=True)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
     return True
 
 
@@ -1201,9 +1227,9 @@ def _state_generator(
 ) -> Generator[TemplateState]:
     """State generator for a domain or all states."""
     states = hass.states
-    # If domain is None, we want to iterate over all states, but making
-    # a copy of the dict is expensive. So we iterate over the protected
-    # _states dict instead. This is safe because we're not modifying it
+    # Making a copy of all states or of the states of a domain is
+    # expensive. So we iterate over the protected _states dict or its
+    # domain index instead. This is safe because we're not modifying it
     # and everything is happening in the same thread (MainThread).
     #
     # We do not want to expose this method in the public API though to
@@ -1213,7 +1239,7 @@ def _state_generator(
     if domain is None:
         container = states._states.values()  # noqa: SLF001
     else:
-        container = states.async_all(domain)
+        container = states._states.domain_states(domain.lower())  # noqa: SLF001
     for state in container:
         yield _template_state_no_collect(hass, state)
 
@@ -1508,9 +1534,7 @@ def floor_areas(hass: HomeAssistant, floor_id_or_name: str) -> Iterable[str]:
     if _floor_id is None:
         return []
 
-    area_reg = area_registry.async_get(hass)
-    entries = area_registry.async_entries_for_floor(area_reg, _floor_id)
-    return [entry.id for entry in entries if entry.id]
+    return list(target_index.async_get(hass).async_floor_areas(_floor_id))
 
 
 def areas(hass: HomeAssistant) -> Iterable[str | None]:
@@ -1602,23 +1626,9 @@ def area_entities(hass: HomeAssistant, area_id_or_name: str) -> Iterable[str]:
         _area_id = area_id_or_name
     if _area_id is None:
         return []
-    ent_reg = entity_registry.async_get(hass)
-    entity_ids = [
-        entry.entity_id
-        for entry in entity_registry.async_entries_for_area(ent_reg, _area_id)
-    ]
-    dev_reg = device_registry.async_get(hass)
-    # We also need to add entities tied to a device in the area that don't themselves
+    # This includes entities tied to a device in the area that don't themselves
     # have an area specified since they inherit the area from the device.
-    entity_ids.extend(
-        [
-            entity.entity_id
-            for device in device_registry.async_entries_for_area(dev_reg, _area_id)
-            for entity in entity_registry.async_entries_for_device(ent_reg, device.id)
-            if entity.area_id is None
-        ]
-    )
-    return entity_ids
+    return list(target_index.async_get(hass).async_area_entities(_area_id))
 
 
 def area_devices(hass: HomeAssistant, area_id_or_name: str) -> Iterable[str]:
@@ -1632,9 +1642,7 @@ def area_devices(hass: HomeAssistant, area_id_or_name: str) -> Iterable[str]:
         _area_id = area_id(hass, area_id_or_name)
     if _area_id is None:
         return []
-    dev_reg = device_registry.async_get(hass)
-    entries = device_registry.async_entries_for_area(dev_reg, _area_id)
-    return [entry.id for entry in entries]
+    return list(target_index.async_get(hass).async_area_devices(_area_id))
 
 
 def labels(hass: HomeAssistant, lookup_value: Any = None) -> Iterable[str | None]:
@@ -1700,27 +1708,21 @@ def label_areas(hass: HomeAssistant, label_id_or_name: str) -> Iterable[str]:
     """Return areas for a given label ID or name."""
     if (_label_id := _label_id_or_name(hass, label_id_or_name)) is None:
         return []
-    area_reg = area_registry.async_get(hass)
-    entries = area_registry.async_entries_for_label(area_reg, _label_id)
-    return [entry.id for entry in entries]
+    return list(target_index.async_get(hass).async_label_areas(_label_id))
 
 
 def label_devices(hass: HomeAssistant, label_id_or_name: str) -> Iterable[str]:
     """Return device IDs for a given label ID or name."""
     if (_label_id := _label_id_or_name(hass, label_id_or_name)) is None:
         return []
-    dev_reg = device_registry.async_get(hass)
-    entries = device_registry.async_entries_for_label(dev_reg, _label_id)
-    return [entry.id for entry in entries]
+    return list(target_index.async_get(hass).async_label_devices(_label_id))
 
 
 def label_entities(hass: HomeAssistant, label_id_or_name: str) -> Iterable[str]:
     """Return entities for a given label ID or name."""
     if (_label_id := _label_id_or_name(hass, label_id_or_name)) is None:
         return []
-    ent_reg = entity_registry.async_get(hass)
-    entries = entity_registry.async_entries_for_label(ent_reg, _label_id)
-    return [entry.entity_id for entry in entries]
+    return list(target_index.async_get(hass).async_label_entities(_label_id))
 
 
 def closest(hass, *args):
@@ -1887,6 +1889,206 @@ def has_value(hass: HomeAssistant, entity_id: str) -> bool:
     )
 
 
+def _matching_states(
+    hass: HomeAssistant,
+    domain: str | Iterable[str] | None,
+    device_class: str | None,
+    area: str | None,
+    label: str | None,
+) -> Generator[State]:
+    """Return the states matching the filters.
+
+    States are looked up in the registries when an area or label is
+    given, in the state index when a device class is given and in the
+    domain index of the state machine otherwise. Only the entities that
+    can match are collected, along with the lifecycle of the domains to
+    pick up entities which are added or removed. Like area_entities and
+    label_entities, changes to the registries are not collected.
+    """
+    domains: frozenset[str] | None = None
+    if domain is not None:
+        domains = frozenset((domain,) if isinstance(domain, str) else domain)
+    render_info = _render_info.get()
+    if render_info is not None and area is None and label is None:
+        if domains is None:
+            render_info.all_states_lifecycle = True
+        else:
+            render_info.domains_lifecycle.update(domains)  # type: ignore[attr-defined]
+
+    states = hass.states
+    entity_ids: Iterable[str]
+    if area is not None:
+        entity_ids = area_entities(hass, area)
+        if label is not None:
+            label_entity_ids = set(label_entities(hass, label))
+            entity_ids = [
+                entity_id for entity_id in entity_ids if entity_id in label_entity_ids
+            ]
+    elif label is not None:
+        entity_ids = label_entities(hass, label)
+    elif device_class is not None:
+        entity_ids = state_index.async_get(hass).async_device_class_entities(
+            device_class, domains
+        )
+    else:
+        # Every state of the domains or of the state machine matches,
+        # so the domains are collected instead of each entity
+        if render_info is not None:
+            if domains is None:
+                render_info.all_states = True
+            else:
+                render_info.domains.update(domains)  # type: ignore[attr-defined]
+        if domains is None:
+            yield from states._states.values()  # noqa: SLF001
+            return
+        for domain_ in domains:
+            yield from states._states.domain_states(domain_)  # noqa: SLF001
+        return
+
+    if domains is not None and (area is not None or label is not None):
+        entity_ids = [
+            entity_id
+            for entity_id in entity_ids
+            if split_entity_id(entity_id)[0] in domains
+        ]
+    if render_info is not None:
+        render_info.entities.update(entity_ids)  # type: ignore[attr-defined]
+    for entity_id in entity_ids:
+        if (state_obj := states.get(entity_id)) is not None and (
+            device_class is None
+            or state_obj.attributes.get(ATTR_DEVICE_CLASS) == device_class
+        ):
+            yield state_obj
+
+
+def _matching_values(
+    hass: HomeAssistant,
+    domain: str | Iterable[str] | None,
+    device_class: str | None,
+    area: str | None,
+    label: str | None,
+    state: str | None,
+    attribute: str | None,
+) -> list[float]:
+    """Return the numeric states or attributes of the matching states."""
+    values: list[float] = []
+    for state_obj in _matching_states(hass, domain, device_class, area, label):
+        if state is not None and state_obj.state != state:
+            continue
+        value: Any = (
+            state_obj.state
+            if attribute is None
+            else state_obj.attributes.get(attribute)
+        )
+        try:
+            values.append(float(value))
+        except (ValueError, TypeError):
+            continue
+    return values
+
+
+def states_count(
+    hass: HomeAssistant,
+    domain: str | Iterable[str] | None = None,
+    device_class: str | None = None,
+    area: str | None = None,
+    label: str | None = None,
+    state: str | None = None,
+) -> int:
+    """Count the states matching the filters."""
+    return sum(
+        1
+        for state_obj in _matching_states(hass, domain, device_class, area, label)
+        if state is None or state_obj.state == state
+    )
+
+
+def states_sum(
+    hass: HomeAssistant,
+    domain: str | Iterable[str] | None = None,
+    device_class: str | None = None,
+    area: str | None = None,
+    label: str | None = None,
+    state: str | None = None,
+    attribute: str | None = None,
+) -> float:
+    """Sum the numeric states or attributes matching the filters."""
+    return math.fsum(
+        _matching_values(hass, domain, device_class, area, label, state, attribute)
+    )
+
+
+def _aggregate_values(
+    function: str,
+    aggregate: Callable[[list[float]], float],
+    values: list[float],
+    default: Any,
+) -> Any:
+    """Aggregate values or return the default when there are none."""
+    if values:
+        return aggregate(values)
+    if default is _SENTINEL:
+        raise_no_default(function, "no numeric states")
+    return default
+
+
+def states_average(
+    hass: HomeAssistant,
+    domain: str | Iterable[str] | None = None,
+    device_class: str | None = None,
+    area: str | None = None,
+    label: str | None = None,
+    state: str | None = None,
+    attribute: str | None = None,
+    default: Any = _SENTINEL,
+) -> Any:
+    """Average the numeric states or attributes matching the filters."""
+    return _aggregate_values(
+        "states_average",
+        statistics.fmean,
+        _matching_values(hass, domain, device_class, area, label, state, attribute),
+        default,
+    )
+
+
+def states_min(
+    hass: HomeAssistant,
+    domain: str | Iterable[str] | None = None,
+    device_class: str | None = None,
+    area: str | None = None,
+    label: str | None = None,
+    state: str | None = None,
+    attribute: str | None = None,
+    default: Any = _SENTINEL,
+) -> Any:
+    """Return the lowest of the numeric states or attributes matching the filters."""
+    return _aggregate_values(
+        "states_min",
+        min,
+        _matching_values(hass, domain, device_class, area, label, state, attribute),
+        default,
+    )
+
+
+def states_max(
+    hass: HomeAssistant,
+    domain: str | Iterable[str] | None = None,
+    device_class: str | None = None,
+    area: str | None = None,
+    label: str | None = None,
+    state: str | None = None,
+    attribute: str | None = None,
+    default: Any = _SENTINEL,
+) -> Any:
+    """Return the highest of the numeric states or attributes matching the filters."""
+    return _aggregate_values(
+        "states_max",
+        max,
+        _matching_values(hass, domain, device_class, area, label, state, attribute),
+        default,
+    )
+
+
 def now(hass: HomeAssistant) -> datetime:
     """Record fetching now."""
     if (render_info := _render_info.get()) is not None:
@@ -2806,6 +3008,116 @@ def _load_custom_templates(hass: HomeAssistant) -> dict[str, str]:
     return result
 
 
+class TemplateBytecodeCache:
+    """Cache of compiled templates which is kept on disk between restarts.
+
+    Templates are keyed by a hash of their source. The code does not
+    depend on the environment it is compiled for, so the cache is shared
+    by the normal, limited and strict environments. Only the templates
+    compiled or loaded since the start are written back, templates which
+    are no longer used are dropped. At most BYTECODE_CACHE_SIZE templates
+    are kept, the least recently used are evicted first.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the cache."""
+        self.path = path
+        self._stored: dict[bytes, CodeType] = {}
+        self._codes: LRU[bytes, CodeType] = LRU(BYTECODE_CACHE_SIZE)
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _magic() -> bytes:
+        """Return the header which identifies compatible cache files.
+
+        Home Assistant may change how templates are compiled, so the
+        cache is invalidated when it is upgraded.
+        """
+        return bc_magic + f"{jinja2.__version__}-{ha_version}".encode()
+
+    def get(self, source: str) -> CodeType | None:
+        """Return the code of a template source if it is cached."""
+        key = hashlib.sha256(source.encode()).digest()
+        if (code := self._codes.get(key)) is None:
+            if (code := self._stored.pop(key, None)) is None:
+                self.misses += 1
+                return None
+            self._codes[key] = code
+        self.hits += 1
+        return code
+
+    def set(self, source: str, code: CodeType) -> None:
+        """Add the code of a template source to the cache."""
+        self._codes[hashlib.sha256(source.encode()).digest()] = code
+        self._dirty = True
+
+    def load(self) -> None:
+        """Load the cache from disk.
+
+        This call does blocking I/O.
+        """
+        magic = self._magic()
+        try:
+            with open(self.path, "rb") as file:
+                if file.read(len(magic)) != magic:
+                    _LOGGER.debug("Ignoring incompatible %s", self.path)
+                    return
+                stored = marshal.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, ValueError, TypeError) as err:
+            _LOGGER.warning("Unable to load %s: %s", self.path, err)
+            return
+        if isinstance(stored, dict):
+            self._stored = stored
+
+    def save(self) -> None:
+        """Write the templates used since the start to disk.
+
+        This call does blocking I/O.
+        """
+        if not self._dirty and not self._stored:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            write_utf8_file(
+                self.path,
+                self._magic() + marshal.dumps(dict(self._codes.items())),
+                mode="wb",
+            )
+        except WriteError:
+            return
+        self._stored.clear()
+        self._dirty = False
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the bytecode cache of compiled templates from disk."""
+    bytecode_cache = TemplateBytecodeCache(
+        hass.config.path(STORAGE_DIR, BYTECODE_CACHE_FILE)
+    )
+    await hass.async_add_executor_job(bytecode_cache.load)
+    hass.data[_BYTECODE_CACHE] = bytecode_cache
+
+    @callback
+    def _async_log_stats(_: Event) -> None:
+        """Log how many templates were compiled during startup."""
+        _LOGGER.debug(
+            "Template bytecode cache: %s hits, %s misses",
+            bytecode_cache.hits,
+            bytecode_cache.misses,
+        )
+
+    async def _async_save(_: Event) -> None:
+        """Write the bytecode cache to disk."""
+        await hass.async_add_executor_job(bytecode_cache.save)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_log_stats)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, _async_save)
+
+
 @singleton(_HASS_LOADER)
 def _get_hass_loader(hass: HomeAssistant) -> HassLoader:
     return HassLoader({})
@@ -3068,6 +3380,11 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 "states",
                 "state_translated",
                 "has_value",
+                "states_count",
+                "states_sum",
+                "states_average",
+                "states_min",
+                "states_max",
                 "utcnow",
                 "now",
                 "device_attr",
@@ -3132,6 +3449,11 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         self.globals["has_value"] = hassfunction(has_value)
         self.filters["has_value"] = self.globals["has_value"]
         self.tests["has_value"] = hassfunction(has_value, pass_eval_context)
+        self.globals["states_count"] = hassfunction(states_count)
+        self.globals["states_sum"] = hassfunction(states_sum)
+        self.globals["states_average"] = hassfunction(states_average)
+        self.globals["states_min"] = hassfunction(states_min)
+        self.globals["states_max"] = hassfunction(states_max)
         self.globals["utcnow"] = hassfunction(utcnow)
         self.globals["now"] = hassfunction(now)
         self.globals["relative_time"] = hassfunction(relative_time)
@@ -3207,7 +3529,16 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
-        compiled = super().compile(source)
+        if (
+            self.hass is not None
+            and isinstance(source, str)
+            and (bytecode_cache := self.hass.data.get(_BYTECODE_CACHE)) is not None
+        ):
+            if (compiled := bytecode_cache.get(source)) is None:
+                compiled = super().compile(source)
+                bytecode_cache.set(source, compiled)
+        else:
+            compiled = super().compile(source)
         self.template_cache[source] = compiled
         return compiled
 
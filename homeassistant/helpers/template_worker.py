@@ -0,0 +1,453 @@
+"""Render expensive templates in a worker process."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+import multiprocessing
+import re
+import time
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import (
+    Context,
+    Event,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
+from homeassistant.exceptions import TemplateError
+import homeassistant.util.dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.unit_system import get_unit_system
+
+from .singleton import singleton
+from .template import (
+    RenderInfo,
+    Template,
+    TemplateState,
+    TemplateStateBase,
+    _get_hass_loader,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_TEMPLATE_WORKER: HassKey[TemplateWorker] = HassKey("template_worker")
+
+# Templates taking longer than this to render on the event loop are
+# rendered in the worker process when the tracker opted in
+RENDER_IN_WORKER_THRESHOLD = 0.1
+
+WORKER_PROCESSES = 1
+
+# Templates using more states are rendered on the event loop, copying
+# the states to the worker would take longer than the render
+MAX_WORKER_STATES = 1000
+
+# Functions which need more than the states and the core configuration
+_LOOP_ONLY_FUNCTIONS = (
+    "area_devices",
+    "area_entities",
+    "area_id",
+    "area_name",
+    "areas",
+    "config_entry_attr",
+    "config_entry_id",
+    "device_attr",
+    "device_entities",
+    "device_id",
+    "floor_areas",
+    "floor_id",
+    "floor_name",
+    "floors",
+    "integration_entities",
+    "is_device_attr",
+    "is_hidden_entity",
+    "issue",
+    "issues",
+    "label_areas",
+    "label_devices",
+    "label_entities",
+    "label_id",
+    "label_name",
+    "labels",
+    "state_translated",
+    "states_average",
+    "states_count",
+    "states_max",
+    "states_min",
+    "states_sum",
+)
+_LOOP_ONLY = re.compile(rf"\b(?:{'|'.join(_LOOP_ONLY_FUNCTIONS)})\b")
+
+# A state is sent to the worker as entity_id, state, attributes,
+# last_changed, last_reported and last_updated timestamps and the
+# context id, user_id and parent_id
+type _StateSnapshot = tuple[
+    str, str, dict[str, Any], float, float, float, str, str | None, str | None
+]
+
+
+@dataclass(slots=True, frozen=True)
+class _WorkerConfig:
+    """Core configuration used by the templates in the worker."""
+
+    config_dir: str
+    time_zone: str
+    latitude: float
+    longitude: float
+    elevation: int
+    radius: int
+    location_name: str
+    unit_system: str
+    currency: str
+    country: str | None
+    language: str
+    legacy_templates: bool
+
+
+@dataclass(slots=True, frozen=True)
+class _TemplateStateVariable:
+    """A template state passed as a variable to the worker."""
+
+    state: _StateSnapshot
+    collect: bool
+
+
+@dataclass(slots=True, frozen=True)
+class _WorkerResult:
+    """Result and collected dependencies of a render in the worker."""
+
+    result: Any
+    error: str | None
+    entities: frozenset[str]
+    domains: frozenset[str]
+    domains_lifecycle: frozenset[str]
+    all_states: bool
+    all_states_lifecycle: bool
+    rate_limit: float | None
+    has_time: bool
+    render_time: float
+
+
+def _snapshot_state(state: State) -> _StateSnapshot:
+    """Return a snapshot of a state which can be sent to the worker."""
+    context = state.context
+    return (
+        state.entity_id,
+        state.state,
+        dict(state.attributes),
+        state.last_changed_timestamp,
+        state.last_reported_timestamp,
+        state.last_updated_timestamp,
+        context.id,
+        context.user_id,
+        context.parent_id,
+    )
+
+
+def _restore_state(snapshot: _StateSnapshot) -> State:
+    """Restore a state from a snapshot."""
+    (
+        entity_id,
+        state,
+        attributes,
+        last_changed_ts,
+        last_reported_ts,
+        last_updated_ts,
+        context_id,
+        user_id,
+        parent_id,
+    ) = snapshot
+    return State(
+        entity_id,
+        state,
+        attributes,
+        last_changed=dt_util.utc_from_timestamp(last_changed_ts),
+        last_reported=dt_util.utc_from_timestamp(last_reported_ts),
+        last_updated=dt_util.utc_from_timestamp(last_updated_ts),
+        context=Context(user_id=user_id, parent_id=parent_id, id=context_id),
+        validate_entity_id=False,
+        last_updated_timestamp=last_updated_ts,
+    )
+
+
+def _snapshot_variables(variables: Mapping[str, Any] | None) -> dict[str, Any]:
+    """Replace the states in the variables with snapshots."""
+    if not variables:
+        return {}
+    snapshot: dict[str, Any] = {}
+    for name, value in variables.items():
+        if isinstance(value, TemplateStateBase):
+            value = _TemplateStateVariable(
+                _snapshot_state(value._state),  # noqa: SLF001
+                value._collect,  # noqa: SLF001
+            )
+        elif isinstance(value, State):
+            value = _TemplateStateVariable(_snapshot_state(value), False)
+        snapshot[name] = value
+    return snapshot
+
+
+def _is_covered(info: RenderInfo, result: _WorkerResult) -> bool:
+    """Return if the states sent to the worker cover what the render used."""
+    if result.all_states or result.all_states_lifecycle:
+        return False
+    domains = info.domains | info.domains_lifecycle
+    return result.domains <= domains and all(
+        entity_id in info.entities or split_entity_id(entity_id)[0] in domains
+        for entity_id in result.entities
+    )
+
+
+@callback
+def async_can_render_in_worker(template: Template) -> bool:
+    """Return if a template can be rendered in the worker.
+
+    Templates which use the registries, repairs issues or translations
+    are always rendered on the event loop.
+    """
+    return not template.is_static and _LOOP_ONLY.search(template.template) is None
+
+
+@callback
+def async_can_send_states(hass: HomeAssistant, info: RenderInfo) -> bool:
+    """Return if the states used by a render can be sent to the worker.
+
+    Templates which iterate all states, or more states than
+    MAX_WORKER_STATES, are rendered on the event loop.
+    """
+    if info.all_states or info.all_states_lifecycle:
+        return False
+    return (
+        len(info.entities)
+        + hass.states.async_entity_ids_count(info.domains | info.domains_lifecycle)
+        <= MAX_WORKER_STATES
+    )
+
+
+class TemplateWorker:
+    """Render templates in a worker process.
+
+    The worker renders a template against a snapshot of the states it
+    used when it was last rendered on the event loop. The render is
+    discarded when it needs states which were not sent along.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the template worker."""
+        self.hass = hass
+        self._executor: ProcessPoolExecutor | None = None
+
+    @callback
+    def _async_get_executor(self) -> ProcessPoolExecutor:
+        """Return the process pool, starting it when needed."""
+        if self._executor is not None:
+            return self._executor
+        config = self.hass.config
+        self._executor = ProcessPoolExecutor(
+            WORKER_PROCESSES,
+            # Forking a process with running threads is not safe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                _WorkerConfig(
+                    config.config_dir,
+                    config.time_zone,
+                    config.latitude,
+                    config.longitude,
+                    config.elevation,
+                    config.radius,
+                    config.location_name,
+                    config.units._name,  # noqa: SLF001
+                    config.currency,
+                    config.country,
+                    config.language,
+                    config.legacy_templates,
+                ),
+            ),
+        )
+        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_shutdown)
+        return self._executor
+
+    async def _async_shutdown(self, event: Event) -> None:
+        """Shut down the worker process."""
+        if (executor := self._executor) is None:
+            return
+        self._executor = None
+        await self.hass.async_add_executor_job(
+            lambda: executor.shutdown(cancel_futures=True)
+        )
+
+    @callback
+    def _async_snapshot(self, info: RenderInfo) -> list[_StateSnapshot]:
+        """Return a snapshot of the states used by the last render."""
+        states = self.hass.states
+        snapshot = [
+            _snapshot_state(state)
+            for state in states.async_all(info.domains | info.domains_lifecycle)
+        ]
+        snapshot.extend(
+            _snapshot_state(state)
+            for entity_id in info.entities
+            if (state := states.get(entity_id)) is not None
+        )
+        return snapshot
+
+    async def async_render_to_info(
+        self, template: Template, variables: Mapping[str, Any] | None, info: RenderInfo
+    ) -> tuple[RenderInfo, float] | None:
+        """Render a template in the worker.
+
+        The states used by the last render of the template, info, are sent
+        to the worker. Returns the render info and the time the render took
+        in the worker, or None when the template has to be rendered on the
+        event loop.
+        """
+        hass = self.hass
+        if not async_can_send_states(hass, info):
+            return None
+        try:
+            result: _WorkerResult | None = await hass.loop.run_in_executor(
+                self._async_get_executor(),
+                _render_in_worker,
+                template.template,
+                self._async_snapshot(info),
+                _snapshot_variables(variables),
+                dict(_get_hass_loader(hass).sources),
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001
+            _LOGGER.debug(
+                "Error rendering template in the worker: %s",
+                template.template,
+                exc_info=True,
+            )
+            return None
+        if result is None or not _is_covered(info, result):
+            return None
+
+        render_info = RenderInfo(template)
+        render_info._result = result.result  # noqa: SLF001
+        if result.error is not None:
+            render_info.exception = TemplateError(result.error)
+        render_info.entities = set(result.entities)
+        render_info.domains = set(result.domains)
+        render_info.domains_lifecycle = set(result.domains_lifecycle)
+        render_info.all_states = result.all_states
+        render_info.all_states_lifecycle = result.all_states_lifecycle
+        render_info.rate_limit = result.rate_limit
+        render_info.has_time = result.has_time
+        render_info._freeze()  # noqa: SLF001
+        return render_info, result.render_time
+
+
+@callback
+@singleton(DATA_TEMPLATE_WORKER)
+def async_get(hass: HomeAssistant) -> TemplateWorker:
+    """Get the template worker."""
+    return TemplateWorker(hass)
+
+
+# The code below runs in the worker process
+
+_WORKER_HASS: HomeAssistant | None = None
+
+
+def _init_worker(config: _WorkerConfig) -> None:
+    """Set up the instance the worker renders templates with."""
+    global _WORKER_HASS  # noqa: PLW0603
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    _WORKER_HASS = loop.run_until_complete(_async_create_worker_hass(config))
+
+
+async def _async_create_worker_hass(config: _WorkerConfig) -> HomeAssistant:
+    """Create the instance the worker renders templates with."""
+    hass = HomeAssistant(config.config_dir)
+    hass_config = hass.config
+    await hass_config.async_set_time_zone(config.time_zone)
+    hass_config.latitude = config.latitude
+    hass_config.longitude = config.longitude
+    hass_config.elevation = config.elevation
+    hass_config.radius = config.radius
+    hass_config.location_name = config.location_name
+    hass_config.units = get_unit_system(config.unit_system)
+    hass_config.currency = config.currency
+    hass_config.country = config.country
+    hass_config.language = config.language
+    hass_config.legacy_templates = config.legacy_templates
+    return hass
+
+
+@lru_cache(maxsize=128)
+def _worker_template(source: str) -> Template:
+    """Return the compiled template for a source."""
+    return Template(source, _WORKER_HASS)
+
+
+def _render_in_worker(
+    source: str,
+    states: Iterable[_StateSnapshot],
+    variables: dict[str, Any],
+    sources: dict[str, str],
+) -> _WorkerResult | None:
+    """Render a template in the worker.
+
+    Returns None when the render failed for another reason than an
+    error in the template.
+    """
+    hass = _WORKER_HASS
+    assert hass is not None
+    return hass.loop.run_until_complete(
+        _async_render_in_worker(hass, source, states, variables, sources)
+    )
+
+
+async def _async_render_in_worker(
+    hass: HomeAssistant,
+    source: str,
+    states: Iterable[_StateSnapshot],
+    variables: dict[str, Any],
+    sources: dict[str, str],
+) -> _WorkerResult | None:
+    """Render a template against a snapshot of the states."""
+    container = hass.states._states  # noqa: SLF001
+    container.data.clear()
+    container._domain_index.clear()  # noqa: SLF001
+    for snapshot in states:
+        container[snapshot[0]] = _restore_state(snapshot)
+    _get_hass_loader(hass).sources = sources
+    for name, value in variables.items():
+        if isinstance(value, _TemplateStateVariable):
+            variables[name] = TemplateState(
+                hass, _restore_state(value.state), value.collect
+            )
+
+    template = _worker_template(source)
+    start = time.perf_counter()
+    try:
+        info = template.async_render_to_info(variables)
+    except Exception:
+        _LOGGER.exception("Error rendering template in the worker: %s", source)
+        return None
+    render_time = time.perf_counter() - start
+    return _WorkerResult(
+        info._result,  # noqa: SLF001
+        None if info.exception is None else str(info.exception),
+        frozenset(info.entities),
+        frozenset(info.domains),
+        frozenset(info.domains_lifecycle),
+        info.all_states,
+        info.all_states_lifecycle,
+        info.rate_limit,
+        info.has_time,
+        render_time,
+    )
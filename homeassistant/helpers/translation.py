@@ -16,7 +16,13 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
-from homeassistant.core import Event, HomeAssistant, async_get_hass, callback
+from homeassistant.core import (
+    Event,
+    ExecutorLane,
+    HomeAssistant,
+    async_get_hass,
+    callback,
+)
 from homeassistant.loader import (
     Integration,
     async_get_config_flows,
@@ -112,8 +118,10 @@ async def _async_get_component_strings(
         has_files_to_load |= bool(files_to_load)
 
     if has_files_to_load:
-        loaded_translations_by_language = await hass.async_add_executor_job(
-            _load_translations_files_by_language, files_to_load_by_language
+        loaded_translations_by_language = await hass.async_add_lane_executor_job(
+            ExecutorLane.TRANSLATIONS,
+            _load_translations_files_by_language,
+            files_to_load_by_language,
         )
 
     for language in languages:
@@ -30,7 +30,7 @@ import voluptuous as vol
 
 from . import generated
 from .const import Platform
-from .core import HomeAssistant, callback
+from .core import ExecutorLane, HomeAssistant, callback
 from .generated.application_credentials import APPLICATION_CREDENTIALS
 from .generated.bluetooth import BLUETOOTH
 from .generated.config_flows import FLOWS
@@ -321,7 +321,9 @@ async def async_get_custom_components(
     if comps_or_future is None:
         future = hass.data[DATA_CUSTOM_COMPONENTS] = hass.loop.create_future()
 
-        comps = await hass.async_add_executor_job(_get_custom_components, hass)
+        comps = await hass.async_add_lane_executor_job(
+            ExecutorLane.LOADER, _get_custom_components, hass
+        )
 
         hass.data[DATA_CUSTOM_COMPONENTS] = comps
         future.set_result(comps)
@@ -410,7 +412,9 @@ async def async_get_integration_descriptions(
     base = generated.__path__[0]
     config_flow_path = pathlib.Path(base) / "integrations.json"
 
-    flow = await hass.async_add_executor_job(config_flow_path.read_text)
+    flow = await hass.async_add_lane_executor_job(
+        ExecutorLane.LOADER, config_flow_path.read_text
+    )
     core_flows = cast(dict[str, Any], json_loads(flow))
     custom_integrations = await async_get_custom_components(hass)
     custom_flows: dict[str, Any] = {
@@ -1411,8 +1415,12 @@ async def async_get_integrations(
     if needed:
         from . import components  # pylint: disable=import-outside-toplevel
 
-        integrations = await hass.async_add_executor_job(
-            _resolve_integrations_from_root, hass, components, needed
+        integrations = await hass.async_add_lane_executor_job(
+            ExecutorLane.LOADER,
+            _resolve_integrations_from_root,
+            hass,
+            components,
+            needed,
         )
         for domain, future in needed.items():
             int_or_exc = integrations.get(domain)
@@ -1683,6 +1691,20 @@ def is_component_module_loaded(hass: HomeAssistant, module: str) -> bool:
     return module in hass.data[DATA_COMPONENTS]
 
 
+@ft.lru_cache(maxsize=1024)
+def integration_domain_from_module(module: str) -> str:
+    """Return the domain of the integration a module belongs to.
+
+    Modules which are not part of an integration return their top level package.
+    """
+    parts = module.split(".")
+    if len(parts) > 2 and parts[:2] == ["homeassistant", "components"]:
+        return parts[2]
+    if len(parts) > 1 and parts[0] == PACKAGE_CUSTOM_COMPONENTS:
+        return parts[1]
+    return parts[0]
+
+
 @callback
 def async_get_issue_integration(
     hass: HomeAssistant | None,
@@ -5,42 +5,115 @@ from __future__ import annotations
 import argparse
 import asyncio
 from collections.abc import Callable
-from contextlib import suppress
+from contextlib import asynccontextmanager, suppress
+from datetime import timedelta
 import logging
+import os
+import platform
+from shutil import rmtree
+import socket
+import statistics
+from tempfile import mkdtemp
 from timeit import default_timer as timer
-
-from homeassistant import core
-from homeassistant.const import EVENT_STATE_CHANGED
+import tracemalloc
+from typing import Any
+
+from homeassistant import config as conf_util, core, loader
+from homeassistant.bootstrap import async_load_base_functionality
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_STATE_CHANGED,
+    __version__,
+)
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    label_registry as lr,
+)
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
     async_track_state_change,
     async_track_state_change_event,
 )
-from homeassistant.helpers.json import JSON_DUMP
+from homeassistant.helpers.json import JSON_DUMP, save_json
+from homeassistant.helpers.recorder import async_initialize_recorder
+from homeassistant.helpers.template import Template
+from homeassistant.runner import RuntimeConfig
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import load_json_object
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
 
 BENCHMARKS: dict[str, Callable] = {}
 
+# Relative slowdown of the fastest run before a benchmark
+# is reported as a regression against the baseline
+DEFAULT_THRESHOLD = 0.1
+
 
 def run(args):
     """Handle benchmark commandline script."""
     # Disable logging
     logging.getLogger("homeassistant.core").setLevel(logging.CRITICAL)
 
-    parser = argparse.ArgumentParser(description="Run a Home Assistant benchmark.")
-    parser.add_argument("name", choices=BENCHMARKS)
+    parser = argparse.ArgumentParser(description="Run Home Assistant benchmarks.")
+    parser.add_argument("name", nargs="+", choices=["all", *BENCHMARKS])
     parser.add_argument("--script", choices=["benchmark"])
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=0,
+        help="Number of runs per benchmark, runs until interrupted if not set",
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--baseline", help="Compare the results to a JSON file written by --json"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown reported as a regression",
+    )
 
     args = parser.parse_args()
 
-    bench = BENCHMARKS[args.name]
+    names = list(BENCHMARKS) if "all" in args.name else args.name
     print("Using event loop:", asyncio.get_event_loop_policy().loop_name)
 
-    with suppress(KeyboardInterrupt):
-        while True:
-            asyncio.run(run_benchmark(bench))
+    if not args.runs:
+        if args.json or args.baseline:
+            parser.error("--json and --baseline require --runs")
+        with suppress(KeyboardInterrupt):
+            while True:
+                for name in names:
+                    asyncio.run(run_benchmark(BENCHMARKS[name]))
+        return 0
+
+    runtimes: dict[str, list[float]] = {}
+    for name in names:
+        runtimes[name] = [
+            asyncio.run(run_benchmark(BENCHMARKS[name])) for _ in range(args.runs)
+        ]
+    results = summarize(runtimes)
+
+    if args.json:
+        save_json(args.json, results)
+
+    if not args.baseline:
+        return 0
+
+    regressions = compare_to_baseline(
+        load_json_object(args.baseline)["benchmarks"],
+        results["benchmarks"],
+        args.threshold,
+    )
+    return 1 if regressions else 0
 
 
 async def run_benchmark(bench):
@@ -49,6 +122,48 @@ async def run_benchmark(bench):
     runtime = await bench(hass)
     print(f"Benchmark {bench.__name__} done in {runtime}s")
     await hass.async_stop()
+    return runtime
+
+
+def summarize(runtimes: dict[str, list[float]]) -> dict[str, Any]:
+    """Summarize the runtimes of the benchmarks."""
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "created": dt_util.utcnow().isoformat(),
+        "benchmarks": {
+            name: {
+                "runs": runs,
+                "min": min(runs),
+                "median": statistics.median(runs),
+                "max": max(runs),
+            }
+            for name, runs in runtimes.items()
+        },
+    }
+
+
+def compare_to_baseline(
+    baseline: dict[str, Any], results: dict[str, Any], threshold: float
+) -> list[str]:
+    """Print the change to the baseline and return the regressed benchmarks.
+
+    The fastest run is compared as it is the least affected by noise.
+    """
+    regressions: list[str] = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name}: {result['min']:.4f}s, not in baseline")
+            continue
+        change = result["min"] / baseline[name]["min"] - 1
+        regressed = change > threshold
+        print(
+            f"{name}: {baseline[name]['min']:.4f}s -> {result['min']:.4f}s "
+            f"({change:+.1%}){' REGRESSION' if regressed else ''}"
+        )
+        if regressed:
+            regressions.append(name)
+    return regressions
 
 
 def benchmark[_CallableT: Callable](func: _CallableT) -> _CallableT:
@@ -57,6 +172,25 @@ def benchmark[_CallableT: Callable](func: _CallableT) -> _CallableT:
     return func
 
 
+@asynccontextmanager
+async def _async_temp_config_dir(hass):
+    """Create a temporary config dir and remove it when done."""
+    config_dir = await hass.async_add_executor_job(mkdtemp)
+    try:
+        yield config_dir
+    finally:
+        await hass.async_add_executor_job(rmtree, config_dir)
+
+
+async def _async_setup_base(hass, config_dir):
+    """Load the registries and config entries to set up integrations."""
+    hass.config.config_dir = config_dir
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+
+
 @benchmark
 async def fire_events(hass):
     """Fire a million events."""
@@ -223,6 +357,232 @@ async def state_changed_event_filter_helper(hass):
     return timer() - start
 
 
+async def _dispatch_state_changed(hass, listener_counts, listen):
+    """Measure the per event dispatch cost of state_changed listeners."""
+    events_to_fire = 10**4
+    total = 0.0
+
+    for listener_count in listener_counts:
+        count = 0
+
+        @core.callback
+        def listener(_):
+            """Handle event."""
+            nonlocal count
+            count += 1
+
+        unsubs = [
+            listen(hass, f"sensor.entity_{idx}", listener)
+            for idx in range(listener_count)
+        ]
+        event_data = {
+            "entity_id": "sensor.entity_0",
+            "old_state": core.State("sensor.entity_0", "off"),
+            "new_state": core.State("sensor.entity_0", "on"),
+        }
+
+        start = timer()
+        for _ in range(events_to_fire):
+            hass.bus.async_fire_internal(EVENT_STATE_CHANGED, event_data)
+        await hass.async_block_till_done()
+        runtime = timer() - start
+
+        assert count == events_to_fire
+        for unsub in unsubs:
+            unsub()
+
+        print(
+            f"{listener_count} listeners: "
+            f"{runtime / events_to_fire * 10**6:.3f}µs per event"
+        )
+        total += runtime
+
+    return total
+
+
+@benchmark
+async def state_changed_filtered_listeners(hass):
+    """Fire 10k state_changed events with 100/1k/10k filtered listeners."""
+
+    def listen(hass, entity_id, listener):
+        @core.callback
+        def event_filter(event_data):
+            """Filter event."""
+            return event_data["entity_id"] == entity_id
+
+        return hass.bus.async_listen(
+            EVENT_STATE_CHANGED, listener, event_filter=event_filter
+        )
+
+    return await _dispatch_state_changed(hass, (100, 1000, 10000), listen)
+
+
+@benchmark
+async def state_changed_entity_keyed_listeners(hass):
+    """Fire 10k state_changed events with 100/1k/10k entity keyed listeners."""
+
+    def listen(hass, entity_id, listener):
+        return hass.bus.async_listen_entities(
+            EVENT_STATE_CHANGED, listener, entity_ids=[entity_id]
+        )
+
+    return await _dispatch_state_changed(hass, (100, 1000, 10000), listen)
+
+
+@benchmark
+async def websocket_state_changed_subscribers(hass):
+    """Forward 1k state changes to 50 websocket subscribers."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api import messages
+
+    subscribers = 50
+    events_to_fire = 1000
+    sent: list[bytes] = []
+
+    for iden in range(1, subscribers + 1):
+        message_id_as_bytes = str(iden).encode()
+
+        @core.callback
+        def forward_event(event, message_id_as_bytes=message_id_as_bytes):
+            """Forward the event like a subscribe_events subscription."""
+            sent.append(messages.cached_event_message(message_id_as_bytes, event))
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, forward_event)
+
+    attributes = {
+        "unit_of_measurement": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "friendly_name": "Washing Machine Power",
+    }
+    hass.states.async_set("sensor.power", "0", attributes)
+    sent.clear()
+
+    start = timer()
+    for idx in range(events_to_fire):
+        hass.states.async_set("sensor.power", str(idx + 1), attributes)
+    await hass.async_block_till_done()
+    runtime = timer() - start
+
+    assert len(sent) == subscribers * events_to_fire
+    print(
+        f"{subscribers} subscribers: "
+        f"{runtime / events_to_fire * 10**6:.3f}µs per event"
+    )
+    return runtime
+
+
+@benchmark
+async def track_point_in_utc_time_timers(hass):
+    """Schedule, reschedule, cancel and fire 20k point in time timers."""
+    timers = 20000
+    reschedules = 5
+    count = 0
+
+    @core.callback
+    def action(_):
+        """Handle the timer."""
+        nonlocal count
+        count += 1
+
+    job = core.HassJob(action, "benchmark timer", job_type=core.HassJobType.Callback)
+    now = dt_util.utcnow()
+    # Spread the timers over the next 15 minutes like time pattern
+    # triggers and template listeners with random microseconds
+    points = [
+        now + timedelta(seconds=60 + idx % 840, microseconds=idx * 7919 % 10**6)
+        for idx in range(timers)
+    ]
+
+    start = timer()
+    cancels = [async_track_point_in_utc_time(hass, job, point) for point in points]
+    schedule_runtime = timer() - start
+
+    start = timer()
+    for _ in range(reschedules):
+        for idx, point in enumerate(points):
+            cancels[idx]()
+            cancels[idx] = async_track_point_in_utc_time(hass, job, point)
+    reschedule_runtime = timer() - start
+
+    start = timer()
+    for cancel in cancels:
+        cancel()
+    cancel_runtime = timer() - start
+
+    start = timer()
+    for idx in range(timers):
+        async_track_point_in_utc_time(
+            hass, job, now - timedelta(microseconds=idx * 7919 % 10**6)
+        )
+    while count < timers:
+        await asyncio.sleep(0)
+    fire_runtime = timer() - start
+
+    print(
+        f"{timers} timers: schedule {schedule_runtime:.3f}s, "
+        f"{reschedules}x reschedule {reschedule_runtime:.3f}s, "
+        f"cancel {cancel_runtime:.3f}s, fire {fire_runtime:.3f}s"
+    )
+    return schedule_runtime + reschedule_runtime + cancel_runtime + fire_runtime
+
+
+@benchmark
+async def state_machine_memory(hass):
+    """Write 10 states each for 10k sensors and report the memory used."""
+    entity_count = 10**4
+    tracemalloc.start()
+    start = timer()
+
+    for value in range(10):
+        for idx in range(entity_count):
+            hass.states.async_set(
+                f"sensor.power_{idx}",
+                value,
+                {
+                    "unit_of_measurement": "W",
+                    "device_class": "power",
+                    "state_class": "measurement",
+                },
+            )
+
+    runtime = timer() - start
+    await hass.async_block_till_done()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{memory // entity_count} bytes per state for {entity_count} states")
+    return runtime
+
+
+@benchmark
+async def state_changed_attributes(hass):
+    """Write 100 states with a changing attribute each for 1k lights."""
+    entity_count = 10**3
+    attributes = {
+        "supported_color_modes": "brightness",
+        "color_mode": "brightness",
+        "friendly_name": "Light",
+        "supported_features": 40,
+        "min_mireds": 153,
+        "max_mireds": 500,
+        "effect": None,
+        "icon": "mdi:lightbulb",
+    }
+    start = timer()
+
+    for value in range(100):
+        for idx in range(entity_count):
+            hass.states.async_set(
+                f"light.light_{idx}",
+                "on",
+                {**attributes, "brightness": value},
+            )
+
+    runtime = timer() - start
+    await hass.async_block_till_done()
+    return runtime
+
+
 @benchmark
 async def filtering_entity_id(hass):
     """Run a 100k state changes through entity filter."""
@@ -308,3 +668,367 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+@benchmark
+async def state_write_listeners(hass):
+    """Write 10k states to 1000 sensors with 0/100/1k state change listeners."""
+    entity_count = 1000
+    writes = 10**4
+    total = 0.0
+
+    for listener_count in (0, 100, 1000):
+        count = 0
+
+        @core.callback
+        def listener(_):
+            """Handle event."""
+            nonlocal count
+            count += 1
+
+        unsubs = [
+            async_track_state_change_event(hass, f"sensor.power_{idx}", listener)
+            for idx in range(listener_count)
+        ]
+
+        start = timer()
+        for idx in range(writes):
+            hass.states.async_set(
+                f"sensor.power_{idx % entity_count}",
+                str(idx + listener_count),
+                {"unit_of_measurement": "W"},
+            )
+        await hass.async_block_till_done()
+        runtime = timer() - start
+
+        assert count == writes * listener_count // entity_count
+        for unsub in unsubs:
+            unsub()
+
+        print(f"{listener_count} listeners: {writes / runtime:.0f} writes per second")
+        total += runtime
+
+    return total
+
+
+@benchmark
+async def template_render(hass):
+    """Render state lookup and state iterating templates 100 times."""
+    renders = 100
+    for idx in range(1000):
+        hass.states.async_set(
+            f"sensor.power_{idx}", str(idx), {"unit_of_measurement": "W"}
+        )
+    templates = [
+        Template("{{ states('sensor.power_1') | float * 2 }}", hass),
+        Template("{{ is_state('sensor.power_1', '1') and 'on' or 'off' }}", hass),
+        Template(
+            "{{ states.sensor | map(attribute='state') | map('float') | sum }}", hass
+        ),
+        Template(
+            "{{ states.sensor | selectattr('state', 'eq', '1') | list | count }}", hass
+        ),
+    ]
+
+    start = timer()
+    for tpl in templates:
+        tpl_start = timer()
+        for _ in range(renders):
+            tpl.async_render()
+        print(f"{tpl.template}: {(timer() - tpl_start) / renders * 10**6:.1f}µs")
+    return timer() - start
+
+
+@benchmark
+async def template_state_iteration(hass):
+    """Render domain iterating templates on a large install 100 times.
+
+    A hundred sensors change state between renders.
+    """
+    renders = 100
+    for idx in range(6000):
+        hass.states.async_set(f"sensor.sensor_{idx}", "on" if idx % 2 else "off")
+    for idx in range(1000):
+        hass.states.async_set(f"light.light_{idx}", "on")
+    await hass.async_block_till_done()
+    templates = [
+        Template(
+            "{{ states.sensor | selectattr('state', 'eq', 'on') | list | count }}",
+            hass,
+        ),
+        Template(
+            "{{ states.sensor | selectattr('state', 'eq', 'off')"
+            " | map(attribute='entity_id') | list | count }}",
+            hass,
+        ),
+        Template("{{ states | selectattr('state', 'eq', 'on') | list | count }}", hass),
+    ]
+
+    total = 0
+    for tpl in templates:
+        runtime = 0
+        for render in range(renders):
+            for idx in range(render, 6000, 60):
+                hass.states.async_set(f"sensor.sensor_{idx}", str(render))
+            await hass.async_block_till_done()
+            start = timer()
+            tpl.async_render()
+            runtime += timer() - start
+        print(f"{tpl.template}: {runtime / renders * 10**3:.2f}ms")
+        total += runtime
+    return total
+
+
+@benchmark
+async def recorder_commit_sqlite(hass):
+    """Record and commit 10k state changes to a SQLite database."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    writes = 10**4
+    async with _async_temp_config_dir(hass) as config_dir:
+        await _async_setup_base(hass, config_dir)
+        async_initialize_recorder(hass)
+        assert await async_setup_component(
+            hass,
+            recorder.DOMAIN,
+            {
+                recorder.DOMAIN: {
+                    "db_url": f"sqlite:///{config_dir}/home-assistant_v2.db",
+                    "commit_interval": 1,
+                }
+            },
+        )
+        await hass.async_start()
+        instance = recorder.get_instance(hass)
+        assert await instance.async_db_ready
+
+        start = timer()
+        for idx in range(writes):
+            hass.states.async_set(
+                f"sensor.power_{idx % 100}", str(idx), {"unit_of_measurement": "W"}
+            )
+        await hass.async_block_till_done()
+        await instance.async_block_till_done()
+        runtime = timer() - start
+
+        print(f"{writes / runtime:.0f} committed states per second")
+        await hass.async_stop()
+
+    return runtime
+
+
+@benchmark
+async def sensor_compile_statistics(hass):
+    """Compile 5 minute statistics of 1k/5k/10k sensors with 3 states each."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.util import session_scope
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.sensor.recorder import compile_statistics
+
+    # Every sensor compiling a sum logs its zero point
+    logging.getLogger("homeassistant.components.sensor.recorder").setLevel(
+        logging.WARNING
+    )
+    states_per_sensor = 3
+    total = 0.0
+    async with _async_temp_config_dir(hass) as config_dir:
+        await _async_setup_base(hass, config_dir)
+        async_initialize_recorder(hass)
+        assert await async_setup_component(
+            hass,
+            recorder.DOMAIN,
+            {
+                recorder.DOMAIN: {
+                    "db_url": f"sqlite:///{config_dir}/home-assistant_v2.db",
+                    "commit_interval": 1,
+                }
+            },
+        )
+        await hass.async_start()
+        instance = recorder.get_instance(hass)
+        assert await instance.async_db_ready
+
+        def _compile(start, end):
+            with session_scope(
+                session=instance.get_session(), read_only=True
+            ) as session:
+                return compile_statistics(hass, session, start, end)
+
+        for sensor_count in (1000, 5000, 10000):
+            start = dt_util.utcnow()
+            for idx in range(sensor_count * states_per_sensor):
+                # Every fourth sensor compiles a sum, the others a mean, min and max
+                sensor = idx % sensor_count
+                hass.states.async_set(
+                    f"sensor.sensor_{sensor_count}_{sensor}",
+                    str(idx),
+                    {
+                        "state_class": "total_increasing"
+                        if sensor % 4 == 0
+                        else "measurement",
+                        "unit_of_measurement": "kWh" if sensor % 4 == 0 else "W",
+                    },
+                )
+            await hass.async_block_till_done()
+            await instance.async_block_till_done()
+            end = dt_util.utcnow() + timedelta(seconds=1)
+
+            compile_start = timer()
+            compiled = await instance.async_add_executor_job(_compile, start, end)
+            runtime = timer() - compile_start
+
+            assert len(compiled.platform_stats) == sensor_count
+            print(f"{sensor_count} sensors: {runtime:.3f}s")
+            total += runtime
+            # Only the sensors of the next round are compiled
+            for idx in range(sensor_count):
+                hass.states.async_remove(f"sensor.sensor_{sensor_count}_{idx}")
+
+        await hass.async_stop()
+
+    return total
+
+
+@benchmark
+async def registry_load(hass):
+    """Load the area, label and entity registries with 10k entities."""
+    entity_count = 10**4
+    async with _async_temp_config_dir(hass) as config_dir:
+        await _async_setup_base(hass, config_dir)
+        area_reg = ar.async_get(hass)
+        label_reg = lr.async_get(hass)
+        ent_reg = er.async_get(hass)
+        area_ids = [area_reg.async_create(f"Area {idx}").id for idx in range(100)]
+        label_ids = [
+            label_reg.async_create(f"Label {idx}").label_id for idx in range(20)
+        ]
+        for idx in range(entity_count):
+            entry = ent_reg.async_get_or_create("sensor", "benchmark", str(idx))
+            ent_reg.async_update_entity(
+                entry.entity_id,
+                area_id=area_ids[idx % len(area_ids)],
+                labels={label_ids[idx % len(label_ids)]},
+            )
+        # Write the registries to disk and drop them to load them again
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+        for registry in (ar, lr, dr, er):
+            hass.data.pop(registry.DATA_REGISTRY)
+
+        start = timer()
+        await ar.async_load(hass)
+        await lr.async_load(hass)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        runtime = timer() - start
+
+    assert len(er.async_get(hass).entities) == entity_count
+    return runtime
+
+
+def _write_yaml_config(config_dir, automation_count):
+    """Write a configuration.yaml including automations and packages."""
+    with open(f"{config_dir}/configuration.yaml", "w", encoding="utf8") as fil:
+        fil.write(
+            "homeassistant:\n"
+            "  packages: !include_dir_named packages\n"
+            "automation: !include automations.yaml\n"
+        )
+    with open(f"{config_dir}/automations.yaml", "w", encoding="utf8") as fil:
+        for idx in range(automation_count):
+            fil.write(
+                f"- id: '{idx}'\n"
+                f"  alias: Automation {idx}\n"
+                "  triggers:\n"
+                "    - trigger: state\n"
+                f"      entity_id: binary_sensor.motion_{idx}\n"
+                "      to: 'on'\n"
+                "  conditions:\n"
+                "    - condition: template\n"
+                "      value_template: \"{{ is_state('sun.sun', 'below_horizon') }}\"\n"
+                "  actions:\n"
+                "    - action: light.turn_on\n"
+                "      target:\n"
+                f"        entity_id: light.room_{idx}\n"
+            )
+    os.mkdir(f"{config_dir}/packages")
+    for idx in range(automation_count // 10):
+        with open(
+            f"{config_dir}/packages/package_{idx}.yaml", "w", encoding="utf8"
+        ) as fil:
+            fil.write(
+                "input_boolean:\n"
+                f"  guest_mode_{idx}:\n"
+                f"    name: Guest mode {idx}\n"
+                "template:\n"
+                "  - sensor:\n"
+                f"      - name: Power {idx}\n"
+                "        unit_of_measurement: W\n"
+                f"        state: \"{{{{ states('sensor.power_{idx}') | float(0) }}}}\"\n"
+            )
+
+
+@benchmark
+async def yaml_config_load(hass):
+    """Load a configuration.yaml with 1k automations and 100 packages 10 times."""
+    loads = 10
+    async with _async_temp_config_dir(hass) as config_dir:
+        hass.config.config_dir = config_dir
+        hass.config.skip_pip = True
+        loader.async_setup(hass)
+        await hass.async_add_executor_job(_write_yaml_config, config_dir, 1000)
+
+        start = timer()
+        for _ in range(loads):
+            config = await conf_util.async_hass_config_yaml(hass)
+        runtime = timer() - start
+
+    assert len(config["automation"]) == 1000
+    return runtime
+
+
+@benchmark
+async def bootstrap(hass):
+    """Bootstrap Home Assistant until it is started."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant import bootstrap as hass_bootstrap
+
+    async with _async_temp_config_dir(hass) as config_dir:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        await hass.async_add_executor_job(
+            _write_bootstrap_config, config_dir, port, 100
+        )
+
+        start = timer()
+        started = await hass_bootstrap.async_setup_hass(
+            RuntimeConfig(
+                config_dir=config_dir,
+                skip_pip=True,
+                log_file=f"{config_dir}/home-assistant.log",
+            )
+        )
+        assert started is not None
+        await started.async_start()
+        runtime = timer() - start
+
+        assert started.state is core.CoreState.running
+        assert not started.config.recovery_mode
+        print(f"{len(started.config.components)} components set up")
+        await started.async_stop()
+
+    return runtime
+
+
+def _write_bootstrap_config(config_dir, port, input_count):
+    """Write a configuration.yaml with some helpers and a free http port."""
+    with open(f"{config_dir}/configuration.yaml", "w", encoding="utf8") as fil:
+        fil.write(f"homeassistant:\nhttp:\n  server_port: {port}\ninput_boolean:\n")
+        for idx in range(input_count):
+            fil.write(f"  guest_mode_{idx}:\n    name: Guest mode {idx}\n")
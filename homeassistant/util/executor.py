@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 import contextlib
 import logging
 import sys
-from threading import Thread
+from threading import Lock, Thread
 import time
 import traceback
-from typing import Any
+from typing import Any, TypedDict
 
 from .thread import async_raise
 
@@ -100,3 +101,95 @@ class InterruptibleThreadPoolExecutor(ThreadPoolExecutor):
             )
             if timeout_remaining <= 0:
                 return
+
+
+class ExecutorStats(TypedDict):
+    """Queue depth and latency stats of an executor."""
+
+    max_workers: int
+    queued: int
+    running: int
+    completed: int
+    total_wait: float
+    max_wait: float
+    total_run: float
+
+
+class InstrumentedThreadPoolExecutor(InterruptibleThreadPoolExecutor):
+    """An InterruptibleThreadPoolExecutor that tracks queue depth and latency."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the executor."""
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def submit[_T](
+        self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any
+    ) -> Future[_T]:
+        """Submit a job and track how long it waits for a worker."""
+        with self._stats_lock:
+            self._queued += 1
+        future = super().submit(self._run_job, time.monotonic(), fn, *args, **kwargs)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future: Future[Any]) -> None:
+        """Stop counting a job as queued if it was cancelled before it started.
+
+        Futures can only be cancelled while pending, _run_job never
+        runs for them.
+        """
+        if future.cancelled():
+            with self._stats_lock:
+                self._queued -= 1
+
+    def _run_job[_T](
+        self, queued_at: float, fn: Callable[..., _T], /, *args: Any, **kwargs: Any
+    ) -> _T:
+        """Run a job in a worker thread and record its timings."""
+        started_at = time.monotonic()
+        wait = started_at - queued_at
+        with self._stats_lock:
+            self._queued -= 1
+            self._running += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            run = time.monotonic() - started_at
+            with self._stats_lock:
+                self._running -= 1
+                self._completed += 1
+                self._total_run += run
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """Set the maximum number of worker threads.
+
+        A lower maximum only limits the threads started from now on,
+        threads which are already running are kept.
+        """
+        # ThreadPoolExecutor only reads _max_workers when deciding whether
+        # to start another thread in _adjust_thread_count, which runs under
+        # the shutdown lock from submit. Replacing the int is atomic and the
+        # new value is seen by the next submit.
+        self._max_workers = max_workers
+
+    def stats(self) -> ExecutorStats:
+        """Return the queue depth and latency stats of the executor."""
+        with self._stats_lock:
+            return {
+                "max_workers": self._max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "total_wait": self._total_wait,
+                "max_wait": self._max_wait,
+                "total_run": self._total_run,
+            }
@@ -0,0 +1,40 @@
+"""Tests for downsampling history."""
+
+from homeassistant.components.history.downsample import (
+    bucket_segments,
+    largest_triangle_three_buckets,
+)
+
+
+def test_largest_triangle_three_buckets() -> None:
+    """Test downsampling keeps the first, last and outstanding points."""
+    points = [(float(x), 0.0) for x in range(100)]
+    points[42] = (42.0, 100.0)
+    points[77] = (77.0, -50.0)
+
+    sampled = largest_triangle_three_buckets(points, 10)
+    assert len(sampled) == 10
+    assert sampled[0] == points[0]
+    assert sampled[-1] == points[-1]
+    assert (42.0, 100.0) in sampled
+    assert (77.0, -50.0) in sampled
+    assert sampled == sorted(sampled)
+
+    assert largest_triangle_three_buckets(points, 100) == points
+    assert largest_triangle_three_buckets(points, 2) == [points[0], points[-1]]
+    assert largest_triangle_three_buckets(points, 1) == [points[-1]]
+
+
+def test_bucket_segments() -> None:
+    """Test segments are split over the buckets they overlap."""
+    segments = [
+        (0.0, 15.0, 1.0, 1.0, 1.0, 1.0),
+        (15.0, 20.0, 0.0, 8.0, 4.0, 3.0),
+        # Not numeric
+        (30.0, 35.0, None, None, None, "unavailable"),
+    ]
+    assert bucket_segments(segments, 0.0, 40.0, 4) == [
+        {"start": 0.0, "min": 1.0, "max": 1.0, "mean": 1.0, "last": 1.0},
+        {"start": 10.0, "min": 0.0, "max": 8.0, "mean": 2.5, "last": 3.0},
+        {"start": 30.0, "last": "unavailable"},
+    ]
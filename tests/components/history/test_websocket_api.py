@@ -5,11 +5,13 @@ from datetime import timedelta
 from unittest.mock import ANY, patch
 
 from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant.components import history
 from homeassistant.components.history import websocket_api
 from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import Statistics
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_state_change_event
@@ -2154,3 +2156,160 @@ async def test_history_stream_live_chained_events(
         "id": 1,
         "type": "event",
     }
+
+
+async def test_downsampled_during_period(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test downsampled history from the states."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    client = await hass_ws_client()
+
+    freezer.move_to(now + timedelta(minutes=1))
+    hass.states.async_set("sensor.power", "1")
+    hass.states.async_set("switch.heater", "on")
+    freezer.move_to(now + timedelta(minutes=11))
+    hass.states.async_set("sensor.power", "3")
+    freezer.move_to(now + timedelta(minutes=21))
+    hass.states.async_set("switch.heater", "off")
+    freezer.move_to(now + timedelta(minutes=31))
+    hass.states.async_set("sensor.power", "5")
+    freezer.move_to(now + timedelta(minutes=46))
+    await async_wait_recording_done(hass)
+
+    start = now + timedelta(minutes=6)
+    end = now + timedelta(minutes=46)
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/downsampled_during_period",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+            "entity_ids": ["sensor.power", "switch.heater", "sensor.unknown"],
+            "buckets": 2,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    middle_ts = (start + timedelta(minutes=20)).timestamp()
+    assert response["result"] == {
+        "sensor.power": [
+            {
+                "start": start.timestamp(),
+                "min": 1,
+                "max": 3,
+                "mean": pytest.approx(2.5),
+                "last": 3,
+            },
+            {
+                "start": middle_ts,
+                "min": 3,
+                "max": 5,
+                "mean": pytest.approx(4.5),
+                "last": 5,
+            },
+        ],
+        "switch.heater": [
+            {"start": start.timestamp(), "last": "off"},
+            {"start": middle_ts, "last": "off"},
+        ],
+    }
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/downsampled_during_period",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+            "entity_ids": ["sensor.power"],
+            "buckets": 2,
+            "method": "lttb",
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "sensor.power": [
+            {"s": 1, "lu": start.timestamp()},
+            {"s": 5, "lu": (now + timedelta(minutes=31)).timestamp()},
+        ]
+    }
+
+    await client.send_json(
+        {
+            "id": 3,
+            "type": "history/downsampled_during_period",
+            "start_time": "invalid",
+            "entity_ids": ["sensor.power"],
+            "buckets": 2,
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
+async def test_downsampled_during_period_statistics(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test downsampled history switches to the statistics for long buckets."""
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=4
+    )
+    imported_stats = [
+        {
+            "start": start + timedelta(hours=hour),
+            "min": hour,
+            "max": hour + 10,
+            "mean": hour + 5,
+        }
+        for hour in range(4)
+    ]
+    recorder_mock.async_import_statistics(
+        {
+            "has_mean": True,
+            "has_sum": False,
+            "name": None,
+            "source": "recorder",
+            "statistic_id": "sensor.temperature",
+            "unit_of_measurement": "°C",
+        },
+        imported_stats,
+        Statistics,
+    )
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/downsampled_during_period",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=4)).isoformat(),
+            "entity_ids": ["sensor.temperature"],
+            "buckets": 2,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "sensor.temperature": [
+            {"start": start.timestamp(), "min": 0, "max": 11, "mean": 5.5, "last": 6},
+            {
+                "start": (start + timedelta(hours=2)).timestamp(),
+                "min": 2,
+                "max": 13,
+                "mean": 7.5,
+                "last": 8,
+            },
+        ]
+    }
@@ -3,7 +3,9 @@
 import asyncio
 from collections.abc import Callable
 from datetime import datetime, timedelta
+from functools import partial
 from http import HTTPStatus
+import logging
 from unittest.mock import Mock
 
 from freezegun import freeze_time
@@ -44,6 +46,7 @@ import homeassistant.core as ha
 from homeassistant.core import Event, HomeAssistant
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entityfilter import CONF_ENTITY_GLOBS
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 
@@ -1478,6 +1481,50 @@ async def test_logbook_context_from_template(
     assert json_dict[5]["context_user_id"] == "9400facee45711eaa9308bfd3d19e474"
 
 
+@pytest.mark.usefixtures("recorder_mock")
+async def test_logbook_coordinator_entities_keep_own_context(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator
+) -> None:
+    """Test entities written by one coordinator refresh are not linked."""
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+
+    coordinator = DataUpdateCoordinator[str](
+        hass, logging.getLogger(__name__), config_entry=None, name="test"
+    )
+    for entity_id in ("switch.one", "switch.two"):
+        hass.states.async_set(entity_id, STATE_OFF)
+        coordinator.async_add_listener(
+            partial(
+                lambda entity_id: hass.states.async_set(entity_id, coordinator.data),
+                entity_id,
+            )
+        )
+    await hass.async_block_till_done()
+
+    coordinator.async_set_updated_data(STATE_ON)
+    await async_wait_recording_done(hass)
+
+    client = await hass_client()
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day, tzinfo=dt_util.UTC)
+    response = await client.get(f"/api/logbook/{start_date.isoformat()}")
+    assert response.status == HTTPStatus.OK
+    json_dict = await response.json()
+
+    entries = [entry for entry in json_dict if "entity_id" in entry]
+    assert [(entry["entity_id"], entry["state"]) for entry in entries] == [
+        ("switch.one", STATE_ON),
+        ("switch.two", STATE_ON),
+    ]
+    assert "context_entity_id" not in entries[1]
+
+
 @pytest.mark.usefixtures("recorder_mock")
 async def test_logbook_(
     hass: HomeAssistant, hass_client: ClientSessionGenerator
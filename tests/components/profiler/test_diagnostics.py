@@ -0,0 +1,44 @@
+"""Tests for the diagnostics data provided by the Profiler integration."""
+
+from homeassistant.components.profiler import SERVICE_START_JOB_STATS
+from homeassistant.components.profiler.const import DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from tests.common import MockConfigEntry
+from tests.components.diagnostics import get_diagnostics_for_config_entry
+from tests.typing import ClientSessionGenerator
+
+
+async def test_diagnostics(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator
+) -> None:
+    """Test diagnostics."""
+    assert await async_setup_component(hass, "diagnostics", {})
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.two", "2", {"unit_of_measurement": "W"})
+
+    diagnostics = await get_diagnostics_for_config_entry(hass, hass_client, entry)
+    assert diagnostics["job_stats"] is None
+    assert diagnostics["states"] == {
+        "states": 2,
+        "unique_attributes": 1,
+        "interned_attributes": 1,
+    }
+    assert "executor_lanes" in diagnostics
+    assert isinstance(diagnostics["pending_timers"], dict)
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_JOB_STATS, {"sample_rate": 1}, blocking=True
+    )
+    diagnostics = await get_diagnostics_for_config_entry(hass, hass_client, entry)
+    assert diagnostics["job_stats"]["running"] is True
+    assert diagnostics["job_stats"]["sample_rate"] == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
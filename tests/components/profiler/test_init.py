@@ -6,6 +6,7 @@ import logging
 import os
 from pathlib import Path
 import sys
+import time
 from unittest.mock import patch
 
 from freezegun.api import FrozenDateTimeFactory
@@ -21,23 +22,27 @@ from homeassistant.components.profiler import (
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_CURRENT_TASKS,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_LOG_STATE_MEMORY,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LRU_STATS,
     SERVICE_MEMORY,
     SERVICE_SET_ASYNCIO_DEBUG,
     SERVICE_START,
+    SERVICE_START_JOB_STATS,
     SERVICE_START_LOG_OBJECT_SOURCES,
     SERVICE_START_LOG_OBJECTS,
+    SERVICE_STOP_JOB_STATS,
     SERVICE_STOP_LOG_OBJECT_SOURCES,
     SERVICE_STOP_LOG_OBJECTS,
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HassJob, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.typing import WebSocketGenerator
 
 
 async def test_basic_usage(hass: HomeAssistant, tmp_path: Path) -> None:
@@ -266,6 +271,118 @@ async def test_log_current_tasks(
     await hass.async_block_till_done()
 
 
+async def test_log_state_memory(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test we can log the memory used by states."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    for idx in range(10):
+        hass.states.async_set(f"sensor.power_{idx}", idx, {"unit_of_measurement": "W"})
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_STATE_MEMORY)
+
+    await hass.services.async_call(DOMAIN, SERVICE_LOG_STATE_MEMORY, {}, blocking=True)
+
+    assert "State memory usage: 10 states" in caplog.text
+    assert "1 unique attribute mappings" in caplog.text
+    caplog.clear()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_job_stats(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test we can sample the event loop time of jobs."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/job_stats"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"
+
+    with pytest.raises(HomeAssistantError, match="Job stats not running"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_STOP_JOB_STATS, {}, blocking=True
+        )
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_JOB_STATS, {"sample_rate": 1}, blocking=True
+    )
+    with pytest.raises(HomeAssistantError, match="Job stats already started"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_START_JOB_STATS, {}, blocking=True
+        )
+
+    calls = []
+
+    @callback
+    def _slow_listener(event: Event) -> None:
+        calls.append(event)
+        time.sleep(0.002)
+
+    async def _coro_listener(event: Event) -> None:
+        calls.append(event)
+
+    hass.bus.async_listen("test_event", _slow_listener)
+    hass.bus.async_listen("test_event", _coro_listener)
+    hass.async_run_hass_job(HassJob(_slow_listener), Event("direct"))
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+    await client.send_json_auto_id({"type": "profiler/job_stats", "limit": 100})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert result["running"] is True
+    assert result["sample_rate"] == 1
+    timings = {timing["target"]: timing for timing in result["top"]}
+    slow = timings[f"{__name__}.test_job_stats.<locals>._slow_listener"]
+    assert slow["integration"] == "tests"
+    assert slow["count"] == 2
+    assert slow["max"] >= 0.002
+    assert sum(slow["histogram"].values()) == 2
+    assert timings[f"{__name__}.test_job_stats.<locals>._coro_listener"]["count"] == 1
+    assert result["integrations"]["tests"]["count"] >= 3
+
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_JOB_STATS, {}, blocking=True)
+    assert "Job stats by integration" in caplog.text
+    assert "async_run_hass_job" not in hass.__dict__
+
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    await client.send_json_auto_id({"type": "profiler/job_stats"})
+    response = await client.receive_json()
+    assert response["result"]["running"] is False
+    assert (
+        response["result"]["integrations"]["tests"]["count"]
+        == (result["integrations"]["tests"]["count"])
+    )
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_JOB_STATS, {"sample_rate": 1}, blocking=True
+    )
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert "async_run_hass_job" not in hass.__dict__
+
+
 async def test_log_scheduled(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
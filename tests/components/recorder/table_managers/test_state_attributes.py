@@ -0,0 +1,43 @@
+"""Test the state attributes table manager."""
+
+from unittest.mock import Mock
+
+from homeassistant.components.recorder.table_managers.state_attributes import (
+    StateAttributesManager,
+)
+
+
+def test_cache_stats_and_adapt_lru_size() -> None:
+    """Test the cache counts its usage and grows with the working set."""
+    manager = StateAttributesManager(Mock())
+    manager._id_map.set_size(4)
+
+    manager.prime((f'{{"idx":{idx}}}', idx) for idx in range(6))
+    assert manager.get_from_cache('{"idx":5}') == 5
+    assert manager.get_from_cache('{"idx":0}') is None
+    assert manager.cache_stats() == {
+        "size": 4,
+        "max_size": 4,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 2,
+    }
+
+    # Only the evicted items which were missed again grow the cache
+    manager.adapt_lru_size(0, 100)
+    assert manager.cache_stats()["max_size"] == 5
+
+    # Nothing was evicted since the last adaptation
+    manager.get_from_cache('{"idx":1}')
+    manager.adapt_lru_size(0, 100)
+    assert manager.cache_stats()["max_size"] == 5
+
+    manager.prime((f'{{"idx":{idx}}}', idx) for idx in range(6, 16))
+    for idx in range(6, 16):
+        manager.get_from_cache(f'{{"idx":{idx}}}')
+    manager.adapt_lru_size(0, 8)
+    assert manager.cache_stats()["max_size"] == 8
+
+    # The minimum size wins over the working set
+    manager.adapt_lru_size(32, 8)
+    assert manager.cache_stats()["max_size"] == 32
@@ -0,0 +1,49 @@
+"""Test the states table manager."""
+
+from unittest.mock import MagicMock, Mock, patch
+
+from homeassistant.components.recorder.table_managers.states import (
+    PendingState,
+    StatesManager,
+)
+
+
+def test_insert_pending_multi_row_mysql() -> None:
+    """Test states are inserted with multi-row INSERT statements on MySQL."""
+    manager = StatesManager()
+    pending_states = {
+        name: PendingState({"entity_id": f"sensor.{name}", "old_state_id": None})
+        for name in ("one", "two", "three", "one_again")
+    }
+    pending_states["one_again"].old_state = pending_states["one"]
+    for pending in pending_states.values():
+        manager.queue_insert(pending)
+
+    connection = MagicMock()
+    connection.dialect.insert_executemany_returning_sort_by_parameter_order = False
+    connection.dialect.name = "mysql"
+    connection.execute.side_effect = [
+        Mock(scalar_one=Mock(return_value=2)),
+        Mock(lastrowid=10),
+        Mock(lastrowid=30),
+        Mock(lastrowid=40),
+    ]
+    session = Mock(connection=Mock(return_value=connection))
+
+    # Two rows per statement
+    with patch(
+        "homeassistant.components.recorder.table_managers.states.DEFAULT_MAX_BIND_VARS",
+        4,
+    ):
+        manager.insert_pending(session)
+
+    # One statement for auto_increment_increment, two for the first
+    # depth and one for the second
+    assert connection.execute.call_count == 4
+    assert {name: pending.state_id for name, pending in pending_states.items()} == {
+        "one": 10,
+        "two": 12,
+        "three": 30,
+        "one_again": 40,
+    }
+    assert pending_states["one_again"].row["old_state_id"] == 10
@@ -20,8 +20,9 @@ from homeassistant.components.recorder.db_schema import (
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import process_timestamp
 from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED
 from homeassistant.core import HomeAssistant, State
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_bytes
 import homeassistant.util.dt as dt_util
 
 from .common import (
@@ -512,6 +513,48 @@ async def test_get_significant_states_minimal_response(
     )
 
 
+@pytest.mark.parametrize("minimal_response", [True, False])
+@pytest.mark.parametrize("significant_changes_only", [True, False])
+@pytest.mark.parametrize("no_attributes", [True, False])
+@pytest.mark.parametrize("include_start_time_state", [True, False])
+async def test_get_significant_states_json(
+    hass: HomeAssistant,
+    minimal_response: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+    include_start_time_state: bool,
+) -> None:
+    """Test the json of the significant states matches the compressed states."""
+    zero, four, states = record_states(hass)
+    await async_wait_recording_done(hass)
+    start = zero + timedelta(seconds=1.5)
+    entity_ids = ["not.recorded", *states, "media_player.test"]
+    kwargs = {
+        "include_start_time_state": include_start_time_state,
+        "significant_changes_only": significant_changes_only,
+        "minimal_response": minimal_response,
+        "no_attributes": no_attributes,
+    }
+
+    hist = history.get_significant_states(
+        hass, start, four, entity_ids, compressed_state_format=True, **kwargs
+    )
+    hist_json, last_time_ts = history.get_significant_states_json(
+        hass, start, four, entity_ids, **kwargs
+    )
+
+    assert hist
+    assert json_bytes(hist_json) == json_bytes(hist)
+    assert last_time_ts == max(
+        state_list[-1][COMPRESSED_STATE_LAST_UPDATED] for state_list in hist.values()
+    )
+    hist_json, last_time_ts = history.get_significant_states_json(
+        hass, start, four, ["not.recorded"], **kwargs
+    )
+    assert json_bytes(hist_json) == b"{}"
+    assert last_time_ts == 0
+
+
 @pytest.mark.parametrize("time_zone", ["Europe/Berlin", "US/Hawaii", "UTC"])
 async def test_get_significant_states_with_initial(
     time_zone, hass: HomeAssistant
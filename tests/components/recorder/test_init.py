@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Generator
 from datetime import datetime, timedelta
+import json
 import sqlite3
 import sys
 import threading
@@ -34,6 +35,8 @@ from homeassistant.components.recorder import (
     statistics,
 )
 from homeassistant.components.recorder.const import (
+    DB_READ_WORKER_PREFIX,
+    DB_WORKER_PREFIX,
     EVENT_RECORDER_5MIN_STATISTICS_GENERATED,
     EVENT_RECORDER_HOURLY_STATISTICS_GENERATED,
     KEEPALIVE_TIME,
@@ -360,6 +363,53 @@ async def test_saving_many_states(
         assert db_states[0].event_id is None
 
 
+@pytest.mark.parametrize("returning", [True, False])
+async def test_saving_many_states_in_one_commit(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    returning: bool,
+) -> None:
+    """Test several states of the same entities are linked in one commit."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_COMMIT_INTERVAL: 30}
+    )
+    dialect = instance.engine.dialect
+
+    with patch.object(
+        dialect, "insert_executemany_returning_sort_by_parameter_order", returning
+    ):
+        for value in range(3):
+            hass.states.async_set("test.one", str(value), {"value": value})
+            hass.states.async_set("test.two", str(value), {"fixed": True})
+        hass.states.async_remove("test.two")
+        await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        states_meta = {
+            meta.entity_id: meta.metadata_id for meta in session.query(StatesMeta)
+        }
+        attributes = {
+            attrs.attributes_id: attrs.shared_attrs
+            for attrs in session.query(StateAttributes)
+        }
+
+    one = [state for state in db_states if state.metadata_id == states_meta["test.one"]]
+    two = [state for state in db_states if state.metadata_id == states_meta["test.two"]]
+    assert [state.state for state in one] == ["0", "1", "2"]
+    assert [state.state for state in two] == ["0", "1", "2", None]
+    for states in (one, two):
+        assert states[0].old_state_id is None
+        for old_state, state in zip(states, states[1:], strict=False):
+            assert state.old_state_id == old_state.state_id
+    assert [json.loads(attributes[state.attributes_id]) for state in one] == [
+        {"value": 0},
+        {"value": 1},
+        {"value": 2},
+    ]
+    assert len({state.attributes_id for state in two[:3]}) == 1
+
+
 async def test_saving_state_with_intermixed_time_changes(
     hass: HomeAssistant, setup_recorder: None
 ) -> None:
@@ -394,19 +444,15 @@ async def test_saving_state_with_exception(
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    def _throw_inserting_states(*args, **kwargs):
+        raise OperationalError("insert the state", "fake params", "forced to fail")
 
     with (
         patch("time.sleep"),
         patch.object(
-            get_instance(hass).event_session,
-            "flush",
-            side_effect=_throw_if_state_in_session,
+            get_instance(hass).states_manager,
+            "insert_pending",
+            side_effect=_throw_inserting_states,
         ),
     ):
         hass.states.async_set(entity_id, "fail", attributes)
@@ -2746,3 +2792,117 @@ async def test_empty_entity_id(
     hass.bus.async_fire("hello", {"entity_id": ""})
     await async_wait_recording_done(hass)
     assert "Invalid entity ID" not in caplog.text
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_read_executor_jobs_use_read_only_connections(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test read executor jobs run in the read workers with read only sessions."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_DB_READ_WORKERS: 2}
+    )
+    hass.states.async_set("test.read_only", "on")
+    await async_wait_recording_done(hass)
+
+    def _read_and_write() -> tuple[str, list[str | None]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            states = [state.state for state in session.query(States)]
+        with (
+            pytest.raises(OperationalError, match="readonly"),
+            session_scope(hass=hass) as session,
+        ):
+            session.add(States(state="off"))
+        return threading.current_thread().name, states
+
+    thread_name, states = await instance.async_add_read_executor_job(_read_and_write)
+    assert thread_name.startswith(DB_READ_WORKER_PREFIX)
+    assert states == ["on"]
+
+    stats = instance.async_read_executor_stats()
+    assert stats is not None
+    assert stats["max_workers"] == 2
+    assert stats["completed"] == 1
+
+    # Sessions outside of the read workers can still write
+    hass.states.async_set("test.read_only", "off")
+    await async_wait_recording_done(hass)
+
+
+async def test_read_executor_without_read_workers(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test read executor jobs run in the database executor without read workers."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_DB_READ_WORKERS: 0}
+    )
+
+    thread_name = await instance.async_add_read_executor_job(
+        lambda: threading.current_thread().name
+    )
+    assert thread_name.startswith(DB_WORKER_PREFIX)
+    assert instance.async_read_executor_stats() is None
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+@pytest.mark.usefixtures("hass_storage")  # Prevent test hass from writing to storage
+async def test_caches_warmed_at_startup(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Test the caches are warmed from the latest states at startup."""
+    async with (
+        async_test_home_assistant() as hass,
+        async_test_recorder(hass) as instance,
+    ):
+        hass.states.async_set("test.warm", "on", {"warm": True})
+        hass.states.async_set("test.warm", "off", {"warm": False})
+        await async_wait_recording_done(hass)
+        await hass.async_stop()
+
+    async with (
+        async_test_home_assistant() as hass,
+        async_test_recorder(hass) as instance,
+    ):
+        # The caches are warmed after the recorder is ready
+        await async_wait_recording_done(hass)
+        assert instance.states_meta_manager.get_from_cache("test.warm") is not None
+        assert (
+            instance.state_attributes_manager.get_from_cache('{"warm":false}')
+            is not None
+        )
+        # Only the attributes of the latest state are warmed
+        assert instance.state_attributes_manager.get_from_cache('{"warm":true}') is None
+
+        misses = instance.async_cache_stats()["states_meta"]["misses"]
+        hass.states.async_set("test.warm", "on", {"warm": False})
+        await async_wait_recording_done(hass)
+        assert instance.async_cache_stats()["states_meta"]["misses"] == misses
+        await hass.async_stop()
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+@pytest.mark.usefixtures("hass_storage")  # Prevent test hass from writing to storage
+async def test_caches_warmed_from_latest_states_only(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Test only the latest states are scanned to warm the caches."""
+    async with (
+        async_test_home_assistant() as hass,
+        async_test_recorder(hass) as instance,
+    ):
+        hass.states.async_set("test.old", "on")
+        hass.states.async_set("test.new", "on")
+        await async_wait_recording_done(hass)
+        await hass.async_stop()
+
+    with patch("homeassistant.components.recorder.core.CACHE_WARM_MAX_STATES", 1):
+        async with (
+            async_test_home_assistant() as hass,
+            async_test_recorder(hass) as instance,
+        ):
+            await async_wait_recording_done(hass)
+            assert instance.states_meta_manager.get_from_cache("test.new") is not None
+            assert instance.states_meta_manager.get_from_cache("test.old") is None
+            await hass.async_stop()
@@ -0,0 +1,267 @@
+"""Test the spill journal of the recorder."""
+
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import StateAttributes, States
+from homeassistant.components.recorder.journal import (
+    SpillJournal,
+    decode_event,
+    encode_event,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from .common import async_block_recorder, async_wait_recording_done
+
+from tests.common import async_fire_time_changed
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def test_encode_decode_state_changed_event() -> None:
+    """Test a state_changed event keeps what is recorded."""
+    context = Context(user_id="user", parent_id="parent")
+    old_state = State("light.kitchen", "off", {"brightness": 0})
+    new_state = State(
+        "light.kitchen",
+        "on",
+        {"brightness": 255, "supported_features": 1},
+        context=context,
+    )
+    event = Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "light.kitchen", "old_state": old_state, "new_state": new_state},
+        EventOrigin.remote,
+        context=context,
+    )
+
+    decoded = decode_event(encode_event(event, None))
+    assert decoded.event_type == EVENT_STATE_CHANGED
+    assert decoded.origin == EventOrigin.remote
+    assert decoded.time_fired_timestamp == event.time_fired_timestamp
+    assert decoded.context.as_dict() == context.as_dict()
+    assert decoded.data["entity_id"] == "light.kitchen"
+    assert (
+        decoded.data["old_state"].last_reported_timestamp
+        == old_state.last_reported_timestamp
+    )
+    decoded_state = decoded.data["new_state"]
+    assert decoded_state.state == "on"
+    # Attributes which are never recorded are left out
+    assert decoded_state.attributes == {"brightness": 255}
+    assert decoded_state.last_changed == new_state.last_changed
+    assert decoded_state.last_reported == new_state.last_reported
+    assert decoded_state.last_updated == new_state.last_updated
+    assert decoded_state.context is decoded.context
+
+    removed = Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "light.kitchen", "old_state": None, "new_state": None},
+    )
+    assert decode_event(encode_event(removed, None)).data == {
+        "entity_id": "light.kitchen",
+        "old_state": None,
+        "new_state": None,
+    }
+
+
+def test_encode_decode_event(caplog: pytest.LogCaptureFixture) -> None:
+    """Test other events keep their data."""
+    event = Event("test_event", {"value": [1, 2, None]})
+    decoded = decode_event(encode_event(event, None))
+    assert decoded.event_type == "test_event"
+    assert decoded.data == {"value": [1, 2, None]}
+    assert decoded.context.id == event.context.id
+
+    assert encode_event(Event("test_event", {"value": object()}), None) is None
+    assert "Event is not JSON serializable" in caplog.text
+
+
+def test_spill_journal(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Test records are read back in order and the journal is truncated."""
+    path = tmp_path / "spill"
+    journal = SpillJournal(str(path))
+    journal.append([b"one", b"two"])
+    journal.append([b"three"])
+    assert journal.pending_bytes == path.stat().st_size
+
+    assert journal.read(2) == [b"one", b"two"]
+    # Records are read again until they are marked as read
+    assert journal.read(2) == [b"one", b"two"]
+    journal.mark_read()
+    assert journal.pending_bytes
+    assert journal.read(2) == [b"three"]
+    journal.mark_read()
+    assert journal.pending_bytes == 0
+    assert path.stat().st_size == 0
+    assert not Path(journal.offset_path).exists()
+    assert journal.read(2) == []
+    journal.mark_read()
+    assert (journal.records_written, journal.records_read) == (3, 3)
+
+    # A record which was only partly written is cut off
+    journal.append([b"four", b"five"])
+    with path.open("r+b") as file:
+        file.truncate(path.stat().st_size - 1)
+    journal = SpillJournal(str(path))
+    journal.open()
+    assert "Cutting off a partly written record" in caplog.text
+    assert journal.read(10) == [b"four"]
+
+
+def test_spill_journal_restart_during_replay(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a restart resumes the replay after the records marked as read."""
+    path = tmp_path / "spill"
+    journal = SpillJournal(str(path))
+    journal.append([b"one", b"two", b"three", b"four"])
+    assert journal.read(2) == [b"one", b"two"]
+    journal.mark_read()
+    # The next batch was not committed when the previous run ended
+    assert journal.read(1) == [b"three"]
+
+    journal = SpillJournal(str(path))
+    journal.open()
+    assert journal.read(10) == [b"three", b"four"]
+    journal.mark_read()
+    assert path.stat().st_size == 0
+    assert not Path(journal.offset_path).exists()
+
+    # A read offset which does not match a record replays the journal
+    journal.append([b"five"])
+    Path(journal.offset_path).write_bytes(b"3")
+    journal = SpillJournal(str(path))
+    journal.open()
+    assert "does not match a record" in caplog.text
+    assert journal.read(10) == [b"five"]
+
+    # The journal is truncated when every record was read before the restart
+    journal.mark_read()
+    journal.append([b"six"])
+    assert journal.read(10) == [b"six"]
+    Path(journal.offset_path).write_bytes(str(path.stat().st_size).encode())
+    journal = SpillJournal(str(path))
+    journal.open()
+    assert journal.pending_bytes == 0
+    assert path.stat().st_size == 0
+    assert not Path(journal.offset_path).exists()
+
+
+async def test_spill_and_replay(
+    hass: HomeAssistant, recorder_mock: Recorder, tmp_path: Path
+) -> None:
+    """Test events are spilled while the backlog is large and replayed in order."""
+    journal = SpillJournal(str(tmp_path / "spill"))
+    with (
+        patch.object(recorder_mock, "spill_journal", journal),
+        patch.object(recorder_mock, "spill_backlog", 2),
+    ):
+        await async_block_recorder(hass, 0.1)
+        for idx in range(10):
+            hass.states.async_set("test.spill", str(idx), {"idx": idx})
+        assert recorder_mock.async_spill_journal_stats()["spilling"] is True
+
+        now = dt_util.utcnow()
+        for seconds in range(1, 20):
+            async_fire_time_changed(hass, now + timedelta(seconds=seconds))
+            await hass.async_block_till_done(wait_background_tasks=True)
+            await async_wait_recording_done(hass)
+            if not recorder_mock.async_spill_journal_stats()["spilling"]:
+                break
+
+        stats = recorder_mock.async_spill_journal_stats()
+        assert stats["spilling"] is False
+        assert stats["size"] == 0
+        assert stats["spilled"] == stats["replayed"] > 0
+        assert stats["replay_rate"] is not None
+
+    with session_scope(hass=hass, read_only=True) as session:
+        rows = (
+            session.query(States, StateAttributes)
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+            .order_by(States.state_id)
+            .all()
+        )
+    assert [state.state for state, _ in rows] == [str(idx) for idx in range(10)]
+    assert [attributes.shared_attrs for _, attributes in rows] == [
+        f'{{"idx":{idx}}}' for idx in range(10)
+    ]
+    # The replayed states are linked to the states before them
+    assert [state.old_state_id for state, _ in rows][1:] == [
+        state.state_id for state, _ in rows
+    ][:-1]
+
+
+async def test_replay_commit_failure_keeps_events(
+    hass: HomeAssistant, recorder_mock: Recorder, tmp_path: Path
+) -> None:
+    """Test a batch which failed to commit is replayed again."""
+    journal = SpillJournal(str(tmp_path / "spill"))
+    commit = recorder_mock._commit_event_session_or_retry
+    failed_commits = []
+
+    def _fail_first_replay_commit() -> None:
+        # A batch was read from the journal but not marked as read yet
+        if journal._batch_end > journal._read_offset and not failed_commits:
+            failed_commits.append(journal._batch_records)
+            raise SQLAlchemyError("forced to fail")
+        commit()
+
+    with (
+        patch.object(recorder_mock, "spill_journal", journal),
+        patch.object(recorder_mock, "spill_backlog", 2),
+        patch.object(
+            recorder_mock,
+            "_commit_event_session_or_retry",
+            _fail_first_replay_commit,
+        ),
+    ):
+        await async_block_recorder(hass, 0.1)
+        for idx in range(10):
+            hass.states.async_set("test.spill", str(idx))
+
+        now = dt_util.utcnow()
+        for seconds in range(1, 20):
+            async_fire_time_changed(hass, now + timedelta(seconds=seconds))
+            await hass.async_block_till_done(wait_background_tasks=True)
+            await async_wait_recording_done(hass)
+            if not recorder_mock.async_spill_journal_stats()["spilling"]:
+                break
+
+        assert failed_commits
+        assert recorder_mock.async_spill_journal_stats()["spilling"] is False
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = [
+            state.state for state in session.query(States).order_by(States.state_id)
+        ]
+    assert states == [str(idx) for idx in range(10)]
+
+
+async def test_spill_disabled(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test events are always queued when spilling is disabled."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_SPILL_BACKLOG: 0}
+    )
+    assert instance.spill_journal is None
+    assert instance.async_spill_journal_stats() is None
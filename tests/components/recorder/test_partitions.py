@@ -0,0 +1,163 @@
+"""Test the time partitioned states and events tables."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from homeassistant.components.recorder import Recorder, partitions
+from homeassistant.components.recorder.db_schema import Base, StateAttributes
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.mark.parametrize(
+    ("table", "primary_key", "partition_by"),
+    [
+        ("states", "(state_id, last_updated_ts)", "RANGE (last_updated_ts)"),
+        ("events", "(event_id, time_fired_ts)", "RANGE (time_fired_ts)"),
+    ],
+)
+def test_partitioned_table(table: str, primary_key: str, partition_by: str) -> None:
+    """Test the partitioned tables include the partition column in the key."""
+    metadata = MetaData()
+    partitioned = partitions._partitioned_table(Base.metadata.tables[table], metadata)
+
+    create = str(CreateTable(partitioned).compile(dialect=postgresql.dialect()))
+    assert f"PRIMARY KEY {primary_key}" in create
+    assert f"PARTITION BY {partition_by}" in create
+    assert f"DEFAULT nextval('{table}_" in create
+    assert "REFERENCES" not in create
+    assert {index.name for index in partitioned.indexes} == {
+        index.name for index in Base.metadata.tables[table].indexes
+    }
+
+
+def test_partition_start() -> None:
+    """Test the start and name of daily and weekly partitions."""
+    # A Friday
+    point_in_time = datetime(2026, 10, 16, 13, 45, 12, tzinfo=UTC)
+
+    daily = partitions.partition_start(point_in_time, "daily")
+    assert daily == datetime(2026, 10, 16, tzinfo=UTC)
+    assert partitions.partition_name("states", daily) == "states_p20261016"
+    assert partitions.partition_start(point_in_time, "weekly") == datetime(
+        2026, 10, 12, tzinfo=UTC
+    )
+
+
+def test_get_and_ensure_partitions() -> None:
+    """Test listing and creating the partitions ahead of time."""
+    start_ts = datetime(2026, 10, 16, tzinfo=UTC).timestamp()
+    connection = MagicMock()
+    connection.execute.return_value = [
+        ("states_default", "DEFAULT"),
+        (
+            "states_p20261016",
+            f"FOR VALUES FROM ('{start_ts}') TO ('{start_ts + 86400}')",
+        ),
+    ]
+    assert partitions.get_partitions(connection, "states") == [
+        ("states_p20261016", start_ts, start_ts + 86400)
+    ]
+
+    existing = partitions.get_partitions(connection, "states")
+    connection.execute.reset_mock()
+    with patch.object(
+        partitions,
+        "get_partitions",
+        side_effect=lambda connection, table: existing if table == "states" else [],
+    ):
+        partitions.ensure_partitions(
+            connection, "weekly", datetime(2026, 10, 16, 12, tzinfo=UTC)
+        )
+    created = [
+        str(call.args[0])
+        for call in connection.execute.call_args_list
+        if str(call.args[0]).startswith("CREATE TABLE")
+    ]
+    # The week of the existing daily partition is not created for the states
+    assert created == [
+        "CREATE TABLE states_p20261019 PARTITION OF states"
+        f" FOR VALUES FROM ({start_ts + 3 * 86400}) TO ({start_ts + 10 * 86400})",
+        "CREATE TABLE events_p20261012 PARTITION OF events"
+        f" FOR VALUES FROM ({start_ts - 4 * 86400}) TO ({start_ts + 3 * 86400})",
+        "CREATE TABLE events_p20261019 PARTITION OF events"
+        f" FOR VALUES FROM ({start_ts + 3 * 86400}) TO ({start_ts + 10 * 86400})",
+    ]
+
+
+def test_setup_partitioned_tables_not_supported(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the tables are not partitioned with SQLite."""
+    engine = create_engine("sqlite://")
+
+    assert partitions.setup_partitioned_tables(engine, "daily") is None
+    assert "only supported with PostgreSQL" in caplog.text
+
+
+async def test_purge_drops_expired_partitions(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the purge drops the partitions before purge_before."""
+    hass.states.async_set("test.partition", "on", {"keep": True})
+    await async_wait_recording_done(hass)
+    with session_scope(hass=hass) as session:
+        session.add(StateAttributes(shared_attrs='{"dropped":true}', hash=1234))
+    with session_scope(hass=hass) as session:
+        attributes_ids = {
+            attributes.shared_attrs: attributes.attributes_id
+            for attributes in session.query(StateAttributes)
+        }
+    last_committed_id = recorder_mock.states_manager._last_committed_id[
+        "test.partition"
+    ]
+    purge_before = dt_util.utcnow() - timedelta(days=1)
+
+    def _expired_partitions(
+        connection: MagicMock, table: str, before: float
+    ) -> list[str]:
+        assert before == purge_before.timestamp()
+        return [f"{table}_p20261016"]
+
+    def _select_distinct_ids(
+        connection: MagicMock, partition: str, column: str
+    ) -> set[int]:
+        return set(attributes_ids.values()) if column == "attributes_id" else set()
+
+    with (
+        patch.object(recorder_mock, "partition_interval", "daily"),
+        patch.object(partitions, "expired_partitions", _expired_partitions),
+        patch.object(partitions, "select_distinct_ids", _select_distinct_ids),
+        patch.object(partitions, "select_max_id", return_value=last_committed_id),
+        patch.object(partitions, "drop_partition") as drop_partition,
+    ):
+        purge_old_data(recorder_mock, purge_before, repack=False)
+
+    assert [call.args[1] for call in drop_partition.call_args_list] == [
+        "states_p20261016",
+        "events_p20261016",
+    ]
+    assert "test.partition" not in recorder_mock.states_manager._last_committed_id
+    with session_scope(hass=hass) as session:
+        # The attributes still used by a state are kept
+        assert [
+            attributes.shared_attrs for attributes in session.query(StateAttributes)
+        ] == ['{"keep":true}']
@@ -25,7 +25,7 @@ from homeassistant.components.recorder.db_schema import (
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import PurgeProgress, purge_old_data
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
@@ -45,6 +45,7 @@ from .common import (
     convert_pending_states_to_meta,
 )
 
+from tests.common import async_fire_time_changed
 from tests.typing import RecorderInstanceGenerator
 
 TEST_EVENT_TYPES = (
@@ -110,6 +111,130 @@ async def test_purge_big_database(hass: HomeAssistant, recorder_mock: Recorder)
             assert state_attributes.count() == 1
 
 
+async def test_purge_progress(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test the progress of an unfinished purge."""
+    for _ in range(12):
+        await _add_test_states(hass, wait_recording_done=False)
+    await async_wait_recording_done(hass)
+    utcnow = dt_util.utcnow()
+    purge_before = utcnow - timedelta(days=4)
+
+    with (
+        patch.object(recorder_mock, "max_bind_vars", 72),
+        patch.object(recorder_mock.database_engine, "max_bind_vars", 72),
+    ):
+        finished = purge_old_data(
+            recorder_mock,
+            purge_before,
+            states_batch_size=1,
+            events_batch_size=1,
+            repack=False,
+        )
+        assert not finished
+
+    progress = recorder_mock.purge_progress
+    assert progress is not None
+    assert progress.purge_before == purge_before.timestamp()
+    assert progress.oldest_ts == pytest.approx(
+        (utcnow - timedelta(days=11)).timestamp(), abs=60
+    )
+    assert progress.rows_purged == progress.cycle_rows_purged == 48
+    assert progress.events_watermark_ts == purge_before.timestamp()
+    assert progress.watermark_ts == pytest.approx(
+        (utcnow - timedelta(days=5)).timestamp(), abs=60
+    )
+    with session_scope(hass=hass) as session:
+        remaining_state_ids = {
+            state_id for (state_id,) in session.query(States.state_id)
+        }
+    assert len(remaining_state_ids) == 24
+    assert progress.last_state_id not in remaining_state_ids
+
+    progress_dict = progress.as_dict()
+    assert progress_dict["purge_before"] == purge_before.isoformat()
+    assert progress_dict["rows_purged"] == 48
+    # Six of the seven days are purged
+    assert progress_dict["rows_remaining"] == 8
+    assert progress_dict["eta"] is not None
+
+    assert purge_old_data(recorder_mock, purge_before, repack=False)
+    assert recorder_mock.purge_progress is None
+
+
+def test_purge_progress_without_rows() -> None:
+    """Test the progress before any rows are purged."""
+    purge_before = dt_util.utcnow()
+    assert PurgeProgress(purge_before.timestamp()).as_dict() == {
+        "purge_before": purge_before.isoformat(),
+        "watermark": None,
+        "last_state_id": None,
+        "last_event_id": None,
+        "rows_purged": 0,
+        "rows_remaining": None,
+        "eta": None,
+    }
+
+
+async def test_purge_task_yields_to_backlog(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the purge task waits while the backlog is above the threshold."""
+    await _add_test_states(hass)
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+
+    with patch.object(recorder_mock, "purge_yield_backlog", -1):
+        recorder_mock.queue_task(PurgeTask(purge_before, False, False))
+        await async_wait_purge_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 6
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await async_wait_purge_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
+async def test_purge_task_rows_per_second(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the purge task keeps to the configured rows per second."""
+    await _add_test_states(hass)
+    await _add_test_events(hass)
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with session_scope(hass=hass) as session:
+        events = session.query(Events).count()
+
+    with (
+        patch.object(recorder_mock, "purge_max_rows_per_second", 1),
+        patch.object(recorder_mock, "max_bind_vars", 2),
+        patch.object(recorder_mock.database_engine, "max_bind_vars", 2),
+    ):
+        recorder_mock.queue_task(PurgeTask(purge_before, False, False))
+        await async_wait_purge_done(hass)
+
+        # A single batch of states and events is purged in each cycle
+        progress = recorder_mock.purge_progress
+        assert progress is not None
+        assert progress.rows_purged == 4
+        with session_scope(hass=hass) as session:
+            assert session.query(States).count() == 4
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+        await async_wait_purge_done(hass)
+        assert progress.rows_purged == 8
+
+        for _ in range(3):
+            async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+            await async_wait_purge_done(hass)
+
+    assert recorder_mock.purge_progress is None
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+        assert session.query(Events).count() == events - 4
+
+
 async def test_purge_old_states(hass: HomeAssistant, recorder_mock: Recorder) -> None:
     """Test deleting old states."""
     await _add_test_states(hass)
@@ -29,6 +29,7 @@ from homeassistant.components.recorder.statistics import (
     get_metadata,
     get_metadata_with_session,
     get_short_term_statistics_run_cache,
+    get_statistics_rollup_cache,
     list_statistic_ids,
     validate_statistics,
 )
@@ -1844,6 +1845,93 @@ async def test_monthly_statistics_sum(
     assert stats == {}
 
 
+@pytest.mark.freeze_time("2021-12-15 00:00:00+00:00")
+async def test_monthly_statistics_rollup_cache(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test monthly statistics are cached until the statistics change."""
+    await async_wait_recording_done(hass)
+    statistic_id = "test:total_energy_import"
+    external_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": statistic_id,
+        "unit_of_measurement": "kWh",
+    }
+    months = [
+        dt_util.as_utc(dt_util.parse_datetime(f"2021-{month:02}-01 00:00:00"))
+        for month in (9, 10, 11, 12)
+    ]
+    async_add_external_statistics(
+        hass,
+        external_metadata,
+        [
+            {"start": start, "state": idx, "sum": idx + 1}
+            for idx, start in enumerate(months)
+        ],
+    )
+    await async_wait_recording_done(hass)
+    rollup_cache = get_statistics_rollup_cache(hass)
+    # December has not been compiled yet
+    rollup_cache.set_compiled_until(months[3].timestamp())
+
+    def _monthly_sums() -> list[float]:
+        stats = statistics_during_period(
+            hass, months[0], period="month", statistic_ids={statistic_id}
+        )
+        return [row["sum"] for row in stats[statistic_id]]
+
+    assert _monthly_sums() == [1.0, 2.0, 3.0, 4.0]
+
+    # Only the hourly statistics after the cached months are read
+    with patch.object(
+        statistics,
+        "_generate_statistics_during_period_stmt",
+        wraps=_generate_statistics_during_period_stmt,
+    ) as generate_stmt:
+        assert _monthly_sums() == [1.0, 2.0, 3.0, 4.0]
+    assert [call.args[0] for call in generate_stmt.call_args_list] == [months[3]]
+
+    # The rollups are dropped when the statistics are imported or adjusted
+    async_add_external_statistics(
+        hass, external_metadata, [{"start": months[0], "state": 0, "sum": 10}]
+    )
+    await async_wait_recording_done(hass)
+    assert _monthly_sums() == [10.0, 2.0, 3.0, 4.0]
+
+    recorder.get_instance(hass).async_adjust_statistics(
+        statistic_id, months[1], 5, "kWh"
+    )
+    await async_wait_recording_done(hass)
+    assert _monthly_sums() == [10.0, 7.0, 8.0, 9.0]
+
+
+def test_statistics_rollup_cache_generation() -> None:
+    """Test a rollup read before the statistics changed is not cached."""
+    rollup_cache = statistics.StatisticsRollupCache()
+    key = ("sensor.energy", "month")
+    rollup = statistics.StatisticsRollup(0, 10, [])
+
+    generation = rollup_cache.generation("sensor.energy")
+    rollup_cache.invalidate(["sensor.energy"])
+    rollup_cache.set(key, rollup, generation)
+    assert rollup_cache.get(key) is None
+
+    generation = rollup_cache.generation("sensor.energy")
+    rollup_cache.clear()
+    rollup_cache.set(key, rollup, generation)
+    assert rollup_cache.get(key) is None
+
+    rollup_cache.set(key, rollup, rollup_cache.generation("sensor.energy"))
+    assert rollup_cache.get(key) is rollup
+    rollup_cache.invalidate(["sensor.other"])
+    assert rollup_cache.get(key) is rollup
+    rollup_cache.invalidate(["sensor.energy"])
+    assert rollup_cache.get(key) is None
+
+
 def test_cache_key_for_generate_statistics_during_period_stmt() -> None:
     """Test cache key for _generate_statistics_during_period_stmt."""
     stmt = _generate_statistics_during_period_stmt(
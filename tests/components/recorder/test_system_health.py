@@ -128,3 +128,25 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
     }
+
+
+async def test_recorder_system_health_spill_journal(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test recorder system health shows the spill journal while it is used."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    with patch.object(
+        recorder_mock,
+        "async_spill_journal_stats",
+        return_value={
+            "spilling": True,
+            "size": 3 * 1024 * 1024,
+            "spilled": 3000,
+            "replayed": 1000,
+            "replay_rate": 1234.4,
+        },
+    ):
+        info = await get_system_health_info(hass, "recorder")
+    assert info["spill_journal_size"] == "3.00 MiB"
+    assert info["spill_journal_replay_rate"] == "1234 events/s"
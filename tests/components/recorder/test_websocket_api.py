@@ -13,6 +13,7 @@ import pytest
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.db_schema import Statistics, StatisticsShortTerm
+from homeassistant.components.recorder.purge import PurgeProgress
 from homeassistant.components.recorder.statistics import (
     async_add_external_statistics,
     get_last_statistics,
@@ -2555,14 +2556,42 @@ async def test_recorder_info(
     await client.send_json_auto_id({"type": "recorder/info"})
     response = await client.receive_json()
     assert response["success"]
+    read_executor = response["result"].pop("read_executor")
+    caches = response["result"].pop("caches")
     assert response["result"] == {
         "backlog": 0,
         "max_backlog": 65000,
         "migration_in_progress": False,
         "migration_is_live": False,
+        "purge": None,
         "recording": True,
+        "spill_journal": {
+            "spilling": False,
+            "size": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "replay_rate": None,
+        },
         "thread_running": True,
     }
+    assert read_executor["max_workers"] == recorder_mock.db_read_workers
+    assert read_executor["queued"] == 0
+    assert set(caches) == {
+        "event_data",
+        "event_types",
+        "state_attributes",
+        "states_meta",
+    }
+    assert caches["states_meta"]["evictions"] == 0
+
+    recorder_mock.purge_progress = PurgeProgress(
+        dt_util.utcnow().timestamp(), rows_purged=10
+    )
+    await client.send_json_auto_id({"type": "recorder/info"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["purge"]["rows_purged"] == 10
+    assert response["result"]["purge"]["rows_remaining"] is None
 
 
 async def test_recorder_info_no_recorder(
@@ -0,0 +1,52 @@
+"""Test template diagnostics."""
+
+from homeassistant.components import template
+from homeassistant.core import HomeAssistant
+
+from tests.common import MockConfigEntry
+from tests.components.diagnostics import get_diagnostics_for_config_entry
+from tests.typing import ClientSessionGenerator
+
+
+async def test_diagnostics(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator
+) -> None:
+    """Test the render counts of the templates are reported."""
+    state_template = "{{ float(states('sensor.one')) + float(states('sensor.two')) }}"
+    hass.states.async_set("sensor.one", "10")
+    hass.states.async_set("sensor.two", "20")
+
+    template_config_entry = MockConfigEntry(
+        data={},
+        domain=template.DOMAIN,
+        options={
+            "name": "My template",
+            "state": state_template,
+            "template_type": "sensor",
+        },
+        title="My template",
+    )
+    template_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(template_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Both changes are rendered once
+    hass.states.async_set("sensor.one", "11")
+    hass.states.async_set("sensor.two", "21")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.my_template").state == "32.0"
+
+    diagnostics = await get_diagnostics_for_config_entry(
+        hass, hass_client, template_config_entry
+    )
+    assert diagnostics["options"] == template_config_entry.options
+    templates = diagnostics["entities"]["sensor.my_template"]["templates"]
+    assert [
+        (
+            template_stats["template"],
+            template_stats["renders"],
+            template_stats["worker_renders"],
+        )
+        for template_stats in templates
+    ] == [(state_template, 3, 0)]
+    assert templates[0]["render_time"] >= templates[0]["last_render_time"] > 0
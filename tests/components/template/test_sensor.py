@@ -25,6 +25,7 @@ from homeassistant.core import Context, CoreState, HomeAssistant, State, callbac
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entity_component import async_update_entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_template_result
 from homeassistant.helpers.template import Template
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.setup import ATTR_COMPONENT, async_setup_component
@@ -609,6 +610,37 @@ async def test_no_template_match_all(
     assert hass.states.get("sensor.invalid_attribute").state == "hello"
 
 
+async def test_render_in_worker_option(hass: HomeAssistant) -> None:
+    """Test templates are only rendered in the worker when the sensor opts in."""
+    with patch(
+        "homeassistant.components.template.template_entity.async_track_template_result",
+        wraps=async_track_template_result,
+    ) as mock_track:
+        assert await async_setup_component(
+            hass,
+            template.DOMAIN,
+            {
+                "template": {
+                    "sensor": [
+                        {
+                            "name": "in_worker",
+                            "state": "{{ states('sensor.one') }}",
+                            "render_in_worker": True,
+                        },
+                        {"name": "in_loop", "state": "{{ states('sensor.two') }}"},
+                    ]
+                }
+            },
+        )
+        await hass.async_block_till_done()
+        await hass.async_start()
+        await hass.async_block_till_done()
+
+    assert sorted(
+        call.kwargs["render_in_worker"] for call in mock_track.call_args_list
+    ) == [False, True]
+
+
 @pytest.mark.parametrize(("count", "domain"), [(1, "template")])
 @pytest.mark.parametrize(
     "config",
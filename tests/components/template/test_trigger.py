@@ -71,6 +71,40 @@ async def test_if_fires_on_change_bool(
     assert calls[0].data["id"] == 0
 
 
+@pytest.mark.parametrize(("count", "domain"), [(1, automation.DOMAIN)])
+@pytest.mark.parametrize(
+    "config",
+    [
+        {
+            automation.DOMAIN: {
+                "trigger": {
+                    "platform": "template",
+                    "value_template": '{{ is_state("binary_sensor.door", "on") }}',
+                },
+                "action": {
+                    "service": "test.automation",
+                    "data_template": {"to": "{{ trigger.to_state.state }}"},
+                },
+            }
+        },
+    ],
+)
+@pytest.mark.usefixtures("start_ha")
+async def test_if_fires_on_change_within_one_iteration(
+    hass: HomeAssistant, calls: list[ServiceCall]
+) -> None:
+    """Test for firing on a change which is undone in the same loop iteration."""
+    hass.states.async_set("binary_sensor.door", "off")
+    await hass.async_block_till_done()
+
+    hass.states.async_set("binary_sensor.door", "on")
+    # The door closes again in the same event loop iteration
+    hass.loop.call_soon(hass.states.async_set, "binary_sensor.door", "off")
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    assert calls[0].data["to"] == "on"
+
+
 @pytest.mark.parametrize(("count", "domain"), [(1, automation.DOMAIN)])
 @pytest.mark.parametrize(
     ("config", "call_setup"),
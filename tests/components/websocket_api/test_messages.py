@@ -10,6 +10,8 @@ from homeassistant.components.websocket_api.messages import (
 )
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import Context, Event, HomeAssistant, State, callback
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
 
 from tests.common import async_capture_events
 
@@ -83,6 +85,19 @@ async def test_cached_event_message_with_different_idens(hass: HomeAssistant) ->
     assert cache_info.currsize == 1
 
 
+async def test_cached_event_message_body(hass: HomeAssistant) -> None:
+    """Test the cached message body only needs the id prepended."""
+    events = async_capture_events(hass, "test_event")
+    hass.bus.async_fire("test_event", {"key": "value"})
+    await hass.async_block_till_done()
+
+    msg = cached_event_message(b"5", events[0])
+    assert msg == b"".join(
+        (b'{"id":5,"type":"event","event":', json_bytes(events[0]), b"}")
+    )
+    assert json_loads(msg)["event"]["data"] == {"key": "value"}
+
+
 async def test_state_diff_event(hass: HomeAssistant) -> None:
     """Test building state_diff_message."""
     state_change_events = async_capture_events(hass, EVENT_STATE_CHANGED)
@@ -4,6 +4,7 @@ from collections import OrderedDict
 from datetime import timedelta
 import logging
 import re
+from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
 
 from freezegun import freeze_time
@@ -14,6 +15,7 @@ from homeassistant.const import (
     ENTITY_MATCH_ALL,
     ENTITY_MATCH_NONE,
     EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
 )
 from homeassistant.core import (
     HomeAssistant,
@@ -35,6 +37,7 @@ from tests.common import (
     MockEntity,
     MockModule,
     MockPlatform,
+    async_capture_events,
     async_fire_time_changed,
     mock_integration,
     mock_platform,
@@ -556,6 +559,135 @@ async def test_register_entity_service(
     assert len(calls) == 2
 
 
+async def test_entity_service_batch(hass: HomeAssistant) -> None:
+    """Test entity classes can handle an entity service for a batch of entities."""
+    batches = []
+    single_calls = []
+
+    class BatchMockEntity(MockEntity):
+        """Mock entity handling set_level for all its entities at once."""
+
+        _entity_service_batch_methods = frozenset({"async_set_level"})
+
+        async def async_set_level(self, level: int) -> None:
+            """Set the level of a single entity."""
+            single_calls.append(self.entity_id)
+            self._attr_state = str(level)
+            self.async_write_ha_state()
+
+        @classmethod
+        async def async_handle_entity_service_batch(
+            cls, method: str, entities: list[MockEntity], data: dict[str, Any]
+        ) -> None:
+            """Set the level of a batch of entities."""
+            batches.append((method, [entity.entity_id for entity in entities], data))
+            for entity in entities:
+                entity._attr_state = str(data["level"])
+
+    batch_entities = [
+        BatchMockEntity(entity_id=f"{DOMAIN}.batch_{idx}") for idx in range(3)
+    ]
+    other_entity = MockEntity(entity_id=f"{DOMAIN}.other")
+    other_calls = []
+
+    async def set_level(level: int) -> None:
+        other_calls.append(level)
+
+    other_entity.async_set_level = set_level
+
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+    await component.async_setup({})
+    await component.async_add_entities([*batch_entities, other_entity])
+    component.async_register_entity_service(
+        "set_level", {vol.Required("level"): int}, "async_set_level"
+    )
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    with patch(
+        "homeassistant.helpers.service.trace_update_result"
+    ) as trace_update_result:
+        await hass.services.async_call(
+            DOMAIN, "set_level", {"entity_id": "all", "level": 5}, blocking=True
+        )
+
+    assert batches == [
+        (
+            "async_set_level",
+            [f"{DOMAIN}.batch_0", f"{DOMAIN}.batch_1", f"{DOMAIN}.batch_2"],
+            {"level": 5},
+        )
+    ]
+    assert single_calls == []
+    assert other_calls == [5]
+    assert [event.data["entity_id"] for event in events] == [
+        f"{DOMAIN}.batch_0",
+        f"{DOMAIN}.batch_1",
+        f"{DOMAIN}.batch_2",
+    ]
+    for entity in batch_entities:
+        assert hass.states.get(entity.entity_id).state == "5"
+
+    trace = trace_update_result.mock_calls[-1].kwargs["entity_service_call"]
+    assert trace["entities"] == 4
+    assert trace["batched_entities"] == 3
+    assert trace["call_time"] >= 0
+    assert trace["update_time"] >= 0
+
+    # A single targeted entity is called without batching or tracing
+    with patch(
+        "homeassistant.helpers.service.trace_update_result"
+    ) as trace_update_result:
+        await hass.services.async_call(
+            DOMAIN,
+            "set_level",
+            {"entity_id": f"{DOMAIN}.batch_1", "level": 3},
+            blocking=True,
+        )
+    assert not trace_update_result.mock_calls
+    assert len(batches) == 1
+    assert single_calls == [f"{DOMAIN}.batch_1"]
+    assert hass.states.get(f"{DOMAIN}.batch_1").state == "3"
+
+
+async def test_entity_service_batch_default(hass: HomeAssistant) -> None:
+    """Test the default batch handler calls the method of each entity."""
+    calls = []
+
+    class BatchMockEntity(MockEntity):
+        """Mock entity batching set_level without a batch handler."""
+
+        _entity_service_batch_methods = frozenset({"async_set_level"})
+
+        async def async_set_level(self, level: int) -> None:
+            """Set the level of a single entity."""
+            calls.append((self.entity_id, level))
+            self._attr_state = str(level)
+            self.async_write_ha_state()
+
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+    await component.async_setup({})
+    await component.async_add_entities(
+        [
+            BatchMockEntity(entity_id=f"{DOMAIN}.batch_{idx}", should_poll=False)
+            for idx in range(2)
+        ]
+    )
+    component.async_register_entity_service(
+        "set_level", {vol.Required("level"): int}, "async_set_level"
+    )
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    await hass.services.async_call(
+        DOMAIN, "set_level", {"entity_id": "all", "level": 5}, blocking=True
+    )
+    assert sorted(calls) == [(f"{DOMAIN}.batch_0", 5), (f"{DOMAIN}.batch_1", 5)]
+    # The states written by the entity methods are not written again
+    assert len(events) == 2
+    for idx in range(2):
+        state = hass.states.get(f"{DOMAIN}.batch_{idx}")
+        assert state.last_reported == state.last_updated
+
+
 async def test_register_entity_service_non_entity_service_schema(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -13,7 +13,7 @@ from freezegun.api import FrozenDateTimeFactory
 import jinja2
 import pytest
 
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import (
     Event,
@@ -23,13 +23,16 @@ from homeassistant.core import (
     callback,
 )
 from homeassistant.exceptions import TemplateError
+from homeassistant.helpers import template_worker
 from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    _TEMPLATE_RENDER_SCHEDULER,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_pending_timer_counts,
     async_track_device_registry_updated_event,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
@@ -50,8 +53,10 @@ from homeassistant.helpers.event import (
     async_track_utc_time_change,
     track_point_in_utc_time,
 )
-from homeassistant.helpers.template import Template, result_as_boolean
+from homeassistant.helpers.template import RenderInfo, Template, result_as_boolean
+from homeassistant.helpers.typing import TemplateVarsType
 from homeassistant.setup import async_setup_component
+from homeassistant.util.async_ import get_scheduled_timer_handles
 import homeassistant.util.dt as dt_util
 
 from tests.common import async_fire_time_changed, async_fire_time_changed_exact
@@ -111,6 +116,134 @@ async def test_track_point_in_time(hass: HomeAssistant) -> None:
     assert len(runs) == 2
 
 
+async def test_track_point_in_utc_time_coalesced(hass: HomeAssistant) -> None:
+    """Test point in time timers in the same second share a loop timer."""
+    now = dt_util.utcnow()
+    second = datetime(now.year + 1, 5, 24, 21, 59, 55, tzinfo=dt_util.UTC)
+    runs = []
+
+    def _track(point_in_time: datetime, name: str) -> Callable[[], None]:
+        return async_track_point_in_utc_time(
+            hass, callback(lambda _: runs.append(name)), point_in_time
+        )
+
+    def _active_handles() -> int:
+        return sum(
+            not handle.cancelled() for handle in get_scheduled_timer_handles(hass.loop)
+        )
+
+    handles_before = _active_handles()
+    _track(second + timedelta(microseconds=800000), "late")
+    _track(second + timedelta(microseconds=200000), "early")
+    unsub_cancelled = _track(second + timedelta(microseconds=500000), "cancelled")
+    _track(second + timedelta(seconds=1), "next second")
+    assert _active_handles() == handles_before + 2
+
+    unsub_cancelled()
+    # Cancelling twice is a no-op
+    unsub_cancelled()
+
+    async_fire_time_changed_exact(hass, second + timedelta(microseconds=500000))
+    await hass.async_block_till_done()
+    assert runs == ["early"]
+
+    async_fire_time_changed_exact(hass, second + timedelta(microseconds=900000))
+    await hass.async_block_till_done()
+    assert runs == ["early", "late"]
+
+    async_fire_time_changed_exact(hass, second + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert runs == ["early", "late", "next second"]
+
+
+async def test_track_point_in_utc_time_cancel_empties_bucket(
+    hass: HomeAssistant,
+) -> None:
+    """Test cancelling all timers of a second cancels its loop timer."""
+
+    def _active_handles() -> int:
+        return sum(
+            not handle.cancelled() for handle in get_scheduled_timer_handles(hass.loop)
+        )
+
+    point_in_time = dt_util.utcnow() + timedelta(hours=1)
+    handles_before = _active_handles()
+    unsubs = [
+        async_track_point_in_utc_time(
+            hass, callback(lambda _: None), point_in_time + timedelta(microseconds=idx)
+        )
+        for idx in range(3)
+    ]
+    assert _active_handles() == handles_before + 1
+    for unsub in unsubs:
+        unsub()
+    assert _active_handles() == handles_before
+
+
+async def test_track_point_in_utc_time_cancelled_by_due_timer(
+    hass: HomeAssistant,
+) -> None:
+    """Test a timer cancelled by a timer firing in the same bucket does not run."""
+    now = dt_util.utcnow()
+    second = datetime(now.year + 1, 5, 24, 21, 59, 55, tzinfo=dt_util.UTC)
+    runs = []
+
+    @callback
+    def _cancel_second(_: datetime) -> None:
+        runs.append("first")
+        unsub_second()
+
+    async_track_point_in_utc_time(
+        hass, _cancel_second, second + timedelta(microseconds=200000)
+    )
+    unsub_second = async_track_point_in_utc_time(
+        hass,
+        callback(lambda _: runs.append("second")),
+        second + timedelta(microseconds=400000),
+    )
+
+    async_fire_time_changed_exact(hass, second + timedelta(microseconds=500000))
+    await hass.async_block_till_done()
+    assert runs == ["first"]
+
+
+async def test_async_pending_timer_counts(hass: HomeAssistant) -> None:
+    """Test counting pending timers per integration."""
+
+    def _action(module: str) -> Callable[[datetime], None]:
+        @callback
+        def action(now: datetime) -> None:
+            """Handle the timer."""
+
+        action.__module__ = module
+        return action
+
+    unsubs = [
+        async_call_later(hass, 10, _action("homeassistant.components.demo.sensor")),
+        async_track_point_in_utc_time(
+            hass,
+            _action("homeassistant.components.demo.light"),
+            dt_util.utcnow() + timedelta(hours=1),
+        ),
+        async_track_time_interval(
+            hass, _action("custom_components.my_timer"), timedelta(minutes=1)
+        ),
+        async_track_utc_time_change(
+            hass, _action("custom_components.my_timer.sensor"), second=5
+        ),
+    ]
+
+    counts = async_pending_timer_counts(hass)
+    assert counts["demo"] == 2
+    assert counts["my_timer"] == 2
+
+    for unsub in unsubs:
+        unsub()
+    counts = async_pending_timer_counts(hass)
+    assert "demo" not in counts
+    assert "my_timer" not in counts
+
+
 async def test_track_point_in_time_drift_rearm(hass: HomeAssistant) -> None:
     """Test tasks with the time rolling backwards."""
     specific_runs = []
@@ -537,6 +670,52 @@ async def test_async_track_state_change_event(hass: HomeAssistant) -> None:
     unsub_throws()
 
 
+async def test_async_track_state_change_event_uses_bus_index(
+    hass: HomeAssistant,
+) -> None:
+    """Test tracked entity ids are dispatched by the entity index of the bus."""
+    listeners = hass.bus.async_listeners()
+    calls = []
+
+    @ha.callback
+    def run_callback(event: Event[EventStateChangedData]) -> None:
+        calls.append(event.data["entity_id"])
+
+    unsub_one = async_track_state_change_event(
+        hass, ["light.one", "light.two"], run_callback
+    )
+    unsub_two = async_track_state_change_event(hass, "light.two", run_callback)
+    unsub_domain = async_track_state_added_domain(hass, ["switch", "fan"], run_callback)
+    # Every tracker adds its keys to the index with a single listener
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == (
+        listeners.get(EVENT_STATE_CHANGED, 0) + 2
+    )
+    keyed_listeners = hass.bus._entity_keyed_listeners[EVENT_STATE_CHANGED]
+    assert set(keyed_listeners.by_entity_id) == {"light.one", "light.two"}
+    assert set(keyed_listeners.by_domain) == {"switch", "fan"}
+
+    hass.states.async_set("light.two", "on")
+    hass.states.async_set("light.three", "on")
+    hass.states.async_set("switch.new", "on")
+    await hass.async_block_till_done()
+    assert sorted(calls) == ["light.two", "light.two", "switch.new"]
+
+    # MATCH_ALL runs once for domains which are in the index as well
+    calls.clear()
+    unsub_all = async_track_state_added_domain(hass, MATCH_ALL, run_callback)
+    hass.states.async_set("fan.new", "on")
+    hass.states.async_set("cover.new", "open")
+    await hass.async_block_till_done()
+    assert sorted(calls) == ["cover.new", "fan.new", "fan.new"]
+    unsub_all()
+
+    unsub_two()
+    assert set(keyed_listeners.by_entity_id) == {"light.one", "light.two"}
+    unsub_one()
+    unsub_domain()
+    assert hass.bus.async_listeners() == listeners
+
+
 async def test_async_track_state_change_event_with_empty_list(
     hass: HomeAssistant,
 ) -> None:
@@ -3259,6 +3438,255 @@ async def test_async_track_template_result_multiple_templates_mixing_domain(
     ]
 
 
+async def test_async_track_template_result_renders_once_per_iteration(
+    hass: HomeAssistant,
+) -> None:
+    """Test state changes in one loop iteration re-render a template once."""
+    template_sum = Template(
+        "{{ states('sensor.one') | int + states('sensor.two') | int }}", hass
+    )
+    refresh_runs: list[tuple[str | None, int]] = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append((event and event.data["entity_id"], updates.pop().result))
+
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template_sum, None)],
+        refresh_listener,
+        entity_id="sensor.sum",
+    )
+    await hass.async_block_till_done()
+    assert info.render_stats[template_sum].renders == 1
+
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+    hass.states.async_set("sensor.one", "3")
+    await hass.async_block_till_done()
+    assert refresh_runs == [("sensor.one", 5)]
+    assert info.render_stats[template_sum].renders == 2
+    assert info.render_stats[template_sum].render_time > 0
+
+    # A tracker removed while a refresh is pending is not refreshed
+    hass.states.async_set("sensor.two", "3")
+    info.async_remove()
+    await hass.async_block_till_done()
+    assert refresh_runs == [("sensor.one", 5)]
+
+
+async def test_async_track_template_result_renders_every_state_change(
+    hass: HomeAssistant,
+) -> None:
+    """Test trackers without an entity re-render for every state change."""
+    template_on = Template("{{ is_state('binary_sensor.door', 'on') }}", hass)
+    refresh_runs: list[bool] = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append(updates.pop().result)
+
+    hass.states.async_set("binary_sensor.door", "off")
+    info = async_track_template_result(
+        hass, [TrackTemplate(template_on, None)], refresh_listener
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("binary_sensor.door", "on")
+    hass.loop.call_soon(hass.states.async_set, "binary_sensor.door", "off")
+    await asyncio.sleep(0)
+    await hass.async_block_till_done()
+    assert refresh_runs == [True, False]
+    info.async_remove()
+
+
+async def test_async_track_template_result_render_in_worker(
+    hass: HomeAssistant,
+) -> None:
+    """Test expensive templates are rendered in the template worker."""
+    template_sum = Template(
+        "{{ states('sensor.one') | int(0) + states('sensor.two') | int(0) }}", hass
+    )
+    worker_results: list[bool] = []
+    refresh_runs: list[int] = []
+
+    async def render_to_info(
+        self: template_worker.TemplateWorker,
+        template: Template,
+        variables: TemplateVarsType,
+        info: RenderInfo,
+    ) -> tuple[RenderInfo, float] | None:
+        if not worker_results.pop(0):
+            return None
+        return template.async_render_to_info(variables), 0.5
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append(updates.pop().result)
+
+    with (
+        patch.object(template_worker, "RENDER_IN_WORKER_THRESHOLD", 0),
+        patch.object(
+            template_worker.TemplateWorker, "async_render_to_info", render_to_info
+        ),
+    ):
+        info = async_track_template_result(
+            hass,
+            [TrackTemplate(template_sum, None)],
+            refresh_listener,
+            render_in_worker=True,
+        )
+        await hass.async_block_till_done()
+        stats = info.render_stats[template_sum]
+        assert (stats.renders, stats.worker_renders) == (1, 0)
+
+        worker_results.append(True)
+        hass.states.async_set("sensor.one", "1")
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert refresh_runs == [1]
+        assert (stats.renders, stats.worker_renders) == (2, 1)
+        assert stats.last_render_time == 0.5
+
+        # A template which cannot be rendered in the worker is rendered
+        # on the event loop instead
+        worker_results.append(False)
+        hass.states.async_set("sensor.two", "2")
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert refresh_runs == [1, 3]
+        assert (stats.renders, stats.worker_renders) == (3, 1)
+        assert stats.last_render_time < 0.5
+        assert not worker_results
+
+        info.async_remove()
+
+
+async def test_async_track_template_result_all_states_not_in_worker(
+    hass: HomeAssistant,
+) -> None:
+    """Test templates iterating all states are not rendered in the worker."""
+    template_count = Template("{{ states | count }}", hass)
+    refresh_runs: list[int] = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        refresh_runs.append(updates.pop().result)
+
+    with (
+        patch.object(template_worker, "RENDER_IN_WORKER_THRESHOLD", 0),
+        patch.object(
+            template_worker.TemplateWorker, "async_render_to_info"
+        ) as mock_render_to_info,
+    ):
+        info = async_track_template_result(
+            hass,
+            [TrackTemplate(template_count, None)],
+            refresh_listener,
+            render_in_worker=True,
+        )
+        await hass.async_block_till_done()
+        hass.states.async_set("sensor.one", "1")
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert refresh_runs == [1]
+    mock_render_to_info.assert_not_called()
+    info.async_remove()
+
+
+async def test_async_track_template_result_dependency_order(
+    hass: HomeAssistant,
+) -> None:
+    """Test templates depending on a template entity render after its templates."""
+    template_dependent = Template(
+        "{{ states('sensor.source') }}-{{ states('sensor.derived') }}", hass
+    )
+    template_derived = Template("{{ states('sensor.source') }}", hass)
+    results: list[str] = []
+
+    @ha.callback
+    def dependent_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        results.append(updates.pop().result)
+
+    @ha.callback
+    def derived_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        hass.states.async_set("sensor.derived", updates.pop().result)
+
+    # The dependent tracker is set up first so it would be refreshed first
+    dependent_info = async_track_template_result(
+        hass,
+        [TrackTemplate(template_dependent, None)],
+        dependent_listener,
+        entity_id="sensor.dependent",
+    )
+    async_track_template_result(
+        hass,
+        [TrackTemplate(template_derived, None)],
+        derived_listener,
+        entity_id="sensor.derived",
+    )
+    dependent_info.async_refresh()
+    await hass.async_block_till_done()
+    assert results[-1] == "unknown-unknown"
+
+    hass.states.async_set("sensor.source", "on")
+    await hass.async_block_till_done()
+    # The dependent template sees the new state of the derived sensor
+    # when it is first re-rendered, the render for the state change of
+    # the derived sensor does not change the result
+    assert results[-1] == "on-on"
+    assert results.count("on-unknown") == 0
+    assert results.count("on-on") == 1
+
+
+async def test_async_track_template_result_dependents_index(
+    hass: HomeAssistant,
+) -> None:
+    """Test the trackers of entities are indexed by the states they listen for."""
+    template = Template(
+        "{{ states('sensor.source') }}-{{ states.light | count }}"
+        "{{ states('sensor.' ~ states('sensor.source')) }}",
+        hass,
+    )
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template, None)],
+        lambda event, updates: None,
+        entity_id="sensor.dependent",
+    )
+    scheduler = hass.data[_TEMPLATE_RENDER_SCHEDULER]
+    assert list(scheduler._async_dependents("sensor.source")) == [info]
+    assert list(scheduler._async_dependents("light.kitchen")) == [info]
+    assert list(scheduler._async_dependents("switch.other")) == []
+
+    # The index follows the states the templates render
+    hass.states.async_set("sensor.source", "other")
+    await hass.async_block_till_done()
+    assert list(scheduler._async_dependents("sensor.other")) == [info]
+
+    info.async_remove()
+    assert list(scheduler._async_dependents("sensor.source")) == []
+    assert list(scheduler._async_dependents("light.kitchen")) == []
+    assert not scheduler._entity_dependents
+    assert not scheduler._domain_dependents
+
+
 async def test_track_template_with_time(hass: HomeAssistant) -> None:
     """Test tracking template with time."""
 
@@ -0,0 +1,36 @@
+"""Tests for the state index helper."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import state_index
+
+
+async def test_state_index_device_classes(hass: HomeAssistant) -> None:
+    """Test the state index follows the device classes of the states."""
+    hass.states.async_set("sensor.power_1", "1", {"device_class": "power"})
+    hass.states.async_set("sensor.no_device_class", "1")
+
+    index = state_index.async_get(hass)
+    assert index is state_index.async_get(hass)
+    assert index.async_device_class_entities("power") == ["sensor.power_1"]
+
+    hass.states.async_set("binary_sensor.power", "on", {"device_class": "power"})
+    hass.states.async_set("sensor.power_2", "2", {"device_class": "power"})
+    assert index.async_device_class_entities("power") == [
+        "sensor.power_1",
+        "sensor.power_2",
+        "binary_sensor.power",
+    ]
+    assert index.async_device_class_entities("power", ["binary_sensor", "light"]) == [
+        "binary_sensor.power"
+    ]
+
+    # Changing the device class moves the entity
+    hass.states.async_set("sensor.power_1", "1", {"device_class": "energy"})
+    assert index.async_device_class_entities("power", ["sensor"]) == ["sensor.power_2"]
+    assert index.async_device_class_entities("energy") == ["sensor.power_1"]
+
+    hass.states.async_set("sensor.power_2", "2")
+    hass.states.async_remove("binary_sensor.power")
+    hass.states.async_remove("sensor.no_device_class")
+    assert index.async_device_class_entities("power") == []
+    assert index._device_classes == {"energy": {"sensor": {"sensor.power_1": None}}}
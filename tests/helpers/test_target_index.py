@@ -0,0 +1,155 @@
+"""Tests for the target index helper."""
+
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+    label_registry as lr,
+    target_index,
+)
+
+from tests.common import MockConfigEntry
+
+
+async def test_target_index_resolves_targets(
+    hass: HomeAssistant,
+    area_registry: ar.AreaRegistry,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    floor_registry: fr.FloorRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test resolving floor, area, device and label targets."""
+    config_entry = MockConfigEntry(domain="light")
+    config_entry.add_to_hass(hass)
+    floor = floor_registry.async_create("first")
+    label = label_registry.async_create("my label")
+    kitchen = area_registry.async_create(
+        "kitchen", floor_id=floor.floor_id, labels={label.label_id}
+    )
+    hall = area_registry.async_create("hall")
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        connections={(dr.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+    )
+    device_registry.async_update_device(
+        device.id, area_id=kitchen.id, labels={label.label_id}
+    )
+    device_light = entity_registry.async_get_or_create(
+        "light", "hue", "1", config_entry=config_entry, device_id=device.id
+    )
+    hall_light = entity_registry.async_get_or_create(
+        "light", "hue", "2", config_entry=config_entry, device_id=device.id
+    )
+    entity_registry.async_update_entity(hall_light.entity_id, area_id=hall.id)
+    config_sensor = entity_registry.async_get_or_create(
+        "sensor",
+        "hue",
+        "3",
+        config_entry=config_entry,
+        device_id=device.id,
+        entity_category=EntityCategory.CONFIG,
+    )
+    labeled_light = entity_registry.async_get_or_create(
+        "light", "hue", "4", config_entry=config_entry
+    )
+    entity_registry.async_update_entity(
+        labeled_light.entity_id, labels={label.label_id}
+    )
+
+    index = target_index.async_get(hass)
+    assert index is target_index.async_get(hass)
+
+    assert index.async_floor_areas(floor.floor_id) == (kitchen.id,)
+    assert index.async_floor_areas("unknown") == ()
+    assert index.async_area_devices(kitchen.id) == (device.id,)
+    assert index.async_area_entities(kitchen.id) == (
+        device_light.entity_id,
+        config_sensor.entity_id,
+    )
+    assert index.async_area_target_entities(kitchen.id) == {device_light.entity_id}
+    assert index.async_area_entities(hall.id) == (hall_light.entity_id,)
+    assert index.async_device_target_entities(device.id) == {
+        device_light.entity_id,
+        hall_light.entity_id,
+    }
+    assert index.async_label_areas(label.label_id) == (kitchen.id,)
+    assert index.async_label_devices(label.label_id) == (device.id,)
+    assert index.async_label_entities(label.label_id) == (labeled_light.entity_id,)
+    assert index.async_label_target_entities(label.label_id) == {
+        labeled_light.entity_id
+    }
+
+
+async def test_target_index_invalidation(
+    hass: HomeAssistant,
+    area_registry: ar.AreaRegistry,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    floor_registry: fr.FloorRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the index follows registry updates."""
+    config_entry = MockConfigEntry(domain="light")
+    config_entry.add_to_hass(hass)
+    floor = floor_registry.async_create("first")
+    kitchen = area_registry.async_create("kitchen", floor_id=floor.floor_id)
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        connections={(dr.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+    )
+    light = entity_registry.async_get_or_create(
+        "light", "hue", "1", config_entry=config_entry, device_id=device.id
+    )
+
+    index = target_index.async_get(hass)
+    area_entities = index.async_area_entities(kitchen.id)
+    assert area_entities == ()
+
+    # Changes which do not alter any relation keep the cached lookups
+    entity_registry.async_update_entity(light.entity_id, name="Ceiling")
+    device_registry.async_update_device(device.id, name_by_user="Bridge")
+    assert index.async_area_entities(kitchen.id) is area_entities
+
+    # The entities of a device follow the device into an area, the lookups
+    # of other areas are kept
+    hall = area_registry.async_create("hall")
+    hall_entities = index.async_area_entities(hall.id)
+    device_registry.async_update_device(device.id, area_id=kitchen.id)
+    assert index.async_area_entities(kitchen.id) == (light.entity_id,)
+    assert index.async_area_entities(hall.id) is hall_entities
+    assert index.async_area_target_entities(kitchen.id) == {light.entity_id}
+
+    entity_registry.async_update_entity(
+        light.entity_id, hidden_by=er.RegistryEntryHider.USER
+    )
+    assert index.async_area_entities(kitchen.id) == (light.entity_id,)
+    assert index.async_area_target_entities(kitchen.id) == set()
+    assert index.async_device_target_entities(device.id) == set()
+
+    entity_registry.async_update_entity(light.entity_id, new_entity_id="light.renamed")
+    assert index.async_area_entities(kitchen.id) == ("light.renamed",)
+
+    entity_registry.async_remove("light.renamed")
+    assert index.async_area_entities(kitchen.id) == ()
+
+    label = label_registry.async_create("my label")
+    area_registry.async_update(kitchen.id, labels={label.label_id})
+    assert index.async_label_areas(label.label_id) == (kitchen.id,)
+
+    area_registry.async_update(hall.id, floor_id=floor.floor_id)
+    assert index.async_floor_areas(floor.floor_id) == (kitchen.id, hall.id)
+
+    # Moving the device to another area drops the lookups of both areas
+    device_registry.async_update_device(device.id, area_id=hall.id)
+    assert index.async_area_devices(kitchen.id) == ()
+    assert index.async_area_devices(hall.id) == (device.id,)
+
+    floor_registry.async_delete(floor.floor_id)
+    assert index.async_floor_areas(floor.floor_id) == ()
+
+    label_registry.async_delete(label.label_id)
+    assert index.async_label_areas(label.label_id) == ()
@@ -7,12 +7,14 @@ from datetime import datetime, timedelta
 import json
 import logging
 import math
+from pathlib import Path
 import random
 from types import MappingProxyType
 from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
+import jinja2
 import orjson
 import pytest
 from syrupy import SnapshotAssertion
@@ -22,6 +24,7 @@ from homeassistant import config_entries
 from homeassistant.components import group
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
     STATE_ON,
     STATE_UNAVAILABLE,
     UnitOfArea,
@@ -344,6 +347,75 @@ async def test_import_change(hass: HomeAssistant) -> None:
     assert to_test.async_render() == "macro2 variable2"
 
 
+def test_bytecode_cache(tmp_path: Path) -> None:
+    """Test compiled templates are kept on disk and unused ones are dropped."""
+    path = str(tmp_path / ".storage" / "template.bytecode")
+    environment = template.TemplateEnvironment(None)
+    bytecode_cache = template.TemplateBytecodeCache(path)
+    bytecode_cache.load()
+    assert bytecode_cache.get("{{ 1 }}") is None
+    bytecode_cache.set("{{ 1 }}", environment.compile("{{ 1 }}"))
+    bytecode_cache.set("{{ 2 }}", environment.compile("{{ 2 }}"))
+    bytecode_cache.save()
+
+    bytecode_cache = template.TemplateBytecodeCache(path)
+    bytecode_cache.load()
+    code = bytecode_cache.get("{{ 1 }}")
+    assert environment.template_class.from_code(environment, code, {}).render() == "1"
+    assert (bytecode_cache.hits, bytecode_cache.misses) == (1, 0)
+    # Templates which were not used since the start are dropped
+    bytecode_cache.save()
+    bytecode_cache = template.TemplateBytecodeCache(path)
+    bytecode_cache.load()
+    assert bytecode_cache.get("{{ 2 }}") is None
+    assert bytecode_cache.get("{{ 1 }}") is not None
+
+    # Files written by another Jinja or Home Assistant version are ignored
+    with patch.object(template.jinja2, "__version__", "0.0.0"):
+        bytecode_cache = template.TemplateBytecodeCache(path)
+        bytecode_cache.load()
+    assert bytecode_cache.get("{{ 1 }}") is None
+    with patch.object(template, "ha_version", "0.0.0"):
+        bytecode_cache = template.TemplateBytecodeCache(path)
+        bytecode_cache.load()
+    assert bytecode_cache.get("{{ 1 }}") is None
+
+    # The least recently used templates are evicted
+    with patch.object(template, "BYTECODE_CACHE_SIZE", 2):
+        bytecode_cache = template.TemplateBytecodeCache(path)
+    for source in ("{{ 1 }}", "{{ 2 }}", "{{ 3 }}"):
+        bytecode_cache.set(source, environment.compile(source))
+    bytecode_cache.save()
+    bytecode_cache = template.TemplateBytecodeCache(path)
+    bytecode_cache.load()
+    assert bytecode_cache.get("{{ 1 }}") is None
+    assert bytecode_cache.get("{{ 2 }}") is not None
+    assert bytecode_cache.get("{{ 3 }}") is not None
+
+
+async def test_bytecode_cache_shared(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test the environments compile templates through the bytecode cache."""
+    hass.config.config_dir = str(tmp_path)
+    await template.async_load_bytecode_cache(hass)
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    template.TemplateEnvironment(hass, limited=True).compile("{{ 1 + 1 }}")
+    template.TemplateEnvironment(hass, strict=True).compile("{{ 1 + 1 }}")
+    bytecode_cache = hass.data[template._BYTECODE_CACHE]
+    assert (bytecode_cache.hits, bytecode_cache.misses) == (2, 1)
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert (tmp_path / ".storage" / template.BYTECODE_CACHE_FILE).exists()
+
+    hass.data.pop(template._ENVIRONMENT)
+    await template.async_load_bytecode_cache(hass)
+    with patch.object(
+        jinja2.sandbox.ImmutableSandboxedEnvironment, "compile"
+    ) as compile_mock:
+        assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert not compile_mock.called
+
+
 def test_loop_controls(hass: HomeAssistant) -> None:
     """Test that loop controls are enabled."""
     assert (
@@ -5607,47 +5679,46 @@ async def test_render_to_info_with_exception(hass: HomeAssistant) -> None:
     assert info.entities == {"test_domain.object"}
 
 
-async def test_lru_increases_with_many_entities(hass: HomeAssistant) -> None:
-    """Test that the template internal LRU cache increases with many entities."""
-    # We do not actually want to record 4096 entities so we mock the entity count
-    mock_entity_count = 16
-
-    assert template.CACHED_TEMPLATE_LRU.get_size() == template.CACHED_TEMPLATE_STATES
-    assert (
-        template.CACHED_TEMPLATE_NO_COLLECT_LRU.get_size()
-        == template.CACHED_TEMPLATE_STATES
-    )
-    template.CACHED_TEMPLATE_LRU.set_size(8)
-    template.CACHED_TEMPLATE_NO_COLLECT_LRU.set_size(8)
-
+async def test_template_states_cached_per_entity(hass: HomeAssistant) -> None:
+    """Test template states are cached per entity until the state changes."""
     template.async_setup(hass)
-    for i in range(mock_entity_count):
+    for i in range(16):
         hass.states.async_set(f"sensor.sensor{i}", "on")
 
-    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
-    await hass.async_block_till_done()
-
-    assert template.CACHED_TEMPLATE_LRU.get_size() == int(
-        round(mock_entity_count * template.ENTITY_COUNT_GROWTH_FACTOR)
+    tpl = template.Template(
+        "{{ states.sensor | selectattr('state', 'eq', 'on') | list | count }}", hass
     )
-    assert template.CACHED_TEMPLATE_NO_COLLECT_LRU.get_size() == int(
-        round(mock_entity_count * template.ENTITY_COUNT_GROWTH_FACTOR)
+    assert tpl.async_render() == 16
+    template_states = {
+        state.entity_id: state for state in template.AllStates(hass).sensor
+    }
+    assert len(template_states) == 16
+    assert all(
+        template.CACHED_TEMPLATE_NO_COLLECT_STATES[entity_id] is template_state
+        for entity_id, template_state in template_states.items()
+    )
+    assert tpl.async_render() == 16
+    assert (
+        template.CACHED_TEMPLATE_NO_COLLECT_STATES["sensor.sensor0"]
+        is (template_states["sensor.sensor0"])
     )
 
-    await hass.async_stop()
-
-    for i in range(mock_entity_count):
-        hass.states.async_set(f"sensor.sensor_add_{i}", "on")
+    hass.states.async_set("sensor.sensor0", "off")
+    assert tpl.async_render() == 15
+    assert template.CACHED_TEMPLATE_NO_COLLECT_STATES["sensor.sensor0"].state == "off"
+    assert (
+        template.CACHED_TEMPLATE_NO_COLLECT_STATES["sensor.sensor1"]
+        is (template_states["sensor.sensor1"])
+    )
 
-    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=20))
+    hass.states.async_remove("sensor.sensor1")
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
     await hass.async_block_till_done()
+    assert "sensor.sensor1" not in template.CACHED_TEMPLATE_NO_COLLECT_STATES
+    assert "sensor.sensor2" in template.CACHED_TEMPLATE_NO_COLLECT_STATES
 
-    assert template.CACHED_TEMPLATE_LRU.get_size() == int(
-        round(mock_entity_count * template.ENTITY_COUNT_GROWTH_FACTOR)
-    )
-    assert template.CACHED_TEMPLATE_NO_COLLECT_LRU.get_size() == int(
-        round(mock_entity_count * template.ENTITY_COUNT_GROWTH_FACTOR)
-    )
+    await hass.async_stop()
+    assert "sensor.sensor2" not in template.CACHED_TEMPLATE_NO_COLLECT_STATES
 
 
 async def test_floors(
@@ -6224,6 +6295,96 @@ async def test_label_areas(
     assert info.rate_limit is None
 
 
+async def test_states_aggregates(hass: HomeAssistant) -> None:
+    """Test aggregating states by domain, device class and attribute."""
+    hass.states.async_set("sensor.power_1", "10", {"device_class": "power"})
+    hass.states.async_set("sensor.power_2", "20.5", {"device_class": "power"})
+    hass.states.async_set("sensor.power_3", "unavailable", {"device_class": "power"})
+    hass.states.async_set("sensor.energy", "5", {"device_class": "energy"})
+    hass.states.async_set("binary_sensor.power", "on", {"device_class": "power"})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_set("light.hall", "off")
+
+    filters = "domain='sensor', device_class='power'"
+    assert render(hass, f"{{{{ states_sum({filters}) }}}}") == 30.5
+    assert render(hass, f"{{{{ states_average({filters}) }}}}") == 15.25
+    assert render(hass, f"{{{{ states_min({filters}) }}}}") == 10.0
+    assert render(hass, f"{{{{ states_max({filters}) }}}}") == 20.5
+    assert render(hass, f"{{{{ states_count({filters}) }}}}") == 3
+    assert render(hass, "{{ states_count(device_class='power') }}") == 4
+    assert render(hass, "{{ states_count(domain=['sensor', 'light']) }}") == 6
+    assert render(hass, "{{ states_count(domain='light', state='on') }}") == 1
+    assert (
+        render(hass, "{{ states_sum(domain='light', attribute='brightness') }}") == 100
+    )
+    assert render(hass, "{{ states_sum(domain='switch') }}") == 0
+    assert render(hass, "{{ states_max(domain='switch', default='none') }}") == "none"
+    with pytest.raises(TemplateError):
+        render(hass, "{{ states_max(domain='switch') }}")
+
+    info = render_to_info(hass, f"{{{{ states_sum({filters}) }}}}")
+    assert_result_info(
+        info, 30.5, ["sensor.power_1", "sensor.power_2", "sensor.power_3"]
+    )
+    assert info.domains_lifecycle == {"sensor"}
+    assert info.rate_limit == template.DOMAIN_STATES_RATE_LIMIT
+
+    # The states are found through the state index
+    hass.states.async_set("sensor.energy", "5", {"device_class": "power"})
+    hass.states.async_remove("sensor.power_1")
+    assert render(hass, f"{{{{ states_sum({filters}) }}}}") == 25.5
+
+    info = render_to_info(hass, "{{ states_count(device_class='power') }}")
+    assert_result_info(
+        info,
+        4,
+        ["sensor.power_2", "sensor.power_3", "sensor.energy", "binary_sensor.power"],
+    )
+    assert info.all_states_lifecycle is True
+
+    info = render_to_info(hass, "{{ states_count(domain='light') }}")
+    assert_result_info(info, 2, domains=["light"])
+    assert info.domains_lifecycle == {"light"}
+
+    info = render_to_info(hass, "{{ states_count() }}")
+    assert_result_info(info, 6, all_states=True)
+
+
+async def test_states_aggregates_area_and_label(
+    hass: HomeAssistant,
+    area_registry: ar.AreaRegistry,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test aggregating the states of an area or label."""
+    config_entry = MockConfigEntry(domain="sensor")
+    config_entry.add_to_hass(hass)
+    kitchen = area_registry.async_create("Kitchen")
+    label = label_registry.async_create("Solar")
+    for unique_id, labels in (("1", {label.label_id}), ("2", set()), ("3", set())):
+        entry = entity_registry.async_get_or_create(
+            "sensor", "test", unique_id, config_entry=config_entry
+        )
+        entity_registry.async_update_entity(
+            entry.entity_id, area_id=kitchen.id, labels=labels
+        )
+    hass.states.async_set("sensor.test_1", "1", {"device_class": "power"})
+    hass.states.async_set("sensor.test_2", "2", {"device_class": "power"})
+    hass.states.async_set("sensor.test_3", "3", {"device_class": "energy"})
+
+    info = render_to_info(hass, "{{ states_sum(area='Kitchen') }}")
+    assert_result_info(info, 6, ["sensor.test_1", "sensor.test_2", "sensor.test_3"])
+    assert not info.domains_lifecycle
+    assert info.rate_limit is None
+
+    assert render(hass, "{{ states_sum(area='Kitchen', device_class='power') }}") == 3
+    assert render(hass, "{{ states_sum(area='Kitchen', domain='light') }}") == 0
+
+    info = render_to_info(hass, "{{ states_sum(area='Kitchen', label='Solar') }}")
+    assert_result_info(info, 1, ["sensor.test_1"])
+    assert render(hass, f"{{{{ states_sum(label='{label.label_id}') }}}}") == 1
+
+
 async def test_template_thread_safety_checks(hass: HomeAssistant) -> None:
     """Test template thread safety checks."""
     hass.states.async_set("sensor.test", "23")
@@ -0,0 +1,97 @@
+"""Tests for the template worker helper."""
+
+from unittest.mock import patch
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers import template_worker
+from homeassistant.helpers.template import Template, TemplateState
+
+
+def test_can_render_in_worker() -> None:
+    """Test templates using more than the states are rendered on the loop."""
+    assert template_worker.async_can_render_in_worker(
+        Template("{{ states('sensor.one') }}")
+    )
+    assert not template_worker.async_can_render_in_worker(Template("static"))
+    assert not template_worker.async_can_render_in_worker(
+        Template("{{ area_entities('kitchen') }}")
+    )
+    assert not template_worker.async_can_render_in_worker(
+        Template("{{ states_sum('sensor') }}")
+    )
+
+
+async def test_can_send_states(hass: HomeAssistant) -> None:
+    """Test templates using all states or too many states stay on the loop."""
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+    hass.states.async_set("light.kitchen", "on")
+
+    info = Template("{{ states.sensor | count }}", hass).async_render_to_info()
+    assert template_worker.async_can_send_states(hass, info)
+    with patch.object(template_worker, "MAX_WORKER_STATES", 1):
+        assert not template_worker.async_can_send_states(hass, info)
+
+    all_states_template = Template("{{ states | map(attribute='state') | list }}", hass)
+    info = all_states_template.async_render_to_info()
+    assert info.all_states
+    assert not template_worker.async_can_send_states(hass, info)
+    worker = template_worker.async_get(hass)
+    with patch.object(worker, "_async_get_executor") as mock_get_executor:
+        assert (
+            await worker.async_render_to_info(all_states_template, None, info) is None
+        )
+    mock_get_executor.assert_not_called()
+
+
+async def test_render_in_worker(hass: HomeAssistant) -> None:
+    """Test templates are rendered in the worker with a snapshot of the states."""
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.two", "2")
+    hass.states.async_set("light.kitchen", "on")
+    worker = template_worker.async_get(hass)
+    assert worker is template_worker.async_get(hass)
+
+    template = Template(
+        "{{ states.sensor | map(attribute='state') | map('int') | sum }}"
+        " {{ state_attr('sensor.one', 'unit_of_measurement') }}"
+        " {{ light.state }}",
+        hass,
+    )
+    variables = {"light": TemplateState(hass, hass.states.get("light.kitchen"))}
+    info = template.async_render_to_info(variables)
+    assert info.result() == "3 W on"
+
+    hass.states.async_set("sensor.two", "5")
+    rendered = await worker.async_render_to_info(template, variables, info)
+    assert rendered is not None
+    worker_info, render_time = rendered
+    assert worker_info.result() == "6 W on"
+    assert worker_info.domains == {"sensor"}
+    assert worker_info.entities == {"sensor.one", "light.kitchen"}
+    assert render_time > 0
+
+    # Errors in the template are returned as the result
+    error_template = Template("{{ states('sensor.one') | int / 0 }}", hass)
+    rendered = await worker.async_render_to_info(
+        error_template, None, error_template.async_render_to_info()
+    )
+    assert rendered is not None
+    assert isinstance(rendered[0].exception, TemplateError)
+
+    # A render which needs states that were not sent to the worker is
+    # left to the event loop
+    single_template = Template("{{ states('sensor.one') }}", hass)
+    assert (
+        await worker.async_render_to_info(
+            Template("{{ states('sensor.two') }}", hass),
+            None,
+            single_template.async_render_to_info(),
+        )
+        is None
+    )
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
@@ -0,0 +1,83 @@
+"""Test the benchmark script."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.scripts import benchmark
+
+
+async def _fast(hass: HomeAssistant) -> float:
+    """Fake fast benchmark."""
+    return 1.0
+
+
+async def _slow(hass: HomeAssistant) -> float:
+    """Fake slow benchmark."""
+    return 2.0
+
+
+def _run(*args: str) -> int:
+    """Run the benchmark script with the fake benchmarks."""
+    with (
+        patch.dict(benchmark.BENCHMARKS, {"fast": _fast, "slow": _slow}, clear=True),
+        patch("sys.argv", ["hass", "--script", "benchmark", *args]),
+    ):
+        return benchmark.run(list(args))
+
+
+def test_compare_to_baseline(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test comparing results to a baseline."""
+    results = benchmark.summarize(
+        {"faster": [0.8, 0.9], "same": [1.05, 1.2], "slower": [1.2], "new": [1.0]}
+    )["benchmarks"]
+    baseline = {"faster": {"min": 1.0}, "same": {"min": 1.0}, "slower": {"min": 1.0}}
+
+    assert results["same"] == {
+        "runs": [1.05, 1.2],
+        "min": 1.05,
+        "median": 1.125,
+        "max": 1.2,
+    }
+    assert benchmark.compare_to_baseline(baseline, results, 0.1) == ["slower"]
+    assert benchmark.compare_to_baseline(baseline, results, 0.25) == []
+
+    output = capsys.readouterr().out
+    assert "faster: 1.0000s -> 0.8000s (-20.0%)\n" in output
+    assert "slower: 1.0000s -> 1.2000s (+20.0%) REGRESSION\n" in output
+    assert "new: 1.0000s, not in baseline\n" in output
+
+
+def test_run_json_and_baseline(tmp_path: Path) -> None:
+    """Test writing results and comparing them to a baseline."""
+    results_file = tmp_path / "results.json"
+
+    assert _run("all", "--runs", "2", "--json", str(results_file)) == 0
+
+    results = json.loads(results_file.read_text())
+    assert results["benchmarks"] == {
+        "fast": {"runs": [1.0, 1.0], "min": 1.0, "median": 1.0, "max": 1.0},
+        "slow": {"runs": [2.0, 2.0], "min": 2.0, "median": 2.0, "max": 2.0},
+    }
+
+    assert _run("fast", "slow", "--runs", "1", "--baseline", str(results_file)) == 0
+
+    # Regress the slow benchmark
+    results["benchmarks"]["slow"]["min"] = 1.5
+    results_file.write_text(json.dumps(results))
+    assert _run("slow", "--runs", "1", "--baseline", str(results_file)) == 1
+    assert (
+        _run(
+            "slow", "--runs", "1", "--baseline", str(results_file), "--threshold", "0.5"
+        )
+        == 0
+    )
+
+
+def test_run_baseline_requires_runs() -> None:
+    """Test comparing to a baseline requires a number of runs."""
+    with pytest.raises(SystemExit):
+        _run("fast", "--baseline", "baseline.json")
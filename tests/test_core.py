@@ -61,6 +61,8 @@ from homeassistant.helpers.json import json_dumps
 from homeassistant.setup import async_setup_component
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
+from homeassistant.util.executor import InterruptibleThreadPoolExecutor
+from homeassistant.util.json import json_loads
 from homeassistant.util.read_only_dict import ReadOnlyDict
 
 from .common import (
@@ -1561,6 +1563,148 @@ async def test_statemachine_avoids_updating_attributes(hass: HomeAssistant) -> N
     assert isinstance(new_state.attributes, ReadOnlyDict)
 
 
+async def test_statemachine_interns_attributes(hass: HomeAssistant) -> None:
+    """Test identical attribute mappings are shared between states."""
+    attrs = {"unit_of_measurement": "W", "device_class": "power"}
+    hass.states.async_set("sensor.one", "1", attrs)
+    hass.states.async_set("sensor.two", "2", dict(attrs))
+    hass.states.async_set("sensor.three", "3", {**attrs, "state_class": None})
+    hass.states.async_set("sensor.four", "4", {"values": [1, 2]})
+    hass.states.async_set("sensor.five", "5", {"values": [1, 2]})
+
+    one = hass.states.get("sensor.one")
+    assert one.attributes is hass.states.get("sensor.two").attributes
+    assert one.attributes is not hass.states.get("sensor.three").attributes
+    # Unhashable values are not interned
+    assert (
+        hass.states.get("sensor.four").attributes
+        is not hass.states.get("sensor.five").attributes
+    )
+    assert hass.states.async_attributes_stats() == {
+        "states": 5,
+        "unique_attributes": 4,
+        "interned_attributes": 2,
+    }
+
+
+async def test_statemachine_interns_changed_attributes(hass: HomeAssistant) -> None:
+    """Test attributes are only interned when an entity is added or they change shape."""
+    hass.states.async_set("light.one", "on", {"brightness": 1})
+    hass.states.async_set("light.two", "on", {"brightness": 2})
+    # Only the values changed
+    hass.states.async_set("light.two", "on", {"brightness": 1})
+    assert (
+        hass.states.get("light.two").attributes
+        is not hass.states.get("light.one").attributes
+    )
+    assert hass.states.get("light.two").attributes == {"brightness": 1}
+
+    # The attributes changed shape
+    hass.states.async_set("light.one", "off", {})
+    hass.states.async_set("light.two", "off", {})
+    assert (
+        hass.states.get("light.two").attributes
+        is hass.states.get("light.one").attributes
+    )
+
+
+@pytest.mark.parametrize(
+    ("attrs", "other_attrs"),
+    [
+        ({"value": 1}, {"value": True}),
+        ({"value": 1}, {"value": 1.0}),
+        ({"value": 0.0}, {"value": -0.0}),
+    ],
+)
+async def test_statemachine_interns_attributes_by_type(
+    hass: HomeAssistant, attrs: dict[str, Any], other_attrs: dict[str, Any]
+) -> None:
+    """Test equal attribute values of a different type are not shared."""
+    hass.states.async_set("sensor.one", "1", attrs)
+    hass.states.async_set("sensor.two", "2", other_attrs)
+
+    other_state = hass.states.get("sensor.two")
+    assert other_state.attributes is not hass.states.get("sensor.one").attributes
+    assert json_dumps(other_state.attributes) == json_dumps(other_attrs)
+
+
+async def test_state_attributes_json_fragment_shared(hass: HomeAssistant) -> None:
+    """Test the attributes JSON fragment is shared when attributes do not change."""
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "W"})
+    state = hass.states.get("sensor.one")
+    assert json_loads(state.as_dict_json) == json_loads(json_dumps(state.as_dict()))
+    fragment = state.attributes_json_fragment
+
+    hass.states.async_set("sensor.one", "2", {"unit_of_measurement": "W"})
+    assert hass.states.get("sensor.one").attributes_json_fragment is fragment
+
+    hass.states.async_set("sensor.one", "3", {"unit_of_measurement": "kW"})
+    assert hass.states.get("sensor.one").attributes_json_fragment is not fragment
+
+
+async def test_statemachine_batch_writes(hass: HomeAssistant) -> None:
+    """Test state writes in a batch fire their events when the batch ends."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set("light.bowl", "off")
+    await hass.async_block_till_done()
+    events.clear()
+
+    with hass.states.async_batch_writes():
+        hass.states.async_set("light.bowl", "on")
+        with hass.states.async_batch_writes():
+            hass.states.async_set("light.kitchen", "on")
+        hass.states.async_remove("light.bowl")
+        # States are applied immediately, events are deferred
+        assert hass.states.get("light.kitchen").state == "on"
+        await asyncio.sleep(0)
+        assert events == []
+
+    await hass.async_block_till_done()
+    assert [
+        (
+            event.data["entity_id"],
+            event.data["old_state"] and event.data["old_state"].state,
+            event.data["new_state"] and event.data["new_state"].state,
+        )
+        for event in events
+    ] == [
+        ("light.bowl", "off", "on"),
+        ("light.kitchen", None, "on"),
+        ("light.bowl", "on", None),
+    ]
+    # Batching only defers the events, every write keeps its own context
+    assert events[0].context.id != events[1].context.id
+
+
+async def test_statemachine_set_many(hass: HomeAssistant) -> None:
+    """Test setting multiple states at once."""
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    state_reported_events = []
+    hass.bus.async_listen(
+        EVENT_STATE_REPORTED,
+        ha.callback(lambda event: state_reported_events.append(event)),
+        event_filter=ha.callback(lambda event_data: True),
+    )
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+
+    context = ha.Context()
+    hass.states.async_set_many(
+        [
+            ("Sensor.One", "1", {"unit_of_measurement": "W"}),
+            ("sensor.two", 2, None),
+        ],
+        context=context,
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.two").state == "2"
+    assert len(state_changed_events) == 2
+    assert state_changed_events[1].context is context
+    assert len(state_reported_events) == 1
+    assert state_reported_events[0].data["entity_id"] == "sensor.one"
+
+
 def test_service_call_repr() -> None:
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -3030,6 +3174,118 @@ async def test_async_add_import_executor_job(hass: HomeAssistant) -> None:
     assert hass.import_executor._max_workers == 1
 
 
+async def test_async_add_lane_executor_job(hass: HomeAssistant) -> None:
+    """Test async_add_lane_executor_job runs jobs in a dedicated pool per lane."""
+    hass.executor_lane_workers["custom"] = 3
+
+    def executor_func(value: int) -> tuple[str, int]:
+        return threading.current_thread().name, value
+
+    thread_name, value = await hass.async_add_lane_executor_job(
+        ha.ExecutorLane.STORAGE, executor_func, 1
+    )
+    assert thread_name.startswith("StorageExecutor")
+    assert value == 1
+
+    thread_name, value = await hass.async_add_lane_executor_job(
+        "custom", executor_func, 2
+    )
+    assert thread_name.startswith("CustomExecutor")
+    assert value == 2
+
+    stats = hass.async_executor_lane_stats()
+    assert set(stats) == {"storage", "custom"}
+    assert stats["storage"]["max_workers"] == 2
+    assert stats["storage"]["completed"] == 1
+    assert stats["custom"]["max_workers"] == 3
+    assert stats["custom"]["queued"] == 0
+
+    await hass.async_stop()
+    assert hass.async_executor_lane_stats() == {}
+
+    # Lanes are shut down, late jobs run in the default executor
+    thread_name, value = await hass.async_add_lane_executor_job(
+        ha.ExecutorLane.STORAGE, executor_func, 3
+    )
+    assert not thread_name.startswith("StorageExecutor")
+    assert value == 3
+    assert hass.async_executor_lane_stats() == {}
+
+
+async def test_async_set_executor_lane_workers(hass: HomeAssistant) -> None:
+    """Test the number of workers of the executor lanes can be configured."""
+
+    def executor_func() -> None:
+        """Do nothing."""
+
+    await hass.async_add_lane_executor_job(ha.ExecutorLane.STORAGE, executor_func)
+    hass.async_set_executor_lane_workers({"storage": 5, "custom": 1})
+    assert hass.executor_lane_workers[ha.ExecutorLane.STORAGE] == 5
+    assert hass.executor_lane_workers[ha.ExecutorLane.LOADER] == 2
+
+    # Lanes in use are resized, new lanes are created with the size
+    await hass.async_add_lane_executor_job("custom", executor_func)
+    stats = hass.async_executor_lane_stats()
+    assert stats["storage"]["max_workers"] == 5
+    assert stats["custom"]["max_workers"] == 1
+
+
+async def test_executor_lanes_shut_down_before_joining(hass: HomeAssistant) -> None:
+    """Test all executor lanes are shut down before their threads are joined."""
+
+    def executor_func() -> None:
+        """Do nothing."""
+
+    await hass.async_add_lane_executor_job(ha.ExecutorLane.STORAGE, executor_func)
+    await hass.async_add_lane_executor_job(ha.ExecutorLane.LOADER, executor_func)
+    calls: list[tuple[str, bool | None]] = []
+    original_shutdown = InterruptibleThreadPoolExecutor.shutdown
+    original_join = InterruptibleThreadPoolExecutor.join_threads_or_timeout
+
+    def _shutdown(self, *args, join_threads_or_timeout: bool = True, **kwargs):
+        calls.append(("shutdown", join_threads_or_timeout))
+        original_shutdown(
+            self, *args, join_threads_or_timeout=join_threads_or_timeout, **kwargs
+        )
+
+    def _join(self):
+        calls.append(("join", None))
+        original_join(self)
+
+    with (
+        patch.object(InterruptibleThreadPoolExecutor, "shutdown", _shutdown),
+        patch.object(InterruptibleThreadPoolExecutor, "join_threads_or_timeout", _join),
+    ):
+        hass._shutdown_executor_lanes()
+
+    assert calls == [
+        ("shutdown", False),
+        ("shutdown", False),
+        ("join", None),
+        ("join", None),
+    ]
+    assert hass.async_executor_lane_stats() == {}
+
+
+async def test_async_stop_not_running_shuts_down_lanes(hass: HomeAssistant) -> None:
+    """Test stopping an instance that was never started shuts down the lanes."""
+    hass.set_state(ha.CoreState.not_running)
+
+    def executor_func() -> str:
+        return threading.current_thread().name
+
+    assert (
+        await hass.async_add_lane_executor_job(ha.ExecutorLane.STORAGE, executor_func)
+    ).startswith("StorageExecutor")
+    assert set(hass.async_executor_lane_stats()) == {"storage"}
+
+    await hass.async_stop()
+    assert hass.async_executor_lane_stats() == {}
+    assert not any(
+        thread.name.startswith("StorageExecutor") for thread in threading.enumerate()
+    )
+
+
 async def test_async_run_job_deprecated(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -3220,6 +3476,164 @@ async def test_report_state_listener_restrictions(hass: HomeAssistant) -> None:
     hass.bus.async_listen(EVENT_STATE_REPORTED, listener, event_filter=mock_filter)
 
 
+async def test_eventbus_listen_entities(hass: HomeAssistant) -> None:
+    """Test entity keyed listeners only receive matching events."""
+    entity_calls = []
+    domain_calls = []
+    both_calls = []
+
+    @ha.callback
+    def entity_listener(event):
+        """Mock entity listener."""
+        entity_calls.append(event)
+
+    @ha.callback
+    def domain_listener(event):
+        """Mock domain listener."""
+        domain_calls.append(event)
+
+    @ha.callback
+    def both_listener(event):
+        """Mock listener for entity_id and domain."""
+        both_calls.append(event)
+
+    old_count = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    unsub_entity = hass.bus.async_listen_entities(
+        EVENT_STATE_CHANGED, entity_listener, entity_ids=["Light.Kitchen"]
+    )
+    unsub_domain = hass.bus.async_listen_entities(
+        EVENT_STATE_CHANGED, domain_listener, domains=["switch"]
+    )
+    unsub_both = hass.bus.async_listen_entities(
+        EVENT_STATE_CHANGED,
+        both_listener,
+        entity_ids=["light.kitchen"],
+        domains=["light"],
+    )
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == old_count + 3
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.fan", "on")
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in entity_calls] == ["light.kitchen"]
+    assert [event.data["entity_id"] for event in domain_calls] == ["switch.fan"]
+    assert [event.data["entity_id"] for event in both_calls] == [
+        "light.kitchen",
+        "light.bowl",
+    ]
+
+    unsub_entity()
+    unsub_domain()
+    unsub_both()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == old_count
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("switch.fan", "off")
+    await hass.async_block_till_done()
+    assert len(entity_calls) == 1
+    assert len(domain_calls) == 1
+    assert len(both_calls) == 2
+
+
+async def test_eventbus_listen_entities_restrictions(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test entity keyed listeners validate their arguments."""
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+
+    with pytest.raises(HomeAssistantError, match="does not support"):
+        hass.bus.async_listen_entities("test", listener, entity_ids=["light.kitchen"])
+
+    with pytest.raises(HomeAssistantError, match="At least one"):
+        hass.bus.async_listen_entities(EVENT_STATE_CHANGED, listener)
+
+    unsub_other = hass.bus.async_listen_entities(
+        EVENT_STATE_REPORTED, listener, entity_ids=["light.bowl"]
+    )
+    unsub = hass.bus.async_listen_entities(
+        EVENT_STATE_REPORTED, listener, entity_ids=["light.kitchen"]
+    )
+    unsub()
+    unsub()
+    assert "Unable to remove unknown job listener" in caplog.text
+    # Removing an unknown listener does not add keys to the index
+    keyed_listeners = hass.bus._entity_keyed_listeners[EVENT_STATE_REPORTED]
+    assert list(keyed_listeners.by_entity_id) == ["light.bowl"]
+    unsub_other()
+
+
+async def test_eventbus_listen_entities_event_filter(hass: HomeAssistant) -> None:
+    """Test entity keyed listeners with an event filter."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_entities(
+        EVENT_STATE_CHANGED,
+        listener,
+        domains=["light"],
+        event_filter=ha.callback(lambda event_data: event_data["old_state"] is None),
+    )
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+    assert [event.data["new_state"].state for event in calls] == ["on"]
+    unsub()
+
+
+async def test_eventbus_listen_entities_dispatch(hass: HomeAssistant) -> None:
+    """Test entity keyed listeners run last and may remove themselves."""
+    calls = []
+
+    @ha.callback
+    def keyed_listener(event):
+        """Mock keyed listener removing itself."""
+        calls.append("keyed")
+        unsub_keyed()
+
+    @ha.callback
+    def other_keyed_listener(event):
+        """Mock keyed listener."""
+        calls.append("other_keyed")
+
+    unsub_keyed = hass.bus.async_listen_entities(
+        EVENT_STATE_CHANGED, keyed_listener, entity_ids=["light.kitchen"]
+    )
+    unsub_other_keyed = hass.bus.async_listen_entities(
+        EVENT_STATE_CHANGED, other_keyed_listener, entity_ids=["light.kitchen"]
+    )
+    unsub = hass.bus.async_listen(
+        EVENT_STATE_CHANGED, ha.callback(lambda event: calls.append("type"))
+    )
+    unsub_match_all = hass.bus.async_listen(
+        MATCH_ALL, ha.callback(lambda event: calls.append("match_all"))
+    )
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+    assert calls == [
+        "type",
+        "match_all",
+        "keyed",
+        "other_keyed",
+        "type",
+        "match_all",
+        "other_keyed",
+    ]
+    unsub_other_keyed()
+    unsub()
+    unsub_match_all()
+
+
 @pytest.mark.parametrize(
     "run_immediately",
     [True, False],
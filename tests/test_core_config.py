@@ -67,6 +67,8 @@ def test_core_config_schema() -> None:
         {"radius": -10},
         {"webrtc": "bla"},
         {"webrtc": {}},
+        {"executor_lanes": {"storage": 0}},
+        {"executor_lanes": {"Not a slug": 2}},
     ):
         with pytest.raises(MultipleInvalid):
             CORE_CONFIG_SCHEMA(value)
@@ -85,6 +87,7 @@ def test_core_config_schema() -> None:
             "language": "sv",
             "radius": "10",
             "webrtc": {"ice_servers": [{"url": "stun:custom_stun_server:3478"}]},
+            "executor_lanes": {"storage": "4"},
         }
     )
 
@@ -413,6 +416,7 @@ async def test_loading_configuration(hass: HomeAssistant) -> None:
             "language": "sv",
             "radius": 150,
             "webrtc": {"ice_servers": [{"url": "stun:custom_stun_server:3478"}]},
+            "executor_lanes": {"storage": 4, "custom": 1},
         },
     )
 
@@ -437,6 +441,8 @@ async def test_loading_configuration(hass: HomeAssistant) -> None:
     assert hass.config.webrtc == RTCConfiguration(
         [RTCIceServer(urls=["stun:custom_stun_server:3478"])]
     )
+    assert hass.executor_lane_workers["storage"] == 4
+    assert hass.executor_lane_workers["custom"] == 1
 
 
 @pytest.mark.parametrize(
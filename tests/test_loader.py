@@ -1128,6 +1128,22 @@ CORE_ISSUE_TRACKER_HUE = CORE_ISSUE_TRACKER + "+label%3A%22integration%3A+hue%22
 CUSTOM_ISSUE_TRACKER = "https://blablabla.com"
 
 
+@pytest.mark.parametrize(
+    ("module", "domain"),
+    [
+        ("homeassistant.components.hue", "hue"),
+        ("homeassistant.components.hue.light", "hue"),
+        ("custom_components.bla.sensor", "bla"),
+        ("homeassistant.helpers.event", "homeassistant"),
+        ("homeassistant.components", "homeassistant"),
+        ("aiohttp.web", "aiohttp"),
+    ],
+)
+def test_integration_domain_from_module(module: str, domain: str) -> None:
+    """Test resolving the integration a module belongs to."""
+    assert loader.integration_domain_from_module(module) == domain
+
+
 @pytest.mark.parametrize(
     ("domain", "module", "issue_tracker"),
     [
@@ -1,13 +1,17 @@
 """Test Home Assistant executor util."""
 
 import concurrent.futures
+import threading
 import time
 from unittest.mock import patch
 
 import pytest
 
 from homeassistant.util import executor
-from homeassistant.util.executor import InterruptibleThreadPoolExecutor
+from homeassistant.util.executor import (
+    InstrumentedThreadPoolExecutor,
+    InterruptibleThreadPoolExecutor,
+)
 
 
 async def test_executor_shutdown_can_interrupt_threads(
@@ -92,3 +96,55 @@ async def test_overall_timeout_reached(caplog: pytest.LogCaptureFixture) -> None
     assert finish - start < 3.0
 
     iexecutor.shutdown()
+
+
+def test_instrumented_executor_stats() -> None:
+    """Test the instrumented executor tracks queue depth and latency."""
+    iexecutor = InstrumentedThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+
+    blocking = iexecutor.submit(release.wait)
+    queued = iexecutor.submit(lambda value, *, extra: value + extra, 1, extra=2)
+    stats = iexecutor.stats()
+    assert stats["max_workers"] == 1
+    assert stats["queued"] + stats["running"] == 2
+    assert stats["completed"] == 0
+
+    time.sleep(0.01)
+    release.set()
+    assert blocking.result() is True
+    assert queued.result() == 3
+
+    iexecutor.shutdown()
+    stats = iexecutor.stats()
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
+    assert stats["completed"] == 2
+    assert stats["max_wait"] >= 0.01
+    assert stats["total_wait"] >= stats["max_wait"]
+    assert stats["total_run"] >= 0.01
+
+
+def test_instrumented_executor_cancelled_jobs() -> None:
+    """Test jobs cancelled before they start are no longer counted as queued."""
+    iexecutor = InstrumentedThreadPoolExecutor(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def _block() -> None:
+        started.set()
+        release.wait()
+
+    blocking = iexecutor.submit(_block)
+    started.wait()
+    queued = iexecutor.submit(time.sleep, 0)
+    assert iexecutor.stats()["queued"] == 1
+    assert queued.cancel()
+    assert iexecutor.stats()["queued"] == 0
+
+    release.set()
+    blocking.result()
+    iexecutor.shutdown()
+    stats = iexecutor.stats()
+    assert stats["queued"] == 0
+    assert stats["completed"] == 1